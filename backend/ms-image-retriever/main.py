@@ -18,8 +18,10 @@ from utils.config import (
 )
 from models import ImageCheckRequest, ImageCheckResponse, ImageInfo, ImageExistence
 from services import minio_service
+from utils.admission import AdmissionController, AdmissionMiddleware
 from utils.auth import User, get_current_user
 from utils.cache import CacheClient
+from utils.deadline import DeadlineMiddleware
 from utils.health import router as health_router
 
 logging.basicConfig(level=logging.INFO)
@@ -63,7 +65,12 @@ async def lifespan(fastapi_app: FastAPI):
     minio_service.shutdown()
 
 
+admission = AdmissionController.from_env()
+
 app = FastAPI(lifespan=lifespan)
+app.state.admission = admission
+app.add_middleware(AdmissionMiddleware, controller=admission)
+app.add_middleware(DeadlineMiddleware)
 app.include_router(health_router)
 
 
@@ -98,6 +105,7 @@ async def get_image(
         cached_data = await cache.get(cache_key)
         if cached_data:
             logger.info("Cache hit for %s", cache_key)
+            admission.mark_cheap(f"/images/{image_type}/{dropper_id}")
             return Response(content=cached_data, media_type="image/png")
 
     # 2. Fetch from MinIO
@@ -110,6 +118,7 @@ async def get_image(
         # 3. Cache in background (non-blocking)
         if cache and cache.is_connected:
             background_tasks.add_task(cache.set, cache_key, data)
+            admission.mark_cheap(f"/images/{image_type}/{dropper_id}")
 
         return Response(content=data, media_type="image/png")
     except S3Error as e:
@@ -1,4 +1,3 @@
-import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 from minio.error import S3Error
 
@@ -59,6 +58,19 @@ class TestGetImage:
 
             assert response.status_code == 404
 
+    def test_cache_hit_marks_path_cheap(self, client, sample_image_data, monkeypatch):
+        """Test cache hits are prioritized by admission control."""
+        from main import admission, app
+
+        cache = MagicMock(is_connected=True)
+        cache.get = AsyncMock(return_value=sample_image_data)
+        monkeypatch.setattr(app.state, "cache", cache)
+
+        response = client.get("/images/mob/100101")
+
+        assert response.status_code == 200
+        assert "/images/mob/100101" in admission.cheap
+
 
 class TestCheckImagesExist:
     """Tests for /api/images/exist endpoint."""
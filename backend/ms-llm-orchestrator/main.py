@@ -14,6 +14,7 @@ from langfuse.langchain import CallbackHandler
 
 from config import settings
 from models import ChatRequest
+from utils.admission import AdmissionController, AdmissionMiddleware
 from utils.auth import User, get_current_user
 from utils.health import router as health_router
 
@@ -94,7 +95,12 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application...")
 
 
+# Each chat holds its slot for the whole stream.
+admission = AdmissionController.from_env(route_limits={"/stream-chat": 16})
+
 app = FastAPI(lifespan=lifespan)
+app.state.admission = admission
+app.add_middleware(AdmissionMiddleware, controller=admission)
 app.include_router(health_router)
 
 
@@ -0,0 +1,75 @@
+"""Configuration settings for maple drop repository service."""
+
+import os
+
+# --- MySQL Connection ---
+DB_HOST_PORT = os.getenv("MYSQL_HOST", "db:3306")
+DB_USER = os.getenv("MYSQL_USER", "username")
+DB_PASSWORD = os.getenv("MYSQL_PASSWORD", "password")
+DB_NAME = os.getenv("MYSQL_DATABASE", "database")
+db_host, db_port = DB_HOST_PORT.split(":")
+DB_CONFIG = {
+    "host": db_host,
+    "port": int(db_port),
+    "user": DB_USER,
+    "password": DB_PASSWORD,
+    "database": DB_NAME
+}
+DB_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "5"))
+
+# --- Schema ---
+# Creates the change log, summary and read model tables every write needs; on by default.
+DB_MIGRATIONS = os.getenv("DB_MIGRATIONS", "on").lower() != "off"
+# drop_data indexes: "off" skips the check, "check" logs missing indexes, "create" also builds them.
+DB_INDEX_BOOTSTRAP = os.getenv("DB_INDEX_BOOTSTRAP", "check").lower()
+
+# --- Augmented Read Model ---
+# Source of drop_names for `python -m services.drop_augmented sync-names`.
+NAMES_MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:20000/?directConnection=true")
+NAMES_MONGO_DATABASE = os.getenv("NAMES_MONGO_DATABASE", "maplestory")
+NAMES_MONGO_COLLECTION = os.getenv("NAMES_MONGO_COLLECTION", "name")
+
+# --- Change Feed ---
+CHANGE_FEED_PAGE_SIZE = int(os.getenv("CHANGE_FEED_PAGE_SIZE", "1000"))
+CHANGE_FEED_MAX_WAIT = float(os.getenv("CHANGE_FEED_MAX_WAIT_SECONDS", "30"))
+CHANGE_FEED_POLL_INTERVAL = float(os.getenv("CHANGE_FEED_POLL_INTERVAL_SECONDS", "1.0"))
+
+# --- Write Coalescing ---
+# Milliseconds to gather concurrent writes into one transaction; 0 commits each write on its own.
+WRITE_COALESCE_WINDOW_MS = float(os.getenv("WRITE_COALESCE_WINDOW_MS", "0"))
+WRITE_COALESCE_MAX_BATCH = int(os.getenv("WRITE_COALESCE_MAX_BATCH", "200"))
+
+# --- Bulk Import ---
+DROP_IMPORT_CHUNK_SIZE = int(os.getenv("DROP_IMPORT_CHUNK_SIZE", "1000"))
+# Imports load on their own connection, outside the pool; this caps how many run at once.
+DROP_IMPORT_MAX_CONCURRENT = int(os.getenv("DROP_IMPORT_MAX_CONCURRENT", "2"))
+# A replace import pauses drop writes; the pause lapses this long after its last chunk.
+DROP_IMPORT_WRITE_PAUSE_SECONDS = int(os.getenv("DROP_IMPORT_WRITE_PAUSE_SECONDS", "300"))
+
+# --- Export ---
+DROP_EXPORT_BATCH_SIZE = int(os.getenv("DROP_EXPORT_BATCH_SIZE", "5000"))
+# Exports stream on their own connection, outside the pool; this caps how many run at once.
+DROP_EXPORT_MAX_CONCURRENT = int(os.getenv("DROP_EXPORT_MAX_CONCURRENT", "2"))
+
+# --- Repository Backend ---
+# "mysql" (default), "sqlite" or "memory"; the latter two serve only the core drop endpoints.
+DROP_REPO_BACKEND = os.getenv("DROP_REPO_BACKEND", "mysql").lower()
+DROP_REPO_SQLITE_PATH = os.getenv("DROP_REPO_SQLITE_PATH", "drop_data.sqlite3")
+# Optional CSV/NDJSON file loaded into a sqlite/memory repository at startup.
+DROP_REPO_SEED_PATH = os.getenv("DROP_REPO_SEED_PATH", "")
+
+# --- Statement Timeouts ---
+# "auto" detects MySQL vs MariaDB on first use; the timeout syntax differs between them.
+DB_SERVER_FLAVOR = os.getenv("DB_SERVER_FLAVOR", "auto").lower()
+# Execution limit for SELECT statements in milliseconds; 0 disables it.
+DB_READ_TIMEOUT_MS = float(os.getenv("DB_READ_TIMEOUT_MS", "5000"))
+# The analytics full-table load reads every row, so it gets its own, longer limit.
+DB_ANALYTICS_TIMEOUT_MS = float(os.getenv("DB_ANALYTICS_TIMEOUT_MS", "120000"))
+# innodb_lock_wait_timeout for write transactions in seconds; 0 keeps the server default.
+DB_LOCK_WAIT_TIMEOUT = int(os.getenv("DB_LOCK_WAIT_TIMEOUT_SECONDS", "5"))
+
+# --- Slow Query Log ---
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_MAX_PER_MINUTE = int(os.getenv("SLOW_QUERY_MAX_PER_MINUTE", "30"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "300"))
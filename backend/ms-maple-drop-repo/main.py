@@ -1,51 +1,292 @@
-"""Maple drop repository microservice for MySQL drop data operations."""
+"""Maple drop repository microservice for drop data operations (MySQL by default)."""
 
+import asyncio
 import logging
-import os
-from typing import Literal
+from contextlib import asynccontextmanager, contextmanager
+from typing import Iterator, Literal, Optional
 
 import mysql.connector
-from fastapi import FastAPI, HTTPException, Request, Depends, Query, Path
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request, Response, Depends, Query, Path, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from mysql.connector import pooling, cursor
 
-from models import DropUpdate, DropCreate, ExistenceCheckRequest, ExistenceCheckResponse
-from services.existence_checker import check_existence
+from config import (
+    DB_ANALYTICS_TIMEOUT_MS,
+    DB_CONFIG,
+    DB_POOL_SIZE,
+    DB_INDEX_BOOTSTRAP,
+    DB_MIGRATIONS,
+    DB_LOCK_WAIT_TIMEOUT,
+    DB_READ_TIMEOUT_MS,
+    DB_SERVER_FLAVOR,
+    CHANGE_FEED_MAX_WAIT,
+    CHANGE_FEED_PAGE_SIZE,
+    CHANGE_FEED_POLL_INTERVAL,
+    DROP_EXPORT_BATCH_SIZE,
+    DROP_EXPORT_MAX_CONCURRENT,
+    DROP_IMPORT_CHUNK_SIZE,
+    DROP_IMPORT_MAX_CONCURRENT,
+    DROP_IMPORT_WRITE_PAUSE_SECONDS,
+    DROP_REPO_BACKEND,
+    DROP_REPO_SEED_PATH,
+    DROP_REPO_SQLITE_PATH,
+    SLOW_QUERY_EXPLAIN,
+    SLOW_QUERY_EXPLAIN_INTERVAL,
+    SLOW_QUERY_MAX_PER_MINUTE,
+    SLOW_QUERY_THRESHOLD_MS,
+    WRITE_COALESCE_MAX_BATCH,
+    WRITE_COALESCE_WINDOW_MS,
+)
+from models import (
+    DropUpdate,
+    DropCreate,
+    DropBatchRequest,
+    DropBatchResponse,
+    DropSearchRequest,
+    DropSearchResponse,
+    ExistenceCheckRequest,
+    ExistenceCheckResponse,
+    ImportReport,
+    ChangeFeedResponse,
+    MobDropSummary,
+    ItemDropSummary,
+    MobRankingRequest,
+    MobRankingResponse,
+)
+from services.change_log import ChangeNotifier, WritesPausedError, fetch_changes, fetch_latest_seq
+from services.drop_augmented import search_augmented
+from services.drop_analytics import AnalyticsCache, compute_mob_rankings, load_drop_columns
+from services.drop_batch import run_drop_batch
+from services.drop_export import FILE_EXTENSIONS, MEDIA_TYPES, arrow_available, stream_export
+from services.drop_import import DropImporter, ImportConflictError, ImportValidationError, aiter_lines, run_import
+from services.drop_repository import DropRepository, create_local_repository, seed_repository
+from services.drop_summary import fetch_item_summary, fetch_mob_summary
+from services.etag import conditional_json_response
+from services.index_bootstrap import ensure_indexes
+from services.mysql_drop_repository import MySQLDropRepository
+from services.query_monitor import (
+    LOCK_WAIT_TIMEOUT_ERRNOS,
+    STATEMENT_TIMEOUT_ERRNOS,
+    MonitoredCursor,
+    ServerFlavor,
+    SlowQueryLog,
+    detect_flavor,
+)
+from services.schema_migrations import run_migrations
+from services.write_coalescer import WriteCoalescer
+from utils.admission import AdmissionController, AdmissionMiddleware
 from utils.auth import User, get_current_user
+from utils.deadline import DeadlineMiddleware, check_deadline, remaining as deadline_remaining
 from utils.health import router as health_router
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# The MySQL pool exists only with the mysql backend; other backends share one local repository.
+cnxpool = None
+local_repository: Optional[DropRepository] = None
+if DROP_REPO_BACKEND == "mysql":
+    cnxpool = pooling.MySQLConnectionPool(pool_name="mypool", pool_size=DB_POOL_SIZE, **DB_CONFIG)
+else:
+    local_repository = create_local_repository(DROP_REPO_BACKEND, DROP_REPO_SQLITE_PATH)
+
+server_flavor: Optional[ServerFlavor] = None if DB_SERVER_FLAVOR == "auto" else DB_SERVER_FLAVOR
+slow_query_log = SlowQueryLog(
+    SLOW_QUERY_THRESHOLD_MS,
+    max_per_minute=SLOW_QUERY_MAX_PER_MINUTE,
+    explain=SLOW_QUERY_EXPLAIN,
+    explain_interval=SLOW_QUERY_EXPLAIN_INTERVAL,
+)
+
+
+def resolve_flavor(cnx) -> ServerFlavor:
+    """Server flavor from config, detected on the first connection when set to auto."""
+    global server_flavor
+    if server_flavor is None:
+        server_flavor = detect_flavor(cnx)
+        logger.info("Detected %s server", server_flavor)
+    return server_flavor
+
+
+def checkout_writer_connection():
+    """Check out a pooled connection with the write lock-wait limit applied."""
+    cnx = cnxpool.get_connection()
+    if DB_LOCK_WAIT_TIMEOUT > 0:
+        # Session variables are reset when the connection returns to the pool.
+        session_cursor = cnx.cursor()
+        try:
+            session_cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", (DB_LOCK_WAIT_TIMEOUT,))
+        finally:
+            session_cursor.close()
+    return cnx
+
+
+def database_http_error(err: mysql.connector.Error) -> HTTPException:
+    """
+    Map a database error to an HTTP error.
+
+    Args:
+        err: Database error.
+
+    Returns:
+        504 for statement timeouts, 503 for lock-wait timeouts and paused
+        writes, 500 otherwise.
+    """
+    if isinstance(err, WritesPausedError):
+        return HTTPException(status_code=503, detail=str(err), headers={"Retry-After": "30"})
+    if err.errno in STATEMENT_TIMEOUT_ERRNOS:
+        return HTTPException(status_code=504, detail="Database query timed out")
+    if err.errno in LOCK_WAIT_TIMEOUT_ERRNOS:
+        return HTTPException(status_code=503, detail="Database lock wait timed out", headers={"Retry-After": "1"})
+    return HTTPException(status_code=500, detail=f"Database error: {err}")
+
+
+change_notifier = ChangeNotifier()
+analytics_cache = AnalyticsCache()
+write_coalescer = (
+    WriteCoalescer(
+        checkout_writer_connection,
+        WRITE_COALESCE_WINDOW_MS / 1000,
+        WRITE_COALESCE_MAX_BATCH,
+        open_cursor=lambda cnx: open_writer_cursor(cnx),
+    )
+    if cnxpool and WRITE_COALESCE_WINDOW_MS > 0
+    else None
+)
+
+
+def migrate_schema() -> None:
+    """
+    Apply pending schema migrations before the first write.
+
+    Raises:
+        mysql.connector.Error: If a migration fails; startup fails with it
+            rather than serving writes against missing tables.
+    """
+    cnx = cnxpool.get_connection()
+    try:
+        applied = run_migrations(cnx)
+    finally:
+        cnx.close()
+    if applied:
+        logger.info("Applied schema migrations: %s", ", ".join(applied))
+
+
+def bootstrap_schema(mode: str) -> None:
+    """
+    Verify drop_data indexes according to the bootstrap mode.
+
+    Args:
+        mode: "off", "check" or "create".
+    """
+    if mode == "off":
+        return
+    cnx = None
+    try:
+        cnx = cnxpool.get_connection()
+        ensure_indexes(cnx, create=mode == "create")
+    except mysql.connector.Error as err:
+        logger.error("Index bootstrap failed: %s", err)
+    finally:
+        if cnx and cnx.is_connected():
+            cnx.close()
+
+
+@asynccontextmanager
+async def lifespan(fastapi_app: FastAPI):
+    """
+    Manage application lifespan for startup and shutdown events.
+
+    Args:
+        fastapi_app: FastAPI application instance.
+
+    Yields:
+        None after startup completes.
+    """
+    # Startup
+    if cnxpool:
+        if DB_MIGRATIONS:
+            await run_in_threadpool(migrate_schema)
+        await run_in_threadpool(bootstrap_schema, DB_INDEX_BOOTSTRAP)
+    if local_repository and DROP_REPO_SEED_PATH:
+        await seed_repository(local_repository, DROP_REPO_SEED_PATH)
+    if write_coalescer:
+        await write_coalescer.start()
+
+    yield
+
+    # Shutdown
+    if write_coalescer:
+        await write_coalescer.stop()
+    if local_repository:
+        local_repository.close()
+
+
+# Long-polls mostly sleep, so they get their own group; bulk jobs get few slots.
+admission = AdmissionController.from_env(
+    route_limits={
+        "/api/drops/changes": 256,
+        "/api/drops/import": DROP_IMPORT_MAX_CONCURRENT,
+        "/api/drops/export": DROP_EXPORT_MAX_CONCURRENT,
+    }
+)
+
+app = FastAPI(lifespan=lifespan)
+app.state.admission = admission
+app.add_middleware(AdmissionMiddleware, controller=admission)
+app.add_middleware(DeadlineMiddleware)
 app.include_router(health_router)
 
-# Database Configuration
-DB_HOST_PORT = os.getenv("MYSQL_HOST", "db:3306")
-DB_USER = os.getenv("MYSQL_USER", "username")
-DB_PASSWORD = os.getenv("MYSQL_PASSWORD", "password")
-DB_NAME = os.getenv("MYSQL_DATABASE", "database")
-db_host, db_port = DB_HOST_PORT.split(":")
-DB_CONFIG = {
-    "host": db_host,
-    "port": int(db_port),
-    "user": DB_USER,
-    "password": DB_PASSWORD,
-    "database": DB_NAME
-}
-cnxpool = pooling.MySQLConnectionPool(pool_name="mypool", pool_size=5, **DB_CONFIG)
 
+def require_mysql() -> None:
+    """
+    Reject MySQL-only features when another repository backend is configured.
 
-def get_db_cursor(request: Request) -> cursor.MySQLCursorDict:
-    """Get database cursor for read operations."""
+    Raises:
+        HTTPException: 501 without a MySQL pool.
+    """
+    if cnxpool is None:
+        raise HTTPException(status_code=501, detail=f"Not available with the {DROP_REPO_BACKEND} backend")
+
+
+def read_timeout_ms(limit_ms: float = DB_READ_TIMEOUT_MS) -> float:
+    """
+    Execution limit for read statements: the configured limit capped by the request deadline.
+
+    Args:
+        limit_ms: Configured limit in milliseconds; 0 for none.
+
+    Returns:
+        Limit in milliseconds; 0 for none.
+
+    Raises:
+        HTTPException: 504 if the request deadline has already passed.
+    """
+    check_deadline()
+    left = deadline_remaining()
+    if left is None:
+        return limit_ms
+    budget = max(1.0, left * 1000)
+    return min(limit_ms, budget) if limit_ms > 0 else budget
+
+
+@contextmanager
+def read_cursor(dictionary: bool = True, limit_ms: float = DB_READ_TIMEOUT_MS) -> Iterator[cursor.MySQLCursorDict]:
+    """Check out a pooled connection and yield a read cursor (dictionary rows by default) limited to ``limit_ms``."""
+    require_mysql()
+    timeout_ms = read_timeout_ms(limit_ms)
     cnx = None
     db_cursor = None
     try:
         cnx = cnxpool.get_connection()
-        db_cursor = cnx.cursor(dictionary=True)
+        db_cursor = MonitoredCursor(
+            cnx, cnx.cursor(dictionary=dictionary), slow_query_log, resolve_flavor(cnx), timeout_ms
+        )
         yield db_cursor
     except mysql.connector.Error as err:
         logger.error("Database error: %s", err, exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Database error: {err}") from err
+        raise database_http_error(err) from err
     finally:
         if db_cursor:
             db_cursor.close()
@@ -53,20 +294,112 @@ def get_db_cursor(request: Request) -> cursor.MySQLCursorDict:
             cnx.close()
 
 
-def get_db_writer_cursor(request: Request) -> cursor.MySQLCursor:
-    """Get database cursor for write operations."""
+async def notify_change_waiters() -> None:
+    """Wake long-poll waiters once a write has been committed."""
+    change_notifier.notify()
+
+
+def read_changes(since: int, limit: int) -> list:
+    """
+    Read a page of the change log on a pooled connection.
+
+    Args:
+        since: Last sequence number already applied by the consumer.
+        limit: Maximum number of changes to return.
+
+    Returns:
+        Changes in sequence order.
+    """
+    with read_cursor() as db_cursor:
+        return fetch_changes(db_cursor, since, limit)
+
+
+async def wait_for_changes(since: int, limit: int, wait: float) -> list:
+    """
+    Long-poll the change log until changes arrive or the wait elapses.
+
+    No connection is held between polls; local writes wake the waiter
+    early and writes from other replicas are seen on the poll interval.
+
+    Args:
+        since: Last sequence number already applied by the consumer.
+        limit: Maximum number of changes to return.
+        wait: Maximum seconds to wait for new changes.
+
+    Returns:
+        Changes in sequence order, empty if none arrived in time.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        changes = await run_in_threadpool(read_changes, since, limit)
+        remaining = deadline - loop.time()
+        if changes or remaining <= 0:
+            return changes
+        await change_notifier.wait(min(remaining, CHANGE_FEED_POLL_INTERVAL))
+
+
+def load_analytics_columns():
+    """Load drop_data analytics columns on a pooled connection, under the analytics statement limit."""
+    with read_cursor(dictionary=False, limit_ms=DB_ANALYTICS_TIMEOUT_MS) as db_cursor:
+        return load_drop_columns(db_cursor)
+
+
+def run_mob_rankings(request: MobRankingRequest) -> MobRankingResponse:
+    """
+    Compute or reuse mob rankings for the current dataset version.
+
+    Args:
+        request: Ranking parameters.
+
+    Returns:
+        Rankings tagged with the dataset version they were computed at.
+    """
+    with read_cursor() as db_cursor:
+        version = fetch_latest_seq(db_cursor)
+    rankings, cached = compute_mob_rankings(
+        load_analytics_columns,
+        analytics_cache,
+        version,
+        request.item_values,
+        request.default_item_value,
+        request.limit,
+    )
+    return MobRankingResponse(version=version, cached=cached, rankings=rankings)
+
+
+def get_db_cursor(request: Request) -> cursor.MySQLCursorDict:
+    """Get database cursor for read operations."""
+    with read_cursor() as db_cursor:
+        yield db_cursor
+
+
+def open_writer_cursor(cnx) -> MonitoredCursor:
+    """Open the monitored cursor every write runs on, coalesced or not."""
+    return MonitoredCursor(cnx, cnx.cursor(), slow_query_log, resolve_flavor(cnx))
+
+
+@contextmanager
+def writer_cursor() -> Iterator[cursor.MySQLCursor]:
+    """Check out a pooled connection and yield a cursor whose transaction commits on success."""
+    require_mysql()
+    check_deadline()
     cnx = None
     db_cursor = None
     try:
-        cnx = cnxpool.get_connection()
-        db_cursor = cnx.cursor()
+        cnx = checkout_writer_connection()
+        db_cursor = open_writer_cursor(cnx)
         yield db_cursor
         cnx.commit()
     except mysql.connector.Error as err:
         logger.error("Database error on write: %s", err, exc_info=True)
         if cnx:
             cnx.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {err}") from err
+        raise database_http_error(err) from err
+    except Exception:
+        if cnx:
+            cnx.rollback()
+        raise
     finally:
         if db_cursor:
             db_cursor.close()
@@ -74,14 +407,50 @@ def get_db_writer_cursor(request: Request) -> cursor.MySQLCursor:
             cnx.close()
 
 
+def get_read_repository(request: Request) -> Iterator[DropRepository]:
+    """Get the drop repository for read operations."""
+    if local_repository:
+        yield local_repository
+        return
+    with read_cursor() as db_cursor:
+        yield MySQLDropRepository(db_cursor)
+
+
+def get_write_repository(request: Request) -> Iterator[DropRepository]:
+    """
+    Get the drop repository for write operations.
+
+    With the write coalescer enabled no connection is held while the
+    request waits for its batch.
+    """
+    if local_repository:
+        yield local_repository
+        return
+    if write_coalescer:
+        try:
+            yield MySQLDropRepository(write_coalescer=write_coalescer)
+        except mysql.connector.Error as err:
+            raise database_http_error(err) from err
+        return
+    with writer_cursor() as db_cursor:
+        yield MySQLDropRepository(db_cursor)
+
+
+def get_db_batch_cursor(request: Request) -> cursor.MySQLCursor:
+    """Get database cursor for a batch transaction, also when single writes are coalesced."""
+    with writer_cursor() as db_cursor:
+        yield db_cursor
+
+
 @app.get("/api/search_drops")
 async def search_drops(
     request: Request,
     query: int = Query(..., description="Must be an integer"),
     query_type: Literal["item", "mob"] = Query(..., description="Choose either 'item' or 'mob'"),
-    db_cursor: cursor.MySQLCursorDict = Depends(get_db_cursor),
+    if_none_match: Optional[str] = Header(default=None),
+    repository: DropRepository = Depends(get_read_repository),
     user: User = Depends(get_current_user),
-):
+) -> Response:
     """
     Search drops by item or mob ID.
 
@@ -89,55 +458,108 @@ async def search_drops(
         request: FastAPI request object.
         query: ID to search for.
         query_type: Type of query (item or mob).
-        db_cursor: Database cursor.
+        if_none_match: ETag validator from a previous response.
+        repository: Drop repository.
         user: Current authenticated user.
 
     Returns:
-        List of matching drop records.
+        List of matching drop records with an ETag, or 304 if unchanged.
     """
     logger.info("User %s searching drops: query=%d, type=%s", user.name, query, query_type)
 
-    field = {
-        "item": "itemid",
-        "mob": "dropperid"
-    }.get(query_type)
-
-    sql_query = f"SELECT * FROM drop_data WHERE {field} = %s"
-    db_cursor.execute(sql_query, (query,))
-    results = db_cursor.fetchall()
+    results = await repository.search(query_type, query)
     for row in results:
         if 'id' in row:
             row['id'] = str(row['id'])
 
     logger.info("Found %d results for user %s", len(results), user.name)
-    return results
+    return conditional_json_response(results, if_none_match)
+
+
+@app.get("/api/search_drops/augmented")
+async def search_drops_augmented(
+    query: int = Query(..., description="Must be an integer"),
+    query_type: Literal["item", "mob"] = Query(..., description="Choose either 'item' or 'mob'"),
+    if_none_match: Optional[str] = Header(default=None),
+    db_cursor: cursor.MySQLCursorDict = Depends(get_db_cursor),
+    user: User = Depends(get_current_user),
+) -> Response:
+    """
+    Search drops by item or mob ID with dropper and item names from the read model.
+
+    Args:
+        query: ID to search for.
+        query_type: Type of query (item or mob).
+        if_none_match: ETag validator from a previous response.
+        db_cursor: Database cursor dependency.
+        user: Current authenticated user.
+
+    Returns:
+        Drop records shaped like the aggregator's AugmentedDrop with an ETag,
+        or 304 if unchanged.
+    """
+    logger.info("User %s searching augmented drops: query=%d, type=%s", user.name, query, query_type)
+
+    results = search_augmented(db_cursor, query_type, query)
+    for row in results:
+        row["id"] = str(row["id"])
+
+    logger.info("Found %d augmented results for user %s", len(results), user.name)
+    return conditional_json_response(results, if_none_match)
+
+
+@app.post("/api/search_drops/bulk", response_model=DropSearchResponse)
+async def search_drops_bulk(
+    request: DropSearchRequest,
+    repository: DropRepository = Depends(get_read_repository),
+    user: User = Depends(get_current_user),
+) -> DropSearchResponse:
+    """
+    Search drops of many mobs or many items in one query.
+
+    Args:
+        request: IDs to search and their type.
+        repository: Drop repository.
+        user: Current authenticated user.
+
+    Returns:
+        Matching drop records by requested ID; IDs without drops map to an empty list.
+    """
+    logger.info("User %s bulk searching drops: %d %s IDs", user.name, len(request.queries), request.query_type)
+
+    results = await repository.search_many(request.query_type, request.queries)
+    for rows in results.values():
+        for row in rows:
+            row["id"] = str(row["id"])
+
+    return DropSearchResponse(results={str(query): rows for query, rows in results.items()})
 
 
 @app.get("/get_drop/{id}")
 async def get_drop(
     id: int = Path(..., description="Must be an integer"),
-    db_cursor: cursor.MySQLCursorDict = Depends(get_db_cursor),
+    if_none_match: Optional[str] = Header(default=None),
+    repository: DropRepository = Depends(get_read_repository),
     user: User = Depends(get_current_user),
-):
+) -> Response:
     """
     Get a single drop record by ID.
 
     Args:
         id: Drop record ID.
-        db_cursor: Database cursor.
+        if_none_match: ETag validator from a previous response.
+        repository: Drop repository.
         user: Current authenticated user.
 
     Returns:
-        Drop record.
+        Drop record with an ETag, or 304 if unchanged.
 
     Raises:
         HTTPException: 404 if not found.
     """
     logger.info("User %s getting drop: id=%d", user.name, id)
 
-    sql_query = "SELECT * FROM drop_data WHERE id = %s"
-    db_cursor.execute(sql_query, (id,))
-    result = db_cursor.fetchone()
+    result = await repository.get(id)
 
     if not result:
         raise HTTPException(status_code=404, detail="Drop record not found")
@@ -145,7 +567,7 @@ async def get_drop(
     if 'id' in result:
         result['id'] = str(result['id'])
 
-    return result
+    return conditional_json_response(result, if_none_match)
 
 
 @app.put("/update_drop/{id}")
@@ -153,7 +575,8 @@ async def update_drop(
     id: int,
     drop: DropUpdate,
     request: Request,
-    db_cursor: cursor.MySQLCursor = Depends(get_db_writer_cursor),
+    background_tasks: BackgroundTasks,
+    repository: DropRepository = Depends(get_write_repository),
     user: User = Depends(get_current_user),
 ):
     """
@@ -163,21 +586,22 @@ async def update_drop(
         id: Drop record ID to update.
         drop: New drop data.
         request: FastAPI request object.
-        db_cursor: Database cursor.
+        background_tasks: Notifies change feed waiters after commit.
+        repository: Drop repository.
         user: Current authenticated user.
 
     Returns:
         Success message with ID.
+
+    Raises:
+        HTTPException: 404 if not found.
     """
     logger.info("User %s updating drop: id=%d", user.name, id)
 
-    sql_update_query = """
-        UPDATE drop_data 
-        SET dropperid=%s, itemid=%s, minimum_quantity=%s, maximum_quantity=%s, questid=%s, chance=%s 
-        WHERE id=%s
-    """
-    values = (drop.dropperid, drop.itemid, drop.minimum_quantity, drop.maximum_quantity, drop.questid, drop.chance, id)
-    db_cursor.execute(sql_update_query, values)
+    if not await repository.update(id, drop):
+        raise HTTPException(status_code=404, detail="Drop record not found")
+
+    background_tasks.add_task(notify_change_waiters)
 
     logger.info("User %s successfully updated drop record: id=%d", user.name, id)
     return {"message": "Drop data updated successfully", "id": id}
@@ -187,7 +611,8 @@ async def update_drop(
 async def add_drop(
     drop: DropCreate,
     request: Request,
-    db_cursor: cursor.MySQLCursor = Depends(get_db_writer_cursor),
+    background_tasks: BackgroundTasks,
+    repository: DropRepository = Depends(get_write_repository),
     user: User = Depends(get_current_user),
 ):
     """
@@ -196,7 +621,8 @@ async def add_drop(
     Args:
         drop: Drop data to create.
         request: FastAPI request object.
-        db_cursor: Database cursor.
+        background_tasks: Notifies change feed waiters after commit.
+        repository: Drop repository.
         user: Current authenticated user.
 
     Returns:
@@ -204,14 +630,8 @@ async def add_drop(
     """
     logger.info("User %s adding new drop", user.name)
 
-    sql_insert_query = """
-        INSERT INTO drop_data 
-        (dropperid, itemid, minimum_quantity, maximum_quantity, questid, chance) 
-        VALUES (%s, %s, %s, %s, %s, %s)
-    """
-    values = (drop.dropperid, drop.itemid, drop.minimum_quantity, drop.maximum_quantity, drop.questid, drop.chance)
-    db_cursor.execute(sql_insert_query, values)
-    new_id = db_cursor.lastrowid
+    new_id = await repository.create(drop)
+    background_tasks.add_task(notify_change_waiters)
 
     logger.info("User %s successfully added drop record: id=%d", user.name, new_id)
     return {"message": "Drop data added successfully", "id": new_id}
@@ -221,7 +641,8 @@ async def add_drop(
 async def delete_drop(
     id: int,
     request: Request,
-    db_cursor: cursor.MySQLCursor = Depends(get_db_writer_cursor),
+    background_tasks: BackgroundTasks,
+    repository: DropRepository = Depends(get_write_repository),
     user: User = Depends(get_current_user),
 ):
     """
@@ -230,7 +651,8 @@ async def delete_drop(
     Args:
         id: Drop record ID to delete.
         request: FastAPI request object.
-        db_cursor: Database cursor.
+        background_tasks: Notifies change feed waiters after commit.
+        repository: Drop repository.
         user: Current authenticated user.
 
     Returns:
@@ -241,20 +663,173 @@ async def delete_drop(
     """
     logger.info("User %s deleting drop: id=%d", user.name, id)
 
-    sql_delete_query = "DELETE FROM drop_data WHERE id = %s"
-    db_cursor.execute(sql_delete_query, (id,))
-
-    if db_cursor.rowcount == 0:
+    if not await repository.delete(id):
         raise HTTPException(status_code=404, detail="Drop record not found")
 
+    background_tasks.add_task(notify_change_waiters)
+
     logger.info("User %s successfully deleted drop record: id=%d", user.name, id)
     return {"message": "Drop data deleted successfully", "id": id}
 
 
+@app.post("/api/drops/batch", response_model=DropBatchResponse)
+async def batch_drops(
+    batch: DropBatchRequest,
+    background_tasks: BackgroundTasks,
+    db_cursor: cursor.MySQLCursor = Depends(get_db_batch_cursor),
+    user: User = Depends(get_current_user),
+) -> DropBatchResponse:
+    """
+    Apply mixed create, update and delete operations in one transaction.
+
+    Args:
+        batch: Operations and mode ("atomic" or "best_effort").
+        background_tasks: Notifies change feed waiters after commit.
+        db_cursor: Database cursor of the batch transaction.
+        user: Current authenticated user.
+
+    Returns:
+        Per-operation results and the number of committed operations.
+
+    Raises:
+        HTTPException: 409 with the per-operation results if an atomic batch
+            references missing rows; nothing is committed.
+    """
+    logger.info("User %s applying %s batch of %d operations", user.name, batch.mode, len(batch.operations))
+
+    response = run_drop_batch(db_cursor, batch)
+    if batch.mode == "atomic" and response.committed == 0:
+        raise HTTPException(status_code=409, detail=response.model_dump())
+    if response.committed:
+        background_tasks.add_task(notify_change_waiters)
+
+    logger.info("User %s committed %d of %d batch operations", user.name, response.committed, len(batch.operations))
+    return response
+
+
+@app.post("/api/drops/import", response_model=ImportReport)
+async def import_drops(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: Literal["csv", "ndjson"] = Query("csv", description="Body format: CSV with header or NDJSON"),
+    mode: Literal["replace", "append"] = Query("replace", description="Swap in a new table or append rows"),
+    chunk_size: int = Query(DROP_IMPORT_CHUNK_SIZE, ge=1, le=50000),
+    skip_invalid: bool = Query(False, description="Skip invalid rows instead of aborting"),
+    max_rows_per_second: Optional[float] = Query(None, gt=0, description="Throttle the load rate"),
+    user: User = Depends(get_current_user),
+) -> ImportReport:
+    """
+    Stream a CSV or NDJSON body into drop_data.
+
+    The body is read incrementally and loaded in chunks on a dedicated
+    connection. In replace mode drop_data is swapped for the loaded table
+    in one RENAME, so readers see either the old or the new data, and rows
+    with an id (such as an export) keep it. Drop writes are rejected with
+    503 while a replace import runs, so none are lost in the swap.
+
+    Args:
+        request: FastAPI request object; its body is streamed.
+        background_tasks: Notifies change feed waiters after the import.
+        format: Body format.
+        mode: "replace" or "append".
+        chunk_size: Rows per INSERT and commit.
+        skip_invalid: Skip invalid rows instead of aborting.
+        max_rows_per_second: Optional load rate limit.
+        user: Current authenticated user.
+
+    Returns:
+        Import report with row counts and throughput.
+
+    Raises:
+        HTTPException: 422 on an invalid row, 409 if another replace import
+            is running or writes reached the old table, 503 if a replace
+            import has paused writes (append mode), 500 on database errors.
+    """
+    logger.info("User %s importing drops: format=%s, mode=%s", user.name, format, mode)
+    require_mysql()
+
+    def log_progress(rows: int, elapsed: float) -> None:
+        logger.info("Import by %s: %d rows loaded in %.1fs", user.name, rows, elapsed)
+
+    try:
+        # The client sets the pace of the upload; a pooled connection would be taken
+        # from every other route for as long as it takes.
+        importer = DropImporter(
+            await run_in_threadpool(mysql.connector.connect, **DB_CONFIG), mode, DROP_IMPORT_WRITE_PAUSE_SECONDS
+        )
+    except mysql.connector.Error as err:
+        raise HTTPException(status_code=500, detail=f"Database error: {err}") from err
+    try:
+        report = await run_import(
+            aiter_lines(request.stream()),
+            importer,
+            format,
+            chunk_size=chunk_size,
+            skip_invalid=skip_invalid,
+            max_rows_per_second=max_rows_per_second,
+            progress=log_progress,
+        )
+    except ImportValidationError as err:
+        raise HTTPException(status_code=422, detail={"line": err.line, "error": err.detail}) from err
+    except ImportConflictError as err:
+        raise HTTPException(status_code=409, detail=str(err)) from err
+    except mysql.connector.Error as err:
+        logger.error("Import failed: %s", err, exc_info=True)
+        raise database_http_error(err) from err
+    finally:
+        await run_in_threadpool(importer.close)
+
+    background_tasks.add_task(notify_change_waiters)
+    logger.info("User %s imported %d drops (%d skipped) in %.1fs", user.name, report.rows, report.skipped, report.seconds)
+    return report
+
+
+@app.get("/api/drops/export")
+async def export_drops(
+    format: Literal["csv", "ndjson", "arrow"] = Query("csv", description="csv, ndjson or arrow (Arrow IPC stream)"),
+    batch_size: int = Query(DROP_EXPORT_BATCH_SIZE, ge=1, le=100000),
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Stream the whole drop_data table.
+
+    Args:
+        format: Output format.
+        batch_size: Rows fetched and encoded per chunk.
+        user: Current authenticated user.
+
+    Returns:
+        Chunked response with every drop row ordered by ID.
+
+    Raises:
+        HTTPException: 501 if Arrow is requested without pyarrow installed,
+            500 on database errors before streaming starts.
+    """
+    logger.info("User %s exporting drops: format=%s", user.name, format)
+    require_mysql()
+
+    if format == "arrow" and not arrow_available():
+        raise HTTPException(status_code=501, detail="Arrow export requires pyarrow")
+    try:
+        # A stream holds its connection until the client has read everything; a pooled
+        # one would be taken from every other route for that long.
+        cnx = await run_in_threadpool(mysql.connector.connect, **DB_CONFIG)
+        chunks = await run_in_threadpool(stream_export, cnx, format, batch_size)
+    except mysql.connector.Error as err:
+        logger.error("Export failed: %s", err, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Database error: {err}") from err
+
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="drop_data.{FILE_EXTENSIONS[format]}"'},
+    )
+
+
 @app.post("/api/drops/exist", response_model=ExistenceCheckResponse)
 async def check_drops_exist(
     request: ExistenceCheckRequest,
-    db_cursor: cursor.MySQLCursorDict = Depends(get_db_cursor),
+    repository: DropRepository = Depends(get_read_repository),
     user: User = Depends(get_current_user),
 ) -> ExistenceCheckResponse:
     """
@@ -262,7 +837,7 @@ async def check_drops_exist(
 
     Args:
         request: Request containing items to check.
-        db_cursor: Database cursor.
+        repository: Drop repository.
         user: Current authenticated user.
 
     Returns:
@@ -270,16 +845,126 @@ async def check_drops_exist(
     """
     logger.info("User %s checking existence of %d items", user.name, len(request.items))
 
-    final_results = check_existence(db_cursor, request.items)
+    final_results = await repository.exists(request.items)
     return ExistenceCheckResponse(results=final_results)
 
 
+@app.get("/api/drops/summary/mob/{dropperid}", response_model=MobDropSummary)
+async def get_mob_summary(
+    dropperid: int = Path(..., description="Mob ID"),
+    db_cursor: cursor.MySQLCursorDict = Depends(get_db_cursor),
+    user: User = Depends(get_current_user),
+) -> MobDropSummary:
+    """
+    Get drop counts and best chance for a mob from the summary table.
+
+    Args:
+        dropperid: Mob ID.
+        db_cursor: Database cursor.
+        user: Current authenticated user.
+
+    Returns:
+        Mob drop summary.
+
+    Raises:
+        HTTPException: 404 if the mob has no drops.
+    """
+    logger.info("User %s getting mob summary: dropperid=%d", user.name, dropperid)
+
+    summary = fetch_mob_summary(db_cursor, dropperid)
+    if not summary:
+        raise HTTPException(status_code=404, detail="No drops for this mob")
+    return MobDropSummary(**summary)
+
+
+@app.get("/api/drops/summary/item/{itemid}", response_model=ItemDropSummary)
+async def get_item_summary(
+    itemid: int = Path(..., description="Item ID"),
+    db_cursor: cursor.MySQLCursorDict = Depends(get_db_cursor),
+    user: User = Depends(get_current_user),
+) -> ItemDropSummary:
+    """
+    Get dropping-mob count and best chance for an item from the summary table.
+
+    Args:
+        itemid: Item ID.
+        db_cursor: Database cursor.
+        user: Current authenticated user.
+
+    Returns:
+        Item drop summary.
+
+    Raises:
+        HTTPException: 404 if no mob drops the item.
+    """
+    logger.info("User %s getting item summary: itemid=%d", user.name, itemid)
+
+    summary = fetch_item_summary(db_cursor, itemid)
+    if not summary:
+        raise HTTPException(status_code=404, detail="No drops for this item")
+    return ItemDropSummary(**summary)
+
+
+@app.post("/api/analytics/mob-rankings", response_model=MobRankingResponse)
+async def get_mob_rankings(
+    request: MobRankingRequest,
+    user: User = Depends(get_current_user),
+) -> MobRankingResponse:
+    """
+    Rank mobs by expected drops per kill across the whole dataset.
+
+    Scores combine chance and mean quantity of every drop of a mob. When
+    ``item_values`` is given, mobs are ranked by expected value per kill.
+    Results are cached per dataset version (latest change sequence).
+
+    Args:
+        request: Ranking parameters.
+        user: Current authenticated user.
+
+    Returns:
+        Ranked mobs with the dataset version used.
+    """
+    logger.info("User %s requesting mob rankings (limit=%d)", user.name, request.limit)
+
+    return await run_in_threadpool(run_mob_rankings, request)
+
+
+@app.get("/api/drops/changes", response_model=ChangeFeedResponse)
+async def get_drop_changes(
+    since: int = Query(0, ge=0, description="Last sequence number already applied"),
+    limit: int = Query(CHANGE_FEED_PAGE_SIZE, ge=1, le=CHANGE_FEED_PAGE_SIZE),
+    wait: float = Query(0, ge=0, le=CHANGE_FEED_MAX_WAIT, description="Seconds to long-poll when nothing is pending"),
+    user: User = Depends(get_current_user),
+) -> ChangeFeedResponse:
+    """
+    Return drop changes recorded after a sequence number.
+
+    Consumers apply the changes in order and pass ``last_seq`` as ``since``
+    on the next call. With ``wait`` > 0 the call long-polls until at least
+    one change is available.
+
+    Args:
+        since: Last sequence number already applied.
+        limit: Maximum number of changes to return.
+        wait: Seconds to wait for new changes.
+        user: Current authenticated user.
+
+    Returns:
+        Changes in sequence order and the sequence number to resume from.
+    """
+    logger.info("User %s reading drop changes since=%d wait=%.1f", user.name, since, wait)
+
+    changes = await wait_for_changes(since, limit, wait)
+    last_seq = changes[-1]["seq"] if changes else since
+    return ChangeFeedResponse(changes=changes, last_seq=last_seq)
+
+
 @app.get("/health/ready")
 async def readiness() -> dict:
     """
     Readiness probe endpoint.
 
-    Checks if MySQL dependency is available.
+    Checks if MySQL dependency is available; local repository backends are always ready.
 
     Returns:
         Status dict with dependency states.
@@ -287,6 +972,9 @@ async def readiness() -> dict:
     Raises:
         HTTPException: 503 if MySQL is unavailable.
     """
+    if local_repository:
+        return {"status": "ready", "backend": DROP_REPO_BACKEND}
+
     cnx = None
     try:
         cnx = cnxpool.get_connection()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Literal
+from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List, Literal, Optional, Union
 
 # --- Pydantic Models for Drop CRUD ---
 class DropUpdate(BaseModel):
@@ -18,6 +18,64 @@ class DropCreate(BaseModel):
     questid: int
     chance: int
 
+# --- Pydantic Models for Bulk Search ---
+class DropSearchRequest(BaseModel):
+    query_type: Literal["item", "mob"] = "mob"
+    queries: List[int] = Field(..., min_length=1, max_length=500)
+
+class DropSearchResponse(BaseModel):
+    results: Dict[str, List[Dict]]
+
+# --- Pydantic Models for Batch Writes ---
+class BatchCreate(BaseModel):
+    op: Literal["create"]
+    data: DropCreate
+
+class BatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: DropUpdate
+
+class BatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+BatchOperation = Annotated[Union[BatchCreate, BatchUpdate, BatchDelete], Field(discriminator="op")]
+
+class DropBatchRequest(BaseModel):
+    mode: Literal["atomic", "best_effort"] = "atomic"
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=1000)
+
+class BatchOperationResult(BaseModel):
+    index: int
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    status: Literal["ok", "not_found", "error", "rolled_back"]
+    detail: Optional[str] = None
+
+class DropBatchResponse(BaseModel):
+    mode: Literal["atomic", "best_effort"]
+    committed: int
+    results: List[BatchOperationResult]
+
+# --- Pydantic Models for Bulk Import ---
+class DropImportRow(DropCreate):
+    id: Optional[int] = Field(default=None, gt=0)
+
+class ImportRowError(BaseModel):
+    line: int
+    detail: str
+
+class ImportReport(BaseModel):
+    mode: Literal["replace", "append"]
+    format: Literal["csv", "ndjson"]
+    rows: int
+    skipped: int
+    chunks: int
+    seconds: float
+    rows_per_second: float
+    errors: List[ImportRowError]
+
 # --- Pydantic Models for Existence Check ---
 class ExistenceInfo(BaseModel):
     type: Literal["mob", "item"]
@@ -33,3 +91,47 @@ class ExistenceResult(BaseModel):
 
 class ExistenceCheckResponse(BaseModel):
     results: List[ExistenceResult]
+
+# --- Pydantic Models for Change Feed ---
+class DropChange(BaseModel):
+    seq: int
+    op: Literal["create", "update", "delete", "reload"]
+    id: str
+    data: Optional[DropUpdate] = None
+
+class ChangeFeedResponse(BaseModel):
+    changes: List[DropChange]
+    last_seq: int
+
+# --- Pydantic Models for Drop Summaries ---
+class MobDropSummary(BaseModel):
+    dropperid: int
+    drop_count: int
+    item_count: int
+    max_chance: int
+    quest_drop_count: int
+
+class ItemDropSummary(BaseModel):
+    itemid: int
+    drop_count: int
+    mob_count: int
+    max_chance: int
+    best_dropperid: int
+    quest_drop_count: int
+
+# --- Pydantic Models for Drop Analytics ---
+class MobRankingRequest(BaseModel):
+    item_values: Optional[Dict[int, float]] = None
+    default_item_value: float = 0.0
+    limit: int = Field(100, ge=1, le=10000)
+
+class MobRanking(BaseModel):
+    dropperid: int
+    drop_count: int
+    expected_drops: float
+    expected_value: Optional[float] = None
+
+class MobRankingResponse(BaseModel):
+    version: int
+    cached: bool
+    rankings: List[MobRanking]
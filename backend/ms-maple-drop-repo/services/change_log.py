@@ -0,0 +1,302 @@
+"""Append-only change log for drop_data writes.
+
+Every write endpoint records its change in the same transaction as the
+write itself. Sequence numbers come from a single counter row that is
+locked until commit, so they are handed out in commit order and a
+consumer reading ``seq > N`` never skips a change that commits late.
+
+The counter row also carries the write pause a replace import sets for
+its duration: a write that would land in the table being replaced is
+rejected when it bumps the counter, instead of being lost in the swap.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+CHANGE_LOG_TABLE = "drop_changes"
+CHANGE_COUNTER_TABLE = "drop_change_counter"
+
+CREATE_CHANGE_LOG_STATEMENTS = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+        seq BIGINT NOT NULL PRIMARY KEY,
+        op VARCHAR(16) NOT NULL,
+        drop_id BIGINT NOT NULL,
+        dropperid INT NULL,
+        itemid INT NULL,
+        minimum_quantity INT NULL,
+        maximum_quantity INT NULL,
+        questid INT NULL,
+        chance INT NULL,
+        changed_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3)
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {CHANGE_COUNTER_TABLE} (
+        id TINYINT NOT NULL PRIMARY KEY,
+        seq BIGINT NOT NULL
+    )
+    """,
+    f"INSERT IGNORE INTO {CHANGE_COUNTER_TABLE} (id, seq) VALUES (1, 0)",
+]
+
+# Added by a later migration; NULL or in the past when writes are open.
+ADD_WRITE_PAUSE_STATEMENT = (
+    f"ALTER TABLE {CHANGE_COUNTER_TABLE} ADD COLUMN writes_paused_until TIMESTAMP NULL DEFAULT NULL"
+)
+WRITES_OPEN = "(writes_paused_until IS NULL OR writes_paused_until < CURRENT_TIMESTAMP)"
+
+# LAST_INSERT_ID(expr) hands the new value back through cursor.lastrowid;
+# no row is updated while writes are paused.
+NEXT_SEQ_QUERY = (
+    f"UPDATE {CHANGE_COUNTER_TABLE} SET seq = LAST_INSERT_ID(seq + 1) WHERE id = 1 AND {WRITES_OPEN}"
+)
+RESERVE_SEQ_QUERY = (
+    f"UPDATE {CHANGE_COUNTER_TABLE} SET seq = LAST_INSERT_ID(seq + %s) WHERE id = 1 AND {WRITES_OPEN}"
+)
+PAUSE_WRITES_QUERY = (
+    f"UPDATE {CHANGE_COUNTER_TABLE} "
+    f"SET writes_paused_until = CURRENT_TIMESTAMP + INTERVAL %s SECOND WHERE id = 1 AND {WRITES_OPEN}"
+)
+EXTEND_PAUSE_QUERY = (
+    f"UPDATE {CHANGE_COUNTER_TABLE} SET writes_paused_until = CURRENT_TIMESTAMP + INTERVAL %s SECOND WHERE id = 1"
+)
+RESUME_WRITES_QUERY = f"UPDATE {CHANGE_COUNTER_TABLE} SET writes_paused_until = NULL WHERE id = 1"
+LOCK_SEQ_QUERY = f"SELECT seq FROM {CHANGE_COUNTER_TABLE} WHERE id = 1 FOR UPDATE"
+INSERT_CHANGE_QUERY = f"""
+    INSERT INTO {CHANGE_LOG_TABLE}
+    (seq, op, drop_id, dropperid, itemid, minimum_quantity, maximum_quantity, questid, chance)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+FETCH_CHANGES_QUERY = f"""
+    SELECT seq, op, drop_id, dropperid, itemid, minimum_quantity, maximum_quantity, questid, chance
+    FROM {CHANGE_LOG_TABLE}
+    WHERE seq > %s
+    ORDER BY seq
+    LIMIT %s
+"""
+LATEST_SEQ_QUERY = f"SELECT seq FROM {CHANGE_COUNTER_TABLE} WHERE id = 1"
+
+DROP_FIELDS = ("dropperid", "itemid", "minimum_quantity", "maximum_quantity", "questid", "chance")
+
+
+class WritesPausedError(mysql.connector.Error):
+    """Drop writes are paused while a replace import swaps drop_data."""
+
+    def __init__(self):
+        super().__init__("Drop writes are paused while a replace import runs")
+
+
+def ensure_change_log(cnx, create: bool = False) -> bool:
+    """
+    Check that the change log tables exist and optionally create them.
+
+    Args:
+        cnx: MySQL connection.
+        create: Create missing tables when True.
+
+    Returns:
+        True if the tables exist after the call.
+    """
+    db_cursor = cnx.cursor()
+    try:
+        db_cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN (%s, %s)",
+            (CHANGE_LOG_TABLE, CHANGE_COUNTER_TABLE),
+        )
+        if db_cursor.fetchone()[0] == 2:
+            return True
+        if not create:
+            logger.warning("Change log tables %s/%s are missing", CHANGE_LOG_TABLE, CHANGE_COUNTER_TABLE)
+            return False
+        for statement in CREATE_CHANGE_LOG_STATEMENTS + [ADD_WRITE_PAUSE_STATEMENT]:
+            db_cursor.execute(statement)
+        cnx.commit()
+        logger.info("Created change log tables")
+        return True
+    finally:
+        db_cursor.close()
+
+
+def _change_values(drop: Optional[Any]) -> Tuple[Any, ...]:
+    """Drop column values stored with a change, all NULL for deletes."""
+    return tuple(getattr(drop, field) for field in DROP_FIELDS) if drop else (None,) * len(DROP_FIELDS)
+
+
+def record_change(db_cursor, op: str, drop_id: int, drop: Optional[Any] = None) -> int:
+    """
+    Append a change to the log inside the caller's transaction.
+
+    Args:
+        db_cursor: Writer cursor of the transaction performing the change.
+        op: "create", "update", "delete", or "reload" after a bulk import
+            replaced the table (drop_id 0; consumers resync).
+        drop_id: ID of the affected drop row.
+        drop: New drop values (DropCreate/DropUpdate), None for deletes and reloads.
+
+    Returns:
+        Sequence number assigned to the change.
+
+    Raises:
+        WritesPausedError: If a replace import has paused writes; the caller rolls back.
+    """
+    db_cursor.execute(NEXT_SEQ_QUERY)
+    if db_cursor.rowcount == 0:
+        raise WritesPausedError()
+    seq = db_cursor.lastrowid
+    db_cursor.execute(INSERT_CHANGE_QUERY, (seq, op, drop_id) + _change_values(drop))
+    return seq
+
+
+def record_changes(db_cursor, changes: Sequence[Tuple[str, int, Optional[Any]]]) -> List[int]:
+    """
+    Append several changes with one counter bump and one multi-row insert.
+
+    Args:
+        db_cursor: Writer cursor of the transaction performing the changes.
+        changes: (op, drop_id, drop) tuples in the order they were applied.
+
+    Returns:
+        Sequence numbers assigned to the changes, in order.
+
+    Raises:
+        WritesPausedError: If a replace import has paused writes; the caller rolls back.
+    """
+    if not changes:
+        return []
+    db_cursor.execute(RESERVE_SEQ_QUERY, (len(changes),))
+    if db_cursor.rowcount == 0:
+        raise WritesPausedError()
+    first_seq = db_cursor.lastrowid - len(changes) + 1
+    seqs = list(range(first_seq, first_seq + len(changes)))
+    db_cursor.executemany(
+        INSERT_CHANGE_QUERY,
+        [(seq, op, drop_id) + _change_values(drop) for seq, (op, drop_id, drop) in zip(seqs, changes)],
+    )
+    return seqs
+
+
+def pause_writes(db_cursor, seconds: float) -> Optional[int]:
+    """
+    Pause drop writes for up to ``seconds`` inside the caller's transaction.
+
+    The pause takes effect once the caller commits and lapses on its own
+    unless extended, so a crashed import does not block writes for good.
+
+    Args:
+        db_cursor: Cursor of the transaction setting the pause.
+        seconds: Pause length.
+
+    Returns:
+        Latest sequence number when the pause was set, or None if writes
+        are already paused by someone else.
+    """
+    db_cursor.execute(PAUSE_WRITES_QUERY, (int(seconds),))
+    if db_cursor.rowcount == 0:
+        return None
+    db_cursor.execute(LOCK_SEQ_QUERY)
+    return db_cursor.fetchone()[0]
+
+
+def extend_write_pause(db_cursor, seconds: float) -> int:
+    """
+    Renew the pause set by ``pause_writes`` and lock the counter row until commit.
+
+    Args:
+        db_cursor: Cursor of the transaction holding the pause.
+        seconds: New pause length from now.
+
+    Returns:
+        Latest sequence number; unchanged since the pause began unless it lapsed.
+    """
+    db_cursor.execute(LOCK_SEQ_QUERY)
+    seq = db_cursor.fetchone()[0]
+    db_cursor.execute(EXTEND_PAUSE_QUERY, (int(seconds),))
+    return seq
+
+
+def resume_writes(db_cursor) -> None:
+    """
+    Lift the write pause once the caller commits.
+
+    Args:
+        db_cursor: Cursor of the transaction lifting the pause.
+    """
+    db_cursor.execute(RESUME_WRITES_QUERY)
+
+
+def fetch_changes(db_cursor, since: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Read changes with a sequence number greater than ``since``.
+
+    Args:
+        db_cursor: Dictionary database cursor.
+        since: Last sequence number the consumer has applied.
+        limit: Maximum number of changes to return.
+
+    Returns:
+        Change rows in sequence order, shaped as {seq, op, id, data}.
+    """
+    db_cursor.execute(FETCH_CHANGES_QUERY, (since, limit))
+    changes = []
+    for row in db_cursor.fetchall():
+        data = None
+        if row["op"] in ("create", "update"):
+            data = {field: row[field] for field in DROP_FIELDS}
+        changes.append({"seq": row["seq"], "op": row["op"], "id": str(row["drop_id"]), "data": data})
+    return changes
+
+
+def fetch_latest_seq(db_cursor) -> int:
+    """
+    Read the latest assigned sequence number.
+
+    Args:
+        db_cursor: Dictionary database cursor.
+
+    Returns:
+        Latest sequence number, 0 if nothing was recorded yet.
+    """
+    db_cursor.execute(LATEST_SEQ_QUERY)
+    row = db_cursor.fetchone()
+    return row["seq"] if row else 0
+
+
+class ChangeNotifier:
+    """
+    Wakes local long-poll waiters when this process commits a write.
+
+    Writes from other replicas are picked up by the waiters' poll interval.
+    """
+
+    def __init__(self):
+        """Initialize with no pending notification."""
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        """Wake all current waiters."""
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait for the next notification.
+
+        Args:
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            True if notified, False on timeout.
+        """
+        event = self._event
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
@@ -0,0 +1,246 @@
+"""Vectorized drop-value analytics over the full drop_data table."""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# drop_data.chance is expressed per million kills.
+CHANCE_SCALE = 1_000_000
+
+ANALYTICS_COLUMNS_QUERY = (
+    "SELECT dropperid, itemid, chance, minimum_quantity, maximum_quantity FROM drop_data"
+)
+
+
+@dataclass(frozen=True)
+class DropColumns:
+    """Column arrays of drop_data, one entry per drop row."""
+
+    dropperid: np.ndarray
+    itemid: np.ndarray
+    chance: np.ndarray
+    minimum_quantity: np.ndarray
+    maximum_quantity: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dropperid)
+
+
+def load_drop_columns(db_cursor, batch_size: int = 10000) -> DropColumns:
+    """
+    Load the analytics columns of drop_data into arrays.
+
+    Args:
+        db_cursor: Tuple (non-dictionary) database cursor.
+        batch_size: Rows fetched per round trip.
+
+    Returns:
+        Column arrays for the whole table.
+    """
+    db_cursor.execute(ANALYTICS_COLUMNS_QUERY)
+    chunks = []
+    while True:
+        rows = db_cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        chunks.append(np.asarray(rows, dtype=np.int64))
+    data = np.concatenate(chunks) if chunks else np.empty((0, 5), dtype=np.int64)
+    return DropColumns(*(data[:, i] for i in range(5)))
+
+
+def expected_quantity_per_kill(columns: DropColumns) -> np.ndarray:
+    """
+    Expected quantity each drop row yields per kill.
+
+    Args:
+        columns: Drop column arrays.
+
+    Returns:
+        Array of drop probability times mean quantity.
+    """
+    probability = np.minimum(columns.chance / CHANCE_SCALE, 1.0)
+    mean_quantity = (columns.minimum_quantity + columns.maximum_quantity) / 2.0
+    return probability * mean_quantity
+
+
+def item_weights(itemid: np.ndarray, item_values: Dict[int, float], default_value: float) -> np.ndarray:
+    """
+    Look up a value for every row's item.
+
+    Args:
+        itemid: Item ID per row.
+        item_values: Value per item ID.
+        default_value: Value for items missing from the table.
+
+    Returns:
+        Value per row.
+    """
+    weights = np.full(len(itemid), default_value, dtype=np.float64)
+    if not item_values or not len(itemid):
+        return weights
+    keys = np.fromiter(item_values.keys(), dtype=np.int64, count=len(item_values))
+    values = np.fromiter(item_values.values(), dtype=np.float64, count=len(item_values))
+    order = np.argsort(keys)
+    keys, values = keys[order], values[order]
+    positions = np.clip(np.searchsorted(keys, itemid), 0, len(keys) - 1)
+    found = keys[positions] == itemid
+    weights[found] = values[positions[found]]
+    return weights
+
+
+def rank_mobs(
+    columns: DropColumns,
+    item_values: Optional[Dict[int, float]] = None,
+    default_item_value: float = 0.0,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    Rank mobs by expected drops (or expected value) per kill.
+
+    Args:
+        columns: Drop column arrays.
+        item_values: Optional value per item ID; ranks by expected value when given.
+        default_item_value: Value for items missing from item_values.
+        limit: Number of mobs to return.
+
+    Returns:
+        Ranked mob rows with drop_count, expected_drops and expected_value.
+    """
+    if not len(columns):
+        return []
+
+    mobs, inverse = np.unique(columns.dropperid, return_inverse=True)
+    per_row = expected_quantity_per_kill(columns)
+    drop_counts = np.bincount(inverse)
+    expected_drops = np.bincount(inverse, weights=per_row)
+
+    expected_value = None
+    score = expected_drops
+    if item_values is not None:
+        weights = item_weights(columns.itemid, item_values, default_item_value)
+        expected_value = np.bincount(inverse, weights=per_row * weights)
+        score = expected_value
+
+    # Sort by score descending, then mob ID ascending for stable output.
+    top = np.lexsort((mobs, -score))[:limit]
+    return [
+        {
+            "dropperid": int(mobs[i]),
+            "drop_count": int(drop_counts[i]),
+            "expected_drops": float(expected_drops[i]),
+            "expected_value": float(expected_value[i]) if expected_value is not None else None,
+        }
+        for i in top
+    ]
+
+
+def ranking_key(item_values: Optional[Dict[int, float]], default_item_value: float, limit: int) -> str:
+    """Digest of ranking parameters for result caching."""
+    payload = json.dumps(
+        [sorted((item_values or {}).items()) if item_values is not None else None, default_item_value, limit]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalyticsCache:
+    """
+    Caches loaded columns and ranking results per dataset version.
+
+    The dataset version is the latest change log sequence number, so any
+    write through the service invalidates both columns and results.
+    """
+
+    def __init__(self, max_results: int = 64):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_results: Ranking results kept for the current version.
+        """
+        self.max_results = max_results
+        self._version: Optional[int] = None
+        self._columns: Optional[DropColumns] = None
+        self._results: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _reset(self, version: int) -> None:
+        """Drop everything cached for an older version."""
+        if self._version != version:
+            self._version = version
+            self._columns = None
+            self._results.clear()
+
+    def get_columns(self, version: int) -> Optional[DropColumns]:
+        """Cached columns for a version, if loaded."""
+        with self._lock:
+            self._reset(version)
+            return self._columns
+
+    def set_columns(self, version: int, columns: DropColumns) -> None:
+        """Store columns loaded at a version."""
+        with self._lock:
+            self._reset(version)
+            self._columns = columns
+
+    def get_result(self, version: int, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached ranking for a version and parameter digest."""
+        with self._lock:
+            self._reset(version)
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def set_result(self, version: int, key: str, result: List[Dict[str, Any]]) -> None:
+        """Store a ranking, evicting the least recently used one."""
+        with self._lock:
+            self._reset(version)
+            self._results[key] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+
+def compute_mob_rankings(
+    load_columns: Callable[[], DropColumns],
+    cache: AnalyticsCache,
+    version: int,
+    item_values: Optional[Dict[int, float]],
+    default_item_value: float,
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Return mob rankings for a dataset version, computing them on a cache miss.
+
+    Args:
+        load_columns: Loads drop_data columns, called only when they are not cached.
+        cache: Analytics cache.
+        version: Current dataset version.
+        item_values: Optional value per item ID.
+        default_item_value: Value for items missing from item_values.
+        limit: Number of mobs to return.
+
+    Returns:
+        Tuple of (rankings, served_from_cache).
+    """
+    key = ranking_key(item_values, default_item_value, limit)
+    cached = cache.get_result(version, key)
+    if cached is not None:
+        return cached, True
+
+    columns = cache.get_columns(version)
+    if columns is None:
+        columns = load_columns()
+        cache.set_columns(version, columns)
+        logger.info("Loaded %d drop rows for analytics at version %d", len(columns), version)
+
+    result = rank_mobs(columns, item_values, default_item_value, limit)
+    cache.set_result(version, key, result)
+    return result, False
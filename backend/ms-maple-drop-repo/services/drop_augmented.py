@@ -0,0 +1,311 @@
+"""Denormalized drop read model with mob and item names.
+
+drop_names mirrors the name resolver's Mongo collection and
+drop_data_augmented stores each drop row with its dropper and item names,
+so an augmented search is one indexed query. Drop writes refresh the
+affected rows in their own transaction. Names are synced hourly by the
+ms-maple-drop-repo-sync-names CronJob, or by hand with the CLI:
+    python -m services.drop_augmented sync-names [--create]
+    python -m services.drop_augmented rebuild
+
+A sync diffs the names against a plain (non-locking) read of drop_names
+and applies only the changes, in short transactions of keyed upserts,
+deletes and name updates. A full rebuild would hold shared locks on every
+drop_data row until commit and stall drop writes for its whole duration;
+the rebuild command does exactly that and is meant for repairs only.
+"""
+
+import argparse
+import logging
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import mysql.connector
+
+from services.drop_repository import SEARCH_COLUMNS, SearchType
+
+logger = logging.getLogger(__name__)
+
+NAMES_TABLE = "drop_names"
+AUGMENTED_TABLE = "drop_data_augmented"
+UNKNOWN_NAME = "Unknown"
+NAME_SYNC_CHUNK_SIZE = 500
+
+CREATE_AUGMENTED_STATEMENTS = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {NAMES_TABLE} (
+        type VARCHAR(8) NOT NULL,
+        id INT NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        PRIMARY KEY (type, id)
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {AUGMENTED_TABLE} (
+        id INT NOT NULL PRIMARY KEY,
+        dropperid INT NOT NULL,
+        dropper_name VARCHAR(255) NOT NULL,
+        itemid INT NOT NULL,
+        item_name VARCHAR(255) NOT NULL,
+        minimum_quantity INT NOT NULL,
+        maximum_quantity INT NOT NULL,
+        questid INT NOT NULL,
+        chance INT NOT NULL,
+        KEY idx_{AUGMENTED_TABLE}_dropperid (dropperid),
+        KEY idx_{AUGMENTED_TABLE}_itemid (itemid)
+    )
+    """,
+]
+
+AUGMENTED_COLUMNS = (
+    "id, dropperid, dropper_name, itemid, item_name, minimum_quantity, maximum_quantity, questid, chance"
+)
+# Drop rows joined to their names through the (type, id) primary key.
+AUGMENTED_SELECT = f"""
+    SELECT drop_data.id, drop_data.dropperid, COALESCE(mob.name, '{UNKNOWN_NAME}'),
+        drop_data.itemid, COALESCE(item.name, '{UNKNOWN_NAME}'),
+        drop_data.minimum_quantity, drop_data.maximum_quantity, drop_data.questid, drop_data.chance
+    FROM drop_data
+    LEFT JOIN {NAMES_TABLE} mob ON mob.type = 'mob' AND mob.id = drop_data.dropperid
+    LEFT JOIN {NAMES_TABLE} item ON item.type = 'item' AND item.id = drop_data.itemid
+    {{where}}
+"""
+INSERT_AUGMENTED = f"INSERT INTO {AUGMENTED_TABLE} ({AUGMENTED_COLUMNS}) "
+SELECT_NAMES_QUERY = f"SELECT type, id, name FROM {NAMES_TABLE}"
+UPSERT_NAMES_QUERY = (
+    f"INSERT INTO {NAMES_TABLE} (type, id, name) VALUES (%s, %s, %s) "
+    f"ON DUPLICATE KEY UPDATE name = VALUES(name)"
+)
+DELETE_NAME_QUERY = f"DELETE FROM {NAMES_TABLE} WHERE type = %s AND id = %s"
+# Renames reach existing augmented rows through the dropperid / itemid indexes.
+RENAME_QUERIES = {
+    "mob": f"UPDATE {AUGMENTED_TABLE} SET dropper_name = %s WHERE dropperid = %s",
+    "item": f"UPDATE {AUGMENTED_TABLE} SET item_name = %s WHERE itemid = %s",
+}
+
+SEARCH_AUGMENTED_QUERIES = {
+    query_type: f"SELECT {AUGMENTED_COLUMNS} FROM {AUGMENTED_TABLE} WHERE {column} = %s"
+    for query_type, column in SEARCH_COLUMNS.items()
+}
+
+
+def _placeholders(values: List[int]) -> str:
+    """Build an IN (...) placeholder list."""
+    return ",".join(["%s"] * len(values))
+
+
+def ensure_augmented_tables(cnx, create: bool = False) -> bool:
+    """
+    Check that the name and augmented tables exist and optionally create them.
+
+    Args:
+        cnx: MySQL connection.
+        create: Create missing tables when True.
+
+    Returns:
+        True if the tables exist after the call.
+    """
+    db_cursor = cnx.cursor()
+    try:
+        db_cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN (%s, %s)",
+            (NAMES_TABLE, AUGMENTED_TABLE),
+        )
+        if db_cursor.fetchone()[0] == 2:
+            return True
+        if not create:
+            logger.warning("Augmented read model tables %s/%s are missing", NAMES_TABLE, AUGMENTED_TABLE)
+            return False
+        for statement in CREATE_AUGMENTED_STATEMENTS:
+            db_cursor.execute(statement)
+        cnx.commit()
+        logger.info("Created augmented read model tables")
+        return True
+    finally:
+        db_cursor.close()
+
+
+def refresh_augmented(db_cursor, drop_ids: Iterable[int]) -> None:
+    """
+    Recompute augmented rows for the given drops inside the caller's transaction.
+
+    Deleted drops lose their augmented row.
+
+    Args:
+        db_cursor: Writer cursor of the transaction that changed drop_data.
+        drop_ids: Drop IDs created, updated or deleted by the write.
+    """
+    drop_ids = sorted(set(drop_ids))
+    if not drop_ids:
+        return
+    params = tuple(drop_ids)
+    db_cursor.execute(f"DELETE FROM {AUGMENTED_TABLE} WHERE id IN ({_placeholders(drop_ids)})", params)
+    db_cursor.execute(
+        INSERT_AUGMENTED + AUGMENTED_SELECT.format(where=f"WHERE drop_data.id IN ({_placeholders(drop_ids)})"),
+        params,
+    )
+
+
+def rebuild_augmented(db_cursor) -> None:
+    """
+    Recompute the augmented table from drop_data and the current names.
+
+    Args:
+        db_cursor: Writer cursor; the caller commits.
+    """
+    db_cursor.execute(f"DELETE FROM {AUGMENTED_TABLE}")
+    db_cursor.execute(INSERT_AUGMENTED + AUGMENTED_SELECT.format(where=""))
+
+
+def _apply_names(cnx, db_cursor, changes: List[Tuple[str, int, Optional[str]]]) -> None:
+    """
+    Store changed names and rename their augmented rows in one short transaction.
+
+    Args:
+        cnx: MySQL connection.
+        db_cursor: Cursor of that connection.
+        changes: (type, id, name) tuples; a None name removes the entry.
+    """
+    try:
+        upserts = [change for change in changes if change[2] is not None]
+        deletes = [(kind, name_id) for kind, name_id, name in changes if name is None]
+        if upserts:
+            db_cursor.executemany(UPSERT_NAMES_QUERY, upserts)
+        if deletes:
+            db_cursor.executemany(DELETE_NAME_QUERY, deletes)
+        for kind, query in RENAME_QUERIES.items():
+            renames = [(name or UNKNOWN_NAME, name_id) for other, name_id, name in changes if other == kind]
+            if renames:
+                db_cursor.executemany(query, renames)
+        cnx.commit()
+    except mysql.connector.Error:
+        cnx.rollback()
+        raise
+
+
+def sync_names(cnx, names: Iterable[Tuple[str, int, str]]) -> Dict[str, int]:
+    """
+    Bring drop_names and the augmented names in line with the given names.
+
+    Only new, renamed and removed names are written, NAME_SYNC_CHUNK_SIZE
+    per transaction, so drop writes never wait long on the sync.
+
+    Args:
+        cnx: MySQL connection; each chunk is committed.
+        names: (type, id, name) tuples.
+
+    Returns:
+        Counts of names stored or renamed and of names removed.
+    """
+    db_cursor = cnx.cursor()
+    try:
+        db_cursor.execute(SELECT_NAMES_QUERY)
+        current = {(kind, int(name_id)): name for kind, name_id, name in db_cursor.fetchall()}
+        cnx.commit()
+
+        changes: List[Tuple[str, int, Optional[str]]] = []
+        seen = set()
+        for kind, name_id, name in names:
+            seen.add((kind, name_id))
+            if current.get((kind, name_id)) != name:
+                changes.append((kind, name_id, name))
+        updated = len(changes)
+        changes += [(kind, name_id, None) for kind, name_id in current.keys() - seen]
+
+        for i in range(0, len(changes), NAME_SYNC_CHUNK_SIZE):
+            _apply_names(cnx, db_cursor, changes[i:i + NAME_SYNC_CHUNK_SIZE])
+        return {"updated": updated, "removed": len(changes) - updated}
+    finally:
+        db_cursor.close()
+
+
+def search_augmented(db_cursor, query_type: SearchType, query: int) -> List[Dict[str, Any]]:
+    """
+    Find augmented drops of a mob or of an item.
+
+    Args:
+        db_cursor: Dictionary database cursor.
+        query_type: "mob" to match dropperid, "item" to match itemid.
+        query: ID to match.
+
+    Returns:
+        Drop rows with dropper_name and item_name.
+    """
+    db_cursor.execute(SEARCH_AUGMENTED_QUERIES[query_type], (query,))
+    return db_cursor.fetchall()
+
+
+def iter_mongo_names(mongo_uri: str, database: str, collection: str) -> Iterable[Tuple[str, int, str]]:
+    """
+    Read (type, id, name) tuples from the name resolver's collection.
+
+    Args:
+        mongo_uri: MongoDB connection string.
+        database: Database name.
+        collection: Collection name.
+
+    Yields:
+        One tuple per mob or item document.
+    """
+    from pymongo import MongoClient
+
+    client = MongoClient(mongo_uri)
+    try:
+        for doc in client[database][collection].find(
+            {"type": {"$in": ["mob", "item"]}}, {"_id": 0, "id": 1, "type": 1, "name": 1}
+        ):
+            yield doc["type"], int(doc["id"]), str(doc["name"])
+    finally:
+        client.close()
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command line arguments.
+
+    Returns:
+        Process exit code.
+    """
+    from config import DB_CONFIG, NAMES_MONGO_COLLECTION, NAMES_MONGO_DATABASE, NAMES_MONGO_URI
+
+    parser = argparse.ArgumentParser(description="Maintain the augmented drop read model.")
+    parser.add_argument(
+        "command",
+        choices=["sync-names", "rebuild"],
+        help="sync-names copies names from MongoDB and rebuilds; rebuild only recomputes from drop_data.",
+    )
+    parser.add_argument("--create", action="store_true", help="Create missing tables first.")
+    parser.add_argument("--mongo-uri", default=NAMES_MONGO_URI, help="MongoDB connection string.")
+    args = parser.parse_args(argv)
+
+    cnx = mysql.connector.connect(**DB_CONFIG)
+    try:
+        if not ensure_augmented_tables(cnx, create=args.create):
+            print("augmented tables missing, rerun with --create")
+            return 1
+        if args.command == "sync-names":
+            counts = sync_names(cnx, iter_mongo_names(args.mongo_uri, NAMES_MONGO_DATABASE, NAMES_MONGO_COLLECTION))
+            print(f"synced names: {counts['updated']} updated, {counts['removed']} removed")
+            return 0
+        db_cursor = cnx.cursor()
+        try:
+            rebuild_augmented(db_cursor)
+            cnx.commit()
+        except mysql.connector.Error:
+            cnx.rollback()
+            raise
+        finally:
+            db_cursor.close()
+    finally:
+        cnx.close()
+
+    print("augmented table rebuilt")
+    return 0
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Mixed create/update/delete batches applied in one transaction."""
+
+import logging
+from typing import List, Optional, Sequence, Union
+
+import mysql.connector
+
+from models import BatchOperation, BatchOperationResult, DropBatchRequest, DropBatchResponse
+from services.drop_writer import WriteOp, apply_writes
+
+logger = logging.getLogger(__name__)
+
+Outcome = Union[Optional[int], mysql.connector.Error]
+
+
+def to_write_ops(operations: Sequence[BatchOperation]) -> List[WriteOp]:
+    """Convert validated batch operations to drop writes."""
+    return [WriteOp(op.op, getattr(op, "id", None), getattr(op, "data", None)) for op in operations]
+
+
+def apply_best_effort(db_cursor, writes: Sequence[WriteOp]) -> List[Outcome]:
+    """
+    Apply writes batched, isolating failures with savepoints if the batch fails.
+
+    Args:
+        db_cursor: Writer cursor; the caller commits.
+        writes: Writes in request order.
+
+    Returns:
+        Per write: its apply_writes result, or the error that rolled it back.
+    """
+    db_cursor.execute("SAVEPOINT drop_batch")
+    try:
+        return apply_writes(db_cursor, writes)
+    except mysql.connector.Error as err:
+        logger.warning("Batch of %d writes failed (%s), applying one by one", len(writes), err)
+        db_cursor.execute("ROLLBACK TO SAVEPOINT drop_batch")
+
+    outcomes: List[Outcome] = []
+    for write in writes:
+        db_cursor.execute("SAVEPOINT drop_batch_op")
+        try:
+            outcomes.append(apply_writes(db_cursor, [write])[0])
+        except mysql.connector.Error as err:
+            db_cursor.execute("ROLLBACK TO SAVEPOINT drop_batch_op")
+            outcomes.append(err)
+    return outcomes
+
+
+def operation_result(index: int, write: WriteOp, outcome: Outcome) -> BatchOperationResult:
+    """Describe the outcome of one write."""
+    if isinstance(outcome, mysql.connector.Error):
+        return BatchOperationResult(index=index, op=write.op, id=write.drop_id, status="error", detail=str(outcome))
+    if outcome is None:
+        return BatchOperationResult(index=index, op=write.op, id=write.drop_id, status="not_found")
+    return BatchOperationResult(index=index, op=write.op, id=outcome, status="ok")
+
+
+def run_drop_batch(db_cursor, request: DropBatchRequest) -> DropBatchResponse:
+    """
+    Apply a batch request inside the caller's transaction.
+
+    In atomic mode any update or delete of a missing row fails the whole
+    batch: successful operations are reported as rolled back and the caller
+    must roll back instead of committing. In best-effort mode missing rows
+    and failing operations are skipped and everything else is committed.
+
+    Args:
+        db_cursor: Writer cursor of the batch transaction.
+        request: Validated batch request.
+
+    Returns:
+        Per-operation results and the number of committed operations.
+    """
+    writes = to_write_ops(request.operations)
+    if request.mode == "atomic":
+        outcomes = apply_writes(db_cursor, writes)
+    else:
+        outcomes = apply_best_effort(db_cursor, writes)
+
+    results = [operation_result(i, write, outcome) for i, (write, outcome) in enumerate(zip(writes, outcomes))]
+    committed = sum(result.status == "ok" for result in results)
+    if request.mode == "atomic" and committed != len(results):
+        results = [
+            result.model_copy(update={"status": "rolled_back"}) if result.status == "ok" else result
+            for result in results
+        ]
+        committed = 0
+    return DropBatchResponse(mode=request.mode, committed=committed, results=results)
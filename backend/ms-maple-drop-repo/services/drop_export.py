@@ -0,0 +1,155 @@
+"""Streaming full-table export of drop_data.
+
+Rows are read from an unbuffered cursor with ``fetchmany`` and encoded
+batch by batch, so memory stays bounded by the batch size whatever the
+table size. Arrow IPC output needs the optional ``pyarrow`` dependency.
+"""
+
+import csv
+import io
+import json
+import logging
+from typing import Any, Iterator, List, Literal, Sequence, Tuple
+
+import mysql.connector
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["csv", "ndjson", "arrow"]
+
+EXPORT_COLUMNS = ("id", "dropperid", "itemid", "minimum_quantity", "maximum_quantity", "questid", "chance")
+EXPORT_QUERY = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM drop_data ORDER BY id"
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+FILE_EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "arrow": "arrows"}
+
+
+def arrow_available() -> bool:
+    """Whether pyarrow is installed for Arrow IPC export."""
+    return pa is not None
+
+
+def iter_batches(db_cursor, batch_size: int) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Yield row batches from an executed cursor until it is exhausted.
+
+    Args:
+        db_cursor: Tuple cursor with EXPORT_QUERY executed.
+        batch_size: Rows per fetchmany call.
+
+    Yields:
+        Lists of row tuples.
+    """
+    while True:
+        rows = db_cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def encode_csv(batches: Iterator[Sequence[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    """Encode row batches as CSV with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(batches: Iterator[Sequence[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    """Encode row batches as NDJSON, with string IDs like the read endpoints."""
+    for rows in batches:
+        lines = []
+        for row in rows:
+            record = dict(zip(EXPORT_COLUMNS, row))
+            record["id"] = str(record["id"])
+            lines.append(json.dumps(record, separators=(",", ":")))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def encode_arrow(batches: Iterator[Sequence[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    """Encode row batches as an Arrow IPC stream of int64 columns."""
+    schema = pa.schema([(name, pa.int64()) for name in EXPORT_COLUMNS])
+    sink = io.BytesIO()
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    writer = pa.ipc.new_stream(sink, schema)
+    yield drain()
+    for rows in batches:
+        columns = [pa.array(column, type=pa.int64()) for column in zip(*rows)]
+        writer.write_batch(pa.record_batch(columns, schema=schema))
+        yield drain()
+    writer.close()
+    yield drain()
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson, "arrow": encode_arrow}
+
+
+def stream_export(cnx, fmt: ExportFormat, batch_size: int) -> Iterator[bytes]:
+    """
+    Stream drop_data on a dedicated connection and release it when done.
+
+    The query is executed before the first chunk is requested, so database
+    errors surface before the response starts. If the client disconnects
+    early, the connection is closed without reading the remaining rows.
+
+    Args:
+        cnx: MySQL connection owned by the export; closed when the stream ends.
+        fmt: "csv", "ndjson" or "arrow".
+        batch_size: Rows per fetchmany call.
+
+    Returns:
+        Iterator of encoded response chunks.
+    """
+    db_cursor = cnx.cursor()
+    try:
+        db_cursor.execute(EXPORT_QUERY)
+    except mysql.connector.Error:
+        db_cursor.close()
+        cnx.close()
+        raise
+
+    def generate() -> Iterator[bytes]:
+        completed = False
+        try:
+            yield from ENCODERS[fmt](iter_batches(db_cursor, batch_size))
+            completed = True
+        finally:
+            if completed:
+                try:
+                    db_cursor.close()
+                except mysql.connector.Error as err:
+                    logger.warning("Failed to release export cursor: %s", err)
+                finally:
+                    if cnx.is_connected():
+                        cnx.close()
+            else:
+                # Draining the unbuffered result would read the rest of the table from the
+                # server; closing the socket instead makes the server abort the statement.
+                try:
+                    cnx.close()
+                except (mysql.connector.Error, OSError) as err:
+                    logger.warning("Failed to close abandoned export connection: %s", err)
+                logger.info("Export (%s) ended before the last row", fmt)
+
+    return generate()
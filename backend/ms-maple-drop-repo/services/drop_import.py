@@ -0,0 +1,387 @@
+"""Streaming bulk import of drop data from CSV or NDJSON.
+
+Rows are validated with DropImportRow in chunks and loaded with multi-row
+INSERTs. In "replace" mode they go into a staging table that is swapped
+into drop_data with one RENAME TABLE, so reads never see a half-loaded
+table; rows carrying an ``id`` (as exports do) keep it, so IDs held by
+clients, caches and feed consumers stay valid. In "append" mode each
+chunk is written to drop_data with the batched writer, keeping the change
+log and summaries in step; ``id`` is ignored and new IDs are assigned.
+
+A replace import pauses drop writes from its start until the derived
+tables are rebuilt: a write committed to the old table would vanish in
+the swap while the change log still reported it. Paused writes are
+rejected (503) rather than queued. The pause is renewed with every chunk
+and lapses on its own if the import dies; if it lapsed and a write got
+through, the swap is refused and the import fails instead.
+
+Can be run as a CLI:
+    python -m services.drop_import drops.csv --mode replace
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Literal, Optional
+
+import mysql.connector
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from models import DropImportRow, ImportReport, ImportRowError
+from services.change_log import extend_write_pause, pause_writes, record_change, resume_writes
+from services.drop_augmented import rebuild_augmented
+from services.drop_summary import rebuild_summaries
+from services.drop_writer import WriteOp, apply_writes, drop_values
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "ndjson"]
+ImportMode = Literal["replace", "append"]
+
+STAGING_TABLE = "drop_data_staging"
+RETIRED_TABLE = "drop_data_retired"
+MAX_REPORTED_ERRORS = 20
+
+# A NULL id takes the next auto-increment value.
+INSERT_STAGING_QUERY = f"""
+    INSERT INTO {STAGING_TABLE}
+    (id, dropperid, itemid, minimum_quantity, maximum_quantity, questid, chance)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+SWAP_TABLES_QUERY = f"RENAME TABLE drop_data TO {RETIRED_TABLE}, {STAGING_TABLE} TO drop_data"
+
+
+class ImportConflictError(RuntimeError):
+    """A replace import cannot proceed without losing concurrent writes."""
+
+
+class ImportValidationError(ValueError):
+    """A row failed validation and invalid rows are not being skipped."""
+
+    def __init__(self, line: int, detail: str):
+        super().__init__(f"line {line}: {detail}")
+        self.line = line
+        self.detail = detail
+
+
+async def aiter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream into decoded lines without buffering the whole body.
+
+    Args:
+        chunks: Raw body chunks, e.g. ``request.stream()``.
+
+    Yields:
+        Lines without their line terminator.
+    """
+    buffer = b""
+    first = True
+    async for chunk in chunks:
+        if first and chunk:
+            chunk = chunk.removeprefix(b"\xef\xbb\xbf")
+            first = False
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8")
+    if buffer:
+        yield buffer.rstrip(b"\r").decode("utf-8")
+
+
+class RecordParser:
+    """Turns CSV (with header) or NDJSON lines into field dictionaries."""
+
+    def __init__(self, fmt: ImportFormat):
+        """
+        Initialize a parser.
+
+        Args:
+            fmt: "csv" or "ndjson".
+        """
+        self.fmt = fmt
+        self.header: Optional[List[str]] = None
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse one line.
+
+        Args:
+            line: Input line.
+
+        Returns:
+            Field dictionary, or None for blank lines and the CSV header.
+
+        Raises:
+            ValueError: If the line is malformed.
+        """
+        if not line.strip():
+            return None
+        if self.fmt == "ndjson":
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+            return record
+        values = next(csv.reader([line]))
+        if self.header is None:
+            self.header = [name.strip() for name in values]
+            return None
+        if len(values) != len(self.header):
+            raise ValueError(f"expected {len(self.header)} columns, got {len(values)}")
+        return dict(zip(self.header, values))
+
+
+class DropImporter:
+    """Loads validated drop chunks on one connection for the length of an import."""
+
+    def __init__(self, cnx, mode: ImportMode, pause_seconds: float = 300):
+        """
+        Initialize an importer.
+
+        Args:
+            cnx: MySQL connection dedicated to this import.
+            mode: "replace" to swap in a staging table, "append" to insert into drop_data.
+            pause_seconds: How long a replace import's write pause holds without a new chunk.
+        """
+        self.cnx = cnx
+        self.mode = mode
+        self.pause_seconds = pause_seconds
+        self.db_cursor = cnx.cursor()
+        self.paused_at_seq: Optional[int] = None
+
+    def begin(self) -> None:
+        """
+        Pause drop writes and prepare an empty staging table with drop_data's columns and indexes.
+
+        Raises:
+            ImportConflictError: If another replace import holds the write pause.
+        """
+        if self.mode != "replace":
+            return
+        seq = pause_writes(self.db_cursor, self.pause_seconds)
+        if seq is None:
+            self.cnx.rollback()
+            raise ImportConflictError("another replace import is running")
+        self.cnx.commit()
+        self.paused_at_seq = seq
+        self.db_cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        self.db_cursor.execute(f"CREATE TABLE {STAGING_TABLE} LIKE drop_data")
+
+    def load(self, drops: List[DropImportRow]) -> None:
+        """
+        Load and commit one chunk.
+
+        Args:
+            drops: Validated rows.
+
+        Raises:
+            mysql.connector.Error: If loading fails, e.g. on a duplicate id in replace mode.
+        """
+        if self.mode == "replace":
+            self.db_cursor.executemany(INSERT_STAGING_QUERY, [(drop.id,) + drop_values(drop) for drop in drops])
+            extend_write_pause(self.db_cursor, self.pause_seconds)
+        else:
+            apply_writes(self.db_cursor, [WriteOp("create", drop=drop) for drop in drops])
+        self.cnx.commit()
+
+    def finish(self) -> None:
+        """
+        Swap the staging table in, refresh derived tables and resume writes.
+
+        Raises:
+            ImportConflictError: If the write pause lapsed and a write reached
+                the old table; drop_data is left untouched.
+        """
+        if self.mode != "replace":
+            return
+        # RENAME commits implicitly; the pause, not the row lock, keeps writers out from here.
+        seq = extend_write_pause(self.db_cursor, self.pause_seconds)
+        if seq != self.paused_at_seq:
+            raise ImportConflictError("drop data changed after the write pause lapsed; rerun the import")
+        self.cnx.commit()
+        self.db_cursor.execute(f"DROP TABLE IF EXISTS {RETIRED_TABLE}")
+        self.db_cursor.execute(SWAP_TABLES_QUERY)
+        self.db_cursor.execute(f"DROP TABLE {RETIRED_TABLE}")
+        rebuild_summaries(self.db_cursor)
+        rebuild_augmented(self.db_cursor)
+        resume_writes(self.db_cursor)
+        record_change(self.db_cursor, "reload", 0)
+        self.cnx.commit()
+        self.paused_at_seq = None
+
+    def abort(self) -> None:
+        """Roll back the open chunk, discard the staging table and resume writes."""
+        try:
+            self.cnx.rollback()
+            # Without a pause of its own the staging table may be another import's.
+            if self.paused_at_seq is not None:
+                self.db_cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+                resume_writes(self.db_cursor)
+                self.cnx.commit()
+                self.paused_at_seq = None
+        except mysql.connector.Error as err:
+            logger.error("Failed to clean up aborted import: %s", err)
+
+    def close(self) -> None:
+        """Release the cursor and connection."""
+        self.db_cursor.close()
+        if self.cnx.is_connected():
+            self.cnx.close()
+
+
+def row_error_detail(err: Exception) -> str:
+    """One-line description of a parse or validation error."""
+    if isinstance(err, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in err.errors())
+    return str(err)
+
+
+async def run_import(
+    lines: AsyncIterable[str],
+    importer: DropImporter,
+    fmt: ImportFormat,
+    chunk_size: int = 1000,
+    skip_invalid: bool = False,
+    max_rows_per_second: Optional[float] = None,
+    progress: Optional[Callable[[int, float], None]] = None,
+) -> ImportReport:
+    """
+    Validate and load lines in chunks, aborting the import on failure.
+
+    Database calls run in the threadpool; the next chunk is parsed only
+    after the previous one is loaded, so memory stays at one chunk.
+
+    Args:
+        lines: Input lines.
+        importer: Importer owning the load connection.
+        fmt: "csv" or "ndjson".
+        chunk_size: Rows per INSERT and commit.
+        skip_invalid: Skip invalid rows instead of failing the import.
+        max_rows_per_second: Throttle loading to this rate when set.
+        progress: Called with (rows loaded, seconds elapsed) after each chunk.
+
+    Returns:
+        Import report.
+
+    Raises:
+        ImportValidationError: If a row is invalid and skip_invalid is False.
+        ImportConflictError: If a replace import cannot run without losing writes.
+        mysql.connector.Error: If loading fails.
+    """
+    parser = RecordParser(fmt)
+    chunk: List[DropImportRow] = []
+    errors: List[ImportRowError] = []
+    rows = skipped = chunks = 0
+    started = time.monotonic()
+
+    async def flush() -> None:
+        nonlocal rows, chunks
+        await run_in_threadpool(importer.load, chunk)
+        rows += len(chunk)
+        chunks += 1
+        chunk.clear()
+        elapsed = time.monotonic() - started
+        if progress:
+            progress(rows, elapsed)
+        if max_rows_per_second:
+            delay = rows / max_rows_per_second - elapsed
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    try:
+        await run_in_threadpool(importer.begin)
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            try:
+                record = parser.parse(line)
+                if record is None:
+                    continue
+                chunk.append(DropImportRow(**record))
+            except (ValueError, csv.Error) as err:
+                detail = row_error_detail(err)
+                if not skip_invalid:
+                    raise ImportValidationError(line_number, detail) from err
+                skipped += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(ImportRowError(line=line_number, detail=detail))
+                continue
+            if len(chunk) >= chunk_size:
+                await flush()
+        if chunk:
+            await flush()
+        await run_in_threadpool(importer.finish)
+    except BaseException:
+        await run_in_threadpool(importer.abort)
+        raise
+
+    seconds = time.monotonic() - started
+    return ImportReport(
+        mode=importer.mode,
+        format=fmt,
+        rows=rows,
+        skipped=skipped,
+        chunks=chunks,
+        seconds=round(seconds, 3),
+        rows_per_second=round(rows / seconds, 1) if seconds > 0 else float(rows),
+        errors=errors,
+    )
+
+
+async def _file_lines(path: str) -> AsyncIterator[str]:
+    """Yield lines of a local file."""
+    with open(path, encoding="utf-8-sig", newline="") as handle:
+        for line in handle:
+            yield line.rstrip("\r\n")
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command line arguments.
+
+    Returns:
+        Process exit code.
+    """
+    from config import DB_CONFIG, DROP_IMPORT_CHUNK_SIZE, DROP_IMPORT_WRITE_PAUSE_SECONDS
+
+    parser = argparse.ArgumentParser(description="Import drop data from a CSV or NDJSON file.")
+    parser.add_argument("path", help="File to import.")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension.")
+    parser.add_argument("--mode", choices=["replace", "append"], default="replace")
+    parser.add_argument("--chunk-size", type=int, default=DROP_IMPORT_CHUNK_SIZE)
+    parser.add_argument("--skip-invalid", action="store_true", help="Skip invalid rows instead of aborting.")
+    parser.add_argument("--max-rows-per-second", type=float, help="Throttle the load rate.")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    importer = DropImporter(mysql.connector.connect(**DB_CONFIG), args.mode, DROP_IMPORT_WRITE_PAUSE_SECONDS)
+    try:
+        report = asyncio.run(run_import(
+            _file_lines(args.path),
+            importer,
+            fmt,
+            chunk_size=args.chunk_size,
+            skip_invalid=args.skip_invalid,
+            max_rows_per_second=args.max_rows_per_second,
+            progress=lambda rows, elapsed: print(f"{rows} rows loaded in {elapsed:.1f}s", file=sys.stderr),
+        ))
+    except (ImportValidationError, ImportConflictError) as err:
+        print(f"import aborted: {err}", file=sys.stderr)
+        return 1
+    finally:
+        importer.close()
+
+    print(report.model_dump_json(indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Storage-independent interface to drop records.
+
+DROP_REPO_BACKEND selects MySQL (the default), SQLite or an in-memory
+store behind the core search/get/write/exists endpoints. The latter two
+need no database server, for throughput benchmarks of the HTTP layer and
+small deployments; features built on MySQL-only tables (change feed,
+summaries, analytics, batch, import and export) stay MySQL-only.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Literal, Optional
+
+from models import DropCreate, DropUpdate, ExistenceInfo, ExistenceResult
+
+logger = logging.getLogger(__name__)
+
+SearchType = Literal["item", "mob"]
+RepositoryBackend = Literal["mysql", "sqlite", "memory"]
+
+DROP_COLUMNS = ("id", "dropperid", "itemid", "minimum_quantity", "maximum_quantity", "questid", "chance")
+SEARCH_COLUMNS = {"item": "itemid", "mob": "dropperid"}
+
+
+class DropRepository(ABC):
+    """Search, read, write and existence checks on drop records."""
+
+    @abstractmethod
+    async def search(self, query_type: SearchType, query: int) -> List[Dict[str, Any]]:
+        """
+        Find drops of a mob or drops of an item.
+
+        Args:
+            query_type: "mob" to match dropperid, "item" to match itemid.
+            query: ID to match.
+
+        Returns:
+            Matching drop rows keyed by column name.
+        """
+
+    async def search_many(self, query_type: SearchType, queries: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Find drops of several mobs or several items.
+
+        Backends without a multi-key query run one search per ID.
+
+        Args:
+            query_type: "mob" to match dropperid, "item" to match itemid.
+            queries: IDs to match; duplicates are searched once.
+
+        Returns:
+            Matching drop rows by requested ID, with an empty list for IDs without drops.
+        """
+        return {query: await self.search(query_type, query) for query in dict.fromkeys(queries)}
+
+    @abstractmethod
+    async def get(self, drop_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Read one drop.
+
+        Args:
+            drop_id: Drop record ID.
+
+        Returns:
+            Drop row, or None if it does not exist.
+        """
+
+    @abstractmethod
+    async def create(self, drop: DropCreate) -> int:
+        """
+        Insert a drop.
+
+        Args:
+            drop: Drop data to create.
+
+        Returns:
+            ID of the new record.
+        """
+
+    @abstractmethod
+    async def update(self, drop_id: int, drop: DropUpdate) -> bool:
+        """
+        Overwrite a drop; updating a missing ID is a no-op.
+
+        Args:
+            drop_id: Drop record ID.
+            drop: New drop data.
+
+        Returns:
+            True if the record existed and was updated.
+        """
+
+    @abstractmethod
+    async def delete(self, drop_id: int) -> bool:
+        """
+        Delete a drop.
+
+        Args:
+            drop_id: Drop record ID.
+
+        Returns:
+            True if the record existed and was deleted.
+        """
+
+    @abstractmethod
+    async def exists(self, items: List[ExistenceInfo]) -> List[ExistenceResult]:
+        """
+        Check which mobs and items have at least one drop.
+
+        Args:
+            items: Mob and item IDs to check.
+
+        Returns:
+            One result per requested item, in request order.
+        """
+
+    def close(self) -> None:
+        """Release resources held by the repository."""
+
+
+def create_local_repository(backend: RepositoryBackend, sqlite_path: str) -> DropRepository:
+    """
+    Build a repository that does not use the MySQL pool.
+
+    Args:
+        backend: "sqlite" or "memory".
+        sqlite_path: Database file for the SQLite backend (":memory:" for a private one).
+
+    Returns:
+        Repository instance shared by all requests.
+
+    Raises:
+        ValueError: For an unknown backend.
+    """
+    if backend == "sqlite":
+        from services.sqlite_drop_repository import SQLiteDropRepository
+        return SQLiteDropRepository(sqlite_path)
+    if backend == "memory":
+        from services.memory_drop_repository import InMemoryDropRepository
+        return InMemoryDropRepository()
+    raise ValueError(f"Unknown drop repository backend: {backend}")
+
+
+async def seed_repository(repository: DropRepository, path: str) -> int:
+    """
+    Load drops from a CSV (with header) or NDJSON file into a repository.
+
+    Args:
+        repository: Repository to fill.
+        path: File to load; ``.ndjson``/``.jsonl`` files are read as NDJSON.
+
+    Returns:
+        Number of drops created.
+    """
+    from services.drop_import import RecordParser
+
+    parser = RecordParser("ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv")
+    count = 0
+    with open(path, encoding="utf-8-sig", newline="") as handle:
+        for line in handle:
+            record = parser.parse(line.rstrip("\r\n"))
+            if record is None:
+                continue
+            await repository.create(DropCreate(**record))
+            count += 1
+    logger.info("Seeded %d drops from %s", count, path)
+    return count
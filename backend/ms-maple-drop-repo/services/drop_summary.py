@@ -0,0 +1,244 @@
+"""Per-mob and per-item drop summary tables maintained on write.
+
+Writes refresh the summary rows of the keys they touch. The aggregate is a
+plain (non-locking) read: an INSERT ... SELECT would take shared locks on
+the drop_data rows of the whole key, which other writers to the same mob
+or item hold exclusively, and deadlock with them. Consistency comes from
+the change log instead: every writer records its change before the
+refresh, and the counter row lock it takes then is held until commit, so
+refreshes run one at a time and each read sees every committed write.
+
+Can be run as a CLI after bulk reloads:
+    python -m services.drop_summary rebuild
+"""
+
+import argparse
+import logging
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+MOB_SUMMARY_TABLE = "drop_mob_summary"
+ITEM_SUMMARY_TABLE = "drop_item_summary"
+
+CREATE_SUMMARY_STATEMENTS = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {MOB_SUMMARY_TABLE} (
+        dropperid INT NOT NULL PRIMARY KEY,
+        drop_count INT NOT NULL,
+        item_count INT NOT NULL,
+        max_chance INT NOT NULL,
+        quest_drop_count INT NOT NULL
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {ITEM_SUMMARY_TABLE} (
+        itemid INT NOT NULL PRIMARY KEY,
+        drop_count INT NOT NULL,
+        mob_count INT NOT NULL,
+        max_chance INT NOT NULL,
+        best_dropperid INT NOT NULL,
+        quest_drop_count INT NOT NULL
+    )
+    """,
+]
+
+# Aggregations grouped on the indexed leading column of each summary key.
+MOB_AGGREGATE_SELECT = """
+    SELECT dropperid, COUNT(*), COUNT(DISTINCT itemid), MAX(chance), SUM(questid <> 0)
+    FROM drop_data {where}
+    GROUP BY dropperid
+"""
+ITEM_AGGREGATE_SELECT = """
+    SELECT itemid, COUNT(*), COUNT(DISTINCT dropperid), MAX(chance),
+        CAST(SUBSTRING_INDEX(GROUP_CONCAT(dropperid ORDER BY chance DESC), ',', 1) AS UNSIGNED),
+        SUM(questid <> 0)
+    FROM drop_data {where}
+    GROUP BY itemid
+"""
+MOB_SUMMARY_COLUMNS = ("dropperid", "drop_count", "item_count", "max_chance", "quest_drop_count")
+ITEM_SUMMARY_COLUMNS = ("itemid", "drop_count", "mob_count", "max_chance", "best_dropperid", "quest_drop_count")
+INSERT_MOB_SUMMARY = f"INSERT INTO {MOB_SUMMARY_TABLE} ({', '.join(MOB_SUMMARY_COLUMNS)}) "
+INSERT_ITEM_SUMMARY = f"INSERT INTO {ITEM_SUMMARY_TABLE} ({', '.join(ITEM_SUMMARY_COLUMNS)}) "
+
+
+def _upsert_query(insert: str, columns: Tuple[str, ...]) -> str:
+    """Single-row upsert overwriting every non-key column."""
+    updates = ", ".join(f"{column} = VALUES({column})" for column in columns[1:])
+    return f"{insert}VALUES ({', '.join(['%s'] * len(columns))}) ON DUPLICATE KEY UPDATE {updates}"
+
+
+UPSERT_MOB_SUMMARY = _upsert_query(INSERT_MOB_SUMMARY, MOB_SUMMARY_COLUMNS)
+UPSERT_ITEM_SUMMARY = _upsert_query(INSERT_ITEM_SUMMARY, ITEM_SUMMARY_COLUMNS)
+
+MOB_SUMMARY_QUERY = (
+    f"SELECT dropperid, drop_count, item_count, max_chance, quest_drop_count "
+    f"FROM {MOB_SUMMARY_TABLE} WHERE dropperid = %s"
+)
+ITEM_SUMMARY_QUERY = (
+    f"SELECT itemid, drop_count, mob_count, max_chance, best_dropperid, quest_drop_count "
+    f"FROM {ITEM_SUMMARY_TABLE} WHERE itemid = %s"
+)
+
+
+def _placeholders(values: List[int]) -> str:
+    """Build an IN (...) placeholder list."""
+    return ",".join(["%s"] * len(values))
+
+
+def ensure_summary_tables(cnx, create: bool = False) -> bool:
+    """
+    Check that the summary tables exist and optionally create them.
+
+    Args:
+        cnx: MySQL connection.
+        create: Create missing tables when True.
+
+    Returns:
+        True if the tables exist after the call.
+    """
+    db_cursor = cnx.cursor()
+    try:
+        db_cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN (%s, %s)",
+            (MOB_SUMMARY_TABLE, ITEM_SUMMARY_TABLE),
+        )
+        if db_cursor.fetchone()[0] == 2:
+            return True
+        if not create:
+            logger.warning("Summary tables %s/%s are missing", MOB_SUMMARY_TABLE, ITEM_SUMMARY_TABLE)
+            return False
+        for statement in CREATE_SUMMARY_STATEMENTS:
+            db_cursor.execute(statement)
+        cnx.commit()
+        logger.info("Created summary tables")
+        return True
+    finally:
+        db_cursor.close()
+
+
+def _refresh_keys(db_cursor, table: str, key: str, aggregate: str, upsert: str, ids: List[int]) -> None:
+    """Overwrite the summary rows of some keys from a non-locking aggregate read."""
+    where = f"WHERE {key} IN ({_placeholders(ids)})"
+    db_cursor.execute(aggregate.format(where=where), tuple(ids))
+    rows = [tuple(row) for row in db_cursor.fetchall()]
+    if rows:
+        db_cursor.executemany(upsert, rows)
+    emptied = sorted(set(ids) - {row[0] for row in rows})
+    if emptied:
+        db_cursor.execute(f"DELETE FROM {table} WHERE {key} IN ({_placeholders(emptied)})", tuple(emptied))
+
+
+def refresh_summaries(db_cursor, dropper_ids: Iterable[int], item_ids: Iterable[int]) -> None:
+    """
+    Recompute summary rows for the given keys inside the caller's transaction.
+
+    Keys whose last drop was removed lose their summary row. The caller
+    must have recorded its change already (see the module docstring).
+
+    Args:
+        db_cursor: Writer cursor of the transaction that changed drop_data.
+        dropper_ids: Mob IDs touched by the write.
+        item_ids: Item IDs touched by the write.
+    """
+    dropper_ids = sorted(set(dropper_ids))
+    item_ids = sorted(set(item_ids))
+
+    if dropper_ids:
+        _refresh_keys(
+            db_cursor, MOB_SUMMARY_TABLE, "dropperid", MOB_AGGREGATE_SELECT, UPSERT_MOB_SUMMARY, dropper_ids
+        )
+    if item_ids:
+        _refresh_keys(
+            db_cursor, ITEM_SUMMARY_TABLE, "itemid", ITEM_AGGREGATE_SELECT, UPSERT_ITEM_SUMMARY, item_ids
+        )
+
+
+def rebuild_summaries(db_cursor) -> None:
+    """
+    Recompute both summary tables from the full drop_data table.
+
+    Args:
+        db_cursor: Writer cursor; the caller commits.
+    """
+    db_cursor.execute(f"DELETE FROM {MOB_SUMMARY_TABLE}")
+    db_cursor.execute(INSERT_MOB_SUMMARY + MOB_AGGREGATE_SELECT.format(where=""))
+    db_cursor.execute(f"DELETE FROM {ITEM_SUMMARY_TABLE}")
+    db_cursor.execute(INSERT_ITEM_SUMMARY + ITEM_AGGREGATE_SELECT.format(where=""))
+
+
+def fetch_mob_summary(db_cursor, dropperid: int) -> Optional[Dict[str, Any]]:
+    """
+    Read the summary row for a mob.
+
+    Args:
+        db_cursor: Dictionary database cursor.
+        dropperid: Mob ID.
+
+    Returns:
+        Summary row, or None if the mob has no drops.
+    """
+    db_cursor.execute(MOB_SUMMARY_QUERY, (dropperid,))
+    return db_cursor.fetchone()
+
+
+def fetch_item_summary(db_cursor, itemid: int) -> Optional[Dict[str, Any]]:
+    """
+    Read the summary row for an item.
+
+    Args:
+        db_cursor: Dictionary database cursor.
+        itemid: Item ID.
+
+    Returns:
+        Summary row, or None if no mob drops the item.
+    """
+    db_cursor.execute(ITEM_SUMMARY_QUERY, (itemid,))
+    return db_cursor.fetchone()
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command line arguments.
+
+    Returns:
+        Process exit code.
+    """
+    from config import DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="Maintain drop summary tables.")
+    parser.add_argument("command", choices=["rebuild"], help="Rebuild summaries from drop_data.")
+    parser.add_argument("--create", action="store_true", help="Create missing summary tables first.")
+    args = parser.parse_args(argv)
+
+    cnx = mysql.connector.connect(**DB_CONFIG)
+    try:
+        if not ensure_summary_tables(cnx, create=args.create):
+            print("summary tables missing, rerun with --create")
+            return 1
+        db_cursor = cnx.cursor()
+        try:
+            rebuild_summaries(db_cursor)
+            cnx.commit()
+        except mysql.connector.Error:
+            cnx.rollback()
+            raise
+        finally:
+            db_cursor.close()
+    finally:
+        cnx.close()
+
+    print("summary tables rebuilt")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
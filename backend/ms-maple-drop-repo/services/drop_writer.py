@@ -0,0 +1,230 @@
+"""Drop write operations with their change log, summary and read model side effects.
+
+Each function runs inside the caller's transaction; the caller commits.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+
+from models import DropCreate, DropUpdate
+from services.change_log import record_change, record_changes
+from services.drop_augmented import refresh_augmented
+from services.drop_summary import refresh_summaries
+
+UPDATE_DROP_QUERY = """
+    UPDATE drop_data
+    SET dropperid=%s, itemid=%s, minimum_quantity=%s, maximum_quantity=%s, questid=%s, chance=%s
+    WHERE id=%s
+"""
+INSERT_DROP_QUERY = """
+    INSERT INTO drop_data
+    (dropperid, itemid, minimum_quantity, maximum_quantity, questid, chance)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+DELETE_DROP_QUERY = "DELETE FROM drop_data WHERE id = %s"
+LOCK_DROP_KEYS_QUERY = "SELECT dropperid, itemid FROM drop_data WHERE id = %s FOR UPDATE"
+LOCK_DROPS_KEYS_QUERY = "SELECT id, dropperid, itemid FROM drop_data WHERE id IN ({ids}) FOR UPDATE"
+DELETE_DROPS_QUERY = "DELETE FROM drop_data WHERE id IN ({ids})"
+AUTO_INCREMENT_STEP_QUERY = "SELECT @@auto_increment_increment"
+
+
+@dataclass(frozen=True)
+class WriteOp:
+    """A single drop write queued for batched application."""
+
+    op: Literal["create", "update", "delete"]
+    drop_id: Optional[int] = None
+    drop: Optional[DropCreate | DropUpdate] = None
+
+
+def drop_values(drop: DropCreate | DropUpdate) -> Tuple[int, ...]:
+    """Column values of a drop in INSERT/UPDATE order."""
+    return (drop.dropperid, drop.itemid, drop.minimum_quantity, drop.maximum_quantity, drop.questid, drop.chance)
+
+
+def lock_drop_keys(db_cursor, drop_id: int) -> Optional[Tuple[int, int]]:
+    """
+    Lock a drop row and read its summary keys.
+
+    Args:
+        db_cursor: Writer cursor.
+        drop_id: Drop record ID.
+
+    Returns:
+        (dropperid, itemid) before the write, or None if the row is missing.
+    """
+    db_cursor.execute(LOCK_DROP_KEYS_QUERY, (drop_id,))
+    row = db_cursor.fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def lock_drops_keys(db_cursor, drop_ids: Sequence[int]) -> Dict[int, Tuple[int, int]]:
+    """
+    Lock several drop rows and read their summary keys.
+
+    Args:
+        db_cursor: Writer cursor.
+        drop_ids: Drop record IDs.
+
+    Returns:
+        (dropperid, itemid) per existing drop ID; missing rows are absent.
+    """
+    if not drop_ids:
+        return {}
+    ids = sorted(set(drop_ids))
+    db_cursor.execute(LOCK_DROPS_KEYS_QUERY.format(ids=",".join(["%s"] * len(ids))), tuple(ids))
+    return {row[0]: (row[1], row[2]) for row in db_cursor.fetchall()}
+
+
+def create_drop(db_cursor, drop: DropCreate) -> int:
+    """
+    Insert a drop record.
+
+    Args:
+        db_cursor: Writer cursor.
+        drop: Drop data to create.
+
+    Returns:
+        ID of the new record.
+    """
+    db_cursor.execute(INSERT_DROP_QUERY, drop_values(drop))
+    new_id = db_cursor.lastrowid
+    record_change(db_cursor, "create", new_id, drop)
+    refresh_summaries(db_cursor, [drop.dropperid], [drop.itemid])
+    refresh_augmented(db_cursor, [new_id])
+    return new_id
+
+
+def update_drop(db_cursor, drop_id: int, drop: DropUpdate) -> bool:
+    """
+    Update a drop record.
+
+    Args:
+        db_cursor: Writer cursor.
+        drop_id: Drop record ID to update.
+        drop: New drop data.
+
+    Returns:
+        True if the record existed and was updated; nothing is written otherwise.
+    """
+    old_keys = lock_drop_keys(db_cursor, drop_id)
+    if old_keys is None:
+        return False
+
+    db_cursor.execute(UPDATE_DROP_QUERY, drop_values(drop) + (drop_id,))
+    record_change(db_cursor, "update", drop_id, drop)
+    refresh_summaries(db_cursor, [drop.dropperid, old_keys[0]], [drop.itemid, old_keys[1]])
+    refresh_augmented(db_cursor, [drop_id])
+    return True
+
+
+def delete_drop(db_cursor, drop_id: int) -> bool:
+    """
+    Delete a drop record.
+
+    Args:
+        db_cursor: Writer cursor.
+        drop_id: Drop record ID to delete.
+
+    Returns:
+        True if the record existed and was deleted.
+    """
+    old_keys = lock_drop_keys(db_cursor, drop_id)
+    db_cursor.execute(DELETE_DROP_QUERY, (drop_id,))
+    if db_cursor.rowcount == 0:
+        return False
+
+    record_change(db_cursor, "delete", drop_id)
+    if old_keys:
+        refresh_summaries(db_cursor, [old_keys[0]], [old_keys[1]])
+    refresh_augmented(db_cursor, [drop_id])
+    return True
+
+
+def apply_write(db_cursor, write: WriteOp) -> Optional[int]:
+    """
+    Apply one write with the single-row functions above.
+
+    Args:
+        db_cursor: Writer cursor.
+        write: Write to apply.
+
+    Returns:
+        New ID for creates, the drop ID for updates and deletes of existing
+        rows, None for updates and deletes of missing rows.
+    """
+    if write.op == "create":
+        return create_drop(db_cursor, write.drop)
+    if write.op == "update":
+        return write.drop_id if update_drop(db_cursor, write.drop_id, write.drop) else None
+    return write.drop_id if delete_drop(db_cursor, write.drop_id) else None
+
+
+def apply_writes(db_cursor, writes: Sequence[WriteOp]) -> List[Optional[int]]:
+    """
+    Apply several writes in one transaction with batched statements.
+
+    Creates become one multi-row INSERT, updates one executemany, deletes one
+    ``DELETE ... IN``, and the change log, summaries and augmented rows are
+    written once for the batch. Updates and deletes are resolved in the given order against a
+    single locking read, so a delete after an update of the same row wins and
+    an update after a delete finds the row missing.
+
+    Args:
+        db_cursor: Writer cursor; the caller commits.
+        writes: Writes in arrival order.
+
+    Returns:
+        Per write: new ID for creates, the drop ID for updates and deletes of
+        existing rows, None for updates and deletes of missing rows.
+    """
+    results: List[Optional[int]] = [None] * len(writes)
+    live = lock_drops_keys(db_cursor, [w.drop_id for w in writes if w.op != "create"])
+
+    creates = [i for i, w in enumerate(writes) if w.op == "create"]
+    if creates:
+        # mysql.connector rewrites an INSERT executemany into one multi-row
+        # INSERT; its rows get consecutive IDs starting at lastrowid.
+        db_cursor.executemany(INSERT_DROP_QUERY, [drop_values(writes[i].drop) for i in creates])
+        first_id = db_cursor.lastrowid
+        step = 1
+        if len(creates) > 1:
+            db_cursor.execute(AUTO_INCREMENT_STEP_QUERY)
+            step = db_cursor.fetchone()[0]
+        for offset, i in enumerate(creates):
+            results[i] = first_id + offset * step
+
+    updates, deletes, changes = [], [], []
+    dropper_ids, item_ids = [], []
+    for i, write in enumerate(writes):
+        if write.op == "create":
+            changes.append(("create", results[i], write.drop))
+            dropper_ids.append(write.drop.dropperid)
+            item_ids.append(write.drop.itemid)
+            continue
+        old_keys = live.get(write.drop_id)
+        if old_keys is None:
+            continue
+        dropper_ids.append(old_keys[0])
+        item_ids.append(old_keys[1])
+        if write.op == "update":
+            updates.append(drop_values(write.drop) + (write.drop_id,))
+            changes.append(("update", write.drop_id, write.drop))
+            live[write.drop_id] = (write.drop.dropperid, write.drop.itemid)
+            dropper_ids.append(write.drop.dropperid)
+            item_ids.append(write.drop.itemid)
+        else:
+            deletes.append(write.drop_id)
+            changes.append(("delete", write.drop_id, None))
+            del live[write.drop_id]
+        results[i] = write.drop_id
+
+    if updates:
+        db_cursor.executemany(UPDATE_DROP_QUERY, updates)
+    if deletes:
+        db_cursor.execute(DELETE_DROPS_QUERY.format(ids=",".join(["%s"] * len(deletes))), tuple(deletes))
+
+    record_changes(db_cursor, changes)
+    refresh_summaries(db_cursor, dropper_ids, item_ids)
+    refresh_augmented(db_cursor, [drop_id for drop_id in results if drop_id is not None])
+    return results
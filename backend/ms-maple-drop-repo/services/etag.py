@@ -0,0 +1,74 @@
+"""Strong ETag computation and conditional request helpers."""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+Rows = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+def compute_etag(rows: Rows) -> str:
+    """
+    Compute a strong ETag from a result digest.
+
+    Hashes column values in key order rather than the JSON body, so a
+    matching If-None-Match never pays for response serialization.
+
+    Args:
+        rows: Single row or list of rows as returned by a dictionary cursor.
+
+    Returns:
+        Quoted ETag value.
+    """
+    if isinstance(rows, dict):
+        rows = [rows]
+    digest = hashlib.sha256()
+    for row in rows:
+        for key in sorted(row):
+            digest.update(f"{key}={row[key]}\x1f".encode("utf-8"))
+        digest.update(b"\x1e")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses weak comparison as required for If-None-Match (RFC 9110 13.1.2).
+
+    Args:
+        if_none_match: Raw If-None-Match header value.
+        etag: Current quoted ETag.
+
+    Returns:
+        True if the client's cached representation is current.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_json_response(rows: Rows, if_none_match: Optional[str]) -> Response:
+    """
+    Build a JSON response with an ETag, or 304 if the client copy is current.
+
+    Args:
+        rows: Response payload.
+        if_none_match: Raw If-None-Match header value.
+
+    Returns:
+        304 response without body, or JSON response with ETag header.
+    """
+    etag = compute_etag(rows)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=rows, headers=headers)
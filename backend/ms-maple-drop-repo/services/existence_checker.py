@@ -1,10 +1,33 @@
-from typing import List
+from typing import List, Tuple
 from mysql.connector import cursor
 from models import ExistenceInfo, ExistenceResult
 
+def build_existence_query(mob_ids: List[int], item_ids: List[int], placeholder: str = "%s") -> Tuple[str, tuple]:
+    """
+    Build the UNION ALL existence query for mob and item IDs.
+
+    Returns an empty query when there is nothing to check. ``placeholder`` is
+    the driver's parameter marker ("?" for sqlite3).
+    """
+    sql_parts = []
+    params = []
+
+    if mob_ids:
+        mob_placeholders = ','.join([placeholder] * len(mob_ids))
+        sql_parts.append(f"SELECT 'mob' as type, dropperid as id FROM drop_data WHERE dropperid IN ({mob_placeholders})")
+        params.extend(mob_ids)
+
+    if item_ids:
+        item_placeholders = ','.join([placeholder] * len(item_ids))
+        sql_parts.append(f"SELECT 'item' as type, itemid as id FROM drop_data WHERE itemid IN ({item_placeholders})")
+        params.extend(item_ids)
+
+    return " UNION ALL ".join(sql_parts), tuple(params)
+
 def check_existence(
     cursor: cursor.MySQLCursorDict, 
-    items: List[ExistenceInfo]
+    items: List[ExistenceInfo],
+    placeholder: str = "%s",
 ) -> List[ExistenceResult]:
     
     mob_ids_to_check = [item.id for item in items if item.type == 'mob']
@@ -13,22 +36,10 @@ def check_existence(
     existing_mob_ids = set()
     existing_item_ids = set()
 
-    sql_parts = []
-    params = []
-
-    if mob_ids_to_check:
-        mob_placeholders = ','.join(['%s'] * len(mob_ids_to_check))
-        sql_parts.append(f"SELECT 'mob' as type, dropperid as id FROM drop_data WHERE dropperid IN ({mob_placeholders})")
-        params.extend(mob_ids_to_check)
-
-    if item_ids_to_check:
-        item_placeholders = ','.join(['%s'] * len(item_ids_to_check))
-        sql_parts.append(f"SELECT 'item' as type, itemid as id FROM drop_data WHERE itemid IN ({item_placeholders})")
-        params.extend(item_ids_to_check)
+    full_query, params = build_existence_query(mob_ids_to_check, item_ids_to_check, placeholder)
 
-    if sql_parts:
-        full_query = " UNION ALL ".join(sql_parts)
-        cursor.execute(full_query, tuple(params))
+    if full_query:
+        cursor.execute(full_query, params)
         db_results = cursor.fetchall()
 
         for row in db_results:
@@ -0,0 +1,161 @@
+"""Index bootstrap and verification for the drop_data table.
+
+Can be run as a CLI:
+    python -m services.index_bootstrap          # report missing indexes
+    python -m services.index_bootstrap --create # create missing indexes
+"""
+
+import argparse
+import logging
+import sys
+from typing import Dict, List, NamedTuple, Tuple
+
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+DROP_TABLE = "drop_data"
+
+
+class IndexSpec(NamedTuple):
+    """Required index on drop_data, satisfied by any index with these leading columns."""
+
+    name: str
+    columns: Tuple[str, ...]
+    reason: str
+
+
+# Every query filters on dropperid, itemid or id. The second column on the
+# composite indexes makes the existence and per-item mob lookups covering.
+REQUIRED_INDEXES: List[IndexSpec] = [
+    IndexSpec("PRIMARY", ("id",), "get/update/delete by id"),
+    IndexSpec("idx_drop_data_dropperid_itemid", ("dropperid", "itemid"), "mob search and mob existence"),
+    IndexSpec("idx_drop_data_itemid_dropperid", ("itemid", "dropperid"), "item search and item existence"),
+]
+
+EXISTING_INDEXES_QUERY = """
+    SELECT INDEX_NAME, COLUMN_NAME
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    ORDER BY INDEX_NAME, SEQ_IN_INDEX
+"""
+
+
+def fetch_existing_indexes(db_cursor, table: str = DROP_TABLE) -> Dict[str, List[str]]:
+    """
+    Read the current index layout of a table.
+
+    Args:
+        db_cursor: Dictionary database cursor.
+        table: Table name in the current database.
+
+    Returns:
+        Dict mapping index name to its ordered column list.
+    """
+    db_cursor.execute(EXISTING_INDEXES_QUERY, (table,))
+    indexes: Dict[str, List[str]] = {}
+    for row in db_cursor.fetchall():
+        indexes.setdefault(row["INDEX_NAME"], []).append(row["COLUMN_NAME"])
+    return indexes
+
+
+def find_missing_indexes(existing: Dict[str, List[str]]) -> List[IndexSpec]:
+    """
+    Compare existing indexes against the required set.
+
+    An index requirement is met by any index whose leading columns match,
+    regardless of its name.
+
+    Args:
+        existing: Dict mapping index name to ordered column list.
+
+    Returns:
+        Required indexes that are not satisfied.
+    """
+    missing = []
+    for spec in REQUIRED_INDEXES:
+        width = len(spec.columns)
+        if not any(tuple(columns[:width]) == spec.columns for columns in existing.values()):
+            missing.append(spec)
+    return missing
+
+
+def create_index_statement(spec: IndexSpec, table: str = DROP_TABLE) -> str:
+    """
+    Build the DDL statement for a required index.
+
+    Args:
+        spec: Index specification.
+        table: Table name.
+
+    Returns:
+        SQL statement creating the index.
+    """
+    columns = ", ".join(spec.columns)
+    if spec.name == "PRIMARY":
+        return f"ALTER TABLE {table} ADD PRIMARY KEY ({columns})"
+    return f"CREATE INDEX {spec.name} ON {table} ({columns})"
+
+
+def ensure_indexes(cnx, create: bool = False) -> List[IndexSpec]:
+    """
+    Check drop_data for required indexes and optionally create them.
+
+    Args:
+        cnx: MySQL connection.
+        create: Create missing indexes when True, only report when False.
+
+    Returns:
+        Indexes that were missing when the check started.
+    """
+    db_cursor = cnx.cursor(dictionary=True)
+    try:
+        missing = find_missing_indexes(fetch_existing_indexes(db_cursor))
+        for spec in missing:
+            if not create:
+                logger.warning(
+                    "Missing index on %s(%s) needed for %s",
+                    DROP_TABLE, ", ".join(spec.columns), spec.reason,
+                )
+                continue
+            statement = create_index_statement(spec)
+            logger.info("Creating index: %s", statement)
+            db_cursor.execute(statement)
+        if not missing:
+            logger.info("All required indexes present on %s", DROP_TABLE)
+        return missing
+    finally:
+        db_cursor.close()
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command line arguments.
+
+    Returns:
+        Process exit code, 1 if indexes are missing and were not created.
+    """
+    from config import DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="Check or create drop_data indexes.")
+    parser.add_argument("--create", action="store_true", help="Create missing indexes.")
+    args = parser.parse_args(argv)
+
+    cnx = mysql.connector.connect(**DB_CONFIG)
+    try:
+        missing = ensure_indexes(cnx, create=args.create)
+    finally:
+        cnx.close()
+
+    for spec in missing:
+        status = "created" if args.create else "missing"
+        print(f"{status}: {spec.name} ({', '.join(spec.columns)})")
+    return 1 if missing and not args.create else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
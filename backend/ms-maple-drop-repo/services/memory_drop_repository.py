@@ -0,0 +1,77 @@
+"""In-memory drop repository for benchmarks and tests."""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from models import DropCreate, DropUpdate, ExistenceInfo, ExistenceResult
+from services.drop_repository import SEARCH_COLUMNS, DropRepository, SearchType
+
+
+class InMemoryDropRepository(DropRepository):
+    """Drop records in process memory, indexed by mob and by item."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._index: Dict[str, Dict[int, Set[int]]] = {key: defaultdict(set) for key in SEARCH_COLUMNS}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def _add(self, row: Dict[str, Any]) -> None:
+        """Store a row and index it."""
+        self._rows[row["id"]] = row
+        for key, column in SEARCH_COLUMNS.items():
+            self._index[key][row[column]].add(row["id"])
+
+    def _remove(self, drop_id: int) -> Optional[Dict[str, Any]]:
+        """Remove a row and its index entries."""
+        row = self._rows.pop(drop_id, None)
+        if row:
+            for key, column in SEARCH_COLUMNS.items():
+                ids = self._index[key][row[column]]
+                ids.discard(drop_id)
+                if not ids:
+                    del self._index[key][row[column]]
+        return row
+
+    async def search(self, query_type: SearchType, query: int) -> List[Dict[str, Any]]:
+        """Find drops of a mob or drops of an item, ordered by ID."""
+        with self._lock:
+            ids = sorted(self._index[query_type].get(query, ()))
+            return [dict(self._rows[drop_id]) for drop_id in ids]
+
+    async def get(self, drop_id: int) -> Optional[Dict[str, Any]]:
+        """Read one drop."""
+        with self._lock:
+            row = self._rows.get(drop_id)
+            return dict(row) if row else None
+
+    async def create(self, drop: DropCreate) -> int:
+        """Insert a drop."""
+        with self._lock:
+            drop_id = self._next_id
+            self._next_id += 1
+            self._add({"id": drop_id, **drop.model_dump()})
+            return drop_id
+
+    async def update(self, drop_id: int, drop: DropUpdate) -> bool:
+        """Overwrite a drop."""
+        with self._lock:
+            if self._remove(drop_id) is None:
+                return False
+            self._add({"id": drop_id, **drop.model_dump()})
+            return True
+
+    async def delete(self, drop_id: int) -> bool:
+        """Delete a drop."""
+        with self._lock:
+            return self._remove(drop_id) is not None
+
+    async def exists(self, items: List[ExistenceInfo]) -> List[ExistenceResult]:
+        """Check existence against the mob and item indexes."""
+        with self._lock:
+            return [
+                ExistenceResult(type=item.type, id=item.id, drop_exist=item.id in self._index[item.type])
+                for item in items
+            ]
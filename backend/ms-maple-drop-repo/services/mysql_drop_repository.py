@@ -0,0 +1,83 @@
+"""MySQL drop repository bound to one request's cursor."""
+
+from typing import Any, Dict, List, Optional
+
+from models import DropCreate, DropUpdate, ExistenceInfo, ExistenceResult
+from services.drop_repository import SEARCH_COLUMNS, DropRepository, SearchType
+from services.drop_writer import WriteOp, apply_write
+from services.existence_checker import check_existence
+
+# --- SQL statements (verified against EXPLAIN in tests/test_query_plans.py) ---
+SEARCH_DROPS_QUERIES = {
+    "item": "SELECT * FROM drop_data WHERE itemid = %s",
+    "mob": "SELECT * FROM drop_data WHERE dropperid = %s",
+}
+SEARCH_MANY_DROPS_QUERIES = {
+    "item": "SELECT * FROM drop_data WHERE itemid IN ({ids})",
+    "mob": "SELECT * FROM drop_data WHERE dropperid IN ({ids})",
+}
+GET_DROP_QUERY = "SELECT * FROM drop_data WHERE id = %s"
+
+
+class MySQLDropRepository(DropRepository):
+    """
+    Drop records in MySQL.
+
+    Reads and direct writes run on the request's cursor inside its
+    transaction. With no cursor, writes go through the write coalescer.
+    """
+
+    def __init__(self, db_cursor=None, write_coalescer=None):
+        """
+        Initialize a request-scoped repository.
+
+        Args:
+            db_cursor: Dictionary cursor for reads, or writer cursor for writes.
+            write_coalescer: Started WriteCoalescer used when db_cursor is None.
+        """
+        self.db_cursor = db_cursor
+        self.write_coalescer = write_coalescer
+
+    async def search(self, query_type: SearchType, query: int) -> List[Dict[str, Any]]:
+        """Find drops of a mob or drops of an item."""
+        self.db_cursor.execute(SEARCH_DROPS_QUERIES[query_type], (query,))
+        return self.db_cursor.fetchall()
+
+    async def search_many(self, query_type: SearchType, queries: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Find drops of several mobs or items with one IN query."""
+        results: Dict[int, List[Dict[str, Any]]] = {query: [] for query in queries}
+        if not results:
+            return results
+        sql = SEARCH_MANY_DROPS_QUERIES[query_type].format(ids=",".join(["%s"] * len(results)))
+        self.db_cursor.execute(sql, tuple(results))
+        column = SEARCH_COLUMNS[query_type]
+        for row in self.db_cursor.fetchall():
+            results[row[column]].append(row)
+        return results
+
+    async def get(self, drop_id: int) -> Optional[Dict[str, Any]]:
+        """Read one drop."""
+        self.db_cursor.execute(GET_DROP_QUERY, (drop_id,))
+        return self.db_cursor.fetchone()
+
+    async def create(self, drop: DropCreate) -> int:
+        """Insert a drop with its change log entry and summary refresh."""
+        return await self._write(WriteOp("create", drop=drop))
+
+    async def update(self, drop_id: int, drop: DropUpdate) -> bool:
+        """Overwrite a drop with its change log entry and summary refresh."""
+        return await self._write(WriteOp("update", drop_id, drop)) is not None
+
+    async def delete(self, drop_id: int) -> bool:
+        """Delete a drop with its change log entry and summary refresh."""
+        return await self._write(WriteOp("delete", drop_id)) is not None
+
+    async def exists(self, items: List[ExistenceInfo]) -> List[ExistenceResult]:
+        """Check existence with one UNION ALL query."""
+        return check_existence(self.db_cursor, items)
+
+    async def _write(self, write: WriteOp) -> Optional[int]:
+        """Apply a write on the cursor, or through the coalescer when there is none."""
+        if self.db_cursor is not None:
+            return apply_write(self.db_cursor, write)
+        return await self.write_coalescer.submit(write)
@@ -0,0 +1,278 @@
+"""Statement timeouts and a rate-limited slow-query log.
+
+Read statements carry a per-statement execution limit: an optimizer hint
+on MySQL, a ``SET STATEMENT ... FOR`` prefix on MariaDB, so no extra round
+trip is needed. Cursors handed to request code are wrapped in a
+MonitoredCursor that times each statement including its fetches and
+reports statements over the threshold to a SlowQueryLog.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, List, Literal, Optional, Sequence
+
+import mysql.connector
+from mysql.connector import errorcode
+
+logger = logging.getLogger(__name__)
+
+ServerFlavor = Literal["mysql", "mariadb"]
+
+# MariaDB reports max_statement_time overruns as ER_STATEMENT_TIMEOUT (1969).
+STATEMENT_TIMEOUT_ERRNOS = {errorcode.ER_QUERY_TIMEOUT, 1969}
+LOCK_WAIT_TIMEOUT_ERRNOS = {errorcode.ER_LOCK_WAIT_TIMEOUT}
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE")
+
+
+def detect_flavor(cnx) -> ServerFlavor:
+    """Tell MariaDB from MySQL by the server version string."""
+    return "mariadb" if "mariadb" in str(cnx.get_server_info()).lower() else "mysql"
+
+
+def with_statement_timeout(sql: str, flavor: ServerFlavor, timeout_ms: float) -> str:
+    """
+    Attach an execution time limit to a SELECT statement.
+
+    Args:
+        sql: Statement to run.
+        flavor: Server flavor.
+        timeout_ms: Limit in milliseconds; 0 leaves the statement unchanged.
+
+    Returns:
+        Statement with the limit applied; non-SELECT statements are unchanged.
+    """
+    stripped = sql.lstrip()
+    if timeout_ms <= 0 or stripped[:6].upper() != "SELECT":
+        return sql
+    if flavor == "mariadb":
+        return f"SET STATEMENT max_statement_time={timeout_ms / 1000:g} FOR {stripped}"
+    return f"SELECT /*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */{stripped[6:]}"
+
+
+def query_shape(sql: str) -> str:
+    """Normalize a statement for grouping: collapsed whitespace and IN lists."""
+    return _PLACEHOLDER_LIST.sub("(%s, ...)", _WHITESPACE.sub(" ", sql).strip())
+
+
+def params_digest(params: Any) -> str:
+    """Short digest of statement parameters, so values are not logged."""
+    return hashlib.sha256(repr(params).encode("utf-8")).hexdigest()[:12]
+
+
+def is_explainable(sql: str) -> bool:
+    """Whether EXPLAIN gives a useful plan for the statement."""
+    head = sql.lstrip()[:6].upper()
+    return head in _EXPLAINABLE or (head == "INSERT" and " SELECT " in sql.upper())
+
+
+class SlowQueryLog:
+    """
+    Logs statements slower than a threshold.
+
+    Entries are limited to ``max_per_minute`` with a token bucket; dropped
+    entries are counted and reported with the next logged one. EXPLAIN runs
+    at most once per statement shape per ``explain_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        max_per_minute: int = 30,
+        explain: bool = True,
+        explain_interval: float = 300.0,
+        history: int = 100,
+    ):
+        """
+        Initialize the log.
+
+        Args:
+            threshold_ms: Statements at or above this latency are slow; 0 disables the log.
+            max_per_minute: Maximum entries logged per minute.
+            explain: Capture EXPLAIN output for slow statements.
+            explain_interval: Seconds before the same shape is explained again.
+            history: Number of recent entries kept in memory.
+        """
+        self.threshold_ms = threshold_ms
+        self.max_per_minute = max_per_minute
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self.history = history
+        self.entries: List[Dict[str, Any]] = []
+        self.suppressed = 0
+        self._tokens = float(max_per_minute)
+        self._refilled = time.monotonic()
+        self._explained: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether statements are being timed."""
+        return self.threshold_ms > 0
+
+    def _take_token(self, now: float) -> bool:
+        """Consume a rate-limit token if one is available."""
+        self._tokens = min(self.max_per_minute, self._tokens + (now - self._refilled) * self.max_per_minute / 60)
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def should_log(self, latency_ms: float) -> bool:
+        """Decide whether a statement is logged, counting rate-limited ones."""
+        if not self.enabled or latency_ms < self.threshold_ms:
+            return False
+        with self._lock:
+            if self._take_token(time.monotonic()):
+                return True
+            self.suppressed += 1
+            return False
+
+    def should_explain(self, shape: str, sql: str) -> bool:
+        """Decide whether to capture EXPLAIN for a shape, remembering the decision."""
+        if not self.explain or not is_explainable(sql):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained.get(shape)
+            if last is not None and now - last < self.explain_interval:
+                return False
+            self._explained[shape] = now
+            return True
+
+    def record(self, sql: str, params: Any, latency_ms: float, plan: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Log a slow statement.
+
+        Args:
+            sql: Statement as issued by the caller (without timeout hints).
+            params: Statement parameters; only their digest is logged.
+            latency_ms: Execution plus fetch time.
+            plan: EXPLAIN rows, or None if not captured.
+
+        Returns:
+            The logged entry.
+        """
+        with self._lock:
+            suppressed, self.suppressed = self.suppressed, 0
+            entry = {
+                "shape": query_shape(sql),
+                "params": params_digest(params),
+                "latency_ms": round(latency_ms, 1),
+                "explain": plan,
+                "suppressed": suppressed,
+            }
+            self.entries.append(entry)
+            del self.entries[:-self.history]
+        logger.warning("Slow query: %s", json.dumps(entry, default=str))
+        return entry
+
+
+class MonitoredCursor:
+    """
+    Cursor proxy applying statement timeouts and timing statements.
+
+    A statement's latency covers its execute call and every fetch until
+    the next statement starts or the cursor is closed; EXPLAIN is then run
+    on a separate cursor of the same connection so caller-visible state
+    such as ``lastrowid`` is untouched.
+    """
+
+    def __init__(self, cnx, db_cursor, slow_log: SlowQueryLog, flavor: ServerFlavor, timeout_ms: float = 0):
+        """
+        Wrap a cursor.
+
+        Args:
+            cnx: Connection the cursor belongs to.
+            db_cursor: Cursor to wrap.
+            slow_log: Slow query log.
+            flavor: Server flavor, for the timeout syntax.
+            timeout_ms: Execution limit for SELECT statements; 0 for none.
+        """
+        self._cnx = cnx
+        self._cursor = db_cursor
+        self._slow_log = slow_log
+        self._flavor = flavor
+        self._timeout_ms = timeout_ms
+        self._pending: Optional[List[Any]] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def _timed(self, call, *args):
+        """Run a cursor call and add its duration to the current statement."""
+        started = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            if self._pending is not None:
+                self._pending[2] += (time.perf_counter() - started) * 1000
+
+    def _finish(self) -> None:
+        """Report the previous statement if it was slow."""
+        if self._pending is None:
+            return
+        sql, params, latency_ms = self._pending
+        self._pending = None
+        if not self._slow_log.should_log(latency_ms):
+            return
+        plan = None
+        shape = query_shape(sql)
+        if self._slow_log.should_explain(shape, sql):
+            plan = self._explain(sql, params)
+        self._slow_log.record(sql, params, latency_ms, plan)
+
+    def _explain(self, sql: str, params: Any) -> Optional[List[Dict[str, Any]]]:
+        """EXPLAIN a statement on a side cursor, returning None on failure."""
+        explain_cursor = None
+        try:
+            explain_cursor = self._cnx.cursor(dictionary=True)
+            explain_cursor.execute(f"EXPLAIN {sql}", params)
+            return explain_cursor.fetchall()
+        except mysql.connector.Error as err:
+            logger.debug("EXPLAIN failed for slow query: %s", err)
+            return None
+        finally:
+            if explain_cursor:
+                explain_cursor.close()
+
+    def execute(self, operation: str, params: Sequence[Any] = (), *args, **kwargs):
+        """Execute a statement with the read timeout applied."""
+        self._finish()
+        statement = with_statement_timeout(operation, self._flavor, self._timeout_ms)
+        if self._slow_log.enabled:
+            self._pending = [operation, params, 0.0]
+        return self._timed(lambda: self._cursor.execute(statement, params, *args, **kwargs))
+
+    def executemany(self, operation: str, seq_params: Sequence[Any], *args, **kwargs):
+        """Execute a statement for each parameter set."""
+        self._finish()
+        if self._slow_log.enabled:
+            self._pending = [operation, seq_params, 0.0]
+        return self._timed(lambda: self._cursor.executemany(operation, seq_params, *args, **kwargs))
+
+    def fetchone(self):
+        """Fetch the next row."""
+        return self._timed(self._cursor.fetchone)
+
+    def fetchmany(self, size: int = 1):
+        """Fetch the next rows."""
+        return self._timed(lambda: self._cursor.fetchmany(size))
+
+    def fetchall(self):
+        """Fetch the remaining rows."""
+        return self._timed(self._cursor.fetchall)
+
+    def close(self) -> None:
+        """Report the last statement and close the cursor."""
+        try:
+            self._finish()
+        finally:
+            self._cursor.close()
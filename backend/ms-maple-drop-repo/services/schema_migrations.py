@@ -0,0 +1,142 @@
+"""Schema migrations for the tables written alongside drop_data.
+
+Every drop write also appends to the change log and refreshes the summary
+and augmented read model tables, so those tables must exist before the
+first write. Migrations run at startup unless DB_MIGRATIONS is off, each
+one exactly once per database, recorded in drop_schema_migrations. A
+named lock keeps replicas starting together from applying them twice.
+Tables added to an existing database are backfilled from drop_data.
+
+Can be run as a CLI:
+    python -m services.schema_migrations
+"""
+
+import logging
+import sys
+from typing import Any, Callable, List, NamedTuple
+
+import mysql.connector
+
+from services.change_log import ADD_WRITE_PAUSE_STATEMENT, CREATE_CHANGE_LOG_STATEMENTS
+from services.drop_augmented import CREATE_AUGMENTED_STATEMENTS, rebuild_augmented
+from services.drop_summary import CREATE_SUMMARY_STATEMENTS, rebuild_summaries
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "drop_schema_migrations"
+MIGRATION_LOCK = "drop_repo_schema_migrations"
+MIGRATION_LOCK_TIMEOUT = 300
+
+CREATE_MIGRATIONS_TABLE = f"""
+    CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+        name VARCHAR(64) NOT NULL PRIMARY KEY,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+APPLIED_MIGRATIONS_QUERY = f"SELECT name FROM {MIGRATIONS_TABLE}"
+RECORD_MIGRATION_QUERY = f"INSERT INTO {MIGRATIONS_TABLE} (name) VALUES (%s)"
+
+
+class Migration(NamedTuple):
+    """A schema change applied once; ``apply`` must be safe to rerun if it fails midway."""
+
+    name: str
+    apply: Callable[[Any], None]
+
+
+def _execute_all(statements: List[str]) -> Callable[[Any], None]:
+    """Migration step running DDL statements in order."""
+    def apply(db_cursor) -> None:
+        for statement in statements:
+            db_cursor.execute(statement)
+    return apply
+
+
+def _create_summaries(db_cursor) -> None:
+    """Create the summary tables and fill them from drop_data."""
+    _execute_all(CREATE_SUMMARY_STATEMENTS)(db_cursor)
+    rebuild_summaries(db_cursor)
+
+
+def _create_augmented(db_cursor) -> None:
+    """Create the read model tables and fill them from drop_data; names follow with the next sync."""
+    _execute_all(CREATE_AUGMENTED_STATEMENTS)(db_cursor)
+    rebuild_augmented(db_cursor)
+
+
+# Append only: applied names are never run again.
+MIGRATIONS: List[Migration] = [
+    Migration("0001_change_log", _execute_all(CREATE_CHANGE_LOG_STATEMENTS)),
+    Migration("0002_drop_summaries", _create_summaries),
+    Migration("0003_augmented_read_model", _create_augmented),
+    Migration("0004_import_write_pause", _execute_all([ADD_WRITE_PAUSE_STATEMENT])),
+]
+
+
+def run_migrations(cnx, migrations: List[Migration] = MIGRATIONS) -> List[str]:
+    """
+    Apply pending migrations in order.
+
+    Args:
+        cnx: MySQL connection.
+        migrations: Migrations to apply when not yet recorded.
+
+    Returns:
+        Names of the migrations applied by this call.
+
+    Raises:
+        RuntimeError: If another process holds the migration lock past the timeout.
+        mysql.connector.Error: If a migration fails; it is retried on the next run.
+    """
+    db_cursor = cnx.cursor()
+    try:
+        db_cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, MIGRATION_LOCK_TIMEOUT))
+        if db_cursor.fetchone()[0] != 1:
+            raise RuntimeError("Timed out waiting for the schema migration lock")
+        try:
+            db_cursor.execute(CREATE_MIGRATIONS_TABLE)
+            db_cursor.execute(APPLIED_MIGRATIONS_QUERY)
+            done = {row[0] for row in db_cursor.fetchall()}
+            applied = []
+            for migration in migrations:
+                if migration.name in done:
+                    continue
+                logger.info("Applying schema migration %s", migration.name)
+                try:
+                    migration.apply(db_cursor)
+                    db_cursor.execute(RECORD_MIGRATION_QUERY, (migration.name,))
+                    cnx.commit()
+                except mysql.connector.Error:
+                    cnx.rollback()
+                    raise
+                applied.append(migration.name)
+            return applied
+        finally:
+            db_cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+            db_cursor.fetchone()
+    finally:
+        db_cursor.close()
+
+
+def main() -> int:
+    """
+    CLI entry point.
+
+    Returns:
+        Process exit code.
+    """
+    from config import DB_CONFIG
+
+    cnx = mysql.connector.connect(**DB_CONFIG)
+    try:
+        applied = run_migrations(cnx)
+    finally:
+        cnx.close()
+
+    print(f"applied: {', '.join(applied)}" if applied else "schema up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""SQLite drop repository for small deployments and benchmarks."""
+
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from models import DropCreate, DropUpdate, ExistenceInfo, ExistenceResult
+from services.drop_repository import SEARCH_COLUMNS, DropRepository, SearchType
+from services.existence_checker import check_existence
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drop_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dropperid INTEGER NOT NULL,
+    itemid INTEGER NOT NULL,
+    minimum_quantity INTEGER NOT NULL,
+    maximum_quantity INTEGER NOT NULL,
+    questid INTEGER NOT NULL,
+    chance INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_drop_data_dropperid_itemid ON drop_data (dropperid, itemid);
+CREATE INDEX IF NOT EXISTS idx_drop_data_itemid_dropperid ON drop_data (itemid, dropperid);
+"""
+
+INSERT_DROP_QUERY = """
+    INSERT INTO drop_data (dropperid, itemid, minimum_quantity, maximum_quantity, questid, chance)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+UPDATE_DROP_QUERY = """
+    UPDATE drop_data
+    SET dropperid=?, itemid=?, minimum_quantity=?, maximum_quantity=?, questid=?, chance=?
+    WHERE id=?
+"""
+
+
+def _values(drop: DropCreate | DropUpdate) -> tuple:
+    """Column values of a drop in INSERT/UPDATE order."""
+    return (drop.dropperid, drop.itemid, drop.minimum_quantity, drop.maximum_quantity, drop.questid, drop.chance)
+
+
+class SQLiteDropRepository(DropRepository):
+    """Drop records in a single SQLite database shared by all requests."""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open the database and create the schema if needed.
+
+        Args:
+            path: Database file, or ":memory:" for a private in-process database.
+        """
+        self._cnx = sqlite3.connect(path, check_same_thread=False)
+        self._cnx.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._cnx.execute("PRAGMA journal_mode=WAL")
+            self._cnx.executescript(SCHEMA)
+
+    async def search(self, query_type: SearchType, query: int) -> List[Dict[str, Any]]:
+        """Find drops of a mob or drops of an item."""
+        with self._lock:
+            rows = self._cnx.execute(
+                f"SELECT * FROM drop_data WHERE {SEARCH_COLUMNS[query_type]} = ?", (query,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def get(self, drop_id: int) -> Optional[Dict[str, Any]]:
+        """Read one drop."""
+        with self._lock:
+            row = self._cnx.execute("SELECT * FROM drop_data WHERE id = ?", (drop_id,)).fetchone()
+        return dict(row) if row else None
+
+    async def create(self, drop: DropCreate) -> int:
+        """Insert a drop."""
+        with self._lock, self._cnx:
+            return self._cnx.execute(INSERT_DROP_QUERY, _values(drop)).lastrowid
+
+    async def update(self, drop_id: int, drop: DropUpdate) -> bool:
+        """Overwrite a drop."""
+        with self._lock, self._cnx:
+            return self._cnx.execute(UPDATE_DROP_QUERY, _values(drop) + (drop_id,)).rowcount > 0
+
+    async def delete(self, drop_id: int) -> bool:
+        """Delete a drop."""
+        with self._lock, self._cnx:
+            return self._cnx.execute("DELETE FROM drop_data WHERE id = ?", (drop_id,)).rowcount > 0
+
+    async def exists(self, items: List[ExistenceInfo]) -> List[ExistenceResult]:
+        """Check existence with the shared UNION ALL query."""
+        with self._lock:
+            return check_existence(self._cnx.cursor(), items, placeholder="?")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._cnx.close()
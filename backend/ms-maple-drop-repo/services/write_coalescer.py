@@ -0,0 +1,183 @@
+"""Group commit of concurrent drop writes.
+
+Writes submitted within a short window are applied in one transaction
+with batched statements, turning a burst of single-row edits into one
+commit. A single flusher task applies batches one after another, so
+writes that arrive while a batch is committing form the next batch.
+
+Each write keeps its request's deadline: it is checked when the write is
+submitted and again just before its batch is applied, so a write whose
+caller has already timed out is dropped instead of committed.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+import mysql.connector
+from fastapi.concurrency import run_in_threadpool
+
+from services.drop_writer import WriteOp, apply_write, apply_writes
+from utils.deadline import check_deadline
+
+logger = logging.getLogger(__name__)
+
+Outcome = Union[Optional[int], Exception]
+
+
+class WriteCoalescer:
+    """Gathers drop writes into batched transactions on a pooled connection."""
+
+    def __init__(
+        self,
+        get_connection: Callable[[], Any],
+        window: float,
+        max_batch: int = 200,
+        open_cursor: Callable[[Any], Any] = lambda cnx: cnx.cursor(),
+    ):
+        """
+        Initialize a stopped coalescer.
+
+        Args:
+            get_connection: Returns a pooled MySQL connection.
+            window: Seconds to wait for more writes after the first one arrives.
+            max_batch: Maximum writes per transaction.
+            open_cursor: Opens the writer cursor on a connection, e.g. a monitored one.
+        """
+        self.get_connection = get_connection
+        self.window = window
+        self.max_batch = max_batch
+        self.open_cursor = open_cursor
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the flusher task on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush queued writes and stop the flusher task."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def submit(self, write: WriteOp) -> Optional[int]:
+        """
+        Queue a write and wait for the transaction that applies it.
+
+        Args:
+            write: Write to apply.
+
+        Returns:
+            The write's own result as returned by ``apply_writes``.
+
+        Raises:
+            HTTPException: 504 if the request deadline passes before the write is applied.
+            mysql.connector.Error: If the write could not be committed.
+        """
+        if self._task is None:
+            raise RuntimeError("WriteCoalescer is not started")
+        check_deadline()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((write, future, contextvars.copy_context()))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect batches from the queue and flush them until stopped."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[WriteOp, asyncio.Future, contextvars.Context]]) -> None:
+        """Apply the batch's live writes and resolve each caller's future with its own outcome."""
+        live = []
+        for write, future, context in batch:
+            if future.done():
+                continue
+            try:
+                # The submitter's context carries its request deadline.
+                context.run(check_deadline)
+            except Exception as err:
+                future.set_exception(err)
+                continue
+            live.append((write, future))
+        if not live:
+            return
+        try:
+            outcomes = await run_in_threadpool(self.commit_batch, [write for write, _ in live])
+        except Exception as err:
+            logger.error("Coalesced write batch failed: %s", err, exc_info=True)
+            outcomes = [err] * len(live)
+        for (_, future), outcome in zip(live, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def commit_batch(self, writes: Sequence[WriteOp]) -> List[Outcome]:
+        """
+        Apply writes in one transaction, falling back to one transaction per write.
+
+        The fallback keeps one failing write (e.g. a deadlock victim or a
+        constraint violation) from failing the other callers in its batch.
+
+        Args:
+            writes: Writes in arrival order.
+
+        Returns:
+            Per write: its result, or the exception that prevented it.
+        """
+        try:
+            return list(self._transaction(apply_writes, writes))
+        except mysql.connector.Error as err:
+            if len(writes) == 1:
+                return [err]
+            logger.warning("Batch of %d writes failed (%s), retrying individually", len(writes), err)
+
+        outcomes: List[Outcome] = []
+        for write in writes:
+            try:
+                outcomes.append(self._transaction(apply_write, write))
+            except mysql.connector.Error as err:
+                outcomes.append(err)
+        return outcomes
+
+    def _transaction(self, apply: Callable[[Any, Any], Any], payload: Any) -> Any:
+        """Run ``apply`` on a fresh writer cursor and commit."""
+        cnx = self.get_connection()
+        db_cursor = self.open_cursor(cnx)
+        try:
+            result = apply(db_cursor, payload)
+            cnx.commit()
+            return result
+        except mysql.connector.Error:
+            cnx.rollback()
+            raise
+        finally:
+            db_cursor.close()
+            if cnx.is_connected():
+                cnx.close()
@@ -28,6 +28,7 @@ def mock_cursor():
 def mock_writer_cursor():
     """Create a mock database writer cursor."""
     cursor = MagicMock()
+    cursor.fetchone.return_value = (100100, 2000001)
     cursor.lastrowid = 1
     cursor.rowcount = 1
     return cursor
@@ -40,10 +41,12 @@ def client(mock_cursor, mock_writer_cursor):
         "MYSQL_HOST": "localhost:3306",
         "MYSQL_USER": "test_user",
         "MYSQL_PASSWORD": "test_password",
-        "MYSQL_DATABASE": "test_db"
+        "MYSQL_DATABASE": "test_db",
+        "DB_INDEX_BOOTSTRAP": "off",
     }):
         with patch("mysql.connector.pooling.MySQLConnectionPool"):
-            from main import app, get_db_cursor, get_db_writer_cursor
+            from main import app, get_db_batch_cursor, get_db_cursor, get_read_repository, get_write_repository
+            from services.mysql_drop_repository import MySQLDropRepository
             from utils.auth import get_current_user
 
             def override_get_db_cursor():
@@ -52,11 +55,19 @@ def client(mock_cursor, mock_writer_cursor):
             def override_get_db_writer_cursor():
                 yield mock_writer_cursor
 
+            def override_get_read_repository():
+                yield MySQLDropRepository(mock_cursor)
+
+            def override_get_write_repository():
+                yield MySQLDropRepository(mock_writer_cursor)
+
             app.dependency_overrides[get_db_cursor] = override_get_db_cursor
-            app.dependency_overrides[get_db_writer_cursor] = override_get_db_writer_cursor
+            app.dependency_overrides[get_db_batch_cursor] = override_get_db_writer_cursor
+            app.dependency_overrides[get_read_repository] = override_get_read_repository
+            app.dependency_overrides[get_write_repository] = override_get_write_repository
             app.dependency_overrides[get_current_user] = mock_get_current_user
 
-            with TestClient(app) as test_client:
+            with patch("main.DB_MIGRATIONS", False), TestClient(app) as test_client:
                 yield test_client
 
             app.dependency_overrides.clear()
@@ -0,0 +1,216 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import DropCreate
+from services.change_log import (
+    ChangeNotifier,
+    WritesPausedError,
+    ensure_change_log,
+    extend_write_pause,
+    fetch_changes,
+    fetch_latest_seq,
+    pause_writes,
+    record_change,
+    record_changes,
+    resume_writes,
+)
+
+
+@pytest.fixture
+def drop():
+    return DropCreate(
+        dropperid=100100,
+        itemid=2000001,
+        minimum_quantity=1,
+        maximum_quantity=5,
+        questid=0,
+        chance=100000,
+    )
+
+
+class TestRecordChange:
+    """Tests for record_change function."""
+
+    def test_assigns_sequence_from_counter(self, drop):
+        """Test the counter row is bumped before the change is inserted."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 17
+
+        seq = record_change(mock_cursor, "create", 42, drop)
+
+        assert seq == 17
+        first, second = mock_cursor.execute.call_args_list
+        assert "LAST_INSERT_ID(seq + 1)" in first[0][0]
+        assert second[0][1] == (17, "create", 42, 100100, 2000001, 1, 5, 0, 100000)
+
+    def test_delete_has_no_values(self):
+        """Test deletes are recorded with NULL drop values."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 3
+
+        record_change(mock_cursor, "delete", 9)
+
+        assert mock_cursor.execute.call_args_list[1][0][1] == (3, "delete", 9) + (None,) * 6
+
+    def test_rejected_while_paused(self, drop):
+        """Test a write is refused when the counter row is paused by a replace import."""
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 0
+
+        with pytest.raises(WritesPausedError):
+            record_change(mock_cursor, "create", 42, drop)
+        assert mock_cursor.execute.call_count == 1
+
+
+class TestRecordChanges:
+    """Tests for record_changes function."""
+
+    def test_reserves_block_of_sequences(self, drop):
+        """Test one counter bump covers the batch and rows are inserted together."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 12
+
+        seqs = record_changes(mock_cursor, [("create", 42, drop), ("delete", 9, None), ("update", 7, drop)])
+
+        assert seqs == [10, 11, 12]
+        assert mock_cursor.execute.call_args[0][1] == (3,)
+        rows = mock_cursor.executemany.call_args[0][1]
+        assert [row[:3] for row in rows] == [(10, "create", 42), (11, "delete", 9), (12, "update", 7)]
+        assert rows[1][3:] == (None,) * 6
+
+    def test_rejected_while_paused(self, drop):
+        """Test a batch is refused when writes are paused."""
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 0
+
+        with pytest.raises(WritesPausedError):
+            record_changes(mock_cursor, [("create", 42, drop)])
+        mock_cursor.executemany.assert_not_called()
+
+    def test_empty_batch(self):
+        """Test nothing is executed for an empty batch."""
+        mock_cursor = MagicMock()
+
+        assert record_changes(mock_cursor, []) == []
+        mock_cursor.execute.assert_not_called()
+
+
+class TestFetchChanges:
+    """Tests for fetch_changes function."""
+
+    def test_shapes_rows(self):
+        """Test rows are shaped as seq/op/id/data."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            {"seq": 5, "op": "update", "drop_id": 42, "dropperid": 1, "itemid": 2,
+             "minimum_quantity": 1, "maximum_quantity": 1, "questid": 0, "chance": 10},
+            {"seq": 6, "op": "delete", "drop_id": 43, "dropperid": None, "itemid": None,
+             "minimum_quantity": None, "maximum_quantity": None, "questid": None, "chance": None},
+            {"seq": 7, "op": "reload", "drop_id": 0, "dropperid": None, "itemid": None,
+             "minimum_quantity": None, "maximum_quantity": None, "questid": None, "chance": None},
+        ]
+
+        changes = fetch_changes(mock_cursor, 4, 100)
+
+        assert changes[0] == {
+            "seq": 5, "op": "update", "id": "42",
+            "data": {"dropperid": 1, "itemid": 2, "minimum_quantity": 1,
+                     "maximum_quantity": 1, "questid": 0, "chance": 10},
+        }
+        assert changes[1]["data"] is None
+        assert changes[2]["data"] is None
+        assert mock_cursor.execute.call_args[0][1] == (4, 100)
+
+    def test_latest_seq_empty(self):
+        """Test latest sequence defaults to 0 without a counter row."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+
+        assert fetch_latest_seq(mock_cursor) == 0
+
+
+class TestWritePause:
+    """Tests for pause_writes, extend_write_pause and resume_writes functions."""
+
+    def test_pause_returns_current_seq(self):
+        """Test pausing reports the sequence number writes stopped at."""
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        mock_cursor.fetchone.return_value = (41,)
+
+        assert pause_writes(mock_cursor, 300) == 41
+        assert mock_cursor.execute.call_args_list[0][0][1] == (300,)
+
+    def test_pause_already_held(self):
+        """Test a second pause is refused while the first one holds."""
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 0
+
+        assert pause_writes(mock_cursor, 300) is None
+        mock_cursor.fetchone.assert_not_called()
+
+    def test_extend_locks_counter(self):
+        """Test extending reads the counter under a row lock."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (41,)
+
+        assert extend_write_pause(mock_cursor, 300) == 41
+        assert mock_cursor.execute.call_args_list[0][0][0].endswith("FOR UPDATE")
+
+    def test_resume_clears_pause(self):
+        mock_cursor = MagicMock()
+
+        resume_writes(mock_cursor)
+
+        assert "writes_paused_until = NULL" in mock_cursor.execute.call_args[0][0]
+
+
+class TestEnsureChangeLog:
+    """Tests for ensure_change_log function."""
+
+    def test_tables_present(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (2,)
+
+        assert ensure_change_log(cnx, create=True) is True
+        cnx.cursor.return_value.execute.assert_called_once()
+
+    def test_missing_check_only(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (0,)
+
+        assert ensure_change_log(cnx, create=False) is False
+        cnx.commit.assert_not_called()
+
+    def test_missing_create(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (0,)
+
+        assert ensure_change_log(cnx, create=True) is True
+        assert cnx.cursor.return_value.execute.call_count == 5
+        cnx.commit.assert_called_once()
+
+
+class TestChangeNotifier:
+    """Tests for ChangeNotifier class."""
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self):
+        notifier = ChangeNotifier()
+
+        assert await notifier.wait(0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_notify_wakes_waiters(self):
+        notifier = ChangeNotifier()
+
+        waiter = asyncio.create_task(notifier.wait(5))
+        await asyncio.sleep(0)
+        notifier.notify()
+
+        assert await waiter is True
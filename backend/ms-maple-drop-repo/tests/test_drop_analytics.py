@@ -0,0 +1,149 @@
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.drop_analytics import (
+    AnalyticsCache,
+    DropColumns,
+    compute_mob_rankings,
+    item_weights,
+    load_drop_columns,
+    rank_mobs,
+)
+
+
+def make_columns(rows):
+    """Build DropColumns from (dropperid, itemid, chance, min, max) tuples."""
+    data = np.asarray(rows, dtype=np.int64).reshape(-1, 5)
+    return DropColumns(*(data[:, i] for i in range(5)))
+
+
+@pytest.fixture
+def columns():
+    return make_columns([
+        (100100, 2000001, 1_000_000, 1, 1),   # 1.0 expected
+        (100100, 2000002, 500_000, 1, 3),     # 0.5 * 2 = 1.0
+        (100200, 2000001, 100_000, 10, 10),   # 0.1 * 10 = 1.0
+        (100200, 2000003, 2_000_000, 2, 2),   # chance capped at 1 -> 2.0
+        (100300, 2000002, 10_000, 1, 1),      # 0.01
+    ])
+
+
+class TestLoadDropColumns:
+    """Tests for load_drop_columns function."""
+
+    def test_loads_in_batches(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.side_effect = [
+            [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10)],
+            [(11, 12, 13, 14, 15)],
+            [],
+        ]
+
+        result = load_drop_columns(mock_cursor, batch_size=2)
+
+        assert len(result) == 3
+        assert result.dropperid.tolist() == [1, 6, 11]
+        assert result.maximum_quantity.tolist() == [5, 10, 15]
+        mock_cursor.fetchmany.assert_called_with(2)
+
+    def test_empty_table(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.return_value = []
+
+        assert len(load_drop_columns(mock_cursor)) == 0
+
+
+class TestRankMobs:
+    """Tests for rank_mobs function."""
+
+    def test_ranks_by_expected_drops(self, columns):
+        result = rank_mobs(columns)
+
+        assert [r["dropperid"] for r in result] == [100200, 100100, 100300]
+        assert result[0]["expected_drops"] == pytest.approx(3.0)
+        assert result[1]["expected_drops"] == pytest.approx(2.0)
+        assert result[0]["drop_count"] == 2
+        assert result[0]["expected_value"] is None
+
+    def test_ranks_by_item_value(self, columns):
+        result = rank_mobs(columns, item_values={2000002: 100.0}, default_item_value=1.0)
+
+        # 100100: 1*1 + 1*100 = 101; 100200: 1 + 2 = 3; 100300: 0.01*100 = 1
+        assert [r["dropperid"] for r in result] == [100100, 100200, 100300]
+        assert result[0]["expected_value"] == pytest.approx(101.0)
+        assert result[2]["expected_value"] == pytest.approx(1.0)
+
+    def test_limit(self, columns):
+        assert len(rank_mobs(columns, limit=1)) == 1
+
+    def test_ties_sorted_by_mob_id(self):
+        tied = make_columns([(300, 1, 1_000_000, 1, 1), (100, 1, 1_000_000, 1, 1)])
+
+        assert [r["dropperid"] for r in rank_mobs(tied)] == [100, 300]
+
+    def test_empty(self):
+        assert rank_mobs(make_columns([])) == []
+
+
+class TestItemWeights:
+    """Tests for item_weights function."""
+
+    def test_lookup_and_default(self):
+        itemid = np.array([5, 1, 9, 1])
+
+        weights = item_weights(itemid, {1: 2.5, 9: 4.0}, default_value=-1.0)
+
+        assert weights.tolist() == [-1.0, 2.5, 4.0, 2.5]
+
+    def test_empty_table(self):
+        assert item_weights(np.array([1, 2]), {}, 0.5).tolist() == [0.5, 0.5]
+
+
+class TestComputeMobRankings:
+    """Tests for compute_mob_rankings caching."""
+
+    def test_cached_per_version(self, columns):
+        cache = AnalyticsCache()
+        load = MagicMock(return_value=columns)
+
+        first, first_cached = compute_mob_rankings(load, cache, 7, None, 0.0, 10)
+        second, second_cached = compute_mob_rankings(load, cache, 7, None, 0.0, 10)
+
+        assert first == second
+        assert (first_cached, second_cached) == (False, True)
+        load.assert_called_once()
+
+    def test_columns_reused_for_new_parameters(self, columns):
+        cache = AnalyticsCache()
+        load = MagicMock(return_value=columns)
+
+        compute_mob_rankings(load, cache, 7, None, 0.0, 10)
+        _, cached = compute_mob_rankings(load, cache, 7, {2000001: 1.0}, 0.0, 10)
+
+        assert cached is False
+        load.assert_called_once()
+
+    def test_new_version_reloads(self, columns):
+        cache = AnalyticsCache()
+        load = MagicMock(return_value=columns)
+
+        compute_mob_rankings(load, cache, 7, None, 0.0, 10)
+        _, cached = compute_mob_rankings(load, cache, 8, None, 0.0, 10)
+
+        assert cached is False
+        assert load.call_count == 2
+
+    def test_result_cache_bounded(self, columns):
+        cache = AnalyticsCache(max_results=1)
+        load = MagicMock(return_value=columns)
+
+        compute_mob_rankings(load, cache, 1, None, 0.0, 1)
+        compute_mob_rankings(load, cache, 1, None, 0.0, 2)
+        _, cached = compute_mob_rankings(load, cache, 1, None, 0.0, 1)
+
+        assert cached is False
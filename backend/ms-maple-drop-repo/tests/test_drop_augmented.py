@@ -0,0 +1,235 @@
+import pytest
+import mysql.connector
+from unittest.mock import MagicMock, patch
+import subprocess
+import sys
+import os
+import tomllib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import drop_augmented
+from services.drop_augmented import (
+    ensure_augmented_tables,
+    rebuild_augmented,
+    refresh_augmented,
+    search_augmented,
+    sync_names,
+    main,
+)
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def executed(mock_cursor):
+    """List of executed SQL statements."""
+    return [" ".join(call[0][0].split()) for call in mock_cursor.execute.call_args_list]
+
+
+class TestRefreshAugmented:
+    """Tests for refresh_augmented function."""
+
+    def test_refreshes_touched_rows(self):
+        """Test delete-then-insert of the touched drop IDs joined to their names."""
+        mock_cursor = MagicMock()
+
+        refresh_augmented(mock_cursor, [8, 7, 8])
+
+        calls = mock_cursor.execute.call_args_list
+        assert calls[0][0] == ("DELETE FROM drop_data_augmented WHERE id IN (%s,%s)", (7, 8))
+        insert = executed(mock_cursor)[1]
+        assert insert.startswith("INSERT INTO drop_data_augmented")
+        assert "LEFT JOIN drop_names mob ON mob.type = 'mob'" in insert
+        assert insert.endswith("WHERE drop_data.id IN (%s,%s)")
+        assert calls[1][0][1] == (7, 8)
+
+    def test_no_rows_no_statements(self):
+        """Test nothing runs without touched rows."""
+        mock_cursor = MagicMock()
+
+        refresh_augmented(mock_cursor, [])
+
+        mock_cursor.execute.assert_not_called()
+
+    def test_rebuild_without_filter(self):
+        """Test full rebuild joins the whole table."""
+        mock_cursor = MagicMock()
+
+        rebuild_augmented(mock_cursor)
+
+        statements = executed(mock_cursor)
+        assert statements[0] == "DELETE FROM drop_data_augmented"
+        assert "WHERE" not in statements[1]
+
+
+def names_connection(stored):
+    """Mock connection whose drop_names table holds the given (type, id, name) rows."""
+    cnx = MagicMock()
+    cnx.cursor.return_value.fetchall.return_value = stored
+    return cnx
+
+
+class TestSyncNames:
+    """Tests for sync_names function."""
+
+    def test_writes_only_changes(self):
+        """Test new, renamed and removed names are applied and unchanged ones skipped."""
+        cnx = names_connection([("mob", 100100, "Snail"), ("mob", 100101, "Blue Snal"), ("item", 4000000, "Gone")])
+        names = [("mob", 100100, "Snail"), ("mob", 100101, "Blue Snail"), ("item", 2000001, "Red Potion")]
+
+        counts = sync_names(cnx, iter(names))
+
+        assert counts == {"updated": 2, "removed": 1}
+        db_cursor = cnx.cursor.return_value
+        calls = {call[0][0]: call[0][1] for call in db_cursor.executemany.call_args_list}
+        assert calls[drop_augmented.UPSERT_NAMES_QUERY] == [("mob", 100101, "Blue Snail"), ("item", 2000001, "Red Potion")]
+        assert calls[drop_augmented.DELETE_NAME_QUERY] == [("item", 4000000)]
+        assert calls[drop_augmented.RENAME_QUERIES["mob"]] == [("Blue Snail", 100101)]
+        assert calls[drop_augmented.RENAME_QUERIES["item"]] == [("Red Potion", 2000001), ("Unknown", 4000000)]
+
+    def test_no_full_rebuild(self):
+        """Test the sync never deletes or re-selects the whole read model."""
+        cnx = names_connection([])
+
+        sync_names(cnx, iter([("mob", 100100, "Snail")]))
+
+        statements = executed(cnx.cursor.return_value)
+        assert statements == ["SELECT type, id, name FROM drop_names"]
+        assert not any("drop_data_augmented" in call[0][0] and "INSERT" in call[0][0]
+                       for call in cnx.cursor.return_value.executemany.call_args_list)
+
+    def test_commits_per_chunk(self):
+        """Test changes are committed in chunks rather than in one transaction."""
+        cnx = names_connection([])
+        names = [("mob", 100100 + i, f"Mob {i}") for i in range(5)]
+
+        with patch.object(drop_augmented, "NAME_SYNC_CHUNK_SIZE", 2):
+            assert sync_names(cnx, iter(names)) == {"updated": 5, "removed": 0}
+
+        upserts = [call[0][1] for call in cnx.cursor.return_value.executemany.call_args_list
+                   if call[0][0] == drop_augmented.UPSERT_NAMES_QUERY]
+        assert [len(chunk) for chunk in upserts] == [2, 2, 1]
+        # One commit ends the snapshot read, then one per chunk.
+        assert cnx.commit.call_count == 4
+
+    def test_failed_chunk_rolls_back(self):
+        """Test a failing chunk is rolled back and surfaces."""
+        cnx = names_connection([])
+        cnx.cursor.return_value.executemany.side_effect = mysql.connector.Error("lock wait timeout")
+
+        with pytest.raises(mysql.connector.Error):
+            sync_names(cnx, iter([("mob", 100100, "Snail")]))
+        cnx.rollback.assert_called_once()
+
+
+class TestSearchAugmented:
+    """Tests for search_augmented function."""
+
+    def test_search_by_mob(self):
+        """Test mob searches match dropperid on the augmented table."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [{"id": 1, "dropper_name": "Snail"}]
+
+        rows = search_augmented(mock_cursor, "mob", 100100)
+
+        assert rows[0]["dropper_name"] == "Snail"
+        sql, params = mock_cursor.execute.call_args[0]
+        assert sql.endswith("FROM drop_data_augmented WHERE dropperid = %s")
+        assert params == (100100,)
+
+
+class TestEnsureAugmentedTables:
+    """Tests for ensure_augmented_tables function."""
+
+    def test_existing(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (2,)
+
+        assert ensure_augmented_tables(cnx) is True
+        cnx.commit.assert_not_called()
+
+    def test_missing_create(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (0,)
+
+        assert ensure_augmented_tables(cnx, create=True) is True
+        assert cnx.cursor.return_value.execute.call_count == 3
+        cnx.commit.assert_called_once()
+
+    def test_missing_check_only(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (1,)
+
+        assert ensure_augmented_tables(cnx, create=False) is False
+
+
+class TestCli:
+    """Tests for the read model CLI."""
+
+    def test_sync_names(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (2,)
+        cnx.cursor.return_value.fetchall.return_value = []
+        names = [("mob", 100100, "Snail"), ("item", 2000001, "Red Potion")]
+
+        with patch("services.drop_augmented.mysql.connector.connect", return_value=cnx), \
+                patch("services.drop_augmented.iter_mongo_names", return_value=iter(names)):
+            assert main(["sync-names"]) == 0
+
+        assert cnx.cursor.return_value.executemany.call_count == 3
+        cnx.close.assert_called_once()
+
+    def test_sync_names_reads_mongo(self):
+        """Test the CronJob's sync path reaches MongoDB through pymongo."""
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (2,)
+        cnx.cursor.return_value.fetchall.return_value = []
+        mongo = MagicMock()
+        mongo.__getitem__.return_value.__getitem__.return_value.find.return_value = [
+            {"type": "mob", "id": "100100", "name": "Snail"}
+        ]
+
+        with patch("services.drop_augmented.mysql.connector.connect", return_value=cnx), \
+                patch("pymongo.MongoClient", return_value=mongo):
+            assert main(["sync-names"]) == 0
+
+        upsert = cnx.cursor.return_value.executemany.call_args_list[0][0]
+        assert upsert[1] == [("mob", 100100, "Snail")]
+        mongo.close.assert_called_once()
+
+    def test_missing_tables(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (0,)
+
+        with patch("services.drop_augmented.mysql.connector.connect", return_value=cnx):
+            assert main(["rebuild"]) == 1
+
+        cnx.commit.assert_not_called()
+
+
+class TestPackaging:
+    """Checks that the sync-names CronJob can run from the service image."""
+
+    def test_image_installs_names_extra(self):
+        """Test the image build installs the extra that provides pymongo."""
+        with open(os.path.join(SERVICE_DIR, "pyproject.toml"), "rb") as f:
+            extras = tomllib.load(f)["project"]["optional-dependencies"]
+        with open(os.path.join(SERVICE_DIR, "Dockerfile")) as f:
+            sync_line = next(line for line in f if "uv sync" in line)
+
+        assert any(dep.startswith("pymongo") for dep in extras["names"])
+        assert "--extra names" in sync_line
+
+    def test_cronjob_entry_point(self):
+        """Test the CronJob's module command starts and loads pymongo."""
+        result = subprocess.run(
+            [sys.executable, "-c", "import pymongo, runpy, sys; sys.argv = ['drop_augmented', '--help']; "
+             "runpy.run_module('services.drop_augmented', run_name='__main__')"],
+            cwd=SERVICE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert "sync-names" in result.stdout
@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import mysql.connector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import DropBatchRequest
+from services.drop_batch import run_drop_batch
+
+
+@pytest.fixture
+def drop_fields():
+    return {
+        "dropperid": 100100,
+        "itemid": 2000001,
+        "minimum_quantity": 1,
+        "maximum_quantity": 5,
+        "questid": 0,
+        "chance": 100000,
+    }
+
+
+def executed(mock_cursor):
+    """List of executed SQL statements."""
+    return [" ".join(call[0][0].split()) for call in mock_cursor.execute.call_args_list]
+
+
+class TestRunDropBatch:
+    """Tests for run_drop_batch function."""
+
+    def test_atomic_success(self, drop_fields):
+        """Test an atomic batch reports every operation as committed."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 42
+        mock_cursor.fetchall.return_value = [(7, 100100, 2000001)]
+        request = DropBatchRequest(operations=[
+            {"op": "create", "data": drop_fields},
+            {"op": "delete", "id": 7},
+        ])
+
+        response = run_drop_batch(mock_cursor, request)
+
+        assert response.committed == 2
+        assert [(r.id, r.status) for r in response.results] == [(42, "ok"), (7, "ok")]
+        assert not any("SAVEPOINT" in sql for sql in executed(mock_cursor))
+
+    def test_atomic_missing_row_rolls_back(self, drop_fields):
+        """Test a missing row marks the other operations as rolled back."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 42
+        mock_cursor.fetchall.return_value = []
+        request = DropBatchRequest(operations=[
+            {"op": "create", "data": drop_fields},
+            {"op": "update", "id": 7, "data": drop_fields},
+        ])
+
+        response = run_drop_batch(mock_cursor, request)
+
+        assert response.committed == 0
+        assert [r.status for r in response.results] == ["rolled_back", "not_found"]
+
+    def test_best_effort_isolates_failures(self, drop_fields):
+        """Test a failing operation is rolled back to its savepoint and the rest applied."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 42
+        mock_cursor.fetchall.return_value = [(7, 100100, 2000001)]
+        failures = {"left": 2}
+
+        def executemany(sql, rows):
+            if "INSERT INTO drop_data" in sql and failures["left"]:
+                failures["left"] -= 1
+                raise mysql.connector.Error("Out of range value for column 'chance'")
+
+        mock_cursor.executemany.side_effect = executemany
+        request = DropBatchRequest(mode="best_effort", operations=[
+            {"op": "create", "data": drop_fields},
+            {"op": "delete", "id": 7},
+        ])
+
+        response = run_drop_batch(mock_cursor, request)
+
+        assert response.committed == 1
+        assert [r.status for r in response.results] == ["error", "ok"]
+        assert "Out of range" in response.results[0].detail
+        statements = executed(mock_cursor)
+        assert "ROLLBACK TO SAVEPOINT drop_batch" in statements
+        assert "ROLLBACK TO SAVEPOINT drop_batch_op" in statements
@@ -0,0 +1,84 @@
+import io
+import json
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import mysql.connector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.drop_export import stream_export
+
+ROWS = [(1, 100100, 2000001, 1, 5, 0, 100000), (2, 100100, 2000002, 1, 1, 0, 5000), (3, 100200, 2000001, 2, 2, 0, 300)]
+
+
+@pytest.fixture
+def connection():
+    """Mock connection whose cursor returns ROWS two at a time."""
+    cnx = MagicMock()
+    db_cursor = cnx.cursor.return_value
+    batches = [ROWS[:2], ROWS[2:], []]
+    db_cursor.fetchmany.side_effect = lambda size: batches.pop(0)
+    return cnx
+
+
+class TestStreamExport:
+    """Tests for stream_export function."""
+
+    def test_csv(self, connection):
+        """Test CSV output has a header and one line per row, one chunk per batch."""
+        chunks = list(stream_export(connection, "csv", 2))
+
+        assert len(chunks) == 2
+        lines = b"".join(chunks).decode().splitlines()
+        assert lines[0] == "id,dropperid,itemid,minimum_quantity,maximum_quantity,questid,chance"
+        assert lines[3] == "3,100200,2000001,2,2,0,300"
+        connection.close.assert_called_once()
+
+    def test_ndjson(self, connection):
+        """Test NDJSON rows carry string IDs like the read endpoints."""
+        records = [json.loads(line) for line in b"".join(stream_export(connection, "ndjson", 2)).splitlines()]
+
+        assert len(records) == 3
+        assert records[0]["id"] == "1"
+        assert records[1]["chance"] == 5000
+
+    def test_arrow(self, connection):
+        """Test Arrow IPC output round-trips through pyarrow."""
+        pa = pytest.importorskip("pyarrow")
+
+        table = pa.ipc.open_stream(io.BytesIO(b"".join(stream_export(connection, "arrow", 2)))).read_all()
+
+        assert table.num_rows == 3
+        assert table.column("itemid").to_pylist() == [2000001, 2000002, 2000001]
+
+    def test_early_close_does_not_drain(self, connection):
+        """Test a disconnecting client closes the connection without reading the remaining rows."""
+        chunks = stream_export(connection, "ndjson", 2)
+        next(chunks)
+        chunks.close()
+
+        connection.consume_results.assert_not_called()
+        assert connection.cursor.return_value.fetchmany.call_count == 1
+        connection.close.assert_called_once()
+
+    def test_early_close_survives_close_error(self, connection):
+        """Test a failure closing the abandoned connection is logged, not raised."""
+        connection.close.side_effect = mysql.connector.InterfaceError("broken pipe")
+        chunks = stream_export(connection, "csv", 2)
+        next(chunks)
+
+        chunks.close()
+
+        connection.close.assert_called_once()
+
+    def test_query_error_releases_connection(self, connection):
+        """Test an error executing the query is raised before streaming starts."""
+        connection.cursor.return_value.execute.side_effect = mysql.connector.Error("gone away")
+
+        with pytest.raises(mysql.connector.Error):
+            stream_export(connection, "csv", 2)
+
+        connection.close.assert_called_once()
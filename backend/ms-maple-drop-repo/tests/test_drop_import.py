@@ -0,0 +1,258 @@
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import mysql.connector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.drop_export import encode_csv, encode_ndjson
+from services.drop_import import (
+    DropImporter,
+    ImportConflictError,
+    ImportValidationError,
+    RecordParser,
+    aiter_lines,
+    run_import,
+)
+
+CSV_HEADER = "dropperid,itemid,minimum_quantity,maximum_quantity,questid,chance"
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+async def stream(*items):
+    for item in items:
+        yield item
+
+
+def executed(mock_cursor):
+    """List of executed SQL statements."""
+    return [" ".join(call[0][0].split()) for call in mock_cursor.execute.call_args_list]
+
+
+def replace_connection(seqs=(5,)):
+    """Mock connection for a replace import; the counter row reads the given sequence numbers in turn."""
+    cnx = MagicMock()
+    db_cursor = cnx.cursor.return_value
+    db_cursor.rowcount = 1
+    db_cursor.lastrowid = 6
+    db_cursor.fetchone.side_effect = [(seq,) for seq in seqs]
+    return cnx, db_cursor
+
+
+@pytest.fixture
+def importer():
+    """Mock importer recording loaded chunks."""
+    mock_importer = MagicMock()
+    mock_importer.mode = "replace"
+    mock_importer.chunks = []
+    mock_importer.load.side_effect = lambda drops: mock_importer.chunks.append(list(drops))
+    return mock_importer
+
+
+class TestAiterLines:
+    """Tests for aiter_lines function."""
+
+    async def test_splits_across_chunks(self):
+        """Test lines split over chunk boundaries are reassembled."""
+        lines = await collect(aiter_lines(stream(b"\xef\xbb\xbfa,b\r\n1,", b"2\n3,4")))
+
+        assert lines == ["a,b", "1,2", "3,4"]
+
+
+class TestRecordParser:
+    """Tests for RecordParser class."""
+
+    def test_csv_uses_header(self):
+        """Test CSV rows are keyed by the header line."""
+        parser = RecordParser("csv")
+
+        assert parser.parse(CSV_HEADER) is None
+        assert parser.parse("100100,2000001,1,5,0,100000")["itemid"] == "2000001"
+
+    def test_csv_column_count(self):
+        """Test rows with the wrong number of columns are rejected."""
+        parser = RecordParser("csv")
+        parser.parse(CSV_HEADER)
+
+        with pytest.raises(ValueError):
+            parser.parse("100100,2000001")
+
+    def test_ndjson_requires_objects(self):
+        """Test NDJSON lines must be objects."""
+        with pytest.raises(ValueError):
+            RecordParser("ndjson").parse("[1, 2]")
+
+
+class TestRunImport:
+    """Tests for run_import function."""
+
+    async def test_loads_in_chunks(self, importer):
+        """Test rows are validated and loaded chunk by chunk."""
+        lines = [CSV_HEADER] + ["100100,2000001,1,5,0,100000"] * 5 + [""]
+        progress = []
+
+        report = await run_import(
+            stream(*lines), importer, "csv", chunk_size=2, progress=lambda rows, _: progress.append(rows)
+        )
+
+        assert [len(chunk) for chunk in importer.chunks] == [2, 2, 1]
+        assert progress == [2, 4, 5]
+        assert report.rows == 5
+        assert report.chunks == 3
+        importer.begin.assert_called_once()
+        importer.finish.assert_called_once()
+        importer.abort.assert_not_called()
+
+    async def test_invalid_row_aborts(self, importer):
+        """Test an invalid row aborts the import with its line number."""
+        lines = ['{"dropperid": 1, "itemid": 2, "minimum_quantity": 1, "maximum_quantity": 1, "questid": 0, "chance": 5}',
+                 '{"dropperid": "x"}']
+
+        with pytest.raises(ImportValidationError) as exc_info:
+            await run_import(stream(*lines), importer, "ndjson")
+
+        assert exc_info.value.line == 2
+        assert "dropperid" in exc_info.value.detail
+        importer.abort.assert_called_once()
+        importer.finish.assert_not_called()
+
+    async def test_skip_invalid(self, importer):
+        """Test invalid rows are skipped and reported when requested."""
+        lines = [CSV_HEADER, "100100,2000001,1,5,0,100000", "oops,2000001,1,5,0,100000"]
+
+        report = await run_import(stream(*lines), importer, "csv", skip_invalid=True)
+
+        assert report.rows == 1
+        assert report.skipped == 1
+        assert report.errors[0].line == 3
+
+    async def test_load_failure_aborts(self, importer):
+        """Test a database error aborts the import."""
+        importer.load.side_effect = mysql.connector.Error("Lost connection")
+
+        with pytest.raises(mysql.connector.Error):
+            await run_import(stream(CSV_HEADER, "100100,2000001,1,5,0,100000"), importer, "csv")
+
+        importer.abort.assert_called_once()
+
+
+class TestDropImporter:
+    """Tests for DropImporter class."""
+
+    def test_replace_swaps_staging_table(self):
+        """Test replace mode loads a staging table and renames it into place."""
+        from models import DropImportRow
+
+        cnx, db_cursor = replace_connection(seqs=(5, 5, 5))
+        importer = DropImporter(cnx, "replace")
+        drop = DropImportRow(dropperid=1, itemid=2, minimum_quantity=1, maximum_quantity=1, questid=0, chance=5)
+
+        importer.begin()
+        importer.load([drop, drop])
+        importer.finish()
+
+        statements = executed(db_cursor)
+        assert "CREATE TABLE drop_data_staging LIKE drop_data" in statements
+        assert "RENAME TABLE drop_data TO drop_data_retired, drop_data_staging TO drop_data" in statements
+        assert "INSERT INTO drop_data_staging" in db_cursor.executemany.call_args[0][0]
+        assert db_cursor.executemany.call_args[0][1][0][0] is None
+        reload = next(call[0][1] for call in db_cursor.execute.call_args_list if "drop_changes" in call[0][0])
+        assert reload[1:3] == ("reload", 0)
+        # Pause, chunk, pre-swap check, rebuild with the reload change.
+        assert cnx.commit.call_count == 4
+
+    def test_replace_pauses_writes_until_rebuilt(self):
+        """Test writes are paused before staging, renewed per chunk and resumed with the reload."""
+        from models import DropImportRow
+
+        cnx, db_cursor = replace_connection(seqs=(5, 5, 5))
+        importer = DropImporter(cnx, "replace", pause_seconds=120)
+        drop = DropImportRow(dropperid=1, itemid=2, minimum_quantity=1, maximum_quantity=1, questid=0, chance=5)
+
+        importer.begin()
+        importer.load([drop])
+        importer.finish()
+
+        statements = executed(db_cursor)
+        pause = statements.index(next(sql for sql in statements if "writes_paused_until = CURRENT_TIMESTAMP" in sql))
+        assert pause < statements.index("CREATE TABLE drop_data_staging LIKE drop_data")
+        assert db_cursor.execute.call_args_list[0][0][1] == (120,)
+        resume = statements.index(next(sql for sql in statements if "writes_paused_until = NULL" in sql))
+        assert resume > statements.index("RENAME TABLE drop_data TO drop_data_retired, drop_data_staging TO drop_data")
+        assert resume > max(i for i, sql in enumerate(statements) if sql.startswith("INSERT INTO drop_data_augmented"))
+
+    def test_second_replace_import_rejected(self):
+        """Test a replace import does not start while another one holds the pause."""
+        cnx, db_cursor = replace_connection()
+        db_cursor.rowcount = 0
+        importer = DropImporter(cnx, "replace")
+
+        with pytest.raises(ImportConflictError):
+            importer.begin()
+        assert not any("drop_data_staging" in sql for sql in executed(db_cursor))
+
+        importer.abort()
+        assert not any("DROP TABLE" in sql for sql in executed(db_cursor))
+
+    def test_lapsed_pause_refuses_swap(self):
+        """Test the swap is refused when a write got through after the pause lapsed."""
+        cnx, db_cursor = replace_connection(seqs=(5, 6))
+        importer = DropImporter(cnx, "replace")
+
+        importer.begin()
+        with pytest.raises(ImportConflictError):
+            importer.finish()
+
+        assert not any(sql.startswith("RENAME TABLE") for sql in executed(db_cursor))
+
+    def test_append_ignores_ids(self):
+        """Test append mode assigns new IDs even when rows carry one."""
+        from models import DropImportRow
+
+        cnx = MagicMock()
+        db_cursor = cnx.cursor.return_value
+        db_cursor.lastrowid = 50
+        importer = DropImporter(cnx, "append")
+
+        importer.load([DropImportRow(id=7, dropperid=1, itemid=2, minimum_quantity=1, maximum_quantity=1,
+                                     questid=0, chance=5)])
+
+        insert = db_cursor.executemany.call_args_list[0][0]
+        assert insert[0].lstrip().startswith("INSERT INTO drop_data")
+        assert insert[1] == [(1, 2, 1, 1, 0, 5)]
+
+    def test_abort_drops_staging_table(self):
+        """Test abort discards the staging table and resumes writes."""
+        cnx, db_cursor = replace_connection()
+        importer = DropImporter(cnx, "replace")
+        importer.begin()
+        db_cursor.execute.reset_mock()
+
+        importer.abort()
+
+        cnx.rollback.assert_called_once()
+        statements = executed(db_cursor)
+        assert statements[0] == "DROP TABLE IF EXISTS drop_data_staging"
+        assert "writes_paused_until = NULL" in statements[1]
+
+
+class TestExportRoundTrip:
+    """Tests for replace-importing a full export."""
+
+    EXPORTED = [(7, 100100, 2000001, 1, 5, 0, 100000), (42, 100101, 2000002, 1, 1, 1000, 5000)]
+
+    @pytest.mark.parametrize("fmt,encode", [("ndjson", encode_ndjson), ("csv", encode_csv)])
+    async def test_replace_import_keeps_ids(self, fmt, encode):
+        """Test an exported file replace-imports with every ID unchanged."""
+        body = b"".join(encode(iter([self.EXPORTED])))
+        cnx, db_cursor = replace_connection(seqs=(5, 5, 5))
+
+        report = await run_import(aiter_lines(stream(body)), DropImporter(cnx, "replace"), fmt)
+
+        assert report.rows == 2
+        assert db_cursor.executemany.call_args[0][1] == self.EXPORTED
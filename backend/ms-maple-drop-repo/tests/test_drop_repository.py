@@ -0,0 +1,114 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import DropCreate, DropUpdate, ExistenceInfo
+from services.drop_repository import create_local_repository, seed_repository
+
+
+def make_drop(dropperid=100100, itemid=2000001, chance=100000):
+    return DropCreate(
+        dropperid=dropperid, itemid=itemid, minimum_quantity=1, maximum_quantity=5, questid=0, chance=chance
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(request):
+    """Each local backend, empty."""
+    repo = create_local_repository(request.param, ":memory:")
+    yield repo
+    repo.close()
+
+
+class TestLocalRepositories:
+    """Contract tests shared by the SQLite and in-memory backends."""
+
+    async def test_create_and_get(self, repository):
+        """Test created drops get increasing IDs and can be read back."""
+        first = await repository.create(make_drop())
+        second = await repository.create(make_drop(itemid=2000002))
+
+        assert second > first
+        row = await repository.get(second)
+        assert row["id"] == second
+        assert row["itemid"] == 2000002
+        assert await repository.get(999) is None
+
+    async def test_search(self, repository):
+        """Test search by mob and by item."""
+        await repository.create(make_drop(100100, 2000001))
+        await repository.create(make_drop(100100, 2000002))
+        await repository.create(make_drop(100200, 2000001))
+
+        assert {row["itemid"] for row in await repository.search("mob", 100100)} == {2000001, 2000002}
+        assert {row["dropperid"] for row in await repository.search("item", 2000001)} == {100100, 100200}
+        assert await repository.search("mob", 999) == []
+
+    async def test_search_many(self, repository):
+        """Test a multi-ID search returns rows per ID, empty for IDs without drops."""
+        await repository.create(make_drop(100100, 2000001))
+        await repository.create(make_drop(100200, 2000002))
+
+        results = await repository.search_many("mob", [100100, 100200, 999, 100100])
+
+        assert list(results) == [100100, 100200, 999]
+        assert [row["itemid"] for row in results[100100]] == [2000001]
+        assert [row["itemid"] for row in results[100200]] == [2000002]
+        assert results[999] == []
+
+    async def test_update_moves_search_keys(self, repository):
+        """Test an update is reflected in search results."""
+        drop_id = await repository.create(make_drop(100100, 2000001))
+
+        assert await repository.update(drop_id, DropUpdate(**make_drop(100200, 2000001).model_dump())) is True
+
+        assert await repository.search("mob", 100100) == []
+        assert [row["id"] for row in await repository.search("mob", 100200)] == [drop_id]
+
+    async def test_update_missing_is_noop(self, repository):
+        """Test updating a missing ID does not create a row."""
+        assert await repository.update(42, DropUpdate(**make_drop().model_dump())) is False
+
+        assert await repository.get(42) is None
+
+    async def test_delete(self, repository):
+        """Test delete reports whether the row existed."""
+        drop_id = await repository.create(make_drop())
+
+        assert await repository.delete(drop_id) is True
+        assert await repository.delete(drop_id) is False
+        assert await repository.search("item", 2000001) == []
+
+    async def test_exists(self, repository):
+        """Test existence checks keep request order."""
+        await repository.create(make_drop(100100, 2000001))
+
+        results = await repository.exists([
+            ExistenceInfo(type="item", id=2000001),
+            ExistenceInfo(type="mob", id=999),
+            ExistenceInfo(type="mob", id=100100),
+        ])
+
+        assert [(r.type, r.id, r.drop_exist) for r in results] == [
+            ("item", 2000001, True), ("mob", 999, False), ("mob", 100100, True),
+        ]
+
+    async def test_seed(self, repository, tmp_path):
+        """Test seeding from a CSV file."""
+        seed = tmp_path / "drops.csv"
+        seed.write_text(
+            "dropperid,itemid,minimum_quantity,maximum_quantity,questid,chance\n"
+            "100100,2000001,1,5,0,100000\n"
+            "100200,2000002,1,1,0,5000\n"
+        )
+
+        assert await seed_repository(repository, str(seed)) == 2
+        assert len(await repository.search("mob", 100200)) == 1
+
+
+def test_unknown_backend():
+    """Test an unknown backend is rejected."""
+    with pytest.raises(ValueError):
+        create_local_repository("postgres", ":memory:")
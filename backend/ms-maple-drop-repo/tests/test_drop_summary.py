@@ -0,0 +1,106 @@
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.drop_summary import (
+    ensure_summary_tables,
+    rebuild_summaries,
+    refresh_summaries,
+    main,
+)
+
+
+class TestRefreshSummaries:
+    """Tests for refresh_summaries function."""
+
+    def test_refreshes_mob_and_item_keys(self):
+        """Test each touched key set is aggregated with a plain read and upserted."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
+            [(100100, 3, 2, 5000, 0), (100200, 1, 1, 100, 1)],
+            [(2000001, 2, 2, 5000, 100100, 0)],
+        ]
+
+        refresh_summaries(mock_cursor, [100200, 100100, 100100], [2000001])
+
+        calls = mock_cursor.execute.call_args_list
+        assert len(calls) == 2
+        assert "GROUP BY dropperid" in calls[0][0][0]
+        assert "WHERE dropperid IN (%s,%s)" in calls[0][0][0]
+        assert calls[0][0][1] == (100100, 100200)
+        assert "GROUP BY itemid" in calls[1][0][0]
+        assert all(not sql.lstrip().startswith(("INSERT", "DELETE")) for sql in (c[0][0] for c in calls))
+        upserts = mock_cursor.executemany.call_args_list
+        assert upserts[0][0][0].startswith("INSERT INTO drop_mob_summary")
+        assert "ON DUPLICATE KEY UPDATE" in upserts[0][0][0]
+        assert upserts[0][0][1] == [(100100, 3, 2, 5000, 0), (100200, 1, 1, 100, 1)]
+        assert upserts[1][0][1] == [(2000001, 2, 2, 5000, 100100, 0)]
+
+    def test_emptied_keys_are_deleted(self):
+        """Test keys without drops left lose their summary row."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [[(100100, 1, 1, 100, 0)], []]
+
+        refresh_summaries(mock_cursor, [100100, 100200], [2000001])
+
+        calls = mock_cursor.execute.call_args_list
+        assert calls[1][0] == ("DELETE FROM drop_mob_summary WHERE dropperid IN (%s)", (100200,))
+        assert calls[3][0] == ("DELETE FROM drop_item_summary WHERE itemid IN (%s)", (2000001,))
+        assert mock_cursor.executemany.call_count == 1
+
+    def test_no_keys_no_statements(self):
+        """Test nothing runs without touched keys."""
+        mock_cursor = MagicMock()
+
+        refresh_summaries(mock_cursor, [], [])
+
+        mock_cursor.execute.assert_not_called()
+
+
+class TestRebuildSummaries:
+    """Tests for rebuild_summaries function."""
+
+    def test_rebuild_without_filter(self):
+        """Test full rebuild aggregates the whole table."""
+        mock_cursor = MagicMock()
+
+        rebuild_summaries(mock_cursor)
+
+        statements = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert statements[0] == "DELETE FROM drop_mob_summary"
+        assert statements[2] == "DELETE FROM drop_item_summary"
+        assert all("WHERE" not in sql for sql in statements)
+
+
+class TestEnsureSummaryTables:
+    """Tests for ensure_summary_tables function."""
+
+    def test_missing_create(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (1,)
+
+        assert ensure_summary_tables(cnx, create=True) is True
+        assert cnx.cursor.return_value.execute.call_count == 3
+        cnx.commit.assert_called_once()
+
+    def test_missing_check_only(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (0,)
+
+        assert ensure_summary_tables(cnx, create=False) is False
+
+
+class TestCli:
+    """Tests for the rebuild CLI."""
+
+    def test_rebuild_commits(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchone.return_value = (2,)
+
+        with patch("services.drop_summary.mysql.connector.connect", return_value=cnx):
+            assert main(["rebuild"]) == 0
+
+        cnx.commit.assert_called_once()
+        cnx.close.assert_called_once()
@@ -0,0 +1,180 @@
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import DropCreate, DropUpdate
+from services import drop_writer
+
+
+@pytest.fixture
+def drop_fields():
+    return {
+        "dropperid": 100100,
+        "itemid": 2000001,
+        "minimum_quantity": 1,
+        "maximum_quantity": 5,
+        "questid": 0,
+        "chance": 100000,
+    }
+
+
+def executed(mock_cursor):
+    """List of executed SQL statements."""
+    return [" ".join(call[0][0].split()) for call in mock_cursor.execute.call_args_list]
+
+
+class TestCreateDrop:
+    """Tests for create_drop function."""
+
+    def test_returns_insert_id_before_logging(self, drop_fields):
+        """Test the drop ID is read before the change log moves lastrowid."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 42
+
+        new_id = drop_writer.create_drop(mock_cursor, DropCreate(**drop_fields))
+
+        assert new_id == 42
+        statements = executed(mock_cursor)
+        assert statements[0].startswith("INSERT INTO drop_data")
+        change = next(i for i, sql in enumerate(statements) if sql.startswith("INSERT INTO drop_changes"))
+        summary = next(i for i, sql in enumerate(statements) if "GROUP BY dropperid" in sql)
+        assert change < summary
+        augmented = next(
+            call for call in mock_cursor.execute.call_args_list
+            if call[0][0].startswith("DELETE FROM drop_data_augmented")
+        )
+        assert augmented[0][1] == (42,)
+
+
+class TestUpdateDrop:
+    """Tests for update_drop function."""
+
+    def test_locks_row_before_update(self, drop_fields):
+        """Test the old keys are read with FOR UPDATE first."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (100100, 2000001)
+
+        drop_writer.update_drop(mock_cursor, 7, DropUpdate(**drop_fields))
+
+        statements = executed(mock_cursor)
+        assert statements[0].endswith("FOR UPDATE")
+        assert statements[1].startswith("UPDATE drop_data")
+        assert mock_cursor.execute.call_args_list[1][0][1][-1] == 7
+
+    def test_missing_row_writes_nothing(self, drop_fields):
+        """Test a missing row is neither updated, logged nor refreshed."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+
+        assert drop_writer.update_drop(mock_cursor, 7, DropUpdate(**drop_fields)) is False
+        assert len(executed(mock_cursor)) == 1
+
+    def test_apply_write_reports_missing_update(self, drop_fields):
+        """Test apply_write agrees with apply_writes on missing rows."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+
+        assert drop_writer.apply_write(mock_cursor, drop_writer.WriteOp("update", 7, DropUpdate(**drop_fields))) is None
+
+
+class TestDeleteDrop:
+    """Tests for delete_drop function."""
+
+    def test_not_found(self):
+        """Test False and no side effects when nothing was deleted."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+        mock_cursor.rowcount = 0
+
+        assert drop_writer.delete_drop(mock_cursor, 9) is False
+        assert len(executed(mock_cursor)) == 2
+
+    def test_deleted(self):
+        """Test deletion logs the change and refreshes old keys."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (100100, 2000001)
+        mock_cursor.rowcount = 1
+
+        assert drop_writer.delete_drop(mock_cursor, 9) is True
+        statements = executed(mock_cursor)
+        assert any(sql.startswith("INSERT INTO drop_changes") for sql in statements)
+        assert any(sql.startswith("DELETE FROM drop_item_summary") for sql in statements)
+
+
+class TestApplyWrites:
+    """Tests for apply_writes function."""
+
+    def test_creates_use_one_multi_row_insert(self, drop_fields):
+        """Test creates share one INSERT and get consecutive IDs."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 40
+        mock_cursor.fetchone.return_value = (1,)
+        drop = DropCreate(**drop_fields)
+
+        results = drop_writer.apply_writes(mock_cursor, [drop_writer.WriteOp("create", drop=drop)] * 3)
+
+        assert results == [40, 41, 42]
+        insert = mock_cursor.executemany.call_args_list[0][0]
+        assert insert[0] == drop_writer.INSERT_DROP_QUERY
+        assert len(insert[1]) == 3
+
+    def test_ids_follow_auto_increment_step(self, drop_fields):
+        """Test IDs honour auto_increment_increment."""
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 40
+        mock_cursor.fetchone.return_value = (2,)
+        drop = DropCreate(**drop_fields)
+
+        results = drop_writer.apply_writes(mock_cursor, [drop_writer.WriteOp("create", drop=drop)] * 2)
+
+        assert results == [40, 42]
+
+    def test_missing_rows_return_none(self, drop_fields):
+        """Test updates and deletes of missing rows have no effect."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(7, 100100, 2000001)]
+        mock_cursor.lastrowid = 5
+
+        results = drop_writer.apply_writes(mock_cursor, [
+            drop_writer.WriteOp("delete", 9),
+            drop_writer.WriteOp("update", 8, DropUpdate(**drop_fields)),
+            drop_writer.WriteOp("delete", 7),
+        ])
+
+        assert results == [None, None, 7]
+        statements = executed(mock_cursor)
+        assert statements[0].endswith("FOR UPDATE")
+        assert mock_cursor.execute.call_args_list[0][0][1] == (7, 8, 9)
+        assert "DELETE FROM drop_data WHERE id IN (%s)" in statements
+        logged = next(
+            call[0][1] for call in mock_cursor.executemany.call_args_list
+            if "drop_changes" in call[0][0]
+        )
+        assert [row[1:3] for row in logged] == [("delete", 7)]
+
+    def test_update_after_delete_finds_row_missing(self, drop_fields):
+        """Test writes to the same row resolve in arrival order."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(7, 100100, 2000001)]
+        update = DropUpdate(**{**drop_fields, "dropperid": 100200})
+
+        results = drop_writer.apply_writes(mock_cursor, [
+            drop_writer.WriteOp("update", 7, update),
+            drop_writer.WriteOp("delete", 7),
+            drop_writer.WriteOp("update", 7, update),
+        ])
+
+        assert results == [7, 7, None]
+        updates = next(
+            call[0][1] for call in mock_cursor.executemany.call_args_list
+            if call[0][0] == drop_writer.UPDATE_DROP_QUERY
+        )
+        assert len(updates) == 1
+        mob_delete = next(
+            call for call in mock_cursor.execute.call_args_list
+            if call[0][0].startswith("DELETE FROM drop_mob_summary")
+        )
+        assert mob_delete[0][1] == (100100, 100200)
@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.etag import compute_etag, etag_matches, conditional_json_response
+
+
+class TestComputeEtag:
+    """Tests for compute_etag function."""
+
+    def test_same_rows_same_etag(self):
+        """Test ETag is stable for identical rows regardless of key order."""
+        a = [{"id": "1", "itemid": 2000001}]
+        b = [{"itemid": 2000001, "id": "1"}]
+
+        assert compute_etag(a) == compute_etag(b)
+
+    def test_changed_value_changes_etag(self):
+        """Test ETag changes when any value changes."""
+        assert compute_etag([{"id": "1", "chance": 1}]) != compute_etag([{"id": "1", "chance": 2}])
+
+    def test_row_order_changes_etag(self):
+        """Test ETag reflects row order."""
+        rows = [{"id": "1"}, {"id": "2"}]
+
+        assert compute_etag(rows) != compute_etag(list(reversed(rows)))
+
+    def test_single_row_matches_list(self):
+        """Test a single row hashes like a one-element list."""
+        assert compute_etag({"id": "1"}) == compute_etag([{"id": "1"}])
+
+    def test_etag_is_quoted(self):
+        """Test ETag is a quoted strong validator."""
+        etag = compute_etag([])
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert not etag.startswith("W/")
+
+
+class TestEtagMatches:
+    """Tests for etag_matches function."""
+
+    def test_missing_header(self):
+        assert etag_matches(None, '"abc"') is False
+
+    def test_exact_match(self):
+        assert etag_matches('"abc"', '"abc"') is True
+
+    def test_match_in_list(self):
+        assert etag_matches('"x", "abc"', '"abc"') is True
+
+    def test_weak_validator_matches(self):
+        assert etag_matches('W/"abc"', '"abc"') is True
+
+    def test_wildcard(self):
+        assert etag_matches("*", '"abc"') is True
+
+    def test_no_match(self):
+        assert etag_matches('"x"', '"abc"') is False
+
+
+class TestConditionalJsonResponse:
+    """Tests for conditional_json_response function."""
+
+    def test_returns_json_with_etag(self):
+        response = conditional_json_response([{"id": "1"}], None)
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == compute_etag([{"id": "1"}])
+
+    def test_returns_304_on_match(self):
+        etag = compute_etag([{"id": "1"}])
+
+        response = conditional_json_response([{"id": "1"}], etag)
+
+        assert response.status_code == 304
+        assert response.body == b""
@@ -0,0 +1,136 @@
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.index_bootstrap import (
+    REQUIRED_INDEXES,
+    create_index_statement,
+    ensure_indexes,
+    fetch_existing_indexes,
+    find_missing_indexes,
+)
+
+
+def make_connection(statistics_rows):
+    """Create a mock connection whose cursor returns information_schema rows."""
+    cnx = MagicMock()
+    db_cursor = MagicMock()
+    db_cursor.fetchall.return_value = statistics_rows
+    cnx.cursor.return_value = db_cursor
+    return cnx, db_cursor
+
+
+FULL_STATISTICS = [
+    {"INDEX_NAME": "PRIMARY", "COLUMN_NAME": "id"},
+    {"INDEX_NAME": "idx_drop_data_dropperid_itemid", "COLUMN_NAME": "dropperid"},
+    {"INDEX_NAME": "idx_drop_data_dropperid_itemid", "COLUMN_NAME": "itemid"},
+    {"INDEX_NAME": "idx_drop_data_itemid_dropperid", "COLUMN_NAME": "itemid"},
+    {"INDEX_NAME": "idx_drop_data_itemid_dropperid", "COLUMN_NAME": "dropperid"},
+]
+
+
+class TestFetchExistingIndexes:
+    """Tests for fetch_existing_indexes function."""
+
+    def test_groups_columns_by_index(self):
+        """Test columns are grouped in index order."""
+        _, db_cursor = make_connection(FULL_STATISTICS)
+
+        result = fetch_existing_indexes(db_cursor)
+
+        assert result["PRIMARY"] == ["id"]
+        assert result["idx_drop_data_itemid_dropperid"] == ["itemid", "dropperid"]
+        assert db_cursor.execute.call_args[0][1] == ("drop_data",)
+
+
+class TestFindMissingIndexes:
+    """Tests for find_missing_indexes function."""
+
+    def test_nothing_missing(self):
+        """Test no indexes reported when all are present."""
+        existing = {
+            "PRIMARY": ["id"],
+            "a": ["dropperid", "itemid"],
+            "b": ["itemid", "dropperid"],
+        }
+
+        assert find_missing_indexes(existing) == []
+
+    def test_missing_itemid_index(self):
+        """Test the itemid index is reported when absent."""
+        existing = {"PRIMARY": ["id"], "a": ["dropperid", "itemid"]}
+
+        missing = find_missing_indexes(existing)
+
+        assert [spec.columns for spec in missing] == [("itemid", "dropperid")]
+
+    def test_single_column_index_does_not_satisfy_composite(self):
+        """Test a single-column index is not treated as covering."""
+        existing = {"PRIMARY": ["id"], "a": ["dropperid"], "b": ["itemid", "dropperid"]}
+
+        missing = find_missing_indexes(existing)
+
+        assert [spec.columns for spec in missing] == [("dropperid", "itemid")]
+
+    def test_longer_index_satisfies_prefix(self):
+        """Test an index with extra trailing columns satisfies the requirement."""
+        existing = {
+            "PRIMARY": ["id"],
+            "a": ["dropperid", "itemid", "chance"],
+            "b": ["itemid", "dropperid", "questid"],
+        }
+
+        assert find_missing_indexes(existing) == []
+
+
+class TestCreateIndexStatement:
+    """Tests for create_index_statement function."""
+
+    def test_secondary_index(self):
+        """Test CREATE INDEX statement for a secondary index."""
+        spec = REQUIRED_INDEXES[1]
+
+        statement = create_index_statement(spec)
+
+        assert statement == "CREATE INDEX idx_drop_data_dropperid_itemid ON drop_data (dropperid, itemid)"
+
+    def test_primary_key(self):
+        """Test primary key uses ALTER TABLE."""
+        spec = REQUIRED_INDEXES[0]
+
+        assert create_index_statement(spec) == "ALTER TABLE drop_data ADD PRIMARY KEY (id)"
+
+
+class TestEnsureIndexes:
+    """Tests for ensure_indexes function."""
+
+    def test_check_only_does_not_create(self):
+        """Test check mode reports missing indexes without DDL."""
+        cnx, db_cursor = make_connection([{"INDEX_NAME": "PRIMARY", "COLUMN_NAME": "id"}])
+
+        missing = ensure_indexes(cnx, create=False)
+
+        assert len(missing) == 2
+        db_cursor.execute.assert_called_once()
+        db_cursor.close.assert_called_once()
+
+    def test_create_missing(self):
+        """Test create mode issues DDL for each missing index."""
+        cnx, db_cursor = make_connection([{"INDEX_NAME": "PRIMARY", "COLUMN_NAME": "id"}])
+
+        ensure_indexes(cnx, create=True)
+
+        statements = [call[0][0] for call in db_cursor.execute.call_args_list[1:]]
+        assert statements == [
+            "CREATE INDEX idx_drop_data_dropperid_itemid ON drop_data (dropperid, itemid)",
+            "CREATE INDEX idx_drop_data_itemid_dropperid ON drop_data (itemid, dropperid)",
+        ]
+
+    def test_all_present(self):
+        """Test nothing is created when indexes exist."""
+        cnx, db_cursor = make_connection(FULL_STATISTICS)
+
+        assert ensure_indexes(cnx, create=True) == []
+        db_cursor.execute.assert_called_once()
@@ -51,6 +51,26 @@ class TestSearchDrops:
         data = response.json()
         assert len(data) == 0
 
+    def test_search_drops_bulk(self, client, mock_cursor, sample_drop_record):
+        """Test a bulk search runs one IN query and groups rows by requested ID."""
+        mock_cursor.fetchall.return_value = [sample_drop_record]
+
+        response = client.post("/api/search_drops/bulk", json={"query_type": "mob", "queries": [100100, 100200]})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results["100100"][0]["id"] == "1"
+        assert results["100200"] == []
+        sql, params = mock_cursor.execute.call_args.args
+        assert "dropperid IN (%s,%s)" in sql
+        assert params == (100100, 100200)
+
+    def test_search_drops_bulk_requires_queries(self, client):
+        """Test a bulk search without IDs is rejected."""
+        response = client.post("/api/search_drops/bulk", json={"query_type": "mob", "queries": []})
+
+        assert response.status_code == 422
+
     def test_search_drops_missing_query(self, client):
         """Test searching drops without query parameter."""
         response = client.get("/api/search_drops", params={
@@ -90,6 +110,51 @@ class TestSearchDrops:
         assert data[0]["id"] == "123"
 
 
+class TestSearchDropsConditional:
+    """Tests for ETag handling on /api/search_drops."""
+
+    def test_search_drops_returns_etag(self, client, mock_cursor, sample_drop_record):
+        """Test that search responses carry a strong ETag."""
+        mock_cursor.fetchall.return_value = [sample_drop_record]
+
+        response = client.get("/api/search_drops", params={"query": 100100, "query_type": "mob"})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('"')
+
+    def test_search_drops_not_modified(self, client, mock_cursor, sample_drop_record):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        mock_cursor.fetchall.return_value = [dict(sample_drop_record)]
+        first = client.get("/api/search_drops", params={"query": 100100, "query_type": "mob"})
+
+        mock_cursor.fetchall.return_value = [dict(sample_drop_record)]
+        response = client.get(
+            "/api/search_drops",
+            params={"query": 100100, "query_type": "mob"},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == first.headers["ETag"]
+
+    def test_search_drops_stale_etag(self, client, mock_cursor, sample_drop_record):
+        """Test that a changed result returns 200 with a new ETag."""
+        mock_cursor.fetchall.return_value = [dict(sample_drop_record)]
+        first = client.get("/api/search_drops", params={"query": 100100, "query_type": "mob"})
+
+        mock_cursor.fetchall.return_value = [dict(sample_drop_record, chance=5)]
+        response = client.get(
+            "/api/search_drops",
+            params={"query": 100100, "query_type": "mob"},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != first.headers["ETag"]
+        assert response.json()[0]["chance"] == 5
+
+
 class TestGetDrop:
     """Tests for /get_drop/{id} endpoint."""
 
@@ -104,6 +169,16 @@ class TestGetDrop:
         assert data["id"] == "1"
         assert data["dropperid"] == 100100
 
+    def test_get_drop_not_modified(self, client, mock_cursor, sample_drop_record):
+        """Test that get_drop honors If-None-Match."""
+        mock_cursor.fetchone.return_value = dict(sample_drop_record)
+        first = client.get("/get_drop/1")
+
+        mock_cursor.fetchone.return_value = dict(sample_drop_record)
+        response = client.get("/get_drop/1", headers={"If-None-Match": first.headers["ETag"]})
+
+        assert response.status_code == 304
+
     def test_get_drop_not_found(self, client, mock_cursor):
         """Test getting a drop that doesn't exist."""
         mock_cursor.fetchone.return_value = None
@@ -131,7 +206,42 @@ class TestUpdateDrop:
         data = response.json()
         assert data["message"] == "Drop data updated successfully"
         assert data["id"] == 1
-        mock_writer_cursor.execute.assert_called_once()
+        statements = [call[0][0] for call in mock_writer_cursor.execute.call_args_list]
+        assert any("UPDATE drop_data" in sql for sql in statements)
+
+    def test_update_drop_records_change(self, client, mock_writer_cursor, sample_drop_data):
+        """Test updating a drop appends an update to the change log."""
+        client.put("/update_drop/7", json=sample_drop_data)
+
+        insert_change = next(
+            call[0] for call in mock_writer_cursor.execute.call_args_list
+            if "INSERT INTO drop_changes" in call[0][0]
+        )
+        assert insert_change[1][1:4] == ("update", 7, 100100)
+
+    def test_update_drop_refreshes_old_and_new_summaries(self, client, mock_writer_cursor, sample_drop_data):
+        """Test summaries are refreshed for both the previous and new mob/item."""
+        mock_writer_cursor.fetchone.return_value = (100200, 2000009)
+
+        client.put("/update_drop/7", json=sample_drop_data)
+
+        params = {
+            call[0][0].split()[2]: call[0][1] for call in mock_writer_cursor.execute.call_args_list
+            if call[0][0].startswith("DELETE FROM drop_")
+        }
+        assert params["drop_mob_summary"] == (100100, 100200)
+        assert params["drop_item_summary"] == (2000001, 2000009)
+
+    def test_update_drop_not_found(self, client, mock_writer_cursor, sample_drop_data):
+        """Test updating a drop that doesn't exist records nothing."""
+        mock_writer_cursor.fetchone.return_value = None
+
+        response = client.put("/update_drop/999", json=sample_drop_data)
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Drop record not found"
+        statements = [call[0][0] for call in mock_writer_cursor.execute.call_args_list]
+        assert not any("drop_changes" in sql for sql in statements)
 
     def test_update_drop_missing_field(self, client):
         """Test updating a drop with missing required field."""
@@ -165,7 +275,17 @@ class TestAddDrop:
         data = response.json()
         assert data["message"] == "Drop data added successfully"
         assert data["id"] == 42
-        mock_writer_cursor.execute.assert_called_once()
+        assert "INSERT INTO drop_data" in mock_writer_cursor.execute.call_args_list[0][0][0]
+
+    def test_add_drop_records_change(self, client, mock_writer_cursor, sample_drop_data):
+        """Test adding a drop appends a create with the new ID to the change log."""
+        mock_writer_cursor.lastrowid = 42
+
+        client.post("/add_drop", json=sample_drop_data)
+
+        insert_change = mock_writer_cursor.execute.call_args_list[2][0]
+        assert "INSERT INTO drop_changes" in insert_change[0]
+        assert insert_change[1][1:3] == ("create", 42)
 
     def test_add_drop_missing_field(self, client):
         """Test adding a drop with missing required field."""
@@ -216,6 +336,18 @@ class TestDeleteDrop:
 
         assert response.status_code == 404
         assert response.json()["detail"] == "Drop record not found"
+        statements = [call[0][0] for call in mock_writer_cursor.execute.call_args_list]
+        assert not any("drop_changes" in sql for sql in statements)
+
+    def test_delete_drop_records_change(self, client, mock_writer_cursor):
+        """Test deleting a drop appends a delete without data to the change log."""
+        client.delete("/delete_drop/5")
+
+        insert_change = next(
+            call[0] for call in mock_writer_cursor.execute.call_args_list
+            if "INSERT INTO drop_changes" in call[0][0]
+        )
+        assert insert_change[1][1:4] == ("delete", 5, None)
 
     def test_delete_drop_invalid_id(self, client):
         """Test deleting a drop with invalid ID format."""
@@ -224,6 +356,311 @@ class TestDeleteDrop:
         assert response.status_code == 422
 
 
+class TestCoalescedWrites:
+    """Tests for write endpoints with the write coalescer enabled."""
+
+    @pytest.fixture
+    def coalescer(self, client):
+        """Route writes to a mock coalescer through the real write repository dependency."""
+        from unittest.mock import AsyncMock
+        from main import app, get_write_repository
+
+        del app.dependency_overrides[get_write_repository]
+        mock_coalescer = MagicMock()
+        mock_coalescer.submit = AsyncMock()
+        with patch("main.write_coalescer", mock_coalescer):
+            yield mock_coalescer
+
+    def test_add_drop_returns_own_id(self, client, coalescer, sample_drop_data):
+        """Test the caller gets the ID assigned within its batch."""
+        coalescer.submit.return_value = 41
+
+        response = client.post("/add_drop", json=sample_drop_data)
+
+        assert response.status_code == 200
+        assert response.json()["id"] == 41
+        write = coalescer.submit.call_args[0][0]
+        assert write.op == "create"
+        assert write.drop.dropperid == 100100
+
+    def test_delete_missing_is_404(self, client, coalescer):
+        """Test a delete of a missing row still returns 404."""
+        coalescer.submit.return_value = None
+
+        response = client.delete("/delete_drop/999")
+
+        assert response.status_code == 404
+
+    def test_batch_failure_is_500(self, client, coalescer, sample_drop_data):
+        """Test a failed transaction surfaces as a database error."""
+        import mysql.connector
+        coalescer.submit.side_effect = mysql.connector.Error("Lock wait timeout")
+
+        response = client.put("/update_drop/7", json=sample_drop_data)
+
+        assert response.status_code == 500
+        assert "Database error" in response.json()["detail"]
+
+    def test_lock_wait_timeout_is_503(self, client, coalescer, sample_drop_data):
+        """Test a lock-wait timeout is reported as retryable."""
+        import mysql.connector
+        coalescer.submit.side_effect = mysql.connector.Error("Lock wait timeout exceeded", errno=1205)
+
+        response = client.put("/update_drop/7", json=sample_drop_data)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
+class TestDatabaseErrors:
+    """Tests for database error mapping."""
+
+    def test_statement_timeout_is_504(self):
+        """Test read statements cut off by the execution limit map to 504."""
+        import mysql.connector
+        from main import database_http_error
+
+        assert database_http_error(mysql.connector.Error("Query execution was interrupted", errno=3024)).status_code == 504
+        assert database_http_error(mysql.connector.Error("Query execution was interrupted", errno=1969)).status_code == 504
+        assert database_http_error(mysql.connector.Error("Table is full", errno=1114)).status_code == 500
+
+    def test_paused_writes_are_503(self):
+        """Test writes refused during a replace import ask the client to retry."""
+        from main import database_http_error
+        from services.change_log import WritesPausedError
+
+        error = database_http_error(WritesPausedError())
+        assert error.status_code == 503
+        assert "Retry-After" in error.headers
+
+
+class TestRequestDeadline:
+    """Tests for request deadline handling."""
+
+    def test_read_timeout_capped_by_deadline(self):
+        """Test the statement limit shrinks to the remaining request budget."""
+        from main import read_timeout_ms
+        from utils.deadline import set_deadline
+
+        set_deadline(0.5)
+        try:
+            assert 0 < read_timeout_ms() <= 500
+        finally:
+            set_deadline(None)
+        assert read_timeout_ms() == 5000
+
+    def test_analytics_load_has_own_limit(self):
+        """Test the full-table analytics load is not held to the per-read limit."""
+        from main import load_analytics_columns
+
+        with patch("main.cnxpool", MagicMock()), \
+                patch("main.resolve_flavor", return_value="mysql"), \
+                patch("main.MonitoredCursor") as monitored, \
+                patch("main.load_drop_columns", return_value="columns"):
+            assert load_analytics_columns() == "columns"
+        assert monitored.call_args[0][4] == 120000
+
+    def test_expired_request_rejected(self, client):
+        """Test a request arriving past its deadline does no work."""
+        response = client.get("/get_drop/1", headers={"X-Request-Timeout-Ms": "0"})
+
+        assert response.status_code == 504
+
+
+class TestBatchDrops:
+    """Tests for /api/drops/batch endpoint."""
+
+    def test_atomic_batch(self, client, mock_writer_cursor, sample_drop_data):
+        """Test mixed operations run batched in one transaction with per-operation results."""
+        mock_writer_cursor.lastrowid = 42
+        mock_writer_cursor.fetchall.return_value = [(7, 100100, 2000001), (8, 100100, 2000002)]
+
+        response = client.post("/api/drops/batch", json={"operations": [
+            {"op": "create", "data": sample_drop_data},
+            {"op": "update", "id": 7, "data": sample_drop_data},
+            {"op": "delete", "id": 8},
+        ]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["mode"] == "atomic"
+        assert data["committed"] == 3
+        assert [(r["op"], r["id"], r["status"]) for r in data["results"]] == [
+            ("create", 42, "ok"), ("update", 7, "ok"), ("delete", 8, "ok"),
+        ]
+        batched = [call[0][0] for call in mock_writer_cursor.executemany.call_args_list]
+        assert any("INSERT INTO drop_data" in sql for sql in batched)
+        assert any("UPDATE drop_data" in sql for sql in batched)
+
+    def test_atomic_batch_missing_row_is_409(self, client, mock_writer_cursor, sample_drop_data):
+        """Test an atomic batch referencing a missing row reports it and commits nothing."""
+        mock_writer_cursor.fetchall.return_value = []
+
+        response = client.post("/api/drops/batch", json={"operations": [
+            {"op": "create", "data": sample_drop_data},
+            {"op": "delete", "id": 9},
+        ]})
+
+        assert response.status_code == 409
+        detail = response.json()["detail"]
+        assert detail["committed"] == 0
+        assert [r["status"] for r in detail["results"]] == ["rolled_back", "not_found"]
+
+    def test_best_effort_batch_skips_missing_rows(self, client, mock_writer_cursor, sample_drop_data):
+        """Test best-effort batches commit what they can."""
+        mock_writer_cursor.lastrowid = 42
+        mock_writer_cursor.fetchall.return_value = []
+
+        response = client.post("/api/drops/batch", json={"mode": "best_effort", "operations": [
+            {"op": "create", "data": sample_drop_data},
+            {"op": "update", "id": 9, "data": sample_drop_data},
+        ]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["committed"] == 1
+        assert [r["status"] for r in data["results"]] == ["ok", "not_found"]
+
+    def test_invalid_operation(self, client, sample_drop_data):
+        """Test operations are validated with the drop models."""
+        response = client.post("/api/drops/batch", json={"operations": [
+            {"op": "update", "data": sample_drop_data},
+        ]})
+
+        assert response.status_code == 422
+
+    def test_empty_batch(self, client):
+        """Test a batch needs at least one operation."""
+        response = client.post("/api/drops/batch", json={"operations": []})
+
+        assert response.status_code == 422
+
+
+class TestImportDrops:
+    """Tests for /api/drops/import endpoint."""
+
+    CSV_BODY = (
+        "dropperid,itemid,minimum_quantity,maximum_quantity,questid,chance\n"
+        "100100,2000001,1,5,0,100000\n"
+        "100100,2000002,1,1,0,5000\n"
+    )
+
+    def test_import_csv(self, client):
+        """Test a CSV body is loaded into the staging table and swapped in on its own connection."""
+        mock_pool = MagicMock()
+        with patch("main.cnxpool", mock_pool), patch("main.mysql.connector.connect") as connect:
+            import_cnx = connect.return_value
+            import_cursor = import_cnx.cursor.return_value
+            import_cursor.lastrowid = 1
+            response = client.post("/api/drops/import", content=self.CSV_BODY, params={"format": "csv"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rows"] == 2
+        assert data["mode"] == "replace"
+        assert len(import_cursor.executemany.call_args[0][1]) == 2
+        mock_pool.get_connection.assert_not_called()
+        import_cnx.close.assert_called_once()
+
+    def test_import_invalid_row(self, client):
+        """Test an invalid row is reported with its line number."""
+        with patch("main.cnxpool", MagicMock()), patch("main.mysql.connector.connect") as connect:
+            response = client.post(
+                "/api/drops/import", content='{"dropperid": 1}\n', params={"format": "ndjson"}
+            )
+
+        assert response.status_code == 422
+        assert response.json()["detail"]["line"] == 1
+        connect.return_value.rollback.assert_called_once()
+
+
+    def test_concurrent_replace_import_is_409(self, client):
+        """Test a replace import is refused while another one has writes paused."""
+        with patch("main.cnxpool", MagicMock()), patch("main.mysql.connector.connect") as connect:
+            connect.return_value.cursor.return_value.rowcount = 0
+            response = client.post("/api/drops/import", content=self.CSV_BODY, params={"format": "csv"})
+
+        assert response.status_code == 409
+
+
+class TestExportDrops:
+    """Tests for /api/drops/export endpoint."""
+
+    def test_export_csv(self, client):
+        """Test the table is streamed as CSV."""
+        mock_pool = MagicMock()
+        with patch("main.cnxpool", mock_pool), patch("main.mysql.connector.connect") as connect:
+            export_cnx = connect.return_value
+            export_cnx.cursor.return_value.fetchmany.side_effect = [[(1, 100100, 2000001, 1, 5, 0, 100000)], []]
+            response = client.get("/api/drops/export", params={"format": "csv"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "drop_data.csv" in response.headers["content-disposition"]
+        assert response.text.splitlines()[1] == "1,100100,2000001,1,5,0,100000"
+        mock_pool.get_connection.assert_not_called()
+        export_cnx.close.assert_called_once()
+
+    def test_export_arrow_without_pyarrow(self, client):
+        """Test Arrow export reports 501 when pyarrow is missing."""
+        with patch("main.arrow_available", return_value=False):
+            response = client.get("/api/drops/export", params={"format": "arrow"})
+
+        assert response.status_code == 501
+
+    def test_export_invalid_format(self, client):
+        """Test unknown formats are rejected."""
+        response = client.get("/api/drops/export", params={"format": "xml"})
+
+        assert response.status_code == 422
+
+
+class TestLocalBackend:
+    """Tests for the core endpoints on a local repository backend."""
+
+    @pytest.fixture
+    def memory_backend(self, client):
+        """Serve requests from an in-memory repository without a MySQL pool."""
+        from main import app, get_read_repository, get_write_repository
+        from services.memory_drop_repository import InMemoryDropRepository
+
+        del app.dependency_overrides[get_read_repository]
+        del app.dependency_overrides[get_write_repository]
+        with patch("main.local_repository", InMemoryDropRepository()), patch("main.cnxpool", None), \
+                patch("main.DROP_REPO_BACKEND", "memory"):
+            yield
+
+    def test_crud_round_trip(self, client, memory_backend, sample_drop_data):
+        """Test add, search, get, update and delete without a database server."""
+        new_id = client.post("/add_drop", json=sample_drop_data).json()["id"]
+
+        search = client.get("/api/search_drops", params={"query": 100100, "query_type": "mob"})
+        assert [row["id"] for row in search.json()] == [str(new_id)]
+
+        client.put(f"/update_drop/{new_id}", json={**sample_drop_data, "chance": 1})
+        assert client.get(f"/get_drop/{new_id}").json()["chance"] == 1
+
+        exists = client.post("/api/drops/exist", json={"items": [{"type": "item", "id": 2000001}]})
+        assert exists.json()["results"][0]["drop_exist"] is True
+
+        assert client.delete(f"/delete_drop/{new_id}").status_code == 200
+        assert client.get(f"/get_drop/{new_id}").status_code == 404
+
+    def test_mysql_only_endpoint(self, client, memory_backend):
+        """Test MySQL-only features report 501."""
+        response = client.get("/api/drops/export")
+
+        assert response.status_code == 501
+        assert "memory" in response.json()["detail"]
+
+    def test_readiness(self, client, memory_backend):
+        """Test local backends are always ready."""
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready", "backend": "memory"}
+
+
 class TestCheckDropsExist:
     """Tests for /api/drops/exist endpoint."""
 
@@ -305,3 +742,155 @@ class TestCheckDropsExist:
         assert response.status_code == 200
         data = response.json()
         assert not any(result["drop_exist"] for result in data["results"])
+
+
+class TestAugmentedSearch:
+    """Tests for /api/search_drops/augmented endpoint."""
+
+    def test_returns_named_rows(self, client, mock_cursor):
+        """Test rows come from the read model with names and string IDs."""
+        mock_cursor.fetchall.return_value = [{
+            "id": 1, "dropperid": 100100, "dropper_name": "Snail", "itemid": 2000001,
+            "item_name": "Red Potion", "minimum_quantity": 1, "maximum_quantity": 1,
+            "questid": 0, "chance": 100000,
+        }]
+
+        response = client.get("/api/search_drops/augmented", params={"query": 100100, "query_type": "mob"})
+
+        assert response.status_code == 200
+        assert response.json()[0]["id"] == "1"
+        assert response.json()[0]["item_name"] == "Red Potion"
+        assert "ETag" in response.headers
+        assert "drop_data_augmented" in mock_cursor.execute.call_args[0][0]
+
+
+class TestDropSummaries:
+    """Tests for /api/drops/summary endpoints."""
+
+    def test_mob_summary(self, client, mock_cursor):
+        """Test reading a mob summary row."""
+        mock_cursor.fetchone.return_value = {
+            "dropperid": 100100, "drop_count": 12, "item_count": 10,
+            "max_chance": 700000, "quest_drop_count": 2,
+        }
+
+        response = client.get("/api/drops/summary/mob/100100")
+
+        assert response.status_code == 200
+        assert response.json()["drop_count"] == 12
+        assert "drop_mob_summary" in mock_cursor.execute.call_args[0][0]
+
+    def test_mob_summary_not_found(self, client, mock_cursor):
+        """Test 404 for a mob without drops."""
+        mock_cursor.fetchone.return_value = None
+
+        response = client.get("/api/drops/summary/mob/1")
+
+        assert response.status_code == 404
+
+    def test_item_summary(self, client, mock_cursor):
+        """Test reading an item summary row."""
+        mock_cursor.fetchone.return_value = {
+            "itemid": 2000001, "drop_count": 40, "mob_count": 38,
+            "max_chance": 900000, "best_dropperid": 100100, "quest_drop_count": 0,
+        }
+
+        response = client.get("/api/drops/summary/item/2000001")
+
+        assert response.status_code == 200
+        assert response.json()["best_dropperid"] == 100100
+        assert "drop_item_summary" in mock_cursor.execute.call_args[0][0]
+
+    def test_item_summary_not_found(self, client, mock_cursor):
+        """Test 404 for an item no mob drops."""
+        mock_cursor.fetchone.return_value = None
+
+        response = client.get("/api/drops/summary/item/1")
+
+        assert response.status_code == 404
+
+
+class TestDropChanges:
+    """Tests for /api/drops/changes endpoint."""
+
+    def test_changes_since(self, client):
+        """Test returning changes after a sequence number."""
+        changes = [
+            {"seq": 11, "op": "create", "id": "42", "data": {
+                "dropperid": 100100, "itemid": 2000001, "minimum_quantity": 1,
+                "maximum_quantity": 5, "questid": 0, "chance": 100000,
+            }},
+            {"seq": 12, "op": "delete", "id": "7", "data": None},
+        ]
+        with patch("main.read_changes", return_value=changes) as mock_read:
+            response = client.get("/api/drops/changes", params={"since": 10, "limit": 50})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [c["seq"] for c in data["changes"]] == [11, 12]
+        assert data["changes"][1]["data"] is None
+        assert data["last_seq"] == 12
+        mock_read.assert_called_once_with(10, 50)
+
+    def test_no_changes_keeps_since(self, client):
+        """Test last_seq echoes since when nothing changed."""
+        with patch("main.read_changes", return_value=[]):
+            response = client.get("/api/drops/changes", params={"since": 10})
+
+        assert response.status_code == 200
+        assert response.json() == {"changes": [], "last_seq": 10}
+
+    def test_long_poll_returns_when_changes_arrive(self, client):
+        """Test long-poll re-reads until changes appear."""
+        change = {"seq": 3, "op": "delete", "id": "1", "data": None}
+        with patch("main.CHANGE_FEED_POLL_INTERVAL", 0.01):
+            with patch("main.read_changes", side_effect=[[], [], [change]]) as mock_read:
+                response = client.get("/api/drops/changes", params={"since": 2, "wait": 5})
+
+        assert response.status_code == 200
+        assert response.json()["last_seq"] == 3
+        assert mock_read.call_count == 3
+
+    def test_wait_above_maximum_rejected(self, client):
+        """Test wait longer than the configured maximum is rejected."""
+        response = client.get("/api/drops/changes", params={"wait": 10_000})
+
+        assert response.status_code == 422
+
+    def test_negative_since_rejected(self, client):
+        """Test negative since is rejected."""
+        response = client.get("/api/drops/changes", params={"since": -1})
+
+        assert response.status_code == 422
+
+
+class TestMobRankings:
+    """Tests for /api/analytics/mob-rankings endpoint."""
+
+    def test_rankings(self, client):
+        """Test rankings are computed from loaded columns and tagged with the version."""
+        import numpy as np
+        from services.drop_analytics import AnalyticsCache, DropColumns
+
+        data = np.array([[100100, 2000001, 1_000_000, 1, 1], [100200, 2000001, 500_000, 1, 1]])
+        columns = DropColumns(*(data[:, i] for i in range(5)))
+        with patch("main.analytics_cache", AnalyticsCache()):
+            with patch("main.fetch_latest_seq", return_value=5):
+                with patch("main.load_analytics_columns", return_value=columns):
+                    first = client.post("/api/analytics/mob-rankings", json={"limit": 1})
+                    second = client.post("/api/analytics/mob-rankings", json={"limit": 1})
+
+        assert first.status_code == 200
+        data = first.json()
+        assert data["version"] == 5
+        assert data["cached"] is False
+        assert data["rankings"] == [
+            {"dropperid": 100100, "drop_count": 1, "expected_drops": 1.0, "expected_value": None}
+        ]
+        assert second.json()["cached"] is True
+
+    def test_invalid_limit(self, client):
+        """Test limit must be positive."""
+        response = client.post("/api/analytics/mob-rankings", json={"limit": 0})
+
+        assert response.status_code == 422
@@ -0,0 +1,169 @@
+import pytest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+import mysql.connector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.query_monitor import (
+    MonitoredCursor,
+    SlowQueryLog,
+    detect_flavor,
+    params_digest,
+    query_shape,
+    with_statement_timeout,
+)
+
+
+class TestStatementTimeout:
+    """Tests for with_statement_timeout function."""
+
+    def test_mysql_hint(self):
+        sql = with_statement_timeout("SELECT * FROM drop_data WHERE id = %s", "mysql", 5000)
+
+        assert sql == "SELECT /*+ MAX_EXECUTION_TIME(5000) */ * FROM drop_data WHERE id = %s"
+
+    def test_mariadb_prefix(self):
+        sql = with_statement_timeout("\n  SELECT 1", "mariadb", 2500)
+
+        assert sql == "SET STATEMENT max_statement_time=2.5 FOR SELECT 1"
+
+    def test_writes_unchanged(self):
+        sql = "UPDATE drop_data SET chance = %s WHERE id = %s"
+
+        assert with_statement_timeout(sql, "mysql", 5000) == sql
+
+    def test_disabled(self):
+        assert with_statement_timeout("SELECT 1", "mysql", 0) == "SELECT 1"
+
+    def test_detect_flavor(self):
+        cnx = MagicMock()
+        cnx.get_server_info.return_value = "11.4.2-MariaDB-ubu2404"
+        assert detect_flavor(cnx) == "mariadb"
+
+        cnx.get_server_info.return_value = "8.4.0"
+        assert detect_flavor(cnx) == "mysql"
+
+
+class TestQueryShape:
+    """Tests for query_shape and params_digest functions."""
+
+    def test_collapses_whitespace_and_in_lists(self):
+        shape = query_shape("SELECT *\n  FROM drop_data\n  WHERE id IN (%s, %s,%s)")
+
+        assert shape == "SELECT * FROM drop_data WHERE id IN (%s, ...)"
+
+    def test_params_digest_hides_values(self):
+        digest = params_digest((100100,))
+
+        assert len(digest) == 12
+        assert "100100" not in digest
+        assert digest == params_digest((100100,))
+        assert digest != params_digest((100101,))
+
+
+class TestSlowQueryLog:
+    """Tests for SlowQueryLog class."""
+
+    def test_threshold(self):
+        slow_log = SlowQueryLog(100)
+
+        assert slow_log.should_log(100)
+        assert not slow_log.should_log(99)
+
+    def test_disabled(self):
+        slow_log = SlowQueryLog(0)
+
+        assert not slow_log.enabled
+        assert not slow_log.should_log(10_000)
+
+    def test_rate_limited_entries_are_counted(self):
+        slow_log = SlowQueryLog(1, max_per_minute=2)
+
+        with patch("services.query_monitor.time.monotonic", return_value=slow_log._refilled):
+            results = [slow_log.should_log(50) for _ in range(5)]
+        entry = slow_log.record("SELECT 1", (), 50, None)
+
+        assert results == [True, True, False, False, False]
+        assert entry["suppressed"] == 3
+        assert slow_log.suppressed == 0
+
+    def test_explain_once_per_shape(self):
+        slow_log = SlowQueryLog(1, explain_interval=300)
+        sql = "SELECT * FROM drop_data WHERE itemid = %s"
+
+        assert slow_log.should_explain(query_shape(sql), sql)
+        assert not slow_log.should_explain(query_shape(sql), sql)
+        assert not slow_log.should_explain("INSERT INTO drop_data VALUES (%s)", "INSERT INTO drop_data VALUES (%s)")
+
+    def test_history_is_bounded(self):
+        slow_log = SlowQueryLog(1, history=2)
+
+        for latency in (10, 20, 30):
+            slow_log.record("SELECT 1", (), latency, None)
+
+        assert [entry["latency_ms"] for entry in slow_log.entries] == [20, 30]
+
+
+class TestMonitoredCursor:
+    """Tests for MonitoredCursor class."""
+
+    @pytest.fixture
+    def cnx(self):
+        cnx = MagicMock()
+        cnx.cursor.return_value.fetchall.return_value = [{"id": 1, "type": "ref", "key": "idx_drop_data_itemid"}]
+        return cnx
+
+    def test_applies_timeout_and_proxies(self, cnx):
+        inner = MagicMock()
+        inner.fetchall.return_value = [{"id": 1}]
+        inner.lastrowid = 7
+        db_cursor = MonitoredCursor(cnx, inner, SlowQueryLog(0), "mysql", 5000)
+
+        db_cursor.execute("SELECT * FROM drop_data WHERE id = %s", (1,))
+
+        assert db_cursor.fetchall() == [{"id": 1}]
+        assert db_cursor.lastrowid == 7
+        inner.execute.assert_called_once_with(
+            "SELECT /*+ MAX_EXECUTION_TIME(5000) */ * FROM drop_data WHERE id = %s", (1,)
+        )
+
+    def test_slow_statement_logged_with_explain(self, cnx):
+        slow_log = SlowQueryLog(0.001)
+        db_cursor = MonitoredCursor(cnx, MagicMock(), slow_log, "mysql", 5000)
+
+        db_cursor.execute("SELECT * FROM drop_data WHERE itemid = %s", (2000001,))
+        db_cursor.fetchall()
+        db_cursor.close()
+
+        assert len(slow_log.entries) == 1
+        entry = slow_log.entries[0]
+        assert entry["shape"] == "SELECT * FROM drop_data WHERE itemid = %s"
+        assert entry["params"] == params_digest((2000001,))
+        assert entry["explain"][0]["key"] == "idx_drop_data_itemid"
+        cnx.cursor.return_value.execute.assert_called_once_with(
+            "EXPLAIN SELECT * FROM drop_data WHERE itemid = %s", (2000001,)
+        )
+
+    def test_previous_statement_reported_on_next_execute(self, cnx):
+        slow_log = SlowQueryLog(0.001, explain=False)
+        db_cursor = MonitoredCursor(cnx, MagicMock(), slow_log, "mysql")
+
+        db_cursor.execute("SELECT 1")
+        db_cursor.execute("SELECT 2")
+
+        assert [entry["shape"] for entry in slow_log.entries] == ["SELECT 1"]
+        cnx.cursor.assert_not_called()
+
+    def test_explain_failure_is_ignored(self, cnx):
+        cnx.cursor.return_value.execute.side_effect = mysql.connector.Error("denied")
+        slow_log = SlowQueryLog(0.001)
+        db_cursor = MonitoredCursor(cnx, MagicMock(), slow_log, "mysql")
+
+        db_cursor.execute("SELECT 1")
+        db_cursor.close()
+
+        assert slow_log.entries[0]["explain"] is None
+        cnx.cursor.return_value.close.assert_called_once()
@@ -0,0 +1,71 @@
+import pytest
+import mysql.connector
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.schema_migrations import MIGRATIONS, Migration, run_migrations
+
+
+def make_connection(applied, locked=1):
+    """Create a mock connection with the given migrations already recorded."""
+    cnx = MagicMock()
+    db_cursor = MagicMock()
+    db_cursor.fetchone.return_value = (locked,)
+    db_cursor.fetchall.return_value = [(name,) for name in applied]
+    cnx.cursor.return_value = db_cursor
+    return cnx, db_cursor
+
+
+def executed(db_cursor):
+    """SQL text of every execute call, whitespace-normalized."""
+    return [" ".join(call[0][0].split()) for call in db_cursor.execute.call_args_list]
+
+
+class TestRunMigrations:
+    """Tests for run_migrations function."""
+
+    def test_fresh_database_applies_all(self):
+        """Test every migration runs, is recorded and committed."""
+        cnx, db_cursor = make_connection([])
+
+        assert run_migrations(cnx) == [migration.name for migration in MIGRATIONS]
+        statements = executed(db_cursor)
+        assert any("CREATE TABLE IF NOT EXISTS drop_changes" in sql for sql in statements)
+        assert any("CREATE TABLE IF NOT EXISTS drop_mob_summary" in sql for sql in statements)
+        assert any("CREATE TABLE IF NOT EXISTS drop_data_augmented" in sql for sql in statements)
+        assert any(sql.startswith("INSERT INTO drop_mob_summary") for sql in statements)
+        assert any(sql.startswith("INSERT INTO drop_data_augmented") for sql in statements)
+        assert cnx.commit.call_count == len(MIGRATIONS)
+        assert statements[-1].startswith("SELECT RELEASE_LOCK")
+
+    def test_applied_migrations_are_skipped(self):
+        """Test recorded migrations do not run again."""
+        cnx, db_cursor = make_connection([migration.name for migration in MIGRATIONS])
+
+        assert run_migrations(cnx) == []
+        assert not any("drop_changes" in sql for sql in executed(db_cursor))
+        cnx.commit.assert_not_called()
+
+    def test_lock_timeout(self):
+        """Test another replica holding the lock stops startup."""
+        cnx, db_cursor = make_connection([], locked=0)
+
+        with pytest.raises(RuntimeError):
+            run_migrations(cnx)
+        assert len(executed(db_cursor)) == 1
+
+    def test_failure_rolls_back_and_releases_lock(self):
+        """Test a failing migration is not recorded and the lock is released."""
+        cnx, db_cursor = make_connection([])
+        failing = MagicMock(side_effect=mysql.connector.Error("boom"))
+
+        with pytest.raises(mysql.connector.Error):
+            run_migrations(cnx, [Migration("0001_fails", failing)])
+
+        statements = executed(db_cursor)
+        assert not any(sql.startswith("INSERT INTO drop_schema_migrations") for sql in statements)
+        assert statements[-1].startswith("SELECT RELEASE_LOCK")
+        cnx.rollback.assert_called_once()
@@ -0,0 +1,176 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import mysql.connector
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import DropCreate
+from services.drop_writer import WriteOp
+from services.write_coalescer import WriteCoalescer
+from utils.deadline import set_deadline
+
+
+@pytest.fixture
+def drop():
+    return DropCreate(
+        dropperid=100100,
+        itemid=2000001,
+        minimum_quantity=1,
+        maximum_quantity=5,
+        questid=0,
+        chance=100000,
+    )
+
+
+@pytest.fixture
+def connection():
+    """Mock pooled connection whose cursor assigns IDs from 40."""
+    cnx = MagicMock()
+    db_cursor = cnx.cursor.return_value
+    db_cursor.lastrowid = 40
+    db_cursor.fetchone.return_value = (1,)
+    db_cursor.fetchall.return_value = []
+    return cnx
+
+
+class TestWriteCoalescer:
+    """Tests for WriteCoalescer class."""
+
+    async def test_concurrent_writes_share_one_commit(self, connection, drop):
+        """Test writes within the window commit together with their own results."""
+        coalescer = WriteCoalescer(lambda: connection, window=0.05)
+        await coalescer.start()
+
+        results = await asyncio.gather(
+            coalescer.submit(WriteOp("create", drop=drop)),
+            coalescer.submit(WriteOp("create", drop=drop)),
+            coalescer.submit(WriteOp("delete", 9)),
+        )
+        await coalescer.stop()
+
+        assert results == [40, 41, None]
+        connection.commit.assert_called_once()
+
+    async def test_max_batch_splits_transactions(self, connection, drop):
+        """Test a full batch is flushed without waiting for the window."""
+        coalescer = WriteCoalescer(lambda: connection, window=10, max_batch=2)
+        await coalescer.start()
+
+        await asyncio.wait_for(
+            asyncio.gather(*(coalescer.submit(WriteOp("create", drop=drop)) for _ in range(2))),
+            timeout=1,
+        )
+        await coalescer.stop()
+
+        connection.commit.assert_called_once()
+
+    async def test_stop_flushes_queued_writes(self, connection, drop):
+        """Test stopping applies writes that are still waiting for the window."""
+        coalescer = WriteCoalescer(lambda: connection, window=10)
+        await coalescer.start()
+
+        pending = asyncio.ensure_future(coalescer.submit(WriteOp("create", drop=drop)))
+        await asyncio.sleep(0)
+        await coalescer.stop()
+
+        assert await pending == 40
+
+    async def test_submit_requires_start(self, connection, drop):
+        """Test submitting before start fails fast."""
+        with pytest.raises(RuntimeError):
+            await WriteCoalescer(lambda: connection, window=0.01).submit(WriteOp("create", drop=drop))
+
+    async def test_expired_deadline_rejected_at_submit(self, connection, drop):
+        """Test a write whose request already timed out is never queued."""
+        coalescer = WriteCoalescer(lambda: connection, window=0.01)
+        await coalescer.start()
+
+        async def late_write():
+            set_deadline(0)
+            return await coalescer.submit(WriteOp("create", drop=drop))
+
+        with pytest.raises(HTTPException) as exc:
+            await asyncio.ensure_future(late_write())
+        await coalescer.stop()
+
+        assert exc.value.status_code == 504
+        connection.commit.assert_not_called()
+
+    async def test_write_expiring_in_queue_is_not_applied(self, connection, drop):
+        """Test a queued write whose deadline passes is dropped while the rest of the batch commits."""
+        coalescer = WriteCoalescer(lambda: connection, window=0.1)
+        await coalescer.start()
+
+        async def write(budget):
+            set_deadline(budget)
+            return await coalescer.submit(WriteOp("create", drop=drop))
+
+        results = await asyncio.gather(write(0.01), write(5), return_exceptions=True)
+        await coalescer.stop()
+
+        assert isinstance(results[0], HTTPException)
+        assert results[0].status_code == 504
+        assert results[1] == 40
+        executed = [c.args[0].lstrip() for c in connection.cursor.return_value.execute.call_args_list]
+        insert_calls = [sql for sql in executed if sql.startswith("INSERT INTO drop_data")]
+        assert len(insert_calls) == 1
+        connection.commit.assert_called_once()
+
+    async def test_transaction_uses_open_cursor(self, connection, drop):
+        """Test batches run on the cursor the factory opens, not a bare one."""
+        monitored = MagicMock(wraps=connection.cursor.return_value)
+        monitored.lastrowid = 40
+        open_cursor = MagicMock(return_value=monitored)
+        coalescer = WriteCoalescer(lambda: connection, window=0.01, open_cursor=open_cursor)
+        await coalescer.start()
+
+        result = await coalescer.submit(WriteOp("create", drop=drop))
+        await coalescer.stop()
+
+        assert result == 40
+        open_cursor.assert_called_once_with(connection)
+        assert monitored.execute.called
+
+
+class TestCommitBatch:
+    """Tests for WriteCoalescer.commit_batch method."""
+
+    def test_failed_batch_retries_writes_individually(self, connection, drop):
+        """Test one failing write does not fail the rest of its batch."""
+        db_cursor = connection.cursor.return_value
+        failure = mysql.connector.Error("Duplicate entry")
+        calls = {"n": 0}
+
+        def executemany(sql, rows):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise failure
+
+        def execute(sql, params=None):
+            # Drop 9 does not exist; every other statement hits its row.
+            db_cursor.rowcount = 0 if sql.lstrip().startswith("DELETE") else 1
+
+        db_cursor.executemany.side_effect = executemany
+        db_cursor.execute.side_effect = execute
+        db_cursor.fetchone.return_value = None
+        coalescer = WriteCoalescer(lambda: connection, window=0.01)
+
+        outcomes = coalescer.commit_batch([WriteOp("create", drop=drop), WriteOp("delete", 9)])
+
+        assert outcomes == [40, None]
+        connection.rollback.assert_called_once()
+        assert connection.commit.call_count == 2
+
+    def test_single_write_failure_is_returned(self, connection, drop):
+        """Test a failing lone write reports its error."""
+        connection.cursor.return_value.executemany.side_effect = mysql.connector.Error("boom")
+        coalescer = WriteCoalescer(lambda: connection, window=0.01)
+
+        outcomes = coalescer.commit_batch([WriteOp("create", drop=drop)])
+
+        assert isinstance(outcomes[0], mysql.connector.Error)
@@ -2,11 +2,12 @@
 
 import logging
 import os
-from typing import List
+from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response
+from fastapi.responses import JSONResponse
 from pymongo import MongoClient
-from pymongo.errors import PyMongoError
+from pymongo.errors import ExecutionTimeout, PyMongoError
 
 from models import (
     ResolveNamesRequest,
@@ -14,9 +15,13 @@ from models import (
     ResolveIdsRequest,
     ResolveIdsResponse,
     GetAllNamesResponse,
+    NameEntry,
+    NameExportResponse,
     NameIdType,
 )
+from utils.admission import AdmissionController, AdmissionMiddleware
 from utils.auth import User, get_current_user
+from utils.deadline import DeadlineMiddleware, check_deadline, remaining
 from utils.health import router as health_router
 
 logging.basicConfig(level=logging.INFO)
@@ -32,10 +37,37 @@ db = client[DB_NAME]
 collection = db[COLLECTION_NAME]
 logger.info("Connected to MongoDB at %s, database '%s', collection '%s'", MONGO_URI, DB_NAME, COLLECTION_NAME)
 
+admission = AdmissionController.from_env(route_limits={"/api/names/export": 4})
+
 app = FastAPI()
+app.state.admission = admission
+app.add_middleware(AdmissionMiddleware, controller=admission)
+app.add_middleware(DeadlineMiddleware)
 app.include_router(health_router)
 
 
+@app.exception_handler(ExecutionTimeout)
+async def execution_timeout_handler(request: Request, exc: ExecutionTimeout) -> JSONResponse:
+    """Report a Mongo query stopped at the request deadline as 504."""
+    logger.warning("MongoDB query exceeded the request deadline: %s", exc)
+    return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+
+
+def max_time_ms() -> Optional[int]:
+    """
+    Server-side time limit for a Mongo query within the request deadline.
+
+    Returns:
+        Remaining budget in milliseconds, or None without a deadline.
+
+    Raises:
+        HTTPException: 504 if the deadline has already passed.
+    """
+    check_deadline()
+    left = remaining()
+    return None if left is None else max(1, int(left * 1000))
+
+
 @app.post("/api/id-names/resolve", response_model=ResolveNamesResponse)
 async def resolve_names(
     request: ResolveNamesRequest,
@@ -56,7 +88,7 @@ async def resolve_names(
     item_cursor = collection.find({
         "id": {"$in": request.idList},
         "type": request.type
-    })
+    }, max_time_ms=max_time_ms())
     names = {str(doc["id"]): doc["name"] for doc in item_cursor}
 
     return ResolveNamesResponse(names=names)
@@ -81,7 +113,7 @@ async def resolve_ids(
 
     item_cursor = collection.find({
         "name": {"$in": request.nameList},
-    })
+    }, max_time_ms=max_time_ms())
     ids = {
         doc["name"]: {"id": doc["id"], "type": doc["type"]}
         for doc in item_cursor
@@ -126,7 +158,7 @@ async def get_ids_by_name(
     """
     logger.info("User %s requesting IDs for name: %s", user.name, name)
 
-    cursor = collection.find({"name": name}, {"_id": 0, "id": 1, "type": 1})
+    cursor = collection.find({"name": name}, {"_id": 0, "id": 1, "type": 1}, max_time_ms=max_time_ms())
 
     result = []
     for doc in cursor:
@@ -136,6 +168,57 @@ async def get_ids_by_name(
     return result
 
 
+def collection_version() -> str:
+    """
+    Cheap version of the name collection for cache validation.
+
+    Names are static game data that change by reload, so the document count
+    and the newest ObjectId identify a state without reading the documents.
+
+    Returns:
+        Version string.
+    """
+    count = collection.estimated_document_count()
+    newest = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    return f"{count}-{newest['_id'] if newest else 0}"
+
+
+@app.get("/api/names/export", response_model=NameExportResponse)
+async def export_names(
+    if_none_match: Optional[str] = Header(default=None),
+    user: User = Depends(get_current_user),
+):
+    """
+    Export every mob and item name for client-side dictionaries.
+
+    Args:
+        if_none_match: ETag of a previously exported version.
+        user: Current authenticated user.
+
+    Returns:
+        All names with the collection version as ETag, or 304 if the
+        caller's version is current.
+    """
+    version = collection_version()
+    etag = f'"{version}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    logger.info("User %s exporting names (version %s)", user.name, version)
+    cursor = collection.find(
+        {"type": {"$in": ["mob", "item"]}}, {"_id": 0, "id": 1, "type": 1, "name": 1}
+    ).sort("_id", 1)
+    export = NameExportResponse(
+        version=version,
+        names=[NameEntry(id=doc["id"], type=doc["type"], name=doc["name"]) for doc in cursor],
+    )
+    return Response(
+        content=export.model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
 @app.get("/health/ready")
 async def readiness() -> dict:
     """
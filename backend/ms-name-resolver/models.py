@@ -27,4 +27,14 @@ class GetAllNamesResponse(BaseModel):
 # --- Pydantic Models for name-to-ids endpoint ---
 class NameIdType(BaseModel):
     type: str
-    id: int
\ No newline at end of file
+    id: int
+
+# --- Pydantic Models for the name dictionary export ---
+class NameEntry(BaseModel):
+    id: int
+    type: Literal["item", "mob"]
+    name: str
+
+class NameExportResponse(BaseModel):
+    version: str
+    names: List[NameEntry]
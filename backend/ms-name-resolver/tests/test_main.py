@@ -1,7 +1,3 @@
-import pytest
-from unittest.mock import patch, MagicMock
-
-
 class TestResolveNames:
     """Tests for /api/id-names/resolve endpoint."""
 
@@ -180,3 +176,58 @@ class TestGetIdsByName:
         assert len(data) == 1
         assert data[0]["id"] == 100100
         assert data[0]["type"] == "mob"
+
+
+class TestExportNames:
+    """Tests for /api/names/export endpoint."""
+
+    def test_export_names(self, client, mock_collection, sample_mob_docs, sample_item_docs):
+        """Test all names are exported with the collection version as ETag."""
+        mock_collection.estimated_document_count.return_value = 4
+        mock_collection.find_one.return_value = {"_id": "abc"}
+        mock_collection.find.return_value.sort.return_value = iter(sample_mob_docs + sample_item_docs)
+
+        response = client.get("/api/names/export")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"4-abc"'
+        data = response.json()
+        assert data["version"] == "4-abc"
+        assert data["names"][0] == {"id": 100100, "type": "mob", "name": "Snail"}
+        assert len(data["names"]) == 4
+
+    def test_export_not_modified(self, client, mock_collection):
+        """Test a current version is answered with 304 without reading names."""
+        mock_collection.estimated_document_count.return_value = 4
+        mock_collection.find_one.return_value = {"_id": "abc"}
+
+        response = client.get("/api/names/export", headers={"If-None-Match": '"4-abc"'})
+
+        assert response.status_code == 304
+        mock_collection.find.assert_not_called()
+
+
+class TestRequestDeadline:
+    """Tests for request deadline handling."""
+
+    def test_query_limited_to_remaining_budget(self, client, mock_collection, sample_mob_docs):
+        """Test Mongo queries get the remaining budget as maxTimeMS."""
+        mock_collection.find.return_value = iter(sample_mob_docs)
+
+        response = client.post(
+            "/api/id-names/resolve",
+            json={"idList": [100100], "type": "mob"},
+            headers={"X-Request-Timeout-Ms": "2000"},
+        )
+
+        assert response.status_code == 200
+        assert 0 < mock_collection.find.call_args.kwargs["max_time_ms"] <= 2000
+
+    def test_mongo_timeout_is_504(self, client, mock_collection):
+        """Test a query stopped by maxTimeMS is reported as a deadline error."""
+        from pymongo.errors import ExecutionTimeout
+        mock_collection.find.side_effect = ExecutionTimeout("operation exceeded time limit")
+
+        response = client.get("/api/name-to-ids/Snail", headers={"X-Request-Timeout-Ms": "2000"})
+
+        assert response.status_code == 504
@@ -1,11 +1,13 @@
 """Search aggregator microservice with Redis caching."""
 
+import asyncio
 import json
 import logging
+import os
 from contextlib import asynccontextmanager
 
 import httpx
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Path, Header, Depends
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Path, Header, Depends, Request
 
 from utils.config import (
     REDIS_HOST,
@@ -15,15 +17,39 @@ from utils.config import (
     REDIS_CACHE_TTL,
     CACHE_ENABLED,
 )
-from models import AugmentedSearchResponse, ExistenceResponse
-from services.search_orchestrator import search_and_augment_drops, aggregate_existence_by_name
+from models import AugmentedSearchResponse, BatchSearchRequest, BatchSearchResponse, ExistenceResponse
+from services.adaptive_limit import DownstreamRejected
+from services.component_cache import ComponentCache
+from services.http_client import SharedHttpClient
+from services.name_dictionary import NameDictionary
+from services.endpoints import endpoint_sets
+from services.resilience import guards
+from services.route_cache import RouteCache
+from services.snapshot import SNAPSHOT_CHECK_SECONDS, SNAPSHOT_PATH, Snapshot, SnapshotStore
+from services.search_orchestrator import (
+    search_and_augment_drops,
+    search_and_augment_many,
+    aggregate_existence_by_name,
+)
+from utils.admission import AdmissionController, AdmissionMiddleware
 from utils.auth import User, get_current_user
 from utils.cache import CacheClient
+from utils.deadline import DeadlineMiddleware
 from utils.health import router as health_router
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+NAME_DICTIONARY_ENABLED = os.getenv("NAME_DICTIONARY_ENABLED", "true").lower() == "true"
+NAME_DICTIONARY_REFRESH_SECONDS = float(os.getenv("NAME_DICTIONARY_REFRESH_SECONDS", "300"))
+# Cache name resolution, drop lists and ID names separately so searches share parts.
+COMPONENT_CACHE_ENABLED = os.getenv("COMPONENT_CACHE_ENABLED", "true").lower() == "true"
+# Budget for requests arriving without an X-Request-Timeout-Ms header from the edge.
+REQUEST_BUDGET_MS = float(os.getenv("REQUEST_BUDGET_MS", "10000"))
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(REDIS_CACHE_TTL)))
+# Image and drop existence changes with uploads and edits, so it expires sooner.
+EXISTENCE_CACHE_TTL = int(os.getenv("EXISTENCE_CACHE_TTL_SECONDS", "300"))
+
 
 @asynccontextmanager
 async def lifespan(fastapi_app: FastAPI):
@@ -37,6 +63,14 @@ async def lifespan(fastapi_app: FastAPI):
         None after startup completes.
     """
     # Startup
+    fastapi_app.state.http = SharedHttpClient()
+    fastapi_app.state.snapshots = SnapshotStore(SNAPSHOT_PATH, SNAPSHOT_CHECK_SECONDS) if SNAPSHOT_PATH else None
+    snapshot_watch = (
+        asyncio.create_task(fastapi_app.state.snapshots.watch()) if fastapi_app.state.snapshots else None
+    )
+    fastapi_app.state.names = (
+        NameDictionary(NAME_DICTIONARY_REFRESH_SECONDS) if NAME_DICTIONARY_ENABLED else None
+    )
     if CACHE_ENABLED:
         fastapi_app.state.cache = CacheClient(
             host=REDIS_HOST,
@@ -50,22 +84,60 @@ async def lifespan(fastapi_app: FastAPI):
     else:
         fastapi_app.state.cache = None
         logger.info("Cache is disabled")
+    fastapi_app.state.components = (
+        ComponentCache(fastapi_app.state.cache)
+        if fastapi_app.state.cache and COMPONENT_CACHE_ENABLED and not fastapi_app.state.snapshots
+        else None
+    )
 
     yield
 
     # Shutdown
+    if snapshot_watch:
+        snapshot_watch.cancel()
+        fastapi_app.state.snapshots.close()
+    if fastapi_app.state.names:
+        await fastapi_app.state.names.close()
+    await fastapi_app.state.http.aclose()
+    if fastapi_app.state.components:
+        await fastapi_app.state.components.flush()
     if fastapi_app.state.cache:
         await fastapi_app.state.cache.close()
 
 
+def response_cache() -> CacheClient | None:
+    """Cache for whole responses; snapshot mode answers without Redis."""
+    return None if app.state.snapshots else app.state.cache
+
+
+def current_snapshot() -> Snapshot | None:
+    """Mapped snapshot in snapshot mode, None otherwise."""
+    return app.state.snapshots.current if app.state.snapshots else None
+
+
+admission = AdmissionController.from_env()
+# Marked per path and query: a hit for one name says nothing about the cost of another.
+route_cache = RouteCache(
+    response_cache, on_cached=lambda request: admission.mark_cheap(request.url.path, request.url.query)
+)
+
+
+def search_cache_key(name: str, **_) -> str:
+    """Cache key of a drop search; the same as before route caching, so entries carry over."""
+    return name
+
+
 app = FastAPI(lifespan=lifespan)
+app.state.admission = admission
+app.add_middleware(AdmissionMiddleware, controller=admission)
+app.add_middleware(DeadlineMiddleware, default_budget_ms=REQUEST_BUDGET_MS)
 app.include_router(health_router)
 
 
 @app.get("/search/{name}")
+@route_cache.cached(ttl=SEARCH_CACHE_TTL, key=search_cache_key)
 async def search_with_cache(
     name: str,
-    background_tasks: BackgroundTasks,
     authorization: str = Header(...),
     user: User = Depends(get_current_user),
 ) -> dict:
@@ -74,7 +146,6 @@ async def search_with_cache(
 
     Args:
         name: Name of the mob to search for.
-        background_tasks: FastAPI background tasks for async caching.
         authorization: JWT authorization header for downstream calls.
         user: Current authenticated user.
 
@@ -86,54 +157,46 @@ async def search_with_cache(
     """
     logger.info("User %s searching for: %s", user.name, name)
 
-    cache: CacheClient | None = app.state.cache
-    cache_key = name
-
-    # 1. Try cache first
-    if cache and cache.is_connected:
-        cached_data = await cache.get(cache_key)
-        if cached_data:
-            logger.info("Cache hit for %s (user: %s)", name, user.name)
-            return json.loads(cached_data.decode("utf-8"))
-
-    logger.info("Cache miss for %s, fetching from aggregator (user: %s)", name, user.name)
-
-    # 2. Fetch and aggregate data (pass authorization to downstream services)
-    headers = {"Authorization": authorization}
-    async with httpx.AsyncClient(headers=headers) as client:
-        try:
-            augmented_drops = await search_and_augment_drops(client, name)
-            response_data = AugmentedSearchResponse(data=augmented_drops)
-            result = response_data.model_dump()
-
-            # 3. Cache in background (non-blocking)
-            if cache and cache.is_connected:
-                json_data = json.dumps(result).encode("utf-8")
-                background_tasks.add_task(cache.set, cache_key, json_data)
-
-            return result
-        except httpx.HTTPStatusError as e:
-            logger.error("HTTP error during search for user %s: %s", user.name, e)
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=e.response.text
-            ) from e
-        except httpx.RequestError as e:
-            logger.error("Request error during search for user %s: %s", user.name, e)
-            raise HTTPException(
-                status_code=500,
-                detail="Error connecting to downstream service"
-            ) from e
+    # Fetch and aggregate data (pass authorization to downstream services)
+    client = app.state.http.bind({"Authorization": authorization})
+    try:
+        augmented_drops = await search_and_augment_drops(
+            client, name, app.state.names, app.state.components, current_snapshot()
+        )
+        response_data = AugmentedSearchResponse(data=augmented_drops)
+        return response_data.model_dump()
+    except httpx.HTTPStatusError as e:
+        logger.error("HTTP error during search for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=e.response.text
+        ) from e
+    except DownstreamRejected as e:
+        logger.warning("Downstream overloaded for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=503,
+            detail="Downstream service overloaded",
+            headers={"Retry-After": "1"},
+        ) from e
+    except httpx.RequestError as e:
+        logger.error("Request error during search for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=500,
+            detail="Error connecting to downstream service"
+        ) from e
 
 
 @app.get("/api/search/drops-augmented", response_model=AugmentedSearchResponse)
+@route_cache.cached(ttl=SEARCH_CACHE_TTL, key=search_cache_key)
 async def search_drops_augmented(
     name: str = Query(..., description="Name of the mob to search for."),
     authorization: str = Header(...),
     user: User = Depends(get_current_user),
 ) -> AugmentedSearchResponse:
     """
-    Search for augmented drop data (internal API, no caching).
+    Search for augmented drop data.
+
+    Shares cache entries with /search/{name}, which returns the same payload.
 
     Args:
         name: Name of the mob to search for.
@@ -148,26 +211,107 @@ async def search_drops_augmented(
     """
     logger.info("User %s requesting drops-augmented for: %s", user.name, name)
 
-    headers = {"Authorization": authorization}
-    async with httpx.AsyncClient(headers=headers) as client:
+    client = app.state.http.bind({"Authorization": authorization})
+    try:
+        augmented_drops = await search_and_augment_drops(
+            client, name, app.state.names, app.state.components, current_snapshot()
+        )
+        return AugmentedSearchResponse(data=augmented_drops)
+    except httpx.HTTPStatusError as e:
+        logger.error("HTTP error for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=e.response.text
+        ) from e
+    except DownstreamRejected as e:
+        logger.warning("Downstream overloaded for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=503,
+            detail="Downstream service overloaded",
+            headers={"Retry-After": "1"},
+        ) from e
+    except httpx.RequestError as e:
+        logger.error("Request error for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred."
+        ) from e
+
+
+@app.post("/api/search/batch", response_model=BatchSearchResponse)
+async def search_batch(
+    body: BatchSearchRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    authorization: str = Header(...),
+    user: User = Depends(get_current_user),
+) -> BatchSearchResponse:
+    """
+    Search for drops of several names at once.
+
+    Each name is looked up in the same cache entries as /search/{name};
+    the misses are searched together with shared downstream calls and
+    cached per name.
+
+    Args:
+        body: Names to search for.
+        request: Incoming request, for its Cache-Control directives.
+        background_tasks: Stores the fetched names after the response.
+        authorization: JWT authorization header for downstream calls.
+        user: Current authenticated user.
+
+    Returns:
+        Augmented drop data by name and the number of names served from cache.
+
+    Raises:
+        HTTPException: On HTTP errors or internal errors.
+    """
+    name_list = list(dict.fromkeys(body.names))
+    logger.info("User %s batch searching %d names", user.name, len(name_list))
+
+    cached = await route_cache.read_many(request, [search_cache_key(name) for name in name_list])
+    results = {name: json.loads(cached[name])["data"] for name in name_list if name in cached}
+    missing = [name for name in name_list if name not in results]
+    if missing:
+        client = app.state.http.bind({"Authorization": authorization})
         try:
-            augmented_drops = await search_and_augment_drops(client, name)
-            return AugmentedSearchResponse(data=augmented_drops)
+            fetched = await search_and_augment_many(
+                client, missing, app.state.names, app.state.components, current_snapshot()
+            )
         except httpx.HTTPStatusError as e:
             logger.error("HTTP error for user %s: %s", user.name, e)
             raise HTTPException(
                 status_code=e.response.status_code,
                 detail=e.response.text
             ) from e
+        except DownstreamRejected as e:
+            logger.warning("Downstream overloaded for user %s: %s", user.name, e)
+            raise HTTPException(
+                status_code=503,
+                detail="Downstream service overloaded",
+                headers={"Retry-After": "1"},
+            ) from e
         except httpx.RequestError as e:
             logger.error("Request error for user %s: %s", user.name, e)
             raise HTTPException(
                 status_code=500,
                 detail="An internal server error occurred."
             ) from e
+        for name, drops in fetched.items():
+            results[name] = drops
+            route_cache.fill(
+                request, background_tasks, search_cache_key(name), AugmentedSearchResponse(data=drops), SEARCH_CACHE_TTL
+            )
+
+    return BatchSearchResponse(results={name: results[name] for name in name_list}, cache_hits=len(cached))
 
 
 @app.get("/api/existence-check/{name}", response_model=ExistenceResponse)
+@route_cache.cached(
+    ttl=EXISTENCE_CACHE_TTL,
+    key=lambda name, **_: f"existence:{name}",
+    cacheable=lambda result: not result.degraded,
+)
 async def get_existence_check(
     name: str = Path(..., description="Name of the mob or item to check existence for."),
     authorization: str = Header(...),
@@ -182,30 +326,38 @@ async def get_existence_check(
         user: Current authenticated user.
 
     Returns:
-        Existence check response with image and drop status.
+        Existence check response with image and drop status; degraded when
+        image existence could not be checked. Degraded responses are not cached.
 
     Raises:
         HTTPException: On HTTP errors or internal errors.
     """
     logger.info("User %s checking existence for: %s", user.name, name)
 
-    headers = {"Authorization": authorization}
-    async with httpx.AsyncClient(headers=headers) as client:
-        try:
-            results = await aggregate_existence_by_name(client, name)
-            return ExistenceResponse(results=results)
-        except httpx.HTTPStatusError as e:
-            logger.error("HTTP error for user %s: %s", user.name, e)
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=e.response.text
-            ) from e
-        except httpx.RequestError as e:
-            logger.error("Request error for user %s: %s", user.name, e)
-            raise HTTPException(
-                status_code=500,
-                detail="An internal server error occurred."
-            ) from e
+    client = app.state.http.bind({"Authorization": authorization})
+    try:
+        results = await aggregate_existence_by_name(client, name, app.state.names, current_snapshot())
+        degraded = any(result["image_exist"] is None for result in results)
+        return ExistenceResponse(results=results, degraded=degraded)
+    except httpx.HTTPStatusError as e:
+        logger.error("HTTP error for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=e.response.text
+        ) from e
+    except DownstreamRejected as e:
+        logger.warning("Downstream overloaded for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=503,
+            detail="Downstream service overloaded",
+            headers={"Retry-After": "1"},
+        ) from e
+    except httpx.RequestError as e:
+        logger.error("Request error for user %s: %s", user.name, e)
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred."
+        ) from e
 
 
 @app.get("/health/ready")
@@ -227,7 +379,40 @@ async def readiness() -> dict:
         else:
             cache_status = "disconnected"
 
+    names: NameDictionary | None = app.state.names
+    components: ComponentCache | None = app.state.components
+    snapshots: SnapshotStore | None = app.state.snapshots
+
     return {
         "status": "ready",
         "cache": cache_status,
+        "name_dictionary": names.stats() if names else "disabled",
+        "component_cache": components.stats() if components else "disabled",
+        "snapshot": snapshots.stats() if snapshots else "disabled",
     }
+
+
+@app.get("/metrics/http-pool")
+async def http_pool_metrics() -> dict:
+    """
+    Connection pool metrics of the shared downstream HTTP client.
+
+    Returns:
+        Connection counts, configured limits and request counters.
+    """
+    return app.state.http.stats()
+
+
+@app.get("/metrics/downstreams")
+async def downstream_metrics() -> dict:
+    """
+    Circuit breaker, bulkhead and replica state of each downstream service.
+
+    Returns:
+        Breaker state, bulkhead load and per-replica balancing state by downstream name.
+    """
+    return {
+        name: {**guard.stats(), "replicas": endpoint_sets[name].stats() if name in endpoint_sets else {}}
+        for name, guard in guards.items()
+    }
+
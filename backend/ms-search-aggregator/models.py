@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Dict, Any, Literal
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Literal, Optional
 
 class AugmentedDrop(BaseModel):
     id: str
@@ -15,6 +15,13 @@ class AugmentedDrop(BaseModel):
 class AugmentedSearchResponse(BaseModel):
     data: List[AugmentedDrop]
 
+class BatchSearchRequest(BaseModel):
+    names: List[str] = Field(..., min_length=1, max_length=50)
+
+class BatchSearchResponse(BaseModel):
+    results: Dict[str, List[AugmentedDrop]]
+    cache_hits: int = 0
+
 class IdInfo(BaseModel):
     id: int
     type: Literal["item", "mob"]
@@ -22,8 +29,9 @@ class IdInfo(BaseModel):
 class ExistenceInfo(BaseModel):
     id: int
     type: Literal["item", "mob"]
-    image_exist: bool
+    image_exist: Optional[bool]  # None when the image retriever was unavailable
     drop_exist: bool
 
 class ExistenceResponse(BaseModel):
     results: List[ExistenceInfo]
+    degraded: bool = False
@@ -0,0 +1,202 @@
+"""Adaptive outbound concurrency limits per downstream service.
+
+Each downstream service gets a limit on in-flight calls that follows its
+observed latency, in the style of a gradient limiter: while the short-term
+latency stays near the long-term baseline the limit grows, and as latency
+rises above the baseline the limit shrinks in proportion. Timeouts,
+connection errors and overload responses cut the limit multiplicatively.
+A call made while the downstream is at its limit is rejected locally at once
+with DownstreamRejected instead of queueing behind slow calls.
+"""
+
+import logging
+import math
+import os
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+OUTBOUND_LIMIT_ENABLED = os.getenv("OUTBOUND_LIMIT_ENABLED", "true").lower() == "true"
+OUTBOUND_LIMIT_INITIAL = int(os.getenv("OUTBOUND_LIMIT_INITIAL", "20"))
+OUTBOUND_LIMIT_MIN = int(os.getenv("OUTBOUND_LIMIT_MIN", "2"))
+OUTBOUND_LIMIT_MAX = int(os.getenv("OUTBOUND_LIMIT_MAX", "200"))
+# Short-term latency may reach this multiple of the baseline before the limit shrinks.
+OUTBOUND_LIMIT_TOLERANCE = float(os.getenv("OUTBOUND_LIMIT_TOLERANCE", "2.0"))
+OUTBOUND_LIMIT_BACKOFF = float(os.getenv("OUTBOUND_LIMIT_BACKOFF", "0.9"))
+
+# Responses that mean the downstream is overloaded, not that the request was bad.
+OVERLOAD_STATUS_CODES = {429, 503, 504}
+
+
+class DownstreamRejected(httpx.RequestError):
+    """A call rejected locally because its downstream is at its concurrency limit."""
+
+
+class AdaptiveLimiter:
+    """Latency-gradient concurrency limit for one downstream."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = OUTBOUND_LIMIT_INITIAL,
+        min_limit: int = OUTBOUND_LIMIT_MIN,
+        max_limit: int = OUTBOUND_LIMIT_MAX,
+        tolerance: float = OUTBOUND_LIMIT_TOLERANCE,
+        backoff: float = OUTBOUND_LIMIT_BACKOFF,
+        short_window: float = 0.1,
+        long_window: float = 0.002,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Downstream name used in logs and stats.
+            initial_limit: Starting concurrency limit.
+            min_limit: Lowest limit.
+            max_limit: Highest limit.
+            tolerance: Latency over baseline ratio tolerated before shrinking.
+            backoff: Multiplier applied to the limit on a dropped call.
+            short_window: EWMA weight of the short-term latency.
+            long_window: EWMA weight of the long-term baseline latency.
+        """
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.short_window = short_window
+        self.long_window = long_window
+        self.in_flight = 0
+        self.short_rtt: Optional[float] = None
+        self.long_rtt: Optional[float] = None
+        self.rejected = 0
+        self.dropped = 0
+
+    @property
+    def current_limit(self) -> int:
+        """Whole number of calls allowed in flight."""
+        return max(self.min_limit, int(self.limit))
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot for one call.
+
+        Returns:
+            True if the call may proceed, False if it is rejected.
+        """
+        if self.in_flight >= self.current_limit:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, rtt: float, dropped: bool) -> None:
+        """
+        Return a slot and adapt the limit to the call's outcome.
+
+        Args:
+            rtt: Call latency in seconds.
+            dropped: Whether the call timed out, failed to connect or was answered with overload.
+        """
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        if dropped:
+            self.dropped += 1
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            logger.debug("Outbound limit for %s cut to %d after a dropped call", self.name, self.current_limit)
+            return
+
+        if self.short_rtt is None:
+            self.short_rtt = self.long_rtt = rtt
+        else:
+            self.short_rtt += (rtt - self.short_rtt) * self.short_window
+            self.long_rtt += (rtt - self.long_rtt) * self.long_window
+        # Let a baseline inflated by a long overload recover.
+        if self.long_rtt > self.short_rtt * self.tolerance:
+            self.long_rtt *= 0.95
+
+        # Only grow when the limit is actually being used.
+        if in_flight < self.current_limit / 2 and self.short_rtt <= self.long_rtt * self.tolerance:
+            return
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / self.short_rtt))
+        estimate = self.limit * gradient + math.sqrt(self.limit)
+        # Each call moves the limit 1/limit of the way, about one full step per round of calls.
+        self.limit += (estimate - self.limit) / self.limit
+        self.limit = min(self.max_limit, max(self.min_limit, self.limit))
+
+    def abandon(self) -> None:
+        """Return the slot of a call cancelled before it finished, without a latency sample."""
+        self.in_flight -= 1
+
+    def stats(self) -> Dict:
+        """Current limit, load, latency estimates and counters."""
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "short_rtt_ms": None if self.short_rtt is None else round(self.short_rtt * 1000, 1),
+            "long_rtt_ms": None if self.long_rtt is None else round(self.long_rtt * 1000, 1),
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+        }
+
+
+class OutboundLimits:
+    """
+    Adaptive limiters keyed by downstream name, created on first use.
+
+    Calls through an EndpointSet are keyed by the set's name, so replicas
+    of one service share a limit however often their addresses change;
+    other calls fall back to the URL host.
+    """
+
+    def __init__(self, enabled: bool = OUTBOUND_LIMIT_ENABLED, **limiter_kwargs):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled: When False calls are never limited.
+            **limiter_kwargs: Passed to each AdaptiveLimiter.
+        """
+        self.enabled = enabled
+        self.limiter_kwargs = limiter_kwargs
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def for_downstream(self, name: str) -> Optional[AdaptiveLimiter]:
+        """
+        Limiter of a downstream.
+
+        Args:
+            name: Downstream service name, or the URL host of a call outside an EndpointSet.
+
+        Returns:
+            The downstream's limiter, or None when limiting is disabled.
+        """
+        if not self.enabled:
+            return None
+        limiter = self.limiters.get(name)
+        if limiter is None:
+            limiter = self.limiters[name] = AdaptiveLimiter(name, **self.limiter_kwargs)
+        return limiter
+
+    def stats(self) -> Dict[str, Dict]:
+        """Stats of every limiter by downstream."""
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+def is_dropped(response: Optional[httpx.Response], error: Optional[BaseException]) -> bool:
+    """
+    Whether a call outcome signals downstream overload.
+
+    Args:
+        response: Response, if one arrived.
+        error: Exception raised by the call, if any.
+
+    Returns:
+        True for timeouts, transport errors and overload status codes.
+    """
+    if error is not None:
+        return isinstance(error, httpx.TransportError)
+    return response is not None and response.status_code in OVERLOAD_STATUS_CODES
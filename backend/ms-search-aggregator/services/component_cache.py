@@ -0,0 +1,92 @@
+"""Cached building blocks of search augmentation.
+
+The route cache stores whole search responses, so two searches sharing
+most of their items share none of the cached work. ComponentCache keeps
+the parts instead, in three layers of the search cache:
+
+- ``name-id:<name>``: name to ID info
+- ``drops:<type>:<id>``: drop list of a mob or an item
+- ``id-name:<type>:<id>``: name of a mob or an item
+
+Each layer is read with one MGET for all keys a search needs, and only
+the misses are fetched downstream. Writes go out in one pipelined round
+trip after the search has been answered.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Literal, Set
+
+from utils.cache import CacheClient
+
+logger = logging.getLogger(__name__)
+
+Layer = Literal["name-id", "drops", "id-name"]
+
+# Names are only added by imports, drops change with every edit.
+COMPONENT_NAME_TTL = int(os.getenv("COMPONENT_NAME_TTL_SECONDS", "86400"))
+COMPONENT_DROPS_TTL = int(os.getenv("COMPONENT_DROPS_TTL_SECONDS", "600"))
+
+
+class ComponentCache:
+    """Name resolution, drop list and ID name layers on a cache client."""
+
+    def __init__(self, cache: CacheClient, name_ttl: int = COMPONENT_NAME_TTL, drops_ttl: int = COMPONENT_DROPS_TTL):
+        """
+        Initialize the layers.
+
+        Args:
+            cache: Connected cache client.
+            name_ttl: Lifetime of name-id and id-name entries in seconds.
+            drops_ttl: Lifetime of drop list entries in seconds.
+        """
+        self.cache = cache
+        self.ttls: Dict[str, int] = {"name-id": name_ttl, "drops": drops_ttl, "id-name": name_ttl}
+        self.hits: Dict[str, int] = dict.fromkeys(self.ttls, 0)
+        self.misses: Dict[str, int] = dict.fromkeys(self.ttls, 0)
+        self._pending: Set[asyncio.Task] = set()
+
+    async def read(self, layer: Layer, keys: List[str]) -> Dict[str, Any]:
+        """
+        Read several entries of one layer.
+
+        Args:
+            layer: Layer name.
+            keys: Entry keys within the layer, e.g. names or "mob:100100".
+
+        Returns:
+            Decoded value by key for the keys found.
+        """
+        if not keys or not self.cache.is_connected:
+            return {}
+        found = await self.cache.get_many([f"{layer}:{key}" for key in keys])
+        values = {key: json.loads(found[f"{layer}:{key}"]) for key in keys if f"{layer}:{key}" in found}
+        self.hits[layer] += len(values)
+        self.misses[layer] += len(keys) - len(values)
+        return values
+
+    def write(self, layer: Layer, values: Dict[str, Any]) -> None:
+        """
+        Store entries of one layer without waiting for Redis.
+
+        Args:
+            layer: Layer name.
+            values: JSON-serializable value by entry key.
+        """
+        if not values or not self.cache.is_connected:
+            return
+        items = {f"{layer}:{key}": json.dumps(value).encode("utf-8") for key, value in values.items()}
+        task = asyncio.create_task(self.cache.set_many(items, self.ttls[layer]))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def flush(self) -> None:
+        """Wait for writes still in flight."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hits and misses per layer."""
+        return {layer: {"hits": self.hits[layer], "misses": self.misses[layer]} for layer in self.ttls}
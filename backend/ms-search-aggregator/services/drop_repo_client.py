@@ -1,25 +1,94 @@
 """Client for ms-maple-drop-repo service."""
 
+import json
 import logging
-from typing import Any, Dict, List
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
 
 import httpx
 
 from models import IdInfo
+from services.endpoints import EndpointSet
+from services.http_client import RequestClient
+from services.resilience import DownstreamGuard
 
 logger = logging.getLogger(__name__)
 
 DROP_REPO_URL = "http://ms-maple-drop-repo:8000"
+DROP_REPO_BULKHEAD = int(os.getenv("DROP_REPO_BULKHEAD", "20"))
+# A full table export takes far longer than a search.
+DROP_EXPORT_TIMEOUT = float(os.getenv("DROP_EXPORT_TIMEOUT_SECONDS", "300"))
 
+guard = DownstreamGuard("ms-maple-drop-repo", DROP_REPO_BULKHEAD)
+endpoints = EndpointSet.from_env("DROP_REPO", "ms-maple-drop-repo", DROP_REPO_URL)
 
+# Last ETag and body per search, used to revalidate with If-None-Match.
+VALIDATOR_CACHE_SIZE = 1024
+_validator_cache: "OrderedDict[Tuple[Any, ...], Tuple[str, List[Dict[str, Any]]]]" = OrderedDict()
+
+
+def _remember_validator(key: Tuple[Any, ...], etag: str, body: List[Dict[str, Any]]) -> None:
+    """
+    Store a response validator, evicting the least recently used entry.
+
+    Args:
+        key: Search key (id, type[, view]).
+        etag: ETag returned by drop-repo.
+        body: Decoded response body.
+    """
+    _validator_cache[key] = (etag, body)
+    _validator_cache.move_to_end(key)
+    while len(_validator_cache) > VALIDATOR_CACHE_SIZE:
+        _validator_cache.popitem(last=False)
+
+
+async def _search_with_validator(
+    client: RequestClient, path: str, key: Tuple[Any, ...], params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    GET a drop-repo search, revalidating a remembered response with If-None-Match.
+
+    Args:
+        client: Shared HTTP client bound to the caller's authorization header.
+        path: Endpoint path.
+        key: Validator cache key.
+        params: Query parameters.
+
+    Returns:
+        Decoded response body, or the remembered body on 304 Not Modified.
+
+    Raises:
+        httpx.HTTPStatusError: On HTTP errors.
+        httpx.RequestError: On connection errors.
+    """
+    cached = _validator_cache.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = await endpoints.get(client, path, params=params, headers=headers, hedge=path)
+    if cached and response.status_code == 304:
+        logger.debug("Drops not modified for %s", key)
+        _validator_cache.move_to_end(key)
+        return cached[1]
+    response.raise_for_status()
+    drops = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        _remember_validator(key, etag, drops)
+    return drops
+
+
+@guard.protect
 async def fetch_drops_by_mob_id(
-    client: httpx.AsyncClient, idInfo: IdInfo
+    client: RequestClient, idInfo: IdInfo
 ) -> List[Dict[str, Any]]:
     """
     Fetch drop data for a given mob ID from the drop-repo service.
 
+    Sends If-None-Match when a previous response for the same search is
+    known, and reuses that body on 304 Not Modified.
+
     Args:
-        client: HTTP client with authorization headers.
+        client: Shared HTTP client bound to the caller's authorization header.
         idInfo: ID info containing id and type.
 
     Returns:
@@ -30,12 +99,12 @@ async def fetch_drops_by_mob_id(
         httpx.RequestError: On connection errors.
     """
     try:
-        response = await client.get(
-            f"{DROP_REPO_URL}/api/search_drops",
-            params={"query": idInfo["id"], "query_type": idInfo["type"]}
+        return await _search_with_validator(
+            client,
+            "/api/search_drops",
+            (idInfo["id"], idInfo["type"]),
+            {"query": idInfo["id"], "query_type": idInfo["type"]},
         )
-        response.raise_for_status()
-        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error("Error fetching drops: %s - %s", e.response.status_code, e.response.text)
         raise
@@ -44,12 +113,84 @@ async def fetch_drops_by_mob_id(
         raise
 
 
-async def check_drops_exist(client: httpx.AsyncClient, items: List[Dict]) -> List[Dict]:
+@guard.protect
+async def fetch_drops_by_ids(
+    client: RequestClient, ids: List[int], id_type: str
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch drop data for several mob or item IDs in one call.
+
+    Args:
+        client: Shared HTTP client bound to the caller's authorization header.
+        ids: IDs to search.
+        id_type: Type of IDs (mob or item).
+
+    Returns:
+        Dict mapping ID strings to their drop data dictionaries.
+
+    Raises:
+        httpx.HTTPStatusError: On HTTP errors.
+        httpx.RequestError: On connection errors.
+    """
+    if not ids:
+        return {}
+    try:
+        response = await endpoints.post(
+            client,
+            "/api/search_drops/bulk",
+            json={"query_type": id_type, "queries": ids},
+            hedge="/api/search_drops/bulk",
+        )
+        response.raise_for_status()
+        return response.json().get("results", {})
+    except httpx.HTTPStatusError as e:
+        logger.error("Error fetching drops in bulk: %s - %s", e.response.status_code, e.response.text)
+        raise
+    except httpx.RequestError as e:
+        logger.error("Connection error while fetching drops in bulk: %s", e)
+        raise
+
+
+@guard.protect
+async def fetch_augmented_drops(
+    client: RequestClient, idInfo: IdInfo
+) -> List[Dict[str, Any]]:
+    """
+    Fetch drops with dropper and item names from drop-repo's read model.
+
+    Args:
+        client: Shared HTTP client bound to the caller's authorization header.
+        idInfo: ID info containing id and type.
+
+    Returns:
+        List of drop dictionaries shaped like AugmentedDrop.
+
+    Raises:
+        httpx.HTTPStatusError: On HTTP errors.
+        httpx.RequestError: On connection errors.
+    """
+    try:
+        return await _search_with_validator(
+            client,
+            "/api/search_drops/augmented",
+            (idInfo["id"], idInfo["type"], "augmented"),
+            {"query": idInfo["id"], "query_type": idInfo["type"]},
+        )
+    except httpx.HTTPStatusError as e:
+        logger.error("Error fetching augmented drops: %s - %s", e.response.status_code, e.response.text)
+        raise
+    except httpx.RequestError as e:
+        logger.error("Connection error while fetching augmented drops: %s", e)
+        raise
+
+
+@guard.protect
+async def check_drops_exist(client: RequestClient, items: List[Dict]) -> List[Dict]:
     """
     Check for the existence of multiple drops.
 
     Args:
-        client: HTTP client with authorization headers.
+        client: Shared HTTP client bound to the caller's authorization header.
         items: List of items to check.
 
     Returns:
@@ -62,9 +203,11 @@ async def check_drops_exist(client: httpx.AsyncClient, items: List[Dict]) -> Lis
     if not items:
         return []
     try:
-        response = await client.post(
-            f"{DROP_REPO_URL}/api/drops/exist",
-            json={"items": items}
+        response = await endpoints.post(
+            client,
+            "/api/drops/exist",
+            json={"items": items},
+            hedge="/api/drops/exist",
         )
         response.raise_for_status()
         return response.json().get('results', [])
@@ -74,3 +217,32 @@ async def check_drops_exist(client: httpx.AsyncClient, items: List[Dict]) -> Lis
     except httpx.RequestError as e:
         logger.error("Connection error while checking drop existence: %s", e)
         raise
+
+
+@guard.protect
+async def export_drops(client: RequestClient) -> List[Dict[str, Any]]:
+    """
+    Download every drop row as NDJSON.
+
+    Args:
+        client: Shared HTTP client bound to the caller's authorization header.
+
+    Returns:
+        List of drop rows ordered by ID.
+
+    Raises:
+        httpx.HTTPStatusError: On HTTP errors.
+        httpx.RequestError: On connection errors.
+    """
+    try:
+        response = await endpoints.get(
+            client, "/api/drops/export", params={"format": "ndjson"}, timeout=DROP_EXPORT_TIMEOUT
+        )
+        response.raise_for_status()
+        return [json.loads(line) for line in response.text.splitlines() if line]
+    except httpx.HTTPStatusError as e:
+        logger.error("Error exporting drops: %s - %s", e.response.status_code, e.response.text)
+        raise
+    except httpx.RequestError as e:
+        logger.error("Connection error while exporting drops: %s", e)
+        raise
@@ -0,0 +1,357 @@
+"""Client-side load balancing across downstream replicas.
+
+A downstream is reached through an EndpointSet: a fixed list of base URLs
+from ``<PREFIX>_ENDPOINTS``, the addresses of a headless service resolved
+from ``<PREFIX>_DNS`` and refreshed periodically, or the single default
+URL. Each request picks a replica by power of two choices on outstanding
+requests, so keep-alive connections no longer pin traffic to one pod.
+Replicas with consecutive failures, or much slower than their peers, are
+ejected for a while; at most half of the replicas are ejected at once.
+Idempotent reads may be hedged on a second replica (see services.hedging).
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import statistics
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from services.hedging import Hedger
+from services.http_client import RequestClient
+
+logger = logging.getLogger(__name__)
+
+LB_FAILURE_THRESHOLD = int(os.getenv("LB_FAILURE_THRESHOLD", "5"))
+# A replica whose latency exceeds this multiple of its peers' median is ejected.
+LB_SLOW_FACTOR = float(os.getenv("LB_SLOW_FACTOR", "3.0"))
+LB_MIN_REQUESTS = int(os.getenv("LB_MIN_REQUESTS", "20"))
+LB_EJECTION_SECONDS = float(os.getenv("LB_EJECTION_SECONDS", "30"))
+LB_MAX_EJECTION_SECONDS = float(os.getenv("LB_MAX_EJECTION_SECONDS", "300"))
+LB_MAX_EJECTED_FRACTION = float(os.getenv("LB_MAX_EJECTED_FRACTION", "0.5"))
+LB_DNS_REFRESH_SECONDS = float(os.getenv("LB_DNS_REFRESH_SECONDS", "30"))
+LATENCY_EWMA_WEIGHT = 0.2
+
+# Every endpoint set by downstream name, for metrics.
+endpoint_sets: Dict[str, "EndpointSet"] = {}
+
+
+def is_server_error(response: httpx.Response) -> bool:
+    """Whether a response is a 5xx."""
+    return getattr(response, "is_server_error", False) is True
+
+
+class Endpoint:
+    """One replica's base URL with load and health state."""
+
+    def __init__(self, url: str):
+        """
+        Initialize the replica state.
+
+        Args:
+            url: Base URL, e.g. http://10.0.0.7:8000.
+        """
+        self.url = url
+        self.outstanding = 0
+        self.latency: Optional[float] = None
+        self.samples = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    def ejected(self, now: float) -> bool:
+        """Whether the replica is ejected at ``now``."""
+        return now < self.ejected_until
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        """Load, latency and ejection state."""
+        return {
+            "outstanding": self.outstanding,
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+            "consecutive_failures": self.failures,
+            "ejected": self.ejected(now),
+            "ejections": self.ejections,
+        }
+
+
+class EndpointSet:
+    """Replicas of one downstream with per-request balancing and outlier ejection."""
+
+    def __init__(
+        self,
+        name: str,
+        urls: Iterable[str] = (),
+        dns: Optional[str] = None,
+        failure_threshold: int = LB_FAILURE_THRESHOLD,
+        slow_factor: float = LB_SLOW_FACTOR,
+        min_requests: int = LB_MIN_REQUESTS,
+        ejection_seconds: float = LB_EJECTION_SECONDS,
+        max_ejected_fraction: float = LB_MAX_EJECTED_FRACTION,
+        dns_refresh: float = LB_DNS_REFRESH_SECONDS,
+        hedger: Optional[Hedger] = None,
+    ):
+        """
+        Create and register the set.
+
+        Args:
+            name: Downstream service name.
+            urls: Fixed base URLs.
+            dns: ``host:port`` of a headless service whose addresses are the replicas.
+            failure_threshold: Consecutive failures that eject a replica.
+            slow_factor: Latency over the peers' median that ejects a replica.
+            min_requests: Samples a replica needs before it can be ejected as slow.
+            ejection_seconds: First ejection length; repeated ejections last longer.
+            max_ejected_fraction: Largest share of replicas ejected at once.
+            dns_refresh: Seconds between DNS resolutions.
+            hedger: Hedging state for idempotent reads; built from the environment when omitted.
+        """
+        self.name = name
+        self.endpoints: List[Endpoint] = [Endpoint(url.rstrip("/")) for url in urls]
+        self.dns = dns
+        self.failure_threshold = failure_threshold
+        self.slow_factor = slow_factor
+        self.min_requests = min_requests
+        self.ejection_seconds = ejection_seconds
+        self.max_ejected_fraction = max_ejected_fraction
+        self.dns_refresh = dns_refresh
+        self.hedger = hedger or Hedger()
+        self._resolved_at: Optional[float] = None
+        self._resolve_task: Optional[asyncio.Task] = None
+        endpoint_sets[name] = self
+
+    @classmethod
+    def from_env(cls, prefix: str, name: str, default_url: str) -> "EndpointSet":
+        """
+        Build a set from ``<PREFIX>_ENDPOINTS`` or ``<PREFIX>_DNS``.
+
+        Args:
+            prefix: Environment variable prefix, e.g. DROP_REPO.
+            name: Downstream service name.
+            default_url: Base URL used when neither variable is set.
+
+        Returns:
+            Configured endpoint set.
+        """
+        urls = [url.strip() for url in os.getenv(f"{prefix}_ENDPOINTS", "").split(",") if url.strip()]
+        dns = os.getenv(f"{prefix}_DNS") or None
+        if not urls and not dns:
+            urls = [default_url]
+        return cls(name, urls, dns)
+
+    async def resolve(self) -> None:
+        """Replace the replicas with the DNS addresses, keeping state of known ones."""
+        host, _, port = self.dns.rpartition(":")
+        self._resolved_at = time.monotonic()
+        infos = await asyncio.get_running_loop().getaddrinfo(host, int(port), type=socket.SOCK_STREAM)
+        urls = sorted({f"http://{info[4][0]}:{port}" for info in infos})
+        if not urls:
+            logger.warning("DNS for %s returned no addresses, keeping %d replicas", self.name, len(self.endpoints))
+            return
+        known = {endpoint.url: endpoint for endpoint in self.endpoints}
+        self.endpoints = [known.get(url) or Endpoint(url) for url in urls]
+
+    async def _resolve_logged(self) -> None:
+        """Resolve, logging failures instead of raising them into the event loop."""
+        try:
+            await self.resolve()
+        except (OSError, ValueError) as e:
+            logger.warning("DNS resolution for %s failed: %s", self.name, e)
+
+    async def _refresh(self) -> None:
+        """Resolve on first use and refresh in the background when due."""
+        if not self.dns:
+            return
+        if not self.endpoints:
+            await self._resolve_logged()
+            if not self.endpoints:
+                raise httpx.ConnectError(f"No replicas resolved for {self.name}")
+            return
+        due = self._resolved_at is None or time.monotonic() - self._resolved_at >= self.dns_refresh
+        if due and (self._resolve_task is None or self._resolve_task.done()):
+            self._resolve_task = asyncio.create_task(self._resolve_logged())
+
+    def pick(self, exclude: Iterable[str] = ()) -> Endpoint:
+        """
+        Choose a replica by power of two choices on outstanding requests.
+
+        Ties go to the replica with fewer recent failures, then lower latency.
+
+        Args:
+            exclude: Base URLs to avoid, e.g. the replica of a hedged attempt.
+
+        Returns:
+            The chosen replica; ejected or excluded replicas are used only when nothing else is left.
+        """
+        now = time.monotonic()
+        exclude = set(exclude)
+        candidates = [e for e in self.endpoints if e.url not in exclude and not e.ejected(now)]
+        if not candidates:
+            candidates = [e for e in self.endpoints if e.url not in exclude] or self.endpoints
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = random.sample(candidates, 2)
+        return min(first, second, key=lambda e: (e.outstanding, e.failures, e.latency or 0.0))
+
+    def _eject(self, endpoint: Endpoint, now: float, reason: str) -> None:
+        """Eject a replica unless that would exceed the ejected share."""
+        ejected = sum(1 for e in self.endpoints if e.ejected(now))
+        if ejected + 1 > int(len(self.endpoints) * self.max_ejected_fraction):
+            return
+        endpoint.ejections += 1
+        duration = min(LB_MAX_EJECTION_SECONDS, self.ejection_seconds * endpoint.ejections)
+        endpoint.ejected_until = now + duration
+        # Start fresh when the replica comes back.
+        endpoint.failures = 0
+        endpoint.latency = None
+        endpoint.samples = 0
+        logger.warning("Ejected %s replica %s for %.0fs: %s", self.name, endpoint.url, duration, reason)
+
+    def record(self, endpoint: Endpoint, rtt: float, failed: bool) -> None:
+        """
+        Record a finished request and eject the replica if it became an outlier.
+
+        Args:
+            endpoint: Replica the request went to.
+            rtt: Request latency in seconds.
+            failed: Whether the request failed in transport or with a 5xx.
+        """
+        now = time.monotonic()
+        if failed:
+            endpoint.failures += 1
+            if endpoint.failures >= self.failure_threshold:
+                self._eject(endpoint, now, f"{endpoint.failures} consecutive failures")
+            return
+
+        endpoint.failures = 0
+        endpoint.samples += 1
+        if endpoint.latency is None:
+            endpoint.latency = rtt
+        else:
+            endpoint.latency += (rtt - endpoint.latency) * LATENCY_EWMA_WEIGHT
+        if endpoint.samples < self.min_requests:
+            return
+        peers = [
+            e.latency for e in self.endpoints
+            if e is not endpoint and e.latency is not None and not e.ejected(now)
+        ]
+        if peers and endpoint.latency > self.slow_factor * statistics.median(peers):
+            self._eject(endpoint, now, f"latency {endpoint.latency * 1000:.0f}ms")
+
+    async def _send(
+        self, client: RequestClient, endpoint: Endpoint, method: str, path: str, operation: Optional[str], **kwargs: Any
+    ) -> httpx.Response:
+        """Send one attempt to a replica and record its outcome."""
+        call = client.get if method == "GET" else client.post
+        endpoint.outstanding += 1
+        started = time.perf_counter()
+        # Local rejections and cancelled attempts say nothing about the replica.
+        failed: Optional[bool] = None
+        try:
+            response = await call(f"{endpoint.url}{path}", downstream=self.name, **kwargs)
+            failed = is_server_error(response)
+            return response
+        except httpx.TransportError:
+            failed = True
+            raise
+        finally:
+            endpoint.outstanding -= 1
+            if failed is not None:
+                latency = time.perf_counter() - started
+                self.record(endpoint, latency, failed)
+                if operation and not failed:
+                    self.hedger.observe(operation, latency)
+
+    async def _hedged(
+        self,
+        client: RequestClient,
+        endpoint: Endpoint,
+        delay: float,
+        method: str,
+        path: str,
+        operation: str,
+        exclude: Iterable[str],
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send an attempt and hedge it on another replica once it outlasts the delay."""
+        first = asyncio.create_task(self._send(client, endpoint, method, path, operation, **kwargs))
+        attempts = {first}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done:
+                return first.result()
+            hedge_endpoint = self.pick([*exclude, endpoint.url])
+            if hedge_endpoint is endpoint:
+                return await first
+            if not self.hedger.budget.try_spend():
+                self.hedger.over_budget += 1
+                return await first
+            self.hedger.hedged += 1
+            second = asyncio.create_task(self._send(client, hedge_endpoint, method, path, operation, **kwargs))
+            attempts.add(second)
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and not is_server_error(task.result()):
+                        if task is second:
+                            self.hedger.hedge_wins += 1
+                        return task.result()
+            # Both attempts failed; report the original one.
+            return first.result()
+        finally:
+            for task in attempts:
+                task.cancel()
+            if attempts:
+                await asyncio.gather(*attempts, return_exceptions=True)
+
+    async def request(
+        self,
+        client: RequestClient,
+        method: str,
+        path: str,
+        exclude: Iterable[str] = (),
+        hedge: Optional[str] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request to a chosen replica.
+
+        Args:
+            client: Shared HTTP client bound to the caller's authorization header.
+            method: "GET" or "POST".
+            path: Path below the base URL.
+            exclude: Base URLs to avoid.
+            hedge: Operation name for an idempotent read that may be hedged; None never hedges.
+            **kwargs: Passed to the client call.
+
+        Returns:
+            Downstream response.
+
+        Raises:
+            httpx.RequestError: On connection errors, or when no replica resolves.
+        """
+        await self._refresh()
+        endpoint = self.pick(exclude)
+        delay = self.hedger.delay(hedge) if hedge else None
+        if delay is None or len(self.endpoints) < 2:
+            return await self._send(client, endpoint, method, path, hedge, **kwargs)
+        return await self._hedged(client, endpoint, delay, method, path, hedge, exclude, **kwargs)
+
+    async def get(self, client: RequestClient, path: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request to a chosen replica."""
+        return await self.request(client, "GET", path, **kwargs)
+
+    async def post(self, client: RequestClient, path: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request to a chosen replica."""
+        return await self.request(client, "POST", path, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Replica states by base URL and hedging counters."""
+        now = time.monotonic()
+        return {
+            "endpoints": {endpoint.url: endpoint.stats(now) for endpoint in self.endpoints},
+            "hedging": self.hedger.stats(),
+        }
@@ -0,0 +1,155 @@
+"""Hedged requests for idempotent downstream reads.
+
+A hedged call starts one attempt and, if it has not answered within the
+observed p95 latency of that operation, starts a second attempt on a
+different replica. The first successful response wins and the other
+attempt is cancelled. Hedges are paid for from a token budget that earns
+a fraction of a token per call, so hedging adds at most that fraction of
+extra load even when a whole downstream is slow.
+"""
+
+import math
+import os
+from collections import deque
+from typing import Deque, Dict, Optional
+
+HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+# Extra attempts allowed per call, e.g. 0.05 for at most 5% more requests.
+HEDGE_BUDGET_RATIO = float(os.getenv("HEDGE_BUDGET_RATIO", "0.05"))
+HEDGE_BUDGET_BURST = float(os.getenv("HEDGE_BUDGET_BURST", "10"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY_MS = float(os.getenv("HEDGE_MIN_DELAY_MS", "5"))
+HEDGE_WINDOW = int(os.getenv("HEDGE_WINDOW", "200"))
+
+
+class LatencyWindow:
+    """Recent successful latencies of one operation."""
+
+    def __init__(self, size: int = HEDGE_WINDOW):
+        """
+        Initialize the window.
+
+        Args:
+            size: Number of latencies kept.
+        """
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, latency: float) -> None:
+        """Record a latency in seconds."""
+        self.samples.append(latency)
+
+    def percentile(self, quantile: float) -> float:
+        """Latency at the given quantile of the window."""
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(quantile * len(ordered)) - 1)]
+
+
+class HedgeBudget:
+    """Token bucket limiting hedges to a fraction of calls."""
+
+    def __init__(self, ratio: float = HEDGE_BUDGET_RATIO, burst: float = HEDGE_BUDGET_BURST):
+        """
+        Initialize an empty budget.
+
+        Args:
+            ratio: Tokens earned per call; one token pays for one hedge.
+            burst: Most tokens that can be saved up.
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = 0.0
+
+    def earn(self) -> None:
+        """Credit one call."""
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Pay for a hedge.
+
+        Returns:
+            True if a token was available.
+        """
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class Hedger:
+    """Per-operation hedge delays and the shared hedge budget of one downstream."""
+
+    def __init__(
+        self,
+        enabled: bool = HEDGING_ENABLED,
+        quantile: float = HEDGE_PERCENTILE,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        min_delay_ms: float = HEDGE_MIN_DELAY_MS,
+        budget: Optional[HedgeBudget] = None,
+    ):
+        """
+        Initialize the hedger.
+
+        Args:
+            enabled: When False calls are never hedged.
+            quantile: Latency quantile after which a hedge starts.
+            min_samples: Latencies an operation needs before it is hedged.
+            min_delay_ms: Shortest hedge delay.
+            budget: Hedge budget; a default one when omitted.
+        """
+        self.enabled = enabled
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay = min_delay_ms / 1000
+        self.budget = budget or HedgeBudget()
+        self.windows: Dict[str, LatencyWindow] = {}
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.over_budget = 0
+
+    def delay(self, operation: str) -> Optional[float]:
+        """
+        Time to wait before hedging a call, crediting the budget.
+
+        Args:
+            operation: Operation name, e.g. "search_drops".
+
+        Returns:
+            Seconds until a hedge, or None if the call is not hedged.
+        """
+        if not self.enabled:
+            return None
+        self.budget.earn()
+        window = self.windows.get(operation)
+        if window is None or len(window.samples) < self.min_samples:
+            return None
+        return max(self.min_delay, window.percentile(self.quantile))
+
+    def observe(self, operation: str, latency: float) -> None:
+        """
+        Record a successful attempt's latency.
+
+        Args:
+            operation: Operation name.
+            latency: Attempt latency in seconds.
+        """
+        window = self.windows.get(operation)
+        if window is None:
+            window = self.windows[operation] = LatencyWindow()
+        window.add(latency)
+
+    def stats(self) -> Dict:
+        """Hedge counters, budget and current delays."""
+        return {
+            "enabled": self.enabled,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "over_budget": self.over_budget,
+            "budget_tokens": round(self.budget.tokens, 2),
+            "delays_ms": {
+                operation: round(window.percentile(self.quantile) * 1000, 1)
+                for operation, window in self.windows.items()
+                if len(window.samples) >= self.min_samples
+            },
+        }
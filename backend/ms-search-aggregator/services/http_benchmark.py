@@ -0,0 +1,112 @@
+"""Requests-per-second benchmark for per-request vs shared HTTP clients.
+
+Compares the old pattern of one AsyncClient per incoming request with the
+app-lifetime SharedHttpClient against any downstream URL:
+    python -m services.http_benchmark http://ms-maple-drop-repo:8000/health/live \
+        --requests 2000 --concurrency 50 --calls-per-request 3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from services.http_client import SharedHttpClient
+
+
+async def run_load(
+    handle_request: Callable[[], Awaitable[None]], requests: int, concurrency: int
+) -> float:
+    """
+    Run simulated incoming requests with bounded concurrency.
+
+    Args:
+        handle_request: One simulated incoming request.
+        requests: Number of incoming requests.
+        concurrency: Requests in flight at once.
+
+    Returns:
+        Incoming requests per second.
+    """
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            await handle_request()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def benchmark(url: str, requests: int, concurrency: int, calls: int, http2: bool) -> Dict[str, float]:
+    """
+    Measure both client strategies against a URL.
+
+    Args:
+        url: Downstream URL to GET.
+        requests: Simulated incoming requests per strategy.
+        concurrency: Incoming requests in flight at once.
+        calls: Downstream calls per incoming request, as made by one search.
+        http2: Enable HTTP/2 on the shared client.
+
+    Returns:
+        Requests per second keyed by strategy.
+    """
+    headers = {"Authorization": "Bearer benchmark"}
+
+    async def per_request_client() -> None:
+        async with httpx.AsyncClient(headers=headers) as client:
+            for _ in range(calls):
+                (await client.get(url)).raise_for_status()
+
+    shared = SharedHttpClient(max_connections=concurrency, max_keepalive_connections=concurrency, http2=http2)
+
+    async def shared_client() -> None:
+        client = shared.bind(headers)
+        for _ in range(calls):
+            (await client.get(url)).raise_for_status()
+
+    try:
+        results = {
+            "per_request": await run_load(per_request_client, requests, concurrency),
+            "shared": await run_load(shared_client, requests, concurrency),
+        }
+        results["shared_connections"] = shared.stats()["connections"]
+        return results
+    finally:
+        await shared.aclose()
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command line arguments.
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark per-request vs shared HTTP clients.")
+    parser.add_argument("url", help="Downstream URL to GET.")
+    parser.add_argument("--requests", type=int, default=1000, help="Simulated incoming requests.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Incoming requests in flight.")
+    parser.add_argument("--calls-per-request", type=int, default=3, help="Downstream calls per request.")
+    parser.add_argument("--http2", action="store_true", help="Enable HTTP/2 on the shared client.")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        benchmark(args.url, args.requests, args.concurrency, args.calls_per_request, args.http2)
+    )
+    print(f"per-request client: {results['per_request']:.1f} req/s")
+    print(f"shared client:      {results['shared']:.1f} req/s "
+          f"({results['shared'] / results['per_request']:.2f}x, {results['shared_connections']} connections)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
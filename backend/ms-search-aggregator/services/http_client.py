@@ -0,0 +1,194 @@
+"""App-lifetime pooled HTTP client for downstream service calls.
+
+One httpx.AsyncClient is created in the application lifespan and shared by
+all requests, so connections to downstream services are kept alive and
+reused. Per-request headers such as Authorization are bound with
+``SharedHttpClient.bind`` and sent on each call instead of being baked
+into the client. Each call also carries the remaining request budget and
+times out when it runs out, and is subject to the adaptive concurrency
+limit of its downstream.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from services.adaptive_limit import DownstreamRejected, OutboundLimits, is_dropped
+from utils.deadline import deadline_headers, deadline_timeout
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT_SECONDS", "5"))
+# Needs the h2 package (the "http2" extra); falls back to HTTP/1.1 without it.
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+
+class SharedHttpClient:
+    """Pooled AsyncClient with request counters for pool metrics."""
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        timeout: float = HTTP_TIMEOUT,
+        http2: bool = HTTP2_ENABLED,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        outbound_limits: Optional[OutboundLimits] = None,
+    ):
+        """
+        Create the underlying client.
+
+        Args:
+            max_connections: Maximum open connections across all hosts.
+            max_keepalive_connections: Idle connections kept for reuse.
+            keepalive_expiry: Seconds an idle connection is kept.
+            timeout: Default timeout for each call in seconds.
+            http2: Negotiate HTTP/2 where the server supports it.
+            transport: Transport override, for tests.
+            outbound_limits: Per-downstream adaptive limiters; built from the environment when omitted.
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP2_ENABLED is set but h2 is not installed, using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.timeout = timeout
+        self.client = httpx.AsyncClient(limits=self.limits, timeout=timeout, http2=http2, transport=transport)
+        self.outbound_limits = outbound_limits or OutboundLimits()
+        self.requests_total = 0
+        self.errors_total = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._started = time.monotonic()
+
+    def bind(self, headers: Dict[str, str]) -> "RequestClient":
+        """
+        Bind per-request headers for downstream calls.
+
+        Args:
+            headers: Headers sent with every call, e.g. Authorization.
+
+        Returns:
+            Client view for one incoming request.
+        """
+        return RequestClient(self, headers)
+
+    async def request(
+        self, method: str, url: str, headers: Dict[str, str], downstream: Optional[str] = None, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request on the shared pool within the current request deadline.
+
+        Args:
+            method: HTTP method.
+            url: Absolute URL.
+            headers: Headers for this call.
+            downstream: Downstream service name keying the concurrency limit; defaults to the URL host.
+            **kwargs: Passed to httpx.AsyncClient.request.
+
+        Returns:
+            Downstream response.
+
+        Raises:
+            HTTPException: 504 if the request deadline has already passed.
+            DownstreamRejected: If the downstream is at its concurrency limit.
+        """
+        kwargs.setdefault("timeout", deadline_timeout(self.timeout))
+        headers = {**headers, **deadline_headers()}
+        limiter = self.outbound_limits.for_downstream(downstream or httpx.URL(url).host)
+        if limiter and not limiter.try_acquire():
+            raise DownstreamRejected(f"{limiter.name} is at its concurrency limit of {limiter.current_limit}")
+        self.requests_total += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        started = time.perf_counter()
+        response = error = None
+        cancelled = False
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+            return response
+        except httpx.RequestError as e:
+            self.errors_total += 1
+            error = e
+            raise
+        except asyncio.CancelledError:
+            # E.g. the losing attempt of a hedged read; its elapsed time is not a latency.
+            cancelled = True
+            raise
+        finally:
+            self.in_flight -= 1
+            if limiter and cancelled:
+                limiter.abandon()
+            elif limiter:
+                limiter.release(time.perf_counter() - started, is_dropped(response, error))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool and request metrics.
+
+        Returns:
+            Connection counts by state, configured limits and request counters.
+        """
+        pool = getattr(self.client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        http2 = sum(1 for connection in connections if "HTTP/2" in connection.info())
+        return {
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "http2_connections": http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "http2_enabled": self.http2,
+            "requests_total": self.requests_total,
+            "errors_total": self.errors_total,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "uptime_seconds": round(time.monotonic() - self._started, 1),
+            "outbound_limits": self.outbound_limits.stats(),
+        }
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self.client.aclose()
+
+
+class RequestClient:
+    """Shared client view that adds one incoming request's headers to each call."""
+
+    def __init__(self, shared: SharedHttpClient, headers: Dict[str, str]):
+        """
+        Initialize the view.
+
+        Args:
+            shared: App-lifetime client.
+            headers: Headers sent with every call.
+        """
+        self.shared = shared
+        self.headers = headers
+
+    def _headers(self, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Merge call-specific headers over the bound ones."""
+        return {**self.headers, **headers} if headers else self.headers
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> httpx.Response:
+        """Send a GET request."""
+        return await self.shared.request("GET", url, self._headers(headers), **kwargs)
+
+    async def post(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> httpx.Response:
+        """Send a POST request."""
+        return await self.shared.request("POST", url, self._headers(headers), **kwargs)
@@ -1,21 +1,31 @@
 """Client for ms-image-retriever service."""
 
 import logging
+import os
 from typing import Dict, List
 
 import httpx
 
+from services.endpoints import EndpointSet
+from services.http_client import RequestClient
+from services.resilience import DownstreamGuard
+
 logger = logging.getLogger(__name__)
 
 IMAGE_RETRIEVER_URL = "http://ms-image-retriever:8000"
+IMAGE_RETRIEVER_BULKHEAD = int(os.getenv("IMAGE_RETRIEVER_BULKHEAD", "10"))
+
+guard = DownstreamGuard("ms-image-retriever", IMAGE_RETRIEVER_BULKHEAD)
+endpoints = EndpointSet.from_env("IMAGE_RETRIEVER", "ms-image-retriever", IMAGE_RETRIEVER_URL)
 
 
-async def check_images_exist(client: httpx.AsyncClient, items: List[Dict]) -> List[Dict]:
+@guard.protect
+async def check_images_exist(client: RequestClient, items: List[Dict]) -> List[Dict]:
     """
     Check for the existence of multiple images.
 
     Args:
-        client: HTTP client with authorization headers.
+        client: Shared HTTP client bound to the caller's authorization header.
         items: List of image items to check.
 
     Returns:
@@ -28,9 +38,11 @@ async def check_images_exist(client: httpx.AsyncClient, items: List[Dict]) -> Li
     if not items:
         return []
     try:
-        response = await client.post(
-            f"{IMAGE_RETRIEVER_URL}/api/images/exist",
-            json={"images": items}
+        response = await endpoints.post(
+            client,
+            "/api/images/exist",
+            json={"images": items},
+            hedge="/api/images/exist",
         )
         response.raise_for_status()
         return response.json().get('results', [])
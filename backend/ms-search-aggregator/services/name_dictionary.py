@@ -0,0 +1,189 @@
+"""Aggregator-local id↔name dictionary for mobs and items.
+
+Names are static game data, so the aggregator keeps a copy of the name
+resolver's collection and resolves searches without remote lookups. The
+copy is revalidated against the resolver's collection version at most
+every ``refresh_interval`` seconds in the background; an unchanged version
+costs one 304 response. Names learned from remote fallbacks on a miss are
+added as they arrive.
+
+Downstream calls need the caller's token, so the first load happens in the
+background of the first request after startup rather than in the lifespan.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services import name_resolver_client
+from services.http_client import RequestClient
+from utils.deadline import set_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class NameDictionary:
+    """In-memory id→name maps per type and a name→(type, id) index."""
+
+    def __init__(self, refresh_interval: float = 300.0):
+        """
+        Initialize an empty dictionary.
+
+        Args:
+            refresh_interval: Seconds between version checks against the resolver.
+        """
+        self.refresh_interval = refresh_interval
+        self.version: Optional[str] = None
+        self._by_id: Dict[str, Dict[int, str]] = {"mob": {}, "item": {}}
+        self._by_name: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        self._checked_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether a full export has been loaded."""
+        return self.version is not None
+
+    def load(self, version: str, entries: Iterable[Dict]) -> None:
+        """
+        Replace the dictionary with a full export.
+
+        Args:
+            version: Collection version of the export.
+            entries: Dicts with id, type and name, in collection order.
+        """
+        by_id: Dict[str, Dict[int, str]] = {"mob": {}, "item": {}}
+        by_name: Dict[str, List[Tuple[str, int]]] = {}
+        for entry in entries:
+            by_id[entry["type"]][entry["id"]] = entry["name"]
+            by_name.setdefault(entry["name"], []).append((entry["type"], entry["id"]))
+        self._by_id = by_id
+        self._by_name = {name: tuple(ids) for name, ids in by_name.items()}
+        self.version = version
+        logger.info("Loaded %d mob and %d item names (version %s)", len(by_id["mob"]), len(by_id["item"]), version)
+
+    def remember(self, names: Dict[str, str], id_type: str) -> None:
+        """
+        Add names resolved remotely after a local miss.
+
+        Args:
+            names: ID string to name mapping from the resolver.
+            id_type: "mob" or "item".
+        """
+        for id_str, name in names.items():
+            drop_id = int(id_str)
+            self._by_id[id_type][drop_id] = name
+            ids = self._by_name.get(name, ())
+            if (id_type, drop_id) not in ids:
+                self._by_name[name] = ids + ((id_type, drop_id),)
+
+    def name_to_id(self, name: str) -> Optional[Dict]:
+        """
+        Resolve a name like the resolver's names-id endpoint.
+
+        Args:
+            name: Mob or item name.
+
+        Returns:
+            {"id", "type"} of the last matching entry, or None on a miss.
+        """
+        ids = self._by_name.get(name)
+        if not ids:
+            return None
+        id_type, drop_id = ids[-1]
+        return {"id": drop_id, "type": id_type}
+
+    def ids_for_name(self, name: str) -> List[Dict]:
+        """
+        All ID/type pairs for a name.
+
+        Args:
+            name: Mob or item name.
+
+        Returns:
+            List of {"type", "id"} dicts; empty on a miss.
+        """
+        return [{"type": id_type, "id": drop_id} for id_type, drop_id in self._by_name.get(name, ())]
+
+    def all_names(self) -> List[str]:
+        """Every distinct name, sorted."""
+        return sorted(self._by_name)
+
+    def names_for_ids(self, ids: List[int], id_type: str) -> Tuple[Dict[str, str], List[int]]:
+        """
+        Resolve IDs locally.
+
+        Args:
+            ids: IDs to resolve.
+            id_type: "mob" or "item".
+
+        Returns:
+            (ID string to name mapping, IDs not in the dictionary).
+        """
+        known = self._by_id[id_type]
+        names, missing = {}, []
+        for drop_id in ids:
+            name = known.get(drop_id)
+            if name is None:
+                missing.append(drop_id)
+            else:
+                names[str(drop_id)] = name
+        return names, missing
+
+    async def refresh(self, client: RequestClient) -> bool:
+        """
+        Revalidate against the resolver and reload if the version changed.
+
+        Args:
+            client: Shared HTTP client bound to a caller's authorization header.
+
+        Returns:
+            True if a new version was loaded.
+        """
+        self._checked_at = time.monotonic()
+        export = await name_resolver_client.export_names(client, self.version)
+        if export is None:
+            return False
+        self.load(export["version"], export["names"])
+        return True
+
+    def schedule_refresh(self, client: RequestClient) -> None:
+        """
+        Start a background refresh when the dictionary is empty or due.
+
+        Args:
+            client: Shared HTTP client bound to the current caller's authorization header.
+        """
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        if self._checked_at is not None and time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_logged(client))
+
+    async def _refresh_logged(self, client: RequestClient) -> None:
+        """Refresh, logging failures instead of raising them into the event loop."""
+        # The task outlives the request that started it; drop its deadline.
+        set_deadline(None)
+        try:
+            await self.refresh(client)
+        except Exception as e:
+            logger.warning("Name dictionary refresh failed: %s", e)
+
+    async def close(self) -> None:
+        """Cancel a running refresh."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict:
+        """Dictionary size and version."""
+        return {
+            "loaded": self.loaded,
+            "version": self.version,
+            "mobs": len(self._by_id["mob"]),
+            "items": len(self._by_id["item"]),
+        }
@@ -1,21 +1,31 @@
 """Client for ms-name-resolver service."""
 
 import logging
+import os
 from typing import Dict, List
 
 import httpx
 
+from services.endpoints import EndpointSet
+from services.http_client import RequestClient
+from services.resilience import DownstreamGuard
+
 logger = logging.getLogger(__name__)
 
 NAME_RESOLVER_URL = "http://ms-name-resolver:8000"
+NAME_RESOLVER_BULKHEAD = int(os.getenv("NAME_RESOLVER_BULKHEAD", "20"))
+
+guard = DownstreamGuard("ms-name-resolver", NAME_RESOLVER_BULKHEAD)
+endpoints = EndpointSet.from_env("NAME_RESOLVER", "ms-name-resolver", NAME_RESOLVER_URL)
 
 
-async def resolve_name_to_id(client: httpx.AsyncClient, name: str) -> dict | None:
+@guard.protect
+async def resolve_name_to_id(client: RequestClient, name: str) -> dict | None:
     """
     Resolve a single name to an ID.
 
     Args:
-        client: HTTP client with authorization headers.
+        client: Shared HTTP client bound to the caller's authorization header.
         name: Name to resolve.
 
     Returns:
@@ -25,9 +35,11 @@ async def resolve_name_to_id(client: httpx.AsyncClient, name: str) -> dict | Non
         httpx.HTTPStatusError: On HTTP errors.
     """
     try:
-        response = await client.post(
-            f"{NAME_RESOLVER_URL}/api/names-id/resolve",
-            json={"nameList": [name]}
+        response = await endpoints.post(
+            client,
+            "/api/names-id/resolve",
+            json={"nameList": [name]},
+            hedge="/api/names-id/resolve",
         )
         response.raise_for_status()
         resolved_ids = response.json().get("ids", {})
@@ -37,8 +49,40 @@ async def resolve_name_to_id(client: httpx.AsyncClient, name: str) -> dict | Non
         raise
 
 
+@guard.protect
+async def resolve_names_to_ids(client: RequestClient, names: List[str]) -> Dict[str, Dict]:
+    """
+    Resolve several names to IDs in one call.
+
+    Args:
+        client: Shared HTTP client bound to the caller's authorization header.
+        names: Names to resolve.
+
+    Returns:
+        Dict mapping each found name to its ID info; unknown names are absent.
+
+    Raises:
+        httpx.HTTPStatusError: On HTTP errors.
+    """
+    if not names:
+        return {}
+    try:
+        response = await endpoints.post(
+            client,
+            "/api/names-id/resolve",
+            json={"nameList": names},
+            hedge="/api/names-id/resolve",
+        )
+        response.raise_for_status()
+        return response.json().get("ids", {})
+    except httpx.HTTPStatusError as e:
+        logger.error("Error resolving names to IDs: %s - %s", e.response.status_code, e.response.text)
+        raise
+
+
+@guard.protect
 async def resolve_ids_to_names(
-    client: httpx.AsyncClient,
+    client: RequestClient,
     ids: List[int],
     id_type: str
 ) -> Dict[str, str]:
@@ -46,7 +90,7 @@ async def resolve_ids_to_names(
     Resolve a list of IDs to their corresponding names.
 
     Args:
-        client: HTTP client with authorization headers.
+        client: Shared HTTP client bound to the caller's authorization header.
         ids: List of IDs to resolve.
         id_type: Type of IDs (mob or item).
 
@@ -59,9 +103,11 @@ async def resolve_ids_to_names(
     if not ids:
         return {}
     try:
-        response = await client.post(
-            f"{NAME_RESOLVER_URL}/api/id-names/resolve",
-            json={"idList": ids, "type": id_type}
+        response = await endpoints.post(
+            client,
+            "/api/id-names/resolve",
+            json={"idList": ids, "type": id_type},
+            hedge="/api/id-names/resolve",
         )
         response.raise_for_status()
         return response.json().get("names", {})
@@ -70,12 +116,13 @@ async def resolve_ids_to_names(
         raise
 
 
-async def get_ids_for_name(client: httpx.AsyncClient, name: str) -> List[Dict]:
+@guard.protect
+async def get_ids_for_name(client: RequestClient, name: str) -> List[Dict]:
     """
     Get all ID/type pairs for a given name.
 
     Args:
-        client: HTTP client with authorization headers.
+        client: Shared HTTP client bound to the caller's authorization header.
         name: Name to look up.
 
     Returns:
@@ -87,9 +134,36 @@ async def get_ids_for_name(client: httpx.AsyncClient, name: str) -> List[Dict]:
     if not name:
         return []
     try:
-        response = await client.get(f"{NAME_RESOLVER_URL}/api/name-to-ids/{name}")
+        response = await endpoints.get(client, f"/api/name-to-ids/{name}", hedge="/api/name-to-ids")
         response.raise_for_status()
         return response.json()
     except httpx.HTTPStatusError as e:
         logger.error("Error getting IDs for name: %s - %s", e.response.status_code, e.response.text)
         raise
+
+
+@guard.protect
+async def export_names(client: RequestClient, version: str | None = None) -> Dict | None:
+    """
+    Download every mob and item name unless the given version is current.
+
+    Args:
+        client: Shared HTTP client bound to the caller's authorization header.
+        version: Version of the caller's copy, if any.
+
+    Returns:
+        Dict with version and names, or None if the version is current.
+
+    Raises:
+        httpx.HTTPStatusError: On HTTP errors.
+    """
+    headers = {"If-None-Match": f'"{version}"'} if version else None
+    try:
+        response = await endpoints.get(client, "/api/names/export", headers=headers)
+        if version and response.status_code == 304:
+            return None
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        logger.error("Error exporting names: %s - %s", e.response.status_code, e.response.text)
+        raise
@@ -0,0 +1,302 @@
+"""Offline precompute of search results for every known name.
+
+Searchable names are a finite set that changes rarely, so the job computes
+the AugmentedSearchResponse of every name ahead of time and writes it
+under the same cache key /search/{name} reads, letting steady-state
+searches answer from Redis without a downstream fan-out:
+    python -m services.precompute --concurrency 4 --batch-size 20
+
+Names come from one name-resolver export, which also backs a local name
+dictionary so the job needs no per-name resolver calls. Names are sorted
+and searched in batches through search_and_augment_many. After each batch
+the job saves a checkpoint (export version and the number of names done
+in order) in Redis; after a failure, a rerun against the same export
+version resumes from it. A completed run or a new version starts over, so
+every scheduled run refreshes drops that changed since the last one.
+Progress and the final report give names and drops per second.
+
+Nothing invalidates stored results when drops change, so they are kept no
+longer than the search routes keep their own fills (SEARCH_CACHE_TTL_SECONDS)
+and the job is scheduled at least that often: a drop edit shows up in
+searches within one search cache TTL, whether the entry was precomputed or
+filled by a request.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from models import AugmentedDrop, AugmentedSearchResponse
+from services.http_client import RequestClient, SharedHttpClient
+from services.name_dictionary import NameDictionary
+from services.route_cache import encode
+from services.search_orchestrator import search_and_augment_many
+from services.service_token import SERVICE_CLIENT_ID, SERVICE_CLIENT_SECRET, job_client
+from utils.cache import CacheClient
+from utils.config import REDIS_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+PRECOMPUTE_BATCH_SIZE = int(os.getenv("PRECOMPUTE_BATCH_SIZE", "20"))
+PRECOMPUTE_CONCURRENCY = int(os.getenv("PRECOMPUTE_CONCURRENCY", "4"))
+# Same variable the search routes read; bounds how stale a stored result can be.
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(REDIS_CACHE_TTL)))
+PRECOMPUTE_TTL = min(int(os.getenv("PRECOMPUTE_TTL_SECONDS", str(SEARCH_CACHE_TTL))), SEARCH_CACHE_TTL)
+PRECOMPUTE_RETRIES = int(os.getenv("PRECOMPUTE_RETRIES", "2"))
+
+CHECKPOINT_KEY = "precompute:checkpoint"
+
+SearchMany = Callable[[RequestClient, List[str], Optional[NameDictionary]], Awaitable[Dict[str, List[AugmentedDrop]]]]
+
+
+@dataclass
+class PrecomputeReport:
+    """Outcome and throughput of one run."""
+
+    version: str
+    total: int
+    resumed_from: int
+    names: int = 0
+    drops: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def names_per_second(self) -> float:
+        """Names computed per second in this run."""
+        return self.names / self.seconds if self.seconds else 0.0
+
+    @property
+    def drops_per_second(self) -> float:
+        """Drops written per second in this run."""
+        return self.drops / self.seconds if self.seconds else 0.0
+
+
+class Checkpoint:
+    """Number of names, in sorted order, whose results are stored for an export version."""
+
+    def __init__(self, cache: CacheClient, version: str, start: int, batch_size: int, total: int):
+        """
+        Initialize the checkpoint of a run.
+
+        Args:
+            cache: Cache holding the checkpoint.
+            version: Name export version the run computes.
+            start: Names already stored when the run starts.
+            batch_size: Names per batch.
+            total: Names in the export.
+        """
+        self.cache = cache
+        self.version = version
+        self.start = start
+        self.done = start
+        self.batch_size = batch_size
+        self.total = total
+        self._finished: Set[int] = set()
+        self._next = 0
+
+    @staticmethod
+    async def load(cache: CacheClient, version: str) -> int:
+        """
+        Names already done for an export version.
+
+        Args:
+            cache: Cache holding the checkpoint.
+            version: Current name export version.
+
+        Returns:
+            Names done by an unfinished earlier run of the same version, 0 otherwise.
+        """
+        raw = await cache.get(CHECKPOINT_KEY)
+        if not raw:
+            return 0
+        saved = json.loads(raw)
+        if saved.get("version") != version or saved["done"] >= saved["total"]:
+            return 0
+        return saved["done"]
+
+    async def finish(self, batch: int) -> None:
+        """
+        Record a stored batch and save how far the run got without gaps.
+
+        Batches finish out of order; the checkpoint only moves past a batch
+        once every batch before it is stored, so a resumed run never skips one.
+
+        Args:
+            batch: Index of the batch within this run.
+        """
+        self._finished.add(batch)
+        advanced = False
+        while self._next in self._finished:
+            self._finished.remove(self._next)
+            self._next += 1
+            advanced = True
+        if advanced:
+            self.done = min(self.total, self.start + self.batch_size * self._next)
+            await self.save()
+
+    async def save(self) -> None:
+        """Persist the checkpoint; it lives as long as the results it describes."""
+        value = {"version": self.version, "done": self.done, "total": self.total, "saved_at": time.time()}
+        await self.cache.set(CHECKPOINT_KEY, json.dumps(value).encode("utf-8"), PRECOMPUTE_TTL)
+
+
+async def precompute(
+    client: RequestClient,
+    cache: CacheClient,
+    batch_size: int = PRECOMPUTE_BATCH_SIZE,
+    concurrency: int = PRECOMPUTE_CONCURRENCY,
+    ttl: int = PRECOMPUTE_TTL,
+    retries: int = PRECOMPUTE_RETRIES,
+    restart: bool = False,
+    search_many: SearchMany = search_and_augment_many,
+    progress: Optional[Callable[[int, float], None]] = None,
+) -> PrecomputeReport:
+    """
+    Compute and cache the search response of every known name.
+
+    Args:
+        client: Shared HTTP client bound to the job's authorization header.
+        cache: Connected search cache.
+        batch_size: Names searched per batch.
+        concurrency: Batches in flight at once.
+        ttl: Lifetime of the stored responses in seconds.
+        retries: Extra attempts of a failing batch before the run stops.
+        restart: Ignore the checkpoint and start from the first name.
+        search_many: Batch search used for each batch.
+        progress: Called with (names done, seconds elapsed) after each batch.
+
+    Returns:
+        Report of the run.
+
+    Raises:
+        httpx.HTTPError: If a batch still fails after its retries, once the
+            batches in flight are done; the checkpoint keeps every batch
+            stored before it.
+        RuntimeError: If results cannot be stored in the cache.
+    """
+    names = NameDictionary(refresh_interval=float("inf"))
+    await names.refresh(client)
+    all_names = names.all_names()
+
+    start = 0 if restart else await Checkpoint.load(cache, names.version)
+    report = PrecomputeReport(version=names.version, total=len(all_names), resumed_from=start)
+    if start:
+        logger.info("Resuming precompute of version %s at name %d of %d", report.version, start, report.total)
+    checkpoint = Checkpoint(cache, report.version, start, batch_size, report.total)
+    pending = iter(enumerate(
+        all_names[offset:offset + batch_size] for offset in range(start, len(all_names), batch_size)
+    ))
+    failure: List[BaseException] = []
+    started = time.perf_counter()
+
+    async def run_batch(batch: List[str]) -> None:
+        for attempt in range(retries + 1):
+            try:
+                results = await search_many(client, batch, names)
+                break
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                logger.warning("Precompute batch starting at %r failed (%s), retrying", batch[0], e)
+                await asyncio.sleep(2 ** attempt)
+        stored = await cache.set_many(
+            {name: encode(AugmentedSearchResponse(data=drops)) for name, drops in results.items()}, ttl
+        )
+        if not stored:
+            raise RuntimeError("Failed to store precomputed results")
+        report.names += len(batch)
+        report.drops += sum(len(drops) for drops in results.values())
+        report.batches += 1
+
+    async def worker() -> None:
+        for index, batch in pending:
+            if failure:
+                return
+            try:
+                await run_batch(batch)
+            except Exception as e:
+                logger.error("Precompute batch starting at %r failed: %s", batch[0], e)
+                failure.append(e)
+                return
+            await checkpoint.finish(index)
+            if progress:
+                progress(checkpoint.done, time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    report.seconds = time.perf_counter() - started
+    if failure:
+        raise failure[0]
+    return report
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command line arguments.
+
+    Returns:
+        Process exit code.
+    """
+    from utils.config import REDIS_DB, REDIS_HOST, REDIS_PASSWORD, REDIS_PORT
+
+    parser = argparse.ArgumentParser(description="Precompute cached search results for every known name.")
+    parser.add_argument("--batch-size", type=int, default=PRECOMPUTE_BATCH_SIZE, help="Names per batch search.")
+    parser.add_argument("--concurrency", type=int, default=PRECOMPUTE_CONCURRENCY, help="Batches in flight.")
+    parser.add_argument(
+        "--ttl", type=int, default=PRECOMPUTE_TTL, help="Lifetime of stored results in seconds, at most the search TTL."
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over.")
+    parser.add_argument("--token", default="", help="Fixed bearer token instead of service account tokens.")
+    args = parser.parse_args(argv)
+    if args.ttl > SEARCH_CACHE_TTL:
+        parser.error(f"--ttl may not exceed SEARCH_CACHE_TTL_SECONDS ({SEARCH_CACHE_TTL}), results are not invalidated")
+    if not args.token and not (SERVICE_CLIENT_ID and SERVICE_CLIENT_SECRET):
+        parser.error("SERVICE_CLIENT_ID and SERVICE_CLIENT_SECRET, or --token, are required")
+
+    def log_progress(done: int, elapsed: float) -> None:
+        logger.info("Precomputed %d names in %.1fs", done, elapsed)
+
+    async def run() -> PrecomputeReport:
+        cache = CacheClient(
+            host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD, prefix="search", ttl=args.ttl
+        )
+        if not await cache.connect():
+            raise RuntimeError("Redis is unavailable")
+        http = SharedHttpClient()
+        try:
+            return await precompute(
+                job_client(http, args.token),
+                cache,
+                batch_size=args.batch_size,
+                concurrency=args.concurrency,
+                ttl=args.ttl,
+                restart=args.restart,
+                progress=log_progress,
+            )
+        finally:
+            await http.aclose()
+            await cache.close()
+
+    try:
+        report = asyncio.run(run())
+    except Exception as e:
+        print(f"precompute failed, rerun to resume from the checkpoint: {e}")
+        return 1
+    print(f"version {report.version}: {report.names} names ({report.resumed_from} already done), "
+          f"{report.drops} drops in {report.seconds:.1f}s, "
+          f"{report.names_per_second:.1f} names/s, {report.drops_per_second:.1f} drops/s")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
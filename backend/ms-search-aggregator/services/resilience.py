@@ -0,0 +1,269 @@
+"""Circuit breakers and bulkheads for downstream clients.
+
+Each downstream client module owns a DownstreamGuard. The bulkhead caps
+how many of the shared pool's connections one downstream can tie up, so a
+slow service cannot starve calls to the others. The circuit breaker opens
+after consecutive failures and then rejects calls at once until a probe
+succeeds, so a failing service costs a fast local error instead of a full
+timeout per request. Both rejections are DownstreamRejected errors.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Literal, TypeVar
+
+import httpx
+
+from services.adaptive_limit import DownstreamRejected
+
+logger = logging.getLogger(__name__)
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "10"))
+BULKHEAD_MAX_WAIT_SECONDS = float(os.getenv("BULKHEAD_MAX_WAIT_SECONDS", "0.05"))
+
+CircuitState = Literal["closed", "open", "half_open"]
+T = TypeVar("T")
+
+# Every guard by downstream name, for metrics.
+guards: Dict[str, "DownstreamGuard"] = {}
+
+
+class CircuitOpenError(DownstreamRejected):
+    """A call rejected because the downstream's circuit is open."""
+
+
+class BulkheadFullError(DownstreamRejected):
+    """A call rejected because the downstream's bulkhead has no free slot."""
+
+
+def is_failure(error: BaseException) -> bool:
+    """
+    Whether an error counts against a downstream's health.
+
+    Args:
+        error: Exception raised by a client call.
+
+    Returns:
+        True for transport errors and 5xx responses; local rejections and 4xx do not count.
+    """
+    if isinstance(error, DownstreamRejected):
+        return False
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_SECONDS,
+    ):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            name: Downstream name used in logs and stats.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds the circuit stays open before a probe is let through.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.rejected = 0
+        self.opened_total = 0
+
+    def allow(self) -> bool:
+        """
+        Decide whether a call may go out, moving from open to half-open when due.
+
+        Returns:
+            True if the call may proceed.
+        """
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.probe_in_flight = False
+        if self.state == "half_open" and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self.state != "closed":
+            logger.info("Circuit for %s closed", self.name)
+        self.state = "closed"
+        self.failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or on a failed probe."""
+        self.failures += 1
+        self.probe_in_flight = False
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+            logger.warning("Circuit for %s opened after %d failures", self.name, self.failures)
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.opened_total += 1
+
+    def record_ignored(self) -> None:
+        """Finish a call whose outcome says nothing about the downstream's health."""
+        self.probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+            "opened_total": self.opened_total,
+        }
+
+
+class Bulkhead:
+    """Cap on concurrent calls to one downstream with a short wait for a slot."""
+
+    def __init__(self, name: str, max_concurrent: int, max_wait: float = BULKHEAD_MAX_WAIT_SECONDS):
+        """
+        Initialize the bulkhead.
+
+        Args:
+            name: Downstream name used in stats.
+            max_concurrent: Calls allowed in flight at once.
+            max_wait: Seconds to wait for a slot before rejecting.
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def acquire(self) -> bool:
+        """
+        Take a slot, waiting at most ``max_wait`` seconds.
+
+        Returns:
+            True if a slot is held.
+        """
+        try:
+            if self._semaphore.locked():
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Return a slot."""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load and counters."""
+        return {"max_concurrent": self.max_concurrent, "in_flight": self.in_flight, "rejected": self.rejected}
+
+
+class DownstreamGuard:
+    """Circuit breaker and bulkhead around one downstream's client calls."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_SECONDS,
+        max_wait: float = BULKHEAD_MAX_WAIT_SECONDS,
+    ):
+        """
+        Create and register the guard.
+
+        Args:
+            name: Downstream service name.
+            max_concurrent: Bulkhead size.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds before an open circuit lets a probe through.
+            max_wait: Seconds to wait for a bulkhead slot.
+        """
+        self.name = name
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+        self.bulkhead = Bulkhead(name, max_concurrent, max_wait)
+        guards[name] = self
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a client call through the breaker and the bulkhead.
+
+        Args:
+            func: Client coroutine function.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            The call's result.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+            BulkheadFullError: If no bulkhead slot frees up in time.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+        if not await self.bulkhead.acquire():
+            self.breaker.record_ignored()
+            raise BulkheadFullError(f"Bulkhead for {self.name} is full")
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            if is_failure(e):
+                self.breaker.record_failure()
+            elif isinstance(e, httpx.HTTPStatusError):
+                # A 4xx answer still shows the downstream is up.
+                self.breaker.record_success()
+            else:
+                self.breaker.record_ignored()
+            raise
+        except BaseException:
+            self.breaker.record_ignored()
+            raise
+        else:
+            self.breaker.record_success()
+            return result
+        finally:
+            self.bulkhead.release()
+
+    def protect(self, func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        """
+        Decorate a client coroutine function so every call goes through the guard.
+
+        Args:
+            func: Client coroutine function.
+
+        Returns:
+            Guarded coroutine function.
+        """
+        @functools.wraps(func)
+        async def guarded(*args: Any, **kwargs: Any) -> T:
+            return await self.call(func, *args, **kwargs)
+
+        return guarded
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker and bulkhead stats."""
+        return {"circuit": self.breaker.stats(), "bulkhead": self.bulkhead.stats()}
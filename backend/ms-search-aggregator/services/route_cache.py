@@ -0,0 +1,175 @@
+"""Response caching for aggregator routes.
+
+``RouteCache.cached`` wraps a route so its JSON response is read from and
+written to Redis through ``utils.cache.CacheClient``, with a per-route TTL
+and key builder. Clients can skip the cache with ``Cache-Control``:
+``no-cache`` recomputes and refreshes the entry, ``no-store`` recomputes
+without touching it. Responses carry ``X-Cache: HIT``, ``MISS`` or
+``BYPASS``. Routes that answer for several keys at once use ``read_many``
+and ``fill`` with the same directives.
+
+Usage:
+    route_cache = RouteCache(lambda: app.state.cache)
+
+    @app.get("/search/{name}")
+    @route_cache.cached(ttl=3600, key=lambda name, **_: name)
+    async def search(name: str): ...
+"""
+
+import functools
+import inspect
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import BackgroundTasks, Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from utils.cache import CacheClient
+
+logger = logging.getLogger(__name__)
+
+CACHE_HEADER = "X-Cache"
+_REQUEST_PARAM = "route_cache_request"
+_BACKGROUND_PARAM = "route_cache_background"
+
+
+def cache_directives(request: Request) -> set:
+    """Lower-cased Cache-Control directives of a request."""
+    header = request.headers.get("cache-control", "")
+    return {directive.strip().lower() for directive in header.split(",") if directive.strip()}
+
+
+def encode(result: Any) -> bytes:
+    """Serialize a route result, dict or model, as JSON bytes."""
+    return json.dumps(jsonable_encoder(result)).encode("utf-8")
+
+
+def json_response(body: bytes, status: str) -> Response:
+    """JSON response carrying the cache status header."""
+    return Response(content=body, media_type="application/json", headers={CACHE_HEADER: status})
+
+
+class RouteCache:
+    """Caching decorator factory bound to an app's cache client."""
+
+    def __init__(
+        self,
+        get_cache: Callable[[], Optional[CacheClient]],
+        on_cached: Optional[Callable[[Request], None]] = None,
+    ):
+        """
+        Initialize the factory.
+
+        Args:
+            get_cache: Returns the current cache client, or None when caching is disabled.
+            on_cached: Called with the request when it is answered from the cache, e.g. to
+                prioritize the same request next time; not called on a miss.
+        """
+        self.get_cache = get_cache
+        self.on_cached = on_cached
+
+    def cache_for(self, request: Request) -> Optional[CacheClient]:
+        """
+        Cache usable for a request.
+
+        Args:
+            request: Incoming request.
+
+        Returns:
+            The cache client, or None when caching is disabled, disconnected
+            or the client sent ``no-store``.
+        """
+        cache = self.get_cache()
+        if not cache or not cache.is_connected or "no-store" in cache_directives(request):
+            return None
+        return cache
+
+    async def read_many(self, request: Request, keys: List[str]) -> Dict[str, bytes]:
+        """
+        Cached bodies of several keys.
+
+        Args:
+            request: Incoming request, for its Cache-Control directives.
+            keys: Cache keys to read.
+
+        Returns:
+            Body by key for the keys found; empty when the cache is unusable
+            or the client sent ``no-cache``.
+        """
+        cache = self.cache_for(request)
+        if not cache or "no-cache" in cache_directives(request):
+            return {}
+        return await cache.get_many(keys)
+
+    def fill(self, request: Request, background_tasks: BackgroundTasks, key: str, result: Any, ttl: int) -> None:
+        """
+        Store a result after the response is sent.
+
+        Args:
+            request: Incoming request, for its Cache-Control directives.
+            background_tasks: Tasks run after the response.
+            key: Cache key.
+            result: Route result, dict or model.
+            ttl: Entry lifetime in seconds.
+        """
+        cache = self.cache_for(request)
+        if cache:
+            background_tasks.add_task(cache.set, key, encode(result), ttl)
+
+    def cached(
+        self,
+        ttl: int,
+        key: Callable[..., str],
+        cacheable: Callable[[Any], bool] = lambda result: True,
+    ) -> Callable:
+        """
+        Cache a route's JSON response.
+
+        Args:
+            ttl: Entry lifetime in seconds.
+            key: Builds the cache key from the route's keyword arguments.
+            cacheable: Decides from the route's result whether it may be stored.
+
+        Returns:
+            Decorator for a route function.
+        """
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+            extra = [
+                inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+                inspect.Parameter(_BACKGROUND_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=BackgroundTasks),
+            ]
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                request: Request = kwargs.pop(_REQUEST_PARAM)
+                background_tasks: BackgroundTasks = kwargs.pop(_BACKGROUND_PARAM)
+                cache = self.cache_for(request)
+                if not cache:
+                    return json_response(encode(await func(*args, **kwargs)), "BYPASS")
+
+                cache_key = key(**kwargs)
+                if "no-cache" not in cache_directives(request):
+                    cached = await cache.get(cache_key)
+                    if cached:
+                        logger.info("Cache hit for %s", cache_key)
+                        if self.on_cached:
+                            self.on_cached(request)
+                        return json_response(cached, "HIT")
+
+                result = await func(*args, **kwargs)
+                body = encode(result)
+                if cacheable(result):
+                    background_tasks.add_task(cache.set, cache_key, body, ttl)
+                return json_response(body, "MISS")
+
+            wrapper.__signature__ = signature.replace(
+                parameters=[
+                    *(p for p in signature.parameters.values() if p.kind != inspect.Parameter.VAR_KEYWORD),
+                    *extra,
+                ]
+            )
+            return wrapper
+
+        return decorator
@@ -1,24 +1,212 @@
-from typing import List, Dict, Any
-import httpx
+from typing import List, Dict, Any, Optional
 import asyncio
 import logging
+import os
+
+import httpx
+
 from models import AugmentedDrop
+from services.component_cache import ComponentCache
+from services.http_client import RequestClient
+from services.name_dictionary import NameDictionary
+from services.snapshot import Snapshot
 from . import name_resolver_client, drop_repo_client, image_retriever_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def search_and_augment_drops(client: httpx.AsyncClient, name: str) -> List[AugmentedDrop]:
+# Read names from drop-repo's denormalized read model instead of two name-resolver calls.
+AUGMENTED_READ_MODEL = os.getenv("AUGMENTED_READ_MODEL", "false").lower() == "true"
+
+
+async def resolve_name_to_id(
+    client: RequestClient,
+    name: str,
+    names: Optional[NameDictionary],
+    components: Optional[ComponentCache] = None,
+) -> dict | None:
+    """Resolve a name from the local dictionary or the component cache, asking the resolver on a miss."""
+    if names:
+        names.schedule_refresh(client)
+        found = names.name_to_id(name)
+        if found:
+            return found
+    if components:
+        cached = await components.read("name-id", [name])
+        if name in cached:
+            return cached[name]
+    found = await name_resolver_client.resolve_name_to_id(client, name)
+    if components and found:
+        components.write("name-id", {name: found})
+    return found
+
+
+async def resolve_names_to_ids(
+    client: RequestClient,
+    name_list: List[str],
+    names: Optional[NameDictionary],
+    components: Optional[ComponentCache] = None,
+) -> Dict[str, dict]:
+    """Resolve names from the local dictionary and the component cache, asking the resolver once for all misses."""
+    found = {}
+    if names:
+        names.schedule_refresh(client)
+        for name in name_list:
+            id_info = names.name_to_id(name)
+            if id_info:
+                found[name] = id_info
+    missing = [name for name in name_list if name not in found]
+    if missing and components:
+        found.update(await components.read("name-id", missing))
+        missing = [name for name in missing if name not in found]
+    if missing:
+        remote = await name_resolver_client.resolve_names_to_ids(client, missing)
+        if components:
+            components.write("name-id", remote)
+        found.update(remote)
+    return found
+
+
+async def resolve_ids_to_names(
+    client: RequestClient,
+    ids: List[int],
+    id_type: str,
+    names: Optional[NameDictionary],
+    components: Optional[ComponentCache] = None,
+) -> Dict[str, str]:
+    """Resolve IDs from the local dictionary and the component cache, asking the resolver only for missing ones."""
+    if names:
+        resolved, missing = names.names_for_ids(ids, id_type)
+    else:
+        resolved, missing = {}, list(ids)
+    if missing and components:
+        cached = await components.read("id-name", [f"{id_type}:{i}" for i in missing])
+        resolved.update({key.split(":", 1)[1]: name for key, name in cached.items()})
+        missing = [i for i in missing if str(i) not in resolved]
+    if missing:
+        remote = await name_resolver_client.resolve_ids_to_names(client, missing, id_type)
+        if names:
+            names.remember(remote, id_type)
+        if components:
+            components.write("id-name", {f"{id_type}:{i}": name for i, name in remote.items()})
+        resolved.update(remote)
+    return resolved
+
+
+async def fetch_drops(
+    client: RequestClient, id_info: dict, components: Optional[ComponentCache] = None
+) -> List[Dict[str, Any]]:
+    """Drops of one mob or item from the component cache, fetching them on a miss."""
+    key = f"{id_info['type']}:{id_info['id']}"
+    if components:
+        cached = await components.read("drops", [key])
+        if key in cached:
+            return cached[key]
+    drops = await drop_repo_client.fetch_drops_by_mob_id(client, id_info)
+    if components:
+        components.write("drops", {key: drops})
+    return drops
+
+
+async def fetch_drops_many(
+    client: RequestClient, id_infos: List[dict], components: Optional[ComponentCache] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Drops of several mobs and items by "type:id", reading the component cache
+    first and fetching the misses with one bulk call per ID type.
+    """
+    keys = list(dict.fromkeys(f"{id_info['type']}:{id_info['id']}" for id_info in id_infos))
+    found = await components.read("drops", keys) if components else {}
+
+    ids_by_type: Dict[str, List[int]] = {}
+    for key in keys:
+        if key not in found:
+            id_type, drop_id = key.split(":", 1)
+            ids_by_type.setdefault(id_type, []).append(int(drop_id))
+    id_types = list(ids_by_type)
+    fetched = await asyncio.gather(
+        *(drop_repo_client.fetch_drops_by_ids(client, ids_by_type[t], t) for t in id_types)
+    )
+    remote = {
+        f"{id_type}:{drop_id}": by_id.get(str(drop_id), [])
+        for id_type, by_id in zip(id_types, fetched)
+        for drop_id in ids_by_type[id_type]
+    }
+    if components:
+        components.write("drops", remote)
+    return {**found, **remote}
+
+
+async def check_images_or_none(client: RequestClient, items: List[Dict]) -> Optional[List[Dict]]:
+    """Image existence, or None when the image retriever is unavailable or its circuit is open."""
+    try:
+        return await image_retriever_client.check_images_exist(client, items)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code < 500:
+            raise
+        logger.warning("Image existence unavailable, returning partial results: %s", e)
+    except httpx.RequestError as e:
+        logger.warning("Image existence unavailable, returning partial results: %s", e)
+    return None
+
+
+def augment_from_snapshot(snapshot: Snapshot, name: str) -> List[AugmentedDrop]:
+    """Search and augment drops from a mapped snapshot without network calls."""
+    id_info = snapshot.name_to_id(name)
+    if not id_info:
+        return []
+    return [
+        AugmentedDrop(
+            **d,
+            dropper_name=snapshot.name_for_id("mob", d['dropperid']) or "Unknown",
+            item_name=snapshot.name_for_id("item", d['itemid']) or "Unknown",
+        ) for d in snapshot.search(id_info["type"], id_info["id"])
+    ]
+
+
+def existence_from_snapshot(snapshot: Snapshot, name: str) -> List[Dict[str, Any]]:
+    """Image and drop existence of a name's IDs from a mapped snapshot without network calls."""
+    return [
+        {
+            **item,
+            "image_exist": snapshot.image_exist(item["type"], item["id"]),
+            "drop_exist": snapshot.has_drops(item["type"], item["id"]),
+        }
+        for item in snapshot.ids_for_name(name)
+    ]
+
+
+async def search_and_augment_drops(
+    client: RequestClient,
+    name: str,
+    names: Optional[NameDictionary] = None,
+    components: Optional[ComponentCache] = None,
+    snapshot: Optional[Snapshot] = None,
+) -> List[AugmentedDrop]:
     """
     Orchestrates the process of searching for drop data, resolving names,
     generating image URLs, and augmenting the final results.
+
+    With AUGMENTED_READ_MODEL set, names come with the drops from
+    drop-repo's read model and the name-resolver ID lookups are skipped.
+    With a name dictionary, names are resolved locally and the resolver is
+    only asked on a miss. With a component cache, the name's ID, its drop
+    list and the dropper and item names are assembled from cached parts
+    and only the missing parts are fetched. With a snapshot, everything is
+    read from the mapped file and no downstream service is called.
     """
-    idInfo = await name_resolver_client.resolve_name_to_id(client, name)
+    if snapshot:
+        return augment_from_snapshot(snapshot, name)
+
+    idInfo = await resolve_name_to_id(client, name, names, components)
     if not idInfo:
         return []
 
-    drops = await drop_repo_client.fetch_drops_by_mob_id(client, idInfo)
+    if AUGMENTED_READ_MODEL:
+        return [AugmentedDrop(**d) for d in await drop_repo_client.fetch_augmented_drops(client, idInfo)]
+
+    drops = await fetch_drops(client, idInfo, components)
     if not drops:
         return []
 
@@ -26,8 +214,8 @@ async def search_and_augment_drops(client: httpx.AsyncClient, name: str) -> List
     item_ids = list(set(d['itemid'] for d in drops))
 
     # Concurrently resolve names and generate image URLs
-    dropper_names_task = name_resolver_client.resolve_ids_to_names(client, dropper_ids, "mob")
-    item_names_task = name_resolver_client.resolve_ids_to_names(client, item_ids, "item")
+    dropper_names_task = resolve_ids_to_names(client, dropper_ids, "mob", names, components)
+    item_names_task = resolve_ids_to_names(client, item_ids, "item", names, components)
     
     # Await the name resolution tasks
     dropper_names, item_names = await asyncio.gather(dropper_names_task, item_names_task)
@@ -41,31 +229,112 @@ async def search_and_augment_drops(client: httpx.AsyncClient, name: str) -> List
         ) for d in drops
     ]
 
-async def aggregate_existence_by_name(client: httpx.AsyncClient, name: str) -> List[Dict[str, Any]]:
+async def search_and_augment_many(
+    client: RequestClient,
+    name_list: List[str],
+    names: Optional[NameDictionary] = None,
+    components: Optional[ComponentCache] = None,
+    snapshot: Optional[Snapshot] = None,
+) -> Dict[str, List[AugmentedDrop]]:
+    """
+    Search drops for several names with shared downstream calls.
+
+    Names are resolved in one call, drops are fetched with one bulk call per
+    ID type, and the dropper and item IDs of all results are unioned so each
+    is resolved to a name once. Each step reads the component cache first
+    when one is given. With AUGMENTED_READ_MODEL set, each name's drops come
+    from drop-repo's read model instead; with a snapshot, from the mapped file.
+
+    Returns:
+        Augmented drops by requested name; unknown names map to an empty list.
+    """
+    if snapshot:
+        return {name: augment_from_snapshot(snapshot, name) for name in name_list}
+
+    results: Dict[str, List[AugmentedDrop]] = {name: [] for name in name_list}
+    id_infos = await resolve_names_to_ids(client, list(results), names, components)
+    if not id_infos:
+        return results
+
+    if AUGMENTED_READ_MODEL:
+        found = list(id_infos)
+        fetched = await asyncio.gather(
+            *(drop_repo_client.fetch_augmented_drops(client, id_infos[name]) for name in found)
+        )
+        for name, drops in zip(found, fetched):
+            results[name] = [AugmentedDrop(**d) for d in drops]
+        return results
+
+    drops_by_key = await fetch_drops_many(client, list(id_infos.values()), components)
+    drops_by_name = {
+        name: drops_by_key.get(f"{id_info['type']}:{id_info['id']}", [])
+        for name, id_info in id_infos.items()
+    }
+
+    all_drops = [d for drops in drops_by_name.values() for d in drops]
+    if not all_drops:
+        return results
+    dropper_names, item_names = await asyncio.gather(
+        resolve_ids_to_names(client, list(set(d['dropperid'] for d in all_drops)), "mob", names, components),
+        resolve_ids_to_names(client, list(set(d['itemid'] for d in all_drops)), "item", names, components),
+    )
+
+    for name, drops in drops_by_name.items():
+        results[name] = [
+            AugmentedDrop(
+                **d,
+                dropper_name=dropper_names.get(str(d['dropperid']), "Unknown"),
+                item_name=item_names.get(str(d['itemid']), "Unknown"),
+            ) for d in drops
+        ]
+    return results
+
+
+async def aggregate_existence_by_name(
+    client: RequestClient,
+    name: str,
+    names: Optional[NameDictionary] = None,
+    snapshot: Optional[Snapshot] = None,
+) -> List[Dict[str, Any]]:
     """
     Orchestrates checking for the existence of images and database entries for a given name.
+
+    Image existence is not critical: when the image retriever fails or its
+    circuit is open, results carry image_exist None instead of failing.
+    With a snapshot, existence is read from the mapped file, where images
+    the builder could not check are None as well.
     """
-    # 1. Get all ID/Type pairs for the name
-    name_id_results = await name_resolver_client.get_ids_for_name(client, name)
+    if snapshot:
+        return existence_from_snapshot(snapshot, name)
+
+    # 1. Get all ID/Type pairs for the name, locally when the dictionary knows it
+    name_id_results = []
+    if names:
+        names.schedule_refresh(client)
+        name_id_results = names.ids_for_name(name)
+    if not name_id_results:
+        name_id_results = await name_resolver_client.get_ids_for_name(client, name)
     if not name_id_results:
         return []
 
     # 2. Concurrently check for image and db existence
-    image_exist_task = image_retriever_client.check_images_exist(client, name_id_results)
+    image_exist_task = check_images_or_none(client, name_id_results)
     db_exist_task = drop_repo_client.check_drops_exist(client, name_id_results)
     
     image_exist_results, db_exist_results = await asyncio.gather(image_exist_task, db_exist_task)
 
     # 3. Merge the results
     # Create a dictionary for quick lookup of existence status
-    existence_map = {(item['type'], item['id']): {'image_exist': item.get('image_exist', False)} for item in image_exist_results}
+    # Unknown rather than missing when the image check was skipped
+    default_image_exist = None if image_exist_results is None else False
+    existence_map = {(item['type'], item['id']): {'image_exist': item.get('image_exist', False)} for item in image_exist_results or []}
     
     for item in db_exist_results:
         key = (item['type'], item['id'])
         if key in existence_map:
             existence_map[key]['drop_exist'] = item.get('drop_exist', False)
         else: # Handle cases where an item exists in DB but not in image results
-            existence_map[key] = {'image_exist': False, 'drop_exist': item.get('drop_exist', False)}
+            existence_map[key] = {'image_exist': default_image_exist, 'drop_exist': item.get('drop_exist', False)}
 
     # 4. Format the final response
     final_results = [
@@ -0,0 +1,141 @@
+"""Service account tokens for offline jobs.
+
+Downstream services verify Keycloak JWTs including their expiry, so a job
+cannot carry a token stored ahead of time. Jobs mint their own with a
+client-credentials grant when they start and renew it shortly before it
+expires, so runs longer than the token lifetime keep working:
+    SERVICE_CLIENT_ID=search-jobs SERVICE_CLIENT_SECRET=... python -m services.precompute
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from services.http_client import RequestClient, SharedHttpClient
+from utils.config import get_token_url
+
+logger = logging.getLogger(__name__)
+
+SERVICE_CLIENT_ID = os.getenv("SERVICE_CLIENT_ID", "")
+SERVICE_CLIENT_SECRET = os.getenv("SERVICE_CLIENT_SECRET", "")
+# Seconds before expiry at which a token is renewed.
+SERVICE_TOKEN_REFRESH_MARGIN = float(os.getenv("SERVICE_TOKEN_REFRESH_MARGIN_SECONDS", "30"))
+
+
+class ServiceToken:
+    """Client-credentials access token, renewed before it expires."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        client_id: str,
+        client_secret: str,
+        token_url: Optional[str] = None,
+        refresh_margin: float = SERVICE_TOKEN_REFRESH_MARGIN,
+    ):
+        """
+        Initialize without a token; the first call fetches one.
+
+        Args:
+            client: HTTP client for the token endpoint.
+            client_id: Keycloak client with service accounts enabled.
+            client_secret: Secret of that client.
+            token_url: Token endpoint; defaults to the realm's.
+            refresh_margin: Seconds before expiry at which the token is renewed.
+        """
+        self.client = client
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_url = token_url or get_token_url()
+        self.refresh_margin = refresh_margin
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def authorization(self) -> str:
+        """
+        Authorization header value with a token valid for at least the refresh margin.
+
+        Returns:
+            "Bearer <token>".
+
+        Raises:
+            httpx.HTTPError: If the token endpoint fails or rejects the client.
+        """
+        async with self._lock:
+            if self._token is None or time.monotonic() >= self._expires_at - self.refresh_margin:
+                await self._fetch()
+        return f"Bearer {self._token}"
+
+    async def _fetch(self) -> None:
+        """Request a new token with the client-credentials grant."""
+        response = await self.client.post(
+            self.token_url,
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            },
+        )
+        response.raise_for_status()
+        payload = response.json()
+        self._token = payload["access_token"]
+        self._expires_at = time.monotonic() + float(payload.get("expires_in", 60))
+        logger.info("Fetched service token for %s, valid for %ss", self.client_id, payload.get("expires_in"))
+
+
+class ServiceRequestClient(RequestClient):
+    """Shared client view that authorizes each call with the current service token."""
+
+    def __init__(self, shared: SharedHttpClient, token: ServiceToken):
+        """
+        Initialize the view.
+
+        Args:
+            shared: Job-lifetime client.
+            token: Service token to send.
+        """
+        super().__init__(shared, {})
+        self.token = token
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> httpx.Response:
+        """Send a GET request."""
+        self.headers = {"Authorization": await self.token.authorization()}
+        return await super().get(url, headers, **kwargs)
+
+    async def post(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> httpx.Response:
+        """Send a POST request."""
+        self.headers = {"Authorization": await self.token.authorization()}
+        return await super().post(url, headers, **kwargs)
+
+
+def job_client(
+    shared: SharedHttpClient,
+    token: str = "",
+    client_id: str = SERVICE_CLIENT_ID,
+    client_secret: str = SERVICE_CLIENT_SECRET,
+) -> RequestClient:
+    """
+    Downstream client for an offline job.
+
+    Args:
+        shared: Job-lifetime client.
+        token: Fixed bearer token for a manual run; used as-is when given.
+        client_id: Service account client ID.
+        client_secret: Service account client secret.
+
+    Returns:
+        Client authorizing calls with the fixed token or with service tokens.
+
+    Raises:
+        ValueError: If neither a token nor client credentials are configured.
+    """
+    if token:
+        return shared.bind({"Authorization": f"Bearer {token}"})
+    if not client_id or not client_secret:
+        raise ValueError("set SERVICE_CLIENT_ID and SERVICE_CLIENT_SECRET, or pass --token")
+    return ServiceRequestClient(shared, ServiceToken(shared.client, client_id, client_secret))
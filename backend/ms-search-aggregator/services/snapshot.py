@@ -0,0 +1,370 @@
+"""Memory-mapped snapshot of drops, names and image existence.
+
+In snapshot mode (SNAPSHOT_PATH set) the aggregator answers searches and
+existence checks from one read-only file instead of calling downstream
+services. The file is memory-mapped, so lookups read straight from the
+page cache and only the rows a search returns are turned into Python
+objects; replicas on the same node mapping the same file share its pages.
+
+Layout: an 8-byte magic, the length of a JSON header, the header (build
+info and the offset, length and type code of every section), then
+8-byte-aligned sections of native-endian arrays:
+
+- ``drops``: int64 rows of DROP_FIELDS, sorted by dropperid then id
+- ``mob_keys`` / ``mob_starts``: sorted dropperids and the row range of each
+- ``item_keys`` / ``item_starts`` / ``item_postings``: sorted itemids and
+  the range of each in ``item_postings``, row numbers sorted by itemid
+- ``name_strings`` / ``name_starts``: UTF-8 names sorted bytewise, equal
+  names in collection order; ``name_types`` and ``name_ids`` per name
+- ``<type>_ids`` / ``<type>_names`` / ``<type>_images``: sorted mob or item
+  IDs, the name entry of each and its image flag (IMAGE_* values)
+
+Sorted keys are binary searched through ``memoryview.cast``. The builder
+writes a new file next to the old one and renames it over the path, and
+SnapshotStore maps the new file once it sees the rename, so a swap is
+atomic for readers.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import mmap
+import os
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "")
+SNAPSHOT_CHECK_SECONDS = float(os.getenv("SNAPSHOT_CHECK_SECONDS", "30"))
+
+MAGIC = b"MSSNAP01"
+DROP_FIELDS = ("id", "dropperid", "itemid", "minimum_quantity", "maximum_quantity", "questid", "chance")
+ID_TYPES = ("mob", "item")
+IMAGE_MISSING, IMAGE_EXISTS, IMAGE_UNKNOWN = 0, 1, 2
+
+FileId = Tuple[int, int, int]
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to a multiple of 8."""
+    return (offset + 7) & ~7
+
+
+def _starts(keys: List[int]) -> Tuple[array, array]:
+    """Unique sorted keys and the start of each run in ``keys``, plus a final end offset."""
+    unique, starts = array("q"), array("I")
+    for i, key in enumerate(keys):
+        if not unique or unique[-1] != key:
+            unique.append(key)
+            starts.append(i)
+    starts.append(len(keys))
+    return unique, starts
+
+
+def write_snapshot(
+    path: str,
+    names_version: str,
+    names: Iterable[Dict],
+    drops: Iterable[Dict],
+    images: Dict[Tuple[str, int], bool],
+) -> Dict[str, int]:
+    """
+    Write a snapshot file and move it into place atomically.
+
+    Args:
+        path: Target path; a temporary file in the same directory is renamed over it.
+        names_version: Version of the name export the snapshot was built from.
+        names: Dicts with id, type and name, in collection order.
+        drops: Drop rows with DROP_FIELDS.
+        images: Image existence by (type, id); IDs missing here are stored as unknown.
+
+    Returns:
+        Counts of drops and names written.
+    """
+    entries = [(entry["name"].encode("utf-8"), entry["type"], int(entry["id"])) for entry in names]
+    # Stable sort keeps collection order among equal names.
+    order = sorted(range(len(entries)), key=lambda i: entries[i][0])
+    name_strings, name_starts = bytearray(), array("I", [0])
+    name_types, name_ids = array("B"), array("q")
+    # Like the resolver's id→name lookups, the last entry of an ID in collection order wins.
+    by_id: Dict[str, Dict[int, Tuple[int, int]]] = {id_type: {} for id_type in ID_TYPES}
+    for position, i in enumerate(order):
+        name, id_type, drop_id = entries[i]
+        name_strings += name
+        name_starts.append(len(name_strings))
+        name_types.append(ID_TYPES.index(id_type))
+        name_ids.append(drop_id)
+        if by_id[id_type].get(drop_id, (-1, -1))[0] < i:
+            by_id[id_type][drop_id] = (i, position)
+
+    rows = sorted(
+        (tuple(int(drop[field]) for field in DROP_FIELDS) for drop in drops),
+        key=lambda row: (row[1], row[0]),
+    )
+    drop_values = array("q", (value for row in rows for value in row))
+    mob_keys, mob_starts = _starts([row[1] for row in rows])
+    item_postings = array("I", sorted(range(len(rows)), key=lambda r: (rows[r][2], rows[r][0])))
+    item_keys, item_starts = _starts([rows[r][2] for r in item_postings])
+
+    sections: Dict[str, Any] = {
+        "drops": drop_values,
+        "mob_keys": mob_keys,
+        "mob_starts": mob_starts,
+        "item_keys": item_keys,
+        "item_starts": item_starts,
+        "item_postings": item_postings,
+        "name_strings": bytes(name_strings),
+        "name_starts": name_starts,
+        "name_types": name_types,
+        "name_ids": name_ids,
+    }
+    for id_type in ID_TYPES:
+        ids = sorted(by_id[id_type])
+        sections[f"{id_type}_ids"] = array("q", ids)
+        sections[f"{id_type}_names"] = array("I", (by_id[id_type][i][1] for i in ids))
+        sections[f"{id_type}_images"] = array("B", (
+            IMAGE_UNKNOWN if (id_type, i) not in images else int(images[(id_type, i)]) for i in ids
+        ))
+
+    layout, offset = {}, 0
+    for name, data in sections.items():
+        size = len(data) * data.itemsize if isinstance(data, array) else len(data)
+        layout[name] = [offset, size, data.typecode if isinstance(data, array) else "B"]
+        offset = _align(offset + size)
+    header = json.dumps({
+        "names_version": names_version,
+        "built_at": time.time(),
+        "drops": len(rows),
+        "names": len(entries),
+        "sections": layout,
+    }).encode("utf-8")
+    body_start = _align(len(MAGIC) + 8 + len(header))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(MAGIC)
+        handle.write(len(header).to_bytes(8, "little"))
+        handle.write(header)
+        for name, data in sections.items():
+            handle.seek(body_start + layout[name][0])
+            handle.write(data.tobytes() if isinstance(data, array) else data)
+        handle.truncate(body_start + offset)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+    logger.info("Wrote snapshot %s: %d drops, %d names", path, len(rows), len(entries))
+    return {"drops": len(rows), "names": len(entries)}
+
+
+class Snapshot:
+    """Read-only view of one mapped snapshot file."""
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file.
+
+        Args:
+            path: Snapshot file written by write_snapshot.
+
+        Raises:
+            ValueError: If the file is not a snapshot.
+        """
+        with open(path, "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            self.file_id: FileId = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a search snapshot")
+        header_size = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 8], "little")
+        self.header = json.loads(self._mmap[len(MAGIC) + 8:len(MAGIC) + 8 + header_size])
+        body_start = _align(len(MAGIC) + 8 + header_size)
+
+        self._buffer = memoryview(self._mmap)
+        self._views: Dict[str, memoryview] = {}
+        for name, (offset, size, typecode) in self.header["sections"].items():
+            start = body_start + offset
+            self._views[name] = self._buffer[start:start + size].cast(typecode)
+        self._drops = self._views["drops"]
+        self._names = len(self._views["name_types"])
+
+    def _name(self, entry: int) -> bytes:
+        """UTF-8 bytes of a name entry."""
+        starts = self._views["name_starts"]
+        return self._views["name_strings"][starts[entry]:starts[entry + 1]].tobytes()
+
+    def _name_entries(self, name: str) -> range:
+        """Name entries equal to a name, in collection order."""
+        target = name.encode("utf-8")
+        low = bisect.bisect_left(range(self._names), target, key=self._name)
+        high = bisect.bisect_right(range(self._names), target, lo=low, key=self._name)
+        return range(low, high)
+
+    def _id_index(self, id_type: str, drop_id: int) -> Optional[int]:
+        """Position of an ID in its type's ID table."""
+        ids = self._views[f"{id_type}_ids"]
+        i = bisect.bisect_left(ids, drop_id)
+        return i if i < len(ids) and ids[i] == drop_id else None
+
+    def _row(self, row: int) -> Dict[str, Any]:
+        """One drop row as the dict drop-repo's search returns."""
+        width = len(DROP_FIELDS)
+        values = dict(zip(DROP_FIELDS, self._drops[row * width:(row + 1) * width].tolist()))
+        values["id"] = str(values["id"])
+        return values
+
+    def _range(self, id_type: str, drop_id: int) -> range:
+        """Range of a mob's drop rows or of an item's postings."""
+        keys = self._views[f"{id_type}_keys"]
+        i = bisect.bisect_left(keys, drop_id)
+        if i == len(keys) or keys[i] != drop_id:
+            return range(0)
+        starts = self._views[f"{id_type}_starts"]
+        return range(starts[i], starts[i + 1])
+
+    def name_to_id(self, name: str) -> Optional[Dict]:
+        """
+        Resolve a name like the resolver's names-id endpoint.
+
+        Args:
+            name: Mob or item name.
+
+        Returns:
+            {"id", "type"} of the last matching entry, or None.
+        """
+        entries = self._name_entries(name)
+        if not entries:
+            return None
+        last = entries[-1]
+        return {"id": self._views["name_ids"][last], "type": ID_TYPES[self._views["name_types"][last]]}
+
+    def ids_for_name(self, name: str) -> List[Dict]:
+        """
+        All ID/type pairs for a name.
+
+        Args:
+            name: Mob or item name.
+
+        Returns:
+            List of {"type", "id"} dicts; empty on a miss.
+        """
+        types, ids = self._views["name_types"], self._views["name_ids"]
+        return [{"type": ID_TYPES[types[i]], "id": ids[i]} for i in self._name_entries(name)]
+
+    def search(self, query_type: str, query: int) -> List[Dict[str, Any]]:
+        """
+        Drops of a mob or of an item, like drop-repo's search.
+
+        Args:
+            query_type: "mob" to match dropperid, "item" to match itemid.
+            query: ID to match.
+
+        Returns:
+            Matching drop rows.
+        """
+        found = self._range(query_type, query)
+        if query_type == "mob":
+            return [self._row(row) for row in found]
+        postings = self._views["item_postings"]
+        return [self._row(postings[i]) for i in found]
+
+    def has_drops(self, id_type: str, drop_id: int) -> bool:
+        """Whether a mob drops anything or an item is dropped by anything."""
+        return bool(self._range(id_type, drop_id))
+
+    def name_for_id(self, id_type: str, drop_id: int) -> Optional[str]:
+        """Name of a mob or item, or None if unknown."""
+        i = self._id_index(id_type, drop_id)
+        return None if i is None else self._name(self._views[f"{id_type}_names"][i]).decode("utf-8")
+
+    def image_exist(self, id_type: str, drop_id: int) -> Optional[bool]:
+        """Image existence of a mob or item, or None if it was not checked."""
+        i = self._id_index(id_type, drop_id)
+        flag = IMAGE_UNKNOWN if i is None else self._views[f"{id_type}_images"][i]
+        return None if flag == IMAGE_UNKNOWN else flag == IMAGE_EXISTS
+
+    def stats(self) -> Dict[str, Any]:
+        """Build info and size."""
+        return {
+            "names_version": self.header["names_version"],
+            "built_at": self.header["built_at"],
+            "drops": self.header["drops"],
+            "names": self.header["names"],
+            "size_bytes": len(self._mmap),
+        }
+
+    def close(self) -> None:
+        """Release the views and unmap the file."""
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._drops = None
+        self._buffer.release()
+        self._mmap.close()
+
+
+class SnapshotStore:
+    """The current snapshot of a path, swapped when a new file is renamed over it."""
+
+    def __init__(self, path: str, check_interval: float = SNAPSHOT_CHECK_SECONDS):
+        """
+        Map the snapshot at a path.
+
+        Args:
+            path: Snapshot file path.
+            check_interval: Seconds between checks for a new file.
+
+        Raises:
+            OSError: If the file cannot be opened.
+            ValueError: If the file is not a snapshot.
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.current = Snapshot(path)
+        self.swaps = 0
+        logger.info("Mapped snapshot %s (%d drops)", path, self.current.header["drops"])
+
+    def reload_if_changed(self) -> bool:
+        """
+        Map the file at the path if it was replaced since the last check.
+
+        Lookups are synchronous, so no request holds the old snapshot when
+        it is unmapped after the swap.
+
+        Returns:
+            True if a new snapshot was swapped in.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError as e:
+            logger.warning("Snapshot %s unavailable, keeping the mapped one: %s", self.path, e)
+            return False
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) == self.current.file_id:
+            return False
+        try:
+            replacement = Snapshot(self.path)
+        except (OSError, ValueError) as e:
+            logger.error("Failed to map new snapshot %s: %s", self.path, e)
+            return False
+        previous, self.current = self.current, replacement
+        previous.close()
+        self.swaps += 1
+        logger.info("Swapped in snapshot %s (%d drops)", self.path, replacement.header["drops"])
+        return True
+
+    async def watch(self) -> None:
+        """Check for a new snapshot every ``check_interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            self.reload_if_changed()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current snapshot stats and the number of swaps."""
+        return {**self.current.stats(), "path": self.path, "swaps": self.swaps}
+
+    def close(self) -> None:
+        """Unmap the current snapshot."""
+        self.current.close()
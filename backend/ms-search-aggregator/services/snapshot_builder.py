@@ -0,0 +1,137 @@
+"""Build the search snapshot served in snapshot mode.
+
+Exports every name from the name resolver and every drop from drop-repo,
+checks image existence of each name's ID in batches, and writes the
+snapshot file next to the given path before renaming it into place:
+    python -m services.snapshot_builder /snapshots/search.snap
+
+Image existence is not critical: batches the image retriever fails to
+answer are stored as unknown and served as degraded existence results.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from services import drop_repo_client, image_retriever_client, name_resolver_client
+from services.http_client import RequestClient, SharedHttpClient
+from services.service_token import SERVICE_CLIENT_ID, SERVICE_CLIENT_SECRET, job_client
+from services.snapshot import SNAPSHOT_PATH, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_IMAGE_BATCH_SIZE = int(os.getenv("SNAPSHOT_IMAGE_BATCH_SIZE", "200"))
+SNAPSHOT_IMAGE_CONCURRENCY = int(os.getenv("SNAPSHOT_IMAGE_CONCURRENCY", "4"))
+
+
+async def fetch_image_flags(
+    client: RequestClient,
+    items: List[Dict],
+    batch_size: int = SNAPSHOT_IMAGE_BATCH_SIZE,
+    concurrency: int = SNAPSHOT_IMAGE_CONCURRENCY,
+) -> Dict[Tuple[str, int], bool]:
+    """
+    Check image existence of many mobs and items in batches.
+
+    Args:
+        client: Shared HTTP client bound to the job's authorization header.
+        items: Dicts with type and id.
+        batch_size: Items per image retriever call.
+        concurrency: Calls in flight at once.
+
+    Returns:
+        Image existence by (type, id) for the batches that were answered.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    flags: Dict[Tuple[str, int], bool] = {}
+
+    async def check(batch: List[Dict]) -> None:
+        async with semaphore:
+            try:
+                results = await image_retriever_client.check_images_exist(client, batch)
+            except httpx.HTTPError as e:
+                logger.warning("Image existence of %d items unavailable, storing as unknown: %s", len(batch), e)
+                return
+        flags.update({(result["type"], result["id"]): result["image_exist"] for result in results})
+
+    await asyncio.gather(*(check(items[i:i + batch_size]) for i in range(0, len(items), batch_size)))
+    return flags
+
+
+async def build_snapshot(
+    client: RequestClient, path: str, image_batch_size: int = SNAPSHOT_IMAGE_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Export names, drops and image flags and write them as a snapshot.
+
+    Args:
+        client: Shared HTTP client bound to the job's authorization header.
+        path: Snapshot file path.
+        image_batch_size: Items per image retriever call.
+
+    Returns:
+        Counts of drops, names and checked images written.
+
+    Raises:
+        httpx.HTTPError: If the name or drop export fails; the old snapshot stays in place.
+    """
+    export, drops = await asyncio.gather(
+        name_resolver_client.export_names(client),
+        drop_repo_client.export_drops(client),
+    )
+    items = list({(entry["type"], entry["id"]): {"type": entry["type"], "id": entry["id"]}
+                  for entry in export["names"]}.values())
+    images = await fetch_image_flags(client, items, image_batch_size)
+    counts = await asyncio.to_thread(write_snapshot, path, export["version"], export["names"], drops, images)
+    return {**counts, "images": len(images)}
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    CLI entry point.
+
+    Args:
+        argv: Command line arguments.
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Build the memory-mapped search snapshot.")
+    parser.add_argument("path", nargs="?", default=SNAPSHOT_PATH, help="Snapshot file to write.")
+    parser.add_argument(
+        "--image-batch-size", type=int, default=SNAPSHOT_IMAGE_BATCH_SIZE, help="Items per image existence call."
+    )
+    parser.add_argument("--token", default="", help="Fixed bearer token instead of service account tokens.")
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error("a snapshot path or SNAPSHOT_PATH is required")
+    if not args.token and not (SERVICE_CLIENT_ID and SERVICE_CLIENT_SECRET):
+        parser.error("SERVICE_CLIENT_ID and SERVICE_CLIENT_SECRET, or --token, are required")
+
+    async def run() -> Dict[str, int]:
+        http = SharedHttpClient()
+        try:
+            return await build_snapshot(job_client(http, args.token), args.path, args.image_batch_size)
+        finally:
+            await http.aclose()
+
+    started = time.perf_counter()
+    try:
+        counts = asyncio.run(run())
+    except httpx.HTTPError as e:
+        print(f"snapshot build failed, {args.path} left unchanged: {e}")
+        return 1
+    print(f"wrote {args.path}: {counts['drops']} drops, {counts['names']} names, "
+          f"{counts['images']} image flags in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import pytest
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.adaptive_limit import AdaptiveLimiter, OutboundLimits, is_dropped
+
+
+def saturate(limiter: AdaptiveLimiter, rtt: float, rounds: int = 50) -> None:
+    """Run rounds of calls that fill the current limit, all with the same latency."""
+    for _ in range(rounds):
+        slots = limiter.current_limit
+        for _ in range(slots):
+            assert limiter.try_acquire()
+        for _ in range(slots):
+            limiter.release(rtt, dropped=False)
+
+
+class TestAdaptiveLimiter:
+    """Tests for AdaptiveLimiter class."""
+
+    def test_rejects_at_limit(self):
+        """Test calls beyond the limit are rejected without waiting."""
+        limiter = AdaptiveLimiter("drop-repo", initial_limit=2, min_limit=1)
+
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        assert limiter.rejected == 1
+
+        limiter.release(0.01, dropped=False)
+        assert limiter.try_acquire()
+
+    def test_grows_while_latency_is_steady(self):
+        """Test a fully used limit grows while latency stays at the baseline."""
+        limiter = AdaptiveLimiter("drop-repo", initial_limit=10, max_limit=50)
+
+        saturate(limiter, 0.01, rounds=20)
+
+        assert limiter.current_limit > 10
+        assert limiter.current_limit <= 50
+
+    def test_idle_limit_does_not_grow(self):
+        """Test a lightly used limit stays put."""
+        limiter = AdaptiveLimiter("drop-repo", initial_limit=10)
+
+        for _ in range(100):
+            limiter.try_acquire()
+            limiter.release(0.01, dropped=False)
+
+        assert limiter.current_limit == 10
+
+    def test_shrinks_when_latency_rises(self):
+        """Test the limit falls once latency climbs well above the baseline."""
+        limiter = AdaptiveLimiter("drop-repo", initial_limit=40, min_limit=2)
+        saturate(limiter, 0.01, rounds=5)
+        before = limiter.current_limit
+
+        saturate(limiter, 0.2, rounds=3)
+
+        assert limiter.current_limit < before
+
+    def test_drops_back_off_multiplicatively(self):
+        """Test timeouts cut the limit by the backoff factor down to the minimum."""
+        limiter = AdaptiveLimiter("drop-repo", initial_limit=20, min_limit=2, backoff=0.5)
+
+        limiter.try_acquire()
+        limiter.release(5.0, dropped=True)
+        assert limiter.current_limit == 10
+
+        for _ in range(10):
+            limiter.try_acquire()
+            limiter.release(5.0, dropped=True)
+        assert limiter.current_limit == 2
+        assert limiter.stats()["dropped"] == 11
+
+
+class TestOutboundLimits:
+    """Tests for the per-downstream registry and outcome classification."""
+
+    def test_one_limiter_per_host(self):
+        """Test hosts get independent limiters."""
+        limits = OutboundLimits(initial_limit=1, min_limit=1)
+
+        assert limits.for_downstream("ms-maple-drop-repo").try_acquire()
+        assert not limits.for_downstream("ms-maple-drop-repo").try_acquire()
+        assert limits.for_downstream("ms-name-resolver").try_acquire()
+        assert set(limits.stats()) == {"ms-maple-drop-repo", "ms-name-resolver"}
+
+    def test_disabled(self):
+        """Test a disabled registry hands out no limiters."""
+        assert OutboundLimits(enabled=False).for_downstream("ms-maple-drop-repo") is None
+
+    @pytest.mark.parametrize("response,error,expected", [
+        (httpx.Response(200), None, False),
+        (httpx.Response(404), None, False),
+        (httpx.Response(503), None, True),
+        (httpx.Response(504), None, True),
+        (None, httpx.ReadTimeout("timeout"), True),
+        (None, httpx.ConnectError("refused"), True),
+    ])
+    def test_is_dropped(self, response, error, expected):
+        """Test which outcomes count as overload."""
+        assert is_dropped(response, error) is expected
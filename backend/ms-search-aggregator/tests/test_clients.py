@@ -1,6 +1,5 @@
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
-import httpx
 import sys
 import os
 
@@ -39,6 +38,20 @@ class TestNameResolverClient:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_resolve_names_to_ids_success(self):
+        """Test resolving several names in one call."""
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"ids": {"Snail": {"id": 100100, "type": "mob"}}}
+        mock_response.raise_for_status = MagicMock()
+        mock_client.post.return_value = mock_response
+
+        result = await name_resolver_client.resolve_names_to_ids(mock_client, ["Snail", "Nobody"])
+
+        assert result == {"Snail": {"id": 100100, "type": "mob"}}
+        assert mock_client.post.call_args.kwargs["json"] == {"nameList": ["Snail", "Nobody"]}
+
     @pytest.mark.asyncio
     async def test_resolve_ids_to_names_success(self):
         """Test resolving IDs to names."""
@@ -85,9 +98,44 @@ class TestNameResolverClient:
         assert result == []
 
 
+class TestExportNames:
+    """Tests for name_resolver_client.export_names function."""
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self):
+        """Test a current version returns None."""
+        mock_client = AsyncMock()
+        mock_client.get.return_value = MagicMock(status_code=304)
+
+        result = await name_resolver_client.export_names(mock_client, "3-abc")
+
+        assert result is None
+        assert mock_client.get.call_args.kwargs["headers"] == {"If-None-Match": '"3-abc"'}
+
+    @pytest.mark.asyncio
+    async def test_full_export(self):
+        """Test the first export is requested without a validator."""
+        mock_client = AsyncMock()
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"version": "3-abc", "names": []}
+        mock_client.get.return_value = response
+
+        result = await name_resolver_client.export_names(mock_client)
+
+        assert result["version"] == "3-abc"
+        assert mock_client.get.call_args.kwargs["headers"] is None
+
+
 class TestDropRepoClient:
     """Tests for drop_repo_client functions."""
 
+    @pytest.fixture(autouse=True)
+    def clear_validator_cache(self):
+        """Start every test without remembered ETags."""
+        drop_repo_client._validator_cache.clear()
+        yield
+        drop_repo_client._validator_cache.clear()
+
     @pytest.mark.asyncio
     async def test_fetch_drops_by_mob_id_success(self):
         """Test fetching drops by mob ID."""
@@ -107,6 +155,81 @@ class TestDropRepoClient:
         assert len(result) == 1
         assert result[0]["dropperid"] == 100100
 
+    @pytest.mark.asyncio
+    async def test_fetch_drops_sends_if_none_match(self):
+        """Test a remembered ETag is sent and reused on 304."""
+        drops = [{"id": "1", "dropperid": 100100, "itemid": 2000001}]
+        first = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+        first.json.return_value = drops
+        not_modified = MagicMock(status_code=304, headers={"ETag": '"v1"'})
+        not_modified.json.side_effect = AssertionError("304 has no body")
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [first, not_modified]
+        id_info = {"id": 100100, "type": "mob"}
+
+        await drop_repo_client.fetch_drops_by_mob_id(mock_client, id_info)
+        result = await drop_repo_client.fetch_drops_by_mob_id(mock_client, id_info)
+
+        assert result == drops
+        assert mock_client.get.call_args_list[0].kwargs["headers"] == {}
+        assert mock_client.get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+        not_modified.raise_for_status.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fetch_drops_updates_validator_on_change(self):
+        """Test a 200 response replaces the remembered body and ETag."""
+        first = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+        first.json.return_value = [{"id": "1"}]
+        second = MagicMock(status_code=200, headers={"ETag": '"v2"'})
+        second.json.return_value = [{"id": "2"}]
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [first, second]
+        id_info = {"id": 2000001, "type": "item"}
+
+        await drop_repo_client.fetch_drops_by_mob_id(mock_client, id_info)
+        result = await drop_repo_client.fetch_drops_by_mob_id(mock_client, id_info)
+
+        assert result == [{"id": "2"}]
+        assert drop_repo_client._validator_cache[(2000001, "item")] == ('"v2"', [{"id": "2"}])
+
+    @pytest.mark.asyncio
+    async def test_fetch_augmented_drops(self):
+        """Test augmented drops are read from the read model endpoint with their own validator."""
+        response = MagicMock(status_code=200, headers={"ETag": '"a1"'})
+        response.json.return_value = [{"id": "1", "dropper_name": "Snail"}]
+        mock_client = AsyncMock()
+        mock_client.get.return_value = response
+
+        result = await drop_repo_client.fetch_augmented_drops(mock_client, {"id": 100100, "type": "mob"})
+
+        assert result[0]["dropper_name"] == "Snail"
+        assert mock_client.get.call_args[0][0].endswith("/api/search_drops/augmented")
+        assert (100100, "mob", "augmented") in drop_repo_client._validator_cache
+        assert (100100, "mob") not in drop_repo_client._validator_cache
+
+    @pytest.mark.asyncio
+    async def test_validator_cache_is_bounded(self):
+        """Test least recently used validators are evicted."""
+        with patch.object(drop_repo_client, "VALIDATOR_CACHE_SIZE", 2):
+            for i in range(3):
+                drop_repo_client._remember_validator((i, "mob"), f'"{i}"', [])
+
+        assert list(drop_repo_client._validator_cache) == [(1, "mob"), (2, "mob")]
+
+    @pytest.mark.asyncio
+    async def test_fetch_drops_by_ids(self):
+        """Test fetching drops of several IDs with one bulk call."""
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"results": {"100100": [{"id": "1"}], "100200": []}}
+        mock_response.raise_for_status = MagicMock()
+        mock_client.post.return_value = mock_response
+
+        result = await drop_repo_client.fetch_drops_by_ids(mock_client, [100100, 100200], "mob")
+
+        assert result == {"100100": [{"id": "1"}], "100200": []}
+        assert mock_client.post.call_args.kwargs["json"] == {"query_type": "mob", "queries": [100100, 100200]}
+
     @pytest.mark.asyncio
     async def test_check_drops_exist_success(self):
         """Test checking drops existence."""
@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.component_cache import ComponentCache
+from services.search_orchestrator import search_and_augment_drops, search_and_augment_many
+
+
+class FakeCache:
+    """In-memory stand-in for CacheClient's batch operations."""
+
+    def __init__(self):
+        self.is_connected = True
+        self.data = {}
+        self.ttls = {}
+        self.reads = 0
+
+    async def get_many(self, keys):
+        self.reads += 1
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    async def set_many(self, items, ttl=None):
+        self.data.update(items)
+        self.ttls.update(dict.fromkeys(items, ttl))
+        return True
+
+
+@pytest.fixture
+def components():
+    """Component cache over an empty in-memory cache."""
+    return ComponentCache(FakeCache(), name_ttl=100, drops_ttl=10)
+
+
+class TestComponentCache:
+    """Tests for ComponentCache layers."""
+
+    @pytest.mark.asyncio
+    async def test_write_then_read(self, components):
+        """Test entries round-trip with their layer's TTL."""
+        components.write("drops", {"mob:100100": [{"id": "1"}]})
+        components.write("id-name", {"item:2000001": "Red Potion"})
+        await components.flush()
+
+        assert await components.read("drops", ["mob:100100", "mob:100101"]) == {"mob:100100": [{"id": "1"}]}
+        assert components.cache.ttls == {"drops:mob:100100": 10, "id-name:item:2000001": 100}
+        assert components.stats()["drops"] == {"hits": 1, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_one_read_per_layer(self, components):
+        """Test all keys of a layer are read in one batch."""
+        await components.read("id-name", ["mob:1", "mob:2", "mob:3"])
+
+        assert components.cache.reads == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnected_cache(self, components):
+        """Test a disconnected cache reads and writes nothing."""
+        components.cache.is_connected = False
+        components.write("name-id", {"Snail": {"id": 100100, "type": "mob"}})
+        await components.flush()
+
+        assert await components.read("name-id", ["Snail"]) == {}
+        assert components.cache.data == {}
+
+
+class TestComponentAssembly:
+    """Tests for searches assembled from cached components."""
+
+    @pytest.mark.asyncio
+    async def test_second_search_fetches_only_missing_parts(self, components, sample_drops):
+        """Test a repeated search is served from parts without downstream calls."""
+        mock_client = AsyncMock()
+
+        with patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver:
+            with patch("services.search_orchestrator.drop_repo_client") as mock_drop_repo:
+                mock_name_resolver.resolve_name_to_id = AsyncMock(return_value={"id": 100100, "type": "mob"})
+                mock_drop_repo.fetch_drops_by_mob_id = AsyncMock(return_value=sample_drops)
+                mock_name_resolver.resolve_ids_to_names = AsyncMock(side_effect=[
+                    {"100100": "Snail"},
+                    {"2000001": "Red Potion", "2000002": "Blue Potion"},
+                ])
+
+                first = await search_and_augment_drops(mock_client, "Snail", None, components)
+                await components.flush()
+                second = await search_and_augment_drops(mock_client, "Snail", None, components)
+
+                assert second == first
+                mock_name_resolver.resolve_name_to_id.assert_awaited_once()
+                mock_drop_repo.fetch_drops_by_mob_id.assert_awaited_once()
+                assert mock_name_resolver.resolve_ids_to_names.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_items_are_resolved_once(self, components, sample_drops):
+        """Test a search sharing items with an earlier one only resolves its new IDs."""
+        mock_client = AsyncMock()
+        components.write("name-id", {"Blue Snail": {"id": 100101, "type": "mob"}})
+        components.write("id-name", {"item:2000001": "Red Potion", "item:2000002": "Blue Potion"})
+        await components.flush()
+        blue_snail_drops = [{**d, "dropperid": 100101} for d in sample_drops]
+
+        with patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver:
+            with patch("services.search_orchestrator.drop_repo_client") as mock_drop_repo:
+                mock_name_resolver.resolve_names_to_ids = AsyncMock(return_value={})
+                mock_drop_repo.fetch_drops_by_ids = AsyncMock(return_value={"100101": blue_snail_drops})
+                mock_name_resolver.resolve_ids_to_names = AsyncMock(return_value={"100101": "Blue Snail"})
+
+                result = await search_and_augment_many(mock_client, ["Blue Snail"], None, components)
+
+                assert [d.item_name for d in result["Blue Snail"]] == ["Red Potion", "Blue Potion"]
+                mock_name_resolver.resolve_names_to_ids.assert_not_called()
+                mock_name_resolver.resolve_ids_to_names.assert_awaited_once_with(mock_client, [100101], "mob")
+                await components.flush()
+                assert "drops:mob:100101" in components.cache.data
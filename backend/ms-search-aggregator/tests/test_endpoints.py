@@ -0,0 +1,154 @@
+import pytest
+import sys
+import os
+import socket
+from unittest.mock import patch, AsyncMock
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.endpoints import EndpointSet
+from services.http_client import SharedHttpClient
+
+URLS = ["http://10.0.0.1:8000", "http://10.0.0.2:8000", "http://10.0.0.3:8000", "http://10.0.0.4:8000"]
+
+
+class TestPick:
+    """Tests for replica selection."""
+
+    def test_prefers_fewer_outstanding(self):
+        """Test the less loaded of the two sampled replicas wins."""
+        endpoints = EndpointSet("test-pick", URLS[:2])
+        endpoints.endpoints[0].outstanding = 5
+
+        assert all(endpoints.pick().url == URLS[1] for _ in range(20))
+
+    def test_spreads_requests(self):
+        """Test idle replicas all receive traffic."""
+        endpoints = EndpointSet("test-spread", URLS)
+
+        assert {endpoints.pick().url for _ in range(200)} == set(URLS)
+
+    def test_exclude(self):
+        """Test an excluded replica is avoided while others remain."""
+        endpoints = EndpointSet("test-exclude", URLS[:2])
+
+        assert all(endpoints.pick(exclude=[URLS[0]]).url == URLS[1] for _ in range(20))
+        assert endpoints.pick(exclude=URLS[:2]).url in URLS[:2]
+
+
+class TestOutlierEjection:
+    """Tests for outlier ejection."""
+
+    def test_ejects_after_consecutive_failures(self):
+        """Test a failing replica is ejected and no longer picked."""
+        endpoints = EndpointSet("test-failures", URLS[:2], failure_threshold=3)
+        failing = endpoints.endpoints[0]
+
+        for _ in range(3):
+            endpoints.record(failing, 0.01, failed=True)
+
+        assert failing.ejections == 1
+        assert all(endpoints.pick().url == URLS[1] for _ in range(20))
+
+    def test_ejects_slow_replica(self):
+        """Test a replica much slower than its peers is ejected."""
+        endpoints = EndpointSet("test-slow", URLS, min_requests=5, slow_factor=3.0)
+        for endpoint in endpoints.endpoints[1:]:
+            for _ in range(5):
+                endpoints.record(endpoint, 0.01, failed=False)
+        slow = endpoints.endpoints[0]
+
+        for _ in range(5):
+            endpoints.record(slow, 0.2, failed=False)
+
+        assert slow.ejections == 1
+        assert endpoints.stats()["endpoints"][URLS[0]]["ejected"] is True
+
+    def test_ejects_at_most_half(self):
+        """Test ejection stops at the maximum ejected share."""
+        endpoints = EndpointSet("test-fraction", URLS[:2], failure_threshold=1)
+
+        for endpoint in endpoints.endpoints:
+            endpoints.record(endpoint, 0.01, failed=True)
+
+        assert [e.ejections for e in endpoints.endpoints] == [1, 0]
+
+    def test_single_replica_never_ejected(self):
+        """Test a lone replica keeps serving."""
+        endpoints = EndpointSet("test-single", URLS[:1], failure_threshold=1)
+
+        endpoints.record(endpoints.endpoints[0], 0.01, failed=True)
+
+        assert endpoints.endpoints[0].ejections == 0
+
+
+class TestConfiguration:
+    """Tests for endpoint configuration and DNS resolution."""
+
+    def test_from_env_list(self):
+        """Test a comma-separated endpoint list."""
+        with patch.dict(os.environ, {"TEST_ENDPOINTS": f"{URLS[0]}, {URLS[1]}/"}):
+            endpoints = EndpointSet.from_env("TEST", "test-env", "http://default:8000")
+
+        assert [e.url for e in endpoints.endpoints] == URLS[:2]
+
+    def test_from_env_default(self):
+        """Test the single default URL without configuration."""
+        endpoints = EndpointSet.from_env("UNSET_TEST", "test-default", "http://default:8000")
+
+        assert [e.url for e in endpoints.endpoints] == ["http://default:8000"]
+
+    @pytest.mark.asyncio
+    async def test_dns_resolution_keeps_known_replicas(self):
+        """Test headless service addresses become replicas and known state survives a refresh."""
+        def addrinfo(*addresses):
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, 8000)) for address in addresses]
+
+        endpoints = EndpointSet("test-dns", dns="drop-repo-headless:8000")
+        with patch("asyncio.base_events.BaseEventLoop.getaddrinfo", new_callable=AsyncMock) as mock_dns:
+            mock_dns.return_value = addrinfo("10.0.0.2", "10.0.0.1")
+            await endpoints.resolve()
+            endpoints.endpoints[0].outstanding = 3
+
+            mock_dns.return_value = addrinfo("10.0.0.1", "10.0.0.3")
+            await endpoints.resolve()
+
+        assert [e.url for e in endpoints.endpoints] == ["http://10.0.0.1:8000", "http://10.0.0.3:8000"]
+        assert endpoints.endpoints[0].outstanding == 3
+
+
+class TestRequest:
+    """Tests for balanced requests."""
+
+    @pytest.mark.asyncio
+    async def test_request_records_outcome(self):
+        """Test server errors count as replica failures and successes reset them."""
+        def handler(request):
+            return httpx.Response(503 if request.url.host == "10.0.0.1" else 200)
+
+        shared = SharedHttpClient(transport=httpx.MockTransport(handler))
+        client = shared.bind({})
+        endpoints = EndpointSet("test-request", URLS[:2], failure_threshold=100)
+
+        for _ in range(20):
+            await endpoints.get(client, "/api/x")
+        await shared.aclose()
+
+        stats = endpoints.stats()["endpoints"]
+        assert stats[URLS[1]]["consecutive_failures"] == 0
+        assert stats[URLS[0]]["consecutive_failures"] > 0
+        assert all(s["outstanding"] == 0 for s in stats.values())
+
+    @pytest.mark.asyncio
+    async def test_replicas_share_one_limiter(self):
+        """Test the concurrency limit is per downstream, not per replica address."""
+        shared = SharedHttpClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        endpoints = EndpointSet("test-limiter", URLS)
+
+        for _ in range(20):
+            await endpoints.get(shared.bind({}), "/api/x")
+        await shared.aclose()
+
+        assert list(shared.outbound_limits.limiters) == ["test-limiter"]
@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.endpoints import EndpointSet
+from services.hedging import HedgeBudget, Hedger, LatencyWindow
+from services.http_client import SharedHttpClient
+
+SLOW = "http://10.0.0.1:8000"
+FAST = "http://10.0.0.2:8000"
+
+
+def warmed_hedger(ratio: float = 1.0, delay: float = 0.01) -> Hedger:
+    """Enabled hedger whose search operation already has a p95 of ``delay``."""
+    hedger = Hedger(enabled=True, min_samples=5, min_delay_ms=0, budget=HedgeBudget(ratio=ratio, burst=10))
+    for _ in range(5):
+        hedger.observe("search", delay)
+    return hedger
+
+
+class TestHedgeParts:
+    """Tests for latency windows, budget and delays."""
+
+    def test_percentile(self):
+        """Test the quantile of recent latencies."""
+        window = LatencyWindow(size=100)
+        for latency in range(1, 101):
+            window.add(latency / 1000)
+
+        assert window.percentile(0.95) == 0.095
+        assert window.percentile(0.5) == 0.05
+
+    def test_budget_caps_hedges(self):
+        """Test hedges are limited to the earned fraction of calls."""
+        budget = HedgeBudget(ratio=0.25, burst=10)
+        spent = 0
+        for _ in range(100):
+            budget.earn()
+            spent += budget.try_spend()
+
+        assert spent == 25
+
+    def test_no_delay_until_warm_or_when_disabled(self):
+        """Test operations are not hedged without enough samples or when disabled."""
+        hedger = Hedger(enabled=True, min_samples=5)
+        assert hedger.delay("search") is None
+
+        assert warmed_hedger().delay("search") == 0.01
+        assert Hedger(enabled=False).delay("search") is None
+
+
+class TestHedgedRequest:
+    """Tests for hedged EndpointSet requests."""
+
+    @staticmethod
+    def transport(seen):
+        """Replica 10.0.0.1 hangs; 10.0.0.2 answers at once."""
+        async def handler(request):
+            seen.append(str(request.url.host))
+            if request.url.host == "10.0.0.1":
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    seen.append("cancelled")
+                    raise
+            return httpx.Response(200, json={"host": request.url.host})
+
+        return httpx.MockTransport(handler)
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_loser_cancelled(self):
+        """Test a slow first attempt is hedged on the other replica and then cancelled."""
+        seen = []
+        shared = SharedHttpClient(transport=self.transport(seen))
+        endpoints = EndpointSet("test-hedge", [SLOW, FAST], hedger=warmed_hedger())
+        endpoints.endpoints[1].outstanding = 1  # make the slow replica the first pick
+
+        response = await endpoints.get(shared.bind({}), "/api/search", hedge="search")
+        await shared.aclose()
+
+        assert response.json() == {"host": "10.0.0.2"}
+        assert seen == ["10.0.0.1", "10.0.0.2", "cancelled"]
+        stats = endpoints.stats()
+        assert stats["hedging"]["hedged"] == 1
+        assert stats["hedging"]["hedge_wins"] == 1
+        assert stats["endpoints"][SLOW]["outstanding"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loser_records_no_latency(self):
+        """Test the cancelled attempt frees its limiter slot without a latency sample."""
+        seen = []
+        shared = SharedHttpClient(transport=self.transport(seen))
+        endpoints = EndpointSet("test-hedge-sample", [SLOW, FAST], hedger=warmed_hedger())
+        endpoints.endpoints[1].outstanding = 1
+
+        await endpoints.get(shared.bind({}), "/api/search", hedge="search")
+        await shared.aclose()
+
+        limiter = shared.outbound_limits.limiters["test-hedge-sample"]
+        assert limiter.in_flight == 0
+        assert limiter.dropped == 0
+        # A second sample would have moved the short- and long-term estimates apart.
+        assert limiter.short_rtt == limiter.long_rtt
+        # Only the winner's latency is a sample: one on top of the five warm-up samples.
+        assert len(endpoints.hedger.windows["search"].samples) == 6
+        assert endpoints.endpoints[0].latency is None
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_budget(self):
+        """Test an exhausted budget leaves the call on its first replica."""
+        seen = []
+
+        async def handler(request):
+            seen.append(str(request.url.host))
+            await asyncio.sleep(0.05)
+            return httpx.Response(200)
+
+        shared = SharedHttpClient(transport=httpx.MockTransport(handler))
+        endpoints = EndpointSet("test-no-budget", [SLOW, FAST], hedger=warmed_hedger(ratio=0))
+
+        response = await endpoints.get(shared.bind({}), "/api/search", hedge="search")
+        await shared.aclose()
+
+        assert response.status_code == 200
+        assert len(seen) == 1
+        assert endpoints.hedger.over_budget == 1
+
+    @pytest.mark.asyncio
+    async def test_unhedged_operation(self):
+        """Test calls without an operation name are never hedged."""
+        seen = []
+        shared = SharedHttpClient(transport=self.transport(seen))
+        endpoints = EndpointSet("test-unhedged", [FAST, SLOW], hedger=warmed_hedger())
+        endpoints.endpoints[1].outstanding = 1
+
+        await endpoints.get(shared.bind({}), "/api/search")
+        await shared.aclose()
+
+        assert seen == ["10.0.0.2"]
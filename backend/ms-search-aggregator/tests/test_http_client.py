@@ -0,0 +1,119 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.adaptive_limit import DownstreamRejected, OutboundLimits
+from services.http_client import SharedHttpClient
+
+
+def echo_headers(request: httpx.Request) -> httpx.Response:
+    """Mock downstream returning the headers it received."""
+    return httpx.Response(200, json={"authorization": request.headers.get("Authorization"),
+                                     "if_none_match": request.headers.get("If-None-Match")})
+
+
+class TestSharedHttpClient:
+    """Tests for SharedHttpClient and RequestClient classes."""
+
+    @pytest.mark.asyncio
+    async def test_bound_headers_sent_per_call(self):
+        """Test each request view sends its own Authorization on the shared client."""
+        shared = SharedHttpClient(transport=httpx.MockTransport(echo_headers))
+
+        first = await shared.bind({"Authorization": "Bearer a"}).get("http://drop-repo/x")
+        second = await shared.bind({"Authorization": "Bearer b"}).post("http://drop-repo/x", json={})
+        await shared.aclose()
+
+        assert first.json()["authorization"] == "Bearer a"
+        assert second.json()["authorization"] == "Bearer b"
+        assert "Authorization" not in shared.client.headers
+
+    @pytest.mark.asyncio
+    async def test_call_headers_merged(self):
+        """Test call-specific headers are added to the bound ones."""
+        shared = SharedHttpClient(transport=httpx.MockTransport(echo_headers))
+        client = shared.bind({"Authorization": "Bearer a"})
+
+        response = await client.get("http://drop-repo/x", headers={"If-None-Match": '"v1"'})
+        await shared.aclose()
+
+        assert response.json() == {"authorization": "Bearer a", "if_none_match": '"v1"'}
+        assert client.headers == {"Authorization": "Bearer a"}
+
+    @pytest.mark.asyncio
+    async def test_stats_count_requests_and_errors(self):
+        """Test request counters, including connection failures."""
+        def fail(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        shared = SharedHttpClient(max_connections=10, transport=httpx.MockTransport(fail))
+
+        with pytest.raises(httpx.ConnectError):
+            await shared.bind({}).get("http://drop-repo/x")
+        stats = shared.stats()
+        await shared.aclose()
+
+        assert stats["requests_total"] == 1
+        assert stats["errors_total"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["max_connections"] == 10
+        assert stats["connections"] == 0
+
+    def test_http2_falls_back_without_h2(self):
+        """Test HTTP/2 is disabled with a warning when h2 is missing."""
+        with patch.dict(sys.modules, {"h2": None}):
+            shared = SharedHttpClient(http2=True)
+
+        assert shared.http2 is False
+
+    @pytest.mark.asyncio
+    async def test_deadline_forwarded(self):
+        """Test calls carry the remaining budget and time out within it."""
+        from utils.deadline import DEADLINE_HEADER, set_deadline
+        seen = {}
+
+        def capture(request):
+            seen["budget"] = request.headers.get(DEADLINE_HEADER)
+            seen["timeout"] = request.extensions["timeout"]["read"]
+            return httpx.Response(200)
+
+        shared = SharedHttpClient(timeout=5, transport=httpx.MockTransport(capture))
+        set_deadline(1.0)
+        try:
+            await shared.bind({}).get("http://drop-repo/x")
+        finally:
+            set_deadline(None)
+            await shared.aclose()
+
+        assert 0 < int(seen["budget"]) <= 1000
+        assert seen["timeout"] <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_rejects_at_downstream_limit(self):
+        """Test calls over a host's adaptive limit fail fast without reaching it."""
+        calls = []
+
+        def record(request):
+            calls.append(request.url.host)
+            return httpx.Response(200)
+
+        limits = OutboundLimits(initial_limit=1, min_limit=1)
+        shared = SharedHttpClient(transport=httpx.MockTransport(record), outbound_limits=limits)
+        limits.for_downstream("drop-repo").try_acquire()
+
+        with pytest.raises(DownstreamRejected):
+            await shared.bind({}).get("http://drop-repo/x")
+        response = await shared.bind({}).get("http://name-resolver/x")
+        stats = shared.stats()
+        await shared.aclose()
+
+        assert response.status_code == 200
+        assert calls == ["name-resolver"]
+        assert stats["outbound_limits"]["drop-repo"]["rejected"] == 1
+        assert stats["outbound_limits"]["name-resolver"]["in_flight"] == 0
+
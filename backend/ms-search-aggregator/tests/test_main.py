@@ -69,6 +69,66 @@ class TestSearchDropsAugmented:
             assert response.status_code == 500
 
 
+class TestSearchBatch:
+    """Tests for /api/search/batch endpoint."""
+
+    def test_search_batch_uses_cache_per_name(self, client, monkeypatch, sample_augmented_drops):
+        """Test cached names are served from cache and only the misses are searched."""
+        import json
+        from main import app
+        from models import AugmentedDrop
+
+        cache = MagicMock(is_connected=True)
+        cache.get_many = AsyncMock(return_value={"Snail": json.dumps({"data": sample_augmented_drops}).encode()})
+        cache.set = AsyncMock(return_value=True)
+        monkeypatch.setattr(app.state, "cache", cache)
+
+        with patch("main.search_and_augment_many", new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = {"Blue Snail": [AugmentedDrop(**d) for d in sample_augmented_drops]}
+
+            response = client.post(
+                "/api/search/batch",
+                json={"names": ["Snail", "Blue Snail", "Snail"]},
+                headers=AUTH_HEADERS,
+            )
+
+            assert response.status_code == 200
+            data = response.json()
+            assert list(data["results"]) == ["Snail", "Blue Snail"]
+            assert data["results"]["Snail"][0]["item_name"] == "Red Potion"
+            assert data["cache_hits"] == 1
+            cache.get_many.assert_awaited_once_with(["Snail", "Blue Snail"])
+            assert mock_search.await_args.args[1] == ["Blue Snail"]
+            assert cache.set.await_args.args[0] == "Blue Snail"
+
+    def test_search_batch_without_cache(self, client):
+        """Test every name is searched when caching is disabled."""
+        with patch("main.search_and_augment_many", new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = {"Snail": [], "Nobody": []}
+
+            response = client.post("/api/search/batch", json={"names": ["Snail", "Nobody"]}, headers=AUTH_HEADERS)
+
+            assert response.status_code == 200
+            assert response.json() == {"results": {"Snail": [], "Nobody": []}, "cache_hits": 0}
+
+    def test_search_batch_requires_names(self, client):
+        """Test an empty batch is rejected."""
+        response = client.post("/api/search/batch", json={"names": []}, headers=AUTH_HEADERS)
+
+        assert response.status_code == 422
+
+    def test_search_batch_rejected_is_503(self, client):
+        """Test a locally rejected downstream call answers 503."""
+        from services.adaptive_limit import DownstreamRejected
+
+        with patch("main.search_and_augment_many", new_callable=AsyncMock) as mock_search:
+            mock_search.side_effect = DownstreamRejected("ms-name-resolver is at its concurrency limit")
+
+            response = client.post("/api/search/batch", json={"names": ["Snail"]}, headers=AUTH_HEADERS)
+
+            assert response.status_code == 503
+
+
 class TestExistenceCheck:
     """Tests for /api/existence-check/{name} endpoint."""
 
@@ -87,6 +147,20 @@ class TestExistenceCheck:
             assert "results" in data
             assert len(data["results"]) == 2
 
+    def test_existence_check_degraded(self, client):
+        """Test partial results without image existence are flagged degraded."""
+        with patch("main.aggregate_existence_by_name", new_callable=AsyncMock) as mock_check:
+            mock_check.return_value = [
+                {"type": "mob", "id": 100100, "image_exist": None, "drop_exist": True},
+            ]
+
+            response = client.get("/api/existence-check/Snail", headers=AUTH_HEADERS)
+
+            assert response.status_code == 200
+            data = response.json()
+            assert data["degraded"] is True
+            assert data["results"][0]["image_exist"] is None
+
     def test_existence_check_empty_result(self, client):
         """Test existence check with no results."""
         with patch("main.aggregate_existence_by_name", new_callable=AsyncMock) as mock_check:
@@ -114,3 +188,118 @@ class TestExistenceCheck:
             response = client.get("/api/existence-check/Snail", headers=AUTH_HEADERS)
 
             assert response.status_code == 404
+
+
+class TestDownstreamRejected:
+    """Tests for local rejections by the outbound limiter."""
+
+    def test_rejection_is_503(self, client):
+        """Test a locally rejected downstream call answers 503 with Retry-After."""
+        from services.adaptive_limit import DownstreamRejected
+
+        with patch("services.search_orchestrator.name_resolver_client.resolve_name_to_id", new_callable=AsyncMock) as mock_resolve:
+            mock_resolve.side_effect = DownstreamRejected("ms-name-resolver is at its concurrency limit")
+
+            response = client.get("/api/search/drops-augmented?name=Snail", headers=AUTH_HEADERS)
+
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "1"
+
+
+class TestHttpPoolMetrics:
+    """Tests for /metrics/http-pool endpoint."""
+
+    def test_pool_metrics(self, client):
+        """Test the shared client's pool metrics are exposed."""
+        response = client.get("/metrics/http-pool")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["connections"] == 0
+        assert data["requests_total"] == 0
+        assert data["max_connections"] > 0
+
+
+class TestAdmission:
+    """Tests for inbound admission control."""
+
+    def test_cache_hit_marks_search_cheap(self, client, monkeypatch):
+        """Test cached searches are prioritized by admission control."""
+        from main import admission, app
+
+        cache = MagicMock(is_connected=True)
+        cache.get = AsyncMock(return_value=b'{"data": []}')
+        monkeypatch.setattr(app.state, "cache", cache)
+
+        response = client.get("/search/Snail", headers=AUTH_HEADERS)
+
+        assert response.status_code == 200
+        assert "/search/Snail" in admission.cheap
+
+    def test_admission_stats(self, client):
+        """Test shed counters are exposed."""
+        response = client.get("/health/admission")
+
+        assert response.status_code == 200
+        assert response.json()["shed_total"] == 0
+
+
+class TestDownstreamMetrics:
+    """Tests for /metrics/downstreams endpoint."""
+
+    def test_downstream_metrics(self, client):
+        """Test breaker and bulkhead state is exposed per downstream."""
+        response = client.get("/metrics/downstreams")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert {"ms-maple-drop-repo", "ms-name-resolver", "ms-image-retriever"} <= set(data)
+        assert data["ms-image-retriever"]["circuit"]["state"] == "closed"
+
+
+
+class TestSnapshotMode:
+    """Tests for searches served from a mapped snapshot."""
+
+    @pytest.fixture
+    def snapshot_store(self, client, monkeypatch, tmp_path):
+        """Serve the app from a small snapshot."""
+        from main import app
+        from services.snapshot import SnapshotStore, write_snapshot
+
+        path = str(tmp_path / "search.snap")
+        names = [{"id": 100100, "type": "mob", "name": "Snail"}, {"id": 2000001, "type": "item", "name": "Red Potion"}]
+        drops = [{"id": 1, "dropperid": 100100, "itemid": 2000001, "minimum_quantity": 1,
+                  "maximum_quantity": 1, "questid": 0, "chance": 100000}]
+        write_snapshot(path, "v1", names, drops, {("mob", 100100): True})
+        store = SnapshotStore(path)
+        monkeypatch.setattr(app.state, "snapshots", store)
+        yield store
+        store.close()
+
+    def test_search_from_snapshot(self, client, snapshot_store):
+        """Test a search is answered from the snapshot without Redis."""
+        with patch("services.search_orchestrator.name_resolver_client.resolve_name_to_id", new_callable=AsyncMock) as mock_resolve:
+            response = client.get("/search/Snail", headers=AUTH_HEADERS)
+
+            mock_resolve.assert_not_called()
+
+        assert response.status_code == 200
+        assert response.headers["x-cache"] == "BYPASS"
+        assert response.json()["data"][0]["item_name"] == "Red Potion"
+
+    def test_existence_from_snapshot(self, client, snapshot_store):
+        """Test existence is answered from the snapshot, degraded for unchecked images."""
+        response = client.get("/api/existence-check/Red Potion", headers=AUTH_HEADERS)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "results": [{"id": 2000001, "type": "item", "image_exist": None, "drop_exist": True}],
+            "degraded": True,
+        }
+
+    def test_readiness_reports_snapshot(self, client, snapshot_store):
+        """Test the mapped snapshot is reported by the readiness probe."""
+        response = client.get("/health/ready")
+
+        assert response.json()["snapshot"]["names_version"] == "v1"
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.name_dictionary import NameDictionary
+
+ENTRIES = [
+    {"id": 100100, "type": "mob", "name": "Snail"},
+    {"id": 2000001, "type": "item", "name": "Red Potion"},
+    {"id": 4000019, "type": "item", "name": "Snail"},
+]
+
+
+@pytest.fixture
+def names():
+    dictionary = NameDictionary(refresh_interval=60)
+    dictionary.load("3-abc", ENTRIES)
+    return dictionary
+
+
+class TestNameDictionary:
+    """Tests for NameDictionary class."""
+
+    def test_name_to_id_uses_last_entry(self, names):
+        """Test duplicate names resolve like the resolver's name map, last entry wins."""
+        assert names.name_to_id("Snail") == {"id": 4000019, "type": "item"}
+        assert names.name_to_id("Orange Mushroom") is None
+
+    def test_ids_for_name(self, names):
+        """Test every ID/type pair of a name is returned."""
+        assert names.ids_for_name("Snail") == [
+            {"type": "mob", "id": 100100},
+            {"type": "item", "id": 4000019},
+        ]
+        assert names.ids_for_name("Orange Mushroom") == []
+
+    def test_names_for_ids_reports_missing(self, names):
+        """Test known IDs resolve locally and unknown ones are returned for fallback."""
+        resolved, missing = names.names_for_ids([2000001, 2000002], "item")
+
+        assert resolved == {"2000001": "Red Potion"}
+        assert missing == [2000002]
+
+    def test_remember_adds_remote_names(self, names):
+        """Test names resolved remotely are found locally afterwards."""
+        names.remember({"2000002": "Blue Potion"}, "item")
+
+        assert names.names_for_ids([2000002], "item") == ({"2000002": "Blue Potion"}, [])
+        assert names.name_to_id("Blue Potion") == {"id": 2000002, "type": "item"}
+
+    @pytest.mark.asyncio
+    async def test_refresh_loads_new_version(self):
+        """Test a refresh sends the known version and loads a changed export."""
+        names = NameDictionary()
+        export = {"version": "3-abc", "names": ENTRIES}
+
+        with patch("services.name_dictionary.name_resolver_client.export_names",
+                   new_callable=AsyncMock, side_effect=[export, None]) as mock_export:
+            assert await names.refresh(AsyncMock()) is True
+            assert await names.refresh(AsyncMock()) is False
+
+        assert names.loaded
+        assert mock_export.call_args_list[1][0][1] == "3-abc"
+        assert names.stats()["mobs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_schedule_refresh_respects_interval(self):
+        """Test background refreshes run once per interval and failures are contained."""
+        names = NameDictionary(refresh_interval=60)
+
+        with patch("services.name_dictionary.name_resolver_client.export_names",
+                   new_callable=AsyncMock, side_effect=RuntimeError("down")) as mock_export:
+            names.schedule_refresh(AsyncMock())
+            await asyncio.sleep(0)
+            names.schedule_refresh(AsyncMock())
+            await names.close()
+
+        assert mock_export.await_count == 1
+        assert not names.loaded
@@ -0,0 +1,158 @@
+import json
+import pytest
+from unittest.mock import patch, AsyncMock
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import AugmentedDrop
+from services.precompute import CHECKPOINT_KEY, PRECOMPUTE_TTL, SEARCH_CACHE_TTL, Checkpoint, main, precompute
+
+EXPORT = {
+    "version": "v1",
+    "names": [
+        {"id": 100100, "type": "mob", "name": "Snail"},
+        {"id": 100101, "type": "mob", "name": "Blue Snail"},
+        {"id": 2000001, "type": "item", "name": "Red Potion"},
+        {"id": 2000002, "type": "item", "name": "Blue Potion"},
+        {"id": 2000003, "type": "item", "name": "Elixir"},
+    ],
+}
+SORTED_NAMES = ["Blue Potion", "Blue Snail", "Elixir", "Red Potion", "Snail"]
+
+
+class FakeCache:
+    """In-memory stand-in for CacheClient."""
+
+    def __init__(self):
+        self.is_connected = True
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+    async def set_many(self, items, ttl=None):
+        self.data.update(items)
+        return True
+
+
+@pytest.fixture(autouse=True)
+def name_export():
+    """Serve the name export without a resolver."""
+    with patch("services.name_dictionary.name_resolver_client.export_names", new=AsyncMock(return_value=EXPORT)):
+        yield
+
+
+def make_search(sample_augmented_drops, fail_on=None):
+    """Batch search returning one drop per name, failing for batches containing fail_on."""
+    calls = []
+
+    async def search_many(client, name_list, names):
+        calls.append(list(name_list))
+        if fail_on in name_list:
+            raise httpx.ConnectError("drop-repo down")
+        return {name: [AugmentedDrop(**sample_augmented_drops[0])] for name in name_list}
+
+    return search_many, calls
+
+
+class TestPrecompute:
+    """Tests for the precompute job."""
+
+    @pytest.mark.asyncio
+    async def test_stores_every_name(self, sample_augmented_drops):
+        """Test every name is stored under its search cache key and reported."""
+        cache = FakeCache()
+        search_many, calls = make_search(sample_augmented_drops)
+        progress = []
+
+        report = await precompute(
+            AsyncMock(), cache, batch_size=2, concurrency=2, search_many=search_many,
+            progress=lambda done, elapsed: progress.append(done),
+        )
+
+        assert sorted(name for batch in calls for name in batch) == SORTED_NAMES
+        assert json.loads(cache.data["Snail"])["data"][0]["item_name"] == "Red Potion"
+        assert (report.names, report.drops, report.batches, report.resumed_from) == (5, 5, 3, 0)
+        assert report.names_per_second > 0
+        assert progress[-1] == 5
+        assert json.loads(cache.data[CHECKPOINT_KEY])["done"] == 5
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_failure(self, sample_augmented_drops):
+        """Test a failed run keeps its checkpoint and a rerun only computes the rest."""
+        cache = FakeCache()
+        failing, _ = make_search(sample_augmented_drops, fail_on="Elixir")
+
+        with pytest.raises(httpx.ConnectError):
+            await precompute(AsyncMock(), cache, batch_size=2, concurrency=1, retries=0, search_many=failing)
+        assert json.loads(cache.data[CHECKPOINT_KEY]) | {"saved_at": 0} == {
+            "version": "v1", "done": 2, "total": 5, "saved_at": 0,
+        }
+
+        search_many, calls = make_search(sample_augmented_drops)
+        report = await precompute(AsyncMock(), cache, batch_size=2, concurrency=1, search_many=search_many)
+
+        assert calls == [["Elixir", "Red Potion"], ["Snail"]]
+        assert report.resumed_from == 2
+        assert report.names == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_failing_batch(self, sample_augmented_drops):
+        """Test a batch failing once is retried before the run gives up."""
+        cache = FakeCache()
+        search_many, _ = make_search(sample_augmented_drops)
+        flaky = AsyncMock(side_effect=[httpx.ReadTimeout("slow"), await search_many(None, SORTED_NAMES, None)])
+
+        with patch("services.precompute.asyncio.sleep", new=AsyncMock()):
+            report = await precompute(AsyncMock(), cache, batch_size=5, retries=1, search_many=flaky)
+
+        assert flaky.await_count == 2
+        assert report.names == 5
+
+    @pytest.mark.asyncio
+    async def test_completed_or_outdated_checkpoint_starts_over(self, sample_augmented_drops):
+        """Test a finished run or a new name version recomputes every name."""
+        cache = FakeCache()
+        cache.data[CHECKPOINT_KEY] = json.dumps({"version": "v1", "done": 5, "total": 5}).encode()
+        assert await Checkpoint.load(cache, "v1") == 0
+        cache.data[CHECKPOINT_KEY] = json.dumps({"version": "v0", "done": 2, "total": 5}).encode()
+        assert await Checkpoint.load(cache, "v1") == 0
+
+        search_many, calls = make_search(sample_augmented_drops)
+        report = await precompute(AsyncMock(), cache, batch_size=5, search_many=search_many)
+
+        assert report.resumed_from == 0
+        assert calls == [SORTED_NAMES]
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_waits_for_earlier_batches(self):
+        """Test an out-of-order batch does not move the checkpoint past an unfinished one."""
+        cache = FakeCache()
+        checkpoint = Checkpoint(cache, "v1", start=0, batch_size=2, total=5)
+
+        await checkpoint.finish(1)
+        assert CHECKPOINT_KEY not in cache.data
+
+        await checkpoint.finish(0)
+        assert json.loads(cache.data[CHECKPOINT_KEY])["done"] == 4
+
+
+class TestResultLifetime:
+    """Tests for the lifetime of precomputed results."""
+
+    def test_default_ttl_within_search_ttl(self):
+        """Test stored results expire no later than entries filled by searches."""
+        assert PRECOMPUTE_TTL <= SEARCH_CACHE_TTL
+
+    def test_longer_ttl_rejected(self):
+        """Test the CLI refuses a lifetime beyond the search TTL."""
+        with pytest.raises(SystemExit):
+            main(["--ttl", str(SEARCH_CACHE_TTL + 1), "--token", "manual"])
@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.adaptive_limit import DownstreamRejected
+from services.resilience import (
+    BulkheadFullError,
+    CircuitBreaker,
+    CircuitOpenError,
+    DownstreamGuard,
+    is_failure,
+)
+
+
+def status_error(status_code: int) -> httpx.HTTPStatusError:
+    """HTTPStatusError with the given status."""
+    return httpx.HTTPStatusError("error", request=MagicMock(), response=httpx.Response(status_code))
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker class."""
+
+    def test_opens_after_threshold(self):
+        """Test consecutive failures open the circuit and calls are then rejected."""
+        breaker = CircuitBreaker("image", failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert not breaker.allow()
+        assert breaker.stats()["rejected"] == 1
+
+    def test_success_resets_failures(self):
+        """Test a success between failures keeps the circuit closed."""
+        breaker = CircuitBreaker("image", failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == "closed"
+
+    def test_half_open_single_probe(self):
+        """Test one probe is let through after the reset timeout and decides the state."""
+        breaker = CircuitBreaker("image", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.allow()
+        assert breaker.state == "half_open"
+        assert not breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    @pytest.mark.parametrize("error,expected", [
+        (httpx.ConnectError("refused"), True),
+        (httpx.ReadTimeout("timeout"), True),
+        (status_error(500), True),
+        (status_error(404), False),
+        (DownstreamRejected("limit"), False),
+        (ValueError("bad"), False),
+    ])
+    def test_is_failure(self, error, expected):
+        """Test which errors count against a downstream."""
+        assert is_failure(error) is expected
+
+
+class TestDownstreamGuard:
+    """Tests for DownstreamGuard class."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test calls are rejected without running once the circuit opens."""
+        guard = DownstreamGuard("test-open", max_concurrent=5, failure_threshold=2, reset_timeout=60)
+        calls = 0
+
+        @guard.protect
+        async def failing():
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("refused")
+
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await failing()
+        with pytest.raises(CircuitOpenError):
+            await failing()
+
+        assert calls == 2
+        assert guard.stats()["circuit"]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_client_errors_keep_circuit_closed(self):
+        """Test 4xx answers do not open the circuit."""
+        guard = DownstreamGuard("test-4xx", max_concurrent=5, failure_threshold=1)
+
+        @guard.protect
+        async def not_found():
+            raise status_error(404)
+
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await not_found()
+
+        assert guard.breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_bulkhead_rejects_when_full(self):
+        """Test calls beyond the bulkhead size are rejected after the short wait."""
+        guard = DownstreamGuard("test-bulkhead", max_concurrent=1, max_wait=0.01)
+        release = asyncio.Event()
+
+        @guard.protect
+        async def slow():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(slow())
+        await asyncio.sleep(0)
+
+        with pytest.raises(BulkheadFullError):
+            await slow()
+
+        release.set()
+        assert await first == "ok"
+        assert guard.stats()["bulkhead"] == {"max_concurrent": 1, "in_flight": 0, "rejected": 1}
@@ -0,0 +1,127 @@
+import pytest
+import sys
+import os
+
+from fastapi import FastAPI, Header
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.route_cache import RouteCache
+from utils.admission import PRIORITY_HIGH, PRIORITY_NORMAL, AdmissionController
+
+
+class FakeCache:
+    """In-memory stand-in for CacheClient."""
+
+    def __init__(self):
+        self.is_connected = True
+        self.data = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        self.ttls[key] = ttl
+        return True
+
+
+@pytest.fixture
+def cached_app():
+    """App with a cached route counting its executions."""
+    app = FastAPI()
+    app.state.cache = FakeCache()
+    app.state.calls = 0
+    app.state.cached_paths = []
+    route_cache = RouteCache(lambda: app.state.cache, on_cached=lambda request: app.state.cached_paths.append(request.url.path))
+
+    admission = AdmissionController(enabled=True)
+    app.state.admission = admission
+    query_cache = RouteCache(
+        lambda: app.state.cache, on_cached=lambda request: admission.mark_cheap(request.url.path, request.url.query)
+    )
+
+    @app.get("/lookup")
+    @query_cache.cached(ttl=60, key=lambda name, **_: f"lookup:{name}")
+    async def lookup(name: str):
+        app.state.calls += 1
+        return {"name": name}
+
+    @app.get("/items/{name}")
+    @route_cache.cached(ttl=60, key=lambda name, **_: f"items:{name}", cacheable=lambda result: result["ok"])
+    async def get_item(name: str, authorization: str = Header("none")):
+        app.state.calls += 1
+        return {"name": name, "ok": name != "partial", "auth": authorization}
+
+    return app
+
+
+class TestRouteCache:
+    """Tests for the RouteCache decorator."""
+
+    def test_miss_then_hit(self, cached_app):
+        """Test the first call fills the cache and the second is served from it."""
+        with TestClient(cached_app) as client:
+            first = client.get("/items/snail", headers={"Authorization": "a"})
+            second = client.get("/items/snail", headers={"Authorization": "b"})
+
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == {"name": "snail", "ok": True, "auth": "a"}
+        assert cached_app.state.calls == 1
+        assert cached_app.state.cache.ttls == {"items:snail": 60}
+        assert cached_app.state.cached_paths == ["/items/snail"]
+
+    def test_no_cache_refreshes(self, cached_app):
+        """Test Cache-Control: no-cache recomputes and overwrites the entry."""
+        with TestClient(cached_app) as client:
+            client.get("/items/snail", headers={"Authorization": "a"})
+            refreshed = client.get("/items/snail", headers={"Authorization": "b", "Cache-Control": "no-cache"})
+            after = client.get("/items/snail")
+
+        assert refreshed.headers["x-cache"] == "MISS"
+        assert after.json()["auth"] == "b"
+        assert cached_app.state.calls == 2
+
+    def test_no_store_bypasses(self, cached_app):
+        """Test Cache-Control: no-store neither reads nor writes the cache."""
+        with TestClient(cached_app) as client:
+            response = client.get("/items/snail", headers={"Cache-Control": "no-store"})
+
+        assert response.headers["x-cache"] == "BYPASS"
+        assert cached_app.state.cache.data == {}
+
+    def test_uncacheable_result_not_stored(self, cached_app):
+        """Test results rejected by the cacheable check are served but not stored."""
+        with TestClient(cached_app) as client:
+            client.get("/items/partial")
+            client.get("/items/partial")
+
+        assert cached_app.state.calls == 2
+        assert cached_app.state.cache.data == {}
+
+    def test_disabled_cache_bypasses(self, cached_app):
+        """Test routes still work without a cache client."""
+        cached_app.state.cache = None
+        with TestClient(cached_app) as client:
+            response = client.get("/items/snail")
+
+        assert response.status_code == 200
+        assert response.headers["x-cache"] == "BYPASS"
+
+    def test_only_hit_queries_are_marked_cheap(self, cached_app):
+        """Test a hit for one name prioritizes that name only, and a miss prioritizes nothing."""
+        admission = cached_app.state.admission
+        with TestClient(cached_app) as client:
+            client.get("/lookup", params={"name": "Snail"})
+            assert admission.classify("/lookup", "name=Snail")[1] == PRIORITY_NORMAL
+
+            hit = client.get("/lookup", params={"name": "Snail"})
+            miss = client.get("/lookup", params={"name": "Slime"})
+
+        assert (hit.headers["x-cache"], miss.headers["x-cache"]) == ("HIT", "MISS")
+        assert admission.classify("/lookup", "name=Snail")[1] == PRIORITY_HIGH
+        assert admission.classify("/lookup", "name=Slime")[1] == PRIORITY_NORMAL
+        assert admission.classify("/lookup", "name=Mushroom")[1] == PRIORITY_NORMAL
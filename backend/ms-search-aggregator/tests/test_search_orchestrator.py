@@ -5,7 +5,75 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.search_orchestrator import search_and_augment_drops, aggregate_existence_by_name
+from services.search_orchestrator import search_and_augment_drops, search_and_augment_many, aggregate_existence_by_name
+
+
+class TestSearchAndAugmentMany:
+    """Tests for search_and_augment_many function."""
+
+    @pytest.mark.asyncio
+    async def test_shares_downstream_calls(self, sample_drops):
+        """Test names, drops and dropper/item names are each fetched once for all names."""
+        mock_client = AsyncMock()
+        blue_snail_drops = [{**sample_drops[0], "id": "3", "dropperid": 100101}]
+
+        with patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver:
+            with patch("services.search_orchestrator.drop_repo_client") as mock_drop_repo:
+                mock_name_resolver.resolve_names_to_ids = AsyncMock(return_value={
+                    "Snail": {"id": 100100, "type": "mob"},
+                    "Blue Snail": {"id": 100101, "type": "mob"},
+                })
+                mock_drop_repo.fetch_drops_by_ids = AsyncMock(return_value={
+                    "100100": sample_drops, "100101": blue_snail_drops,
+                })
+                mock_name_resolver.resolve_ids_to_names = AsyncMock(side_effect=[
+                    {"100100": "Snail", "100101": "Blue Snail"},
+                    {"2000001": "Red Potion", "2000002": "Blue Potion"},
+                ])
+
+                result = await search_and_augment_many(mock_client, ["Snail", "Blue Snail", "Nobody"])
+
+                assert list(result) == ["Snail", "Blue Snail", "Nobody"]
+                assert [d.item_name for d in result["Snail"]] == ["Red Potion", "Blue Potion"]
+                assert result["Blue Snail"][0].dropper_name == "Blue Snail"
+                assert result["Nobody"] == []
+                mock_name_resolver.resolve_names_to_ids.assert_awaited_once_with(
+                    mock_client, ["Snail", "Blue Snail", "Nobody"]
+                )
+                mock_drop_repo.fetch_drops_by_ids.assert_awaited_once_with(mock_client, [100100, 100101], "mob")
+                assert sorted(mock_name_resolver.resolve_ids_to_names.await_args_list[0].args[1]) == [100100, 100101]
+
+    @pytest.mark.asyncio
+    async def test_uses_name_dictionary(self, sample_drops):
+        """Test names known locally are not sent to the resolver."""
+        mock_client = AsyncMock()
+        names = MagicMock()
+        names.name_to_id.side_effect = lambda name: {"id": 100100, "type": "mob"} if name == "Snail" else None
+        names.names_for_ids.side_effect = lambda ids, id_type: ({str(i): f"{id_type}-{i}" for i in ids}, [])
+
+        with patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver:
+            with patch("services.search_orchestrator.drop_repo_client") as mock_drop_repo:
+                mock_name_resolver.resolve_names_to_ids = AsyncMock(return_value={})
+                mock_drop_repo.fetch_drops_by_ids = AsyncMock(return_value={"100100": sample_drops})
+
+                result = await search_and_augment_many(mock_client, ["Snail", "Nobody"], names)
+
+                assert result["Snail"][0].item_name == "item-2000001"
+                mock_name_resolver.resolve_names_to_ids.assert_awaited_once_with(mock_client, ["Nobody"])
+
+    @pytest.mark.asyncio
+    async def test_no_names_found(self):
+        """Test no drops are fetched when no name resolves."""
+        mock_client = AsyncMock()
+
+        with patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver:
+            with patch("services.search_orchestrator.drop_repo_client") as mock_drop_repo:
+                mock_name_resolver.resolve_names_to_ids = AsyncMock(return_value={})
+
+                result = await search_and_augment_many(mock_client, ["Nobody"])
+
+                assert result == {"Nobody": []}
+                mock_drop_repo.fetch_drops_by_ids.assert_not_called()
 
 
 class TestSearchAndAugmentDrops:
@@ -75,6 +143,54 @@ class TestSearchAndAugmentDrops:
                 assert result[0].item_name == "Unknown"
 
 
+    @pytest.mark.asyncio
+    async def test_search_uses_read_model(self):
+        """Test names come from drop-repo's read model without name lookups."""
+        mock_client = AsyncMock()
+        augmented = [{
+            "id": "1", "dropperid": 100100, "dropper_name": "Snail", "itemid": 2000001,
+            "item_name": "Red Potion", "minimum_quantity": 1, "maximum_quantity": 1,
+            "questid": 0, "chance": 100000,
+        }]
+
+        with patch("services.search_orchestrator.AUGMENTED_READ_MODEL", True), \
+                patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver, \
+                patch("services.search_orchestrator.drop_repo_client") as mock_drop_repo:
+            mock_name_resolver.resolve_name_to_id = AsyncMock(return_value={"id": 100100, "type": "mob"})
+            mock_drop_repo.fetch_augmented_drops = AsyncMock(return_value=augmented)
+            mock_name_resolver.resolve_ids_to_names = AsyncMock()
+
+            result = await search_and_augment_drops(mock_client, "Snail")
+
+        assert result[0].item_name == "Red Potion"
+        mock_name_resolver.resolve_ids_to_names.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_search_resolves_names_locally(self, sample_drops):
+        """Test a loaded dictionary replaces the resolver calls, falling back only for misses."""
+        from services.name_dictionary import NameDictionary
+        names = NameDictionary()
+        names.load("v1", [
+            {"id": 100100, "type": "mob", "name": "Snail"},
+            {"id": 2000001, "type": "item", "name": "Red Potion"},
+        ])
+        mock_client = AsyncMock()
+
+        with patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver, \
+                patch("services.search_orchestrator.drop_repo_client") as mock_drop_repo, \
+                patch.object(names, "schedule_refresh"):
+            mock_name_resolver.resolve_name_to_id = AsyncMock()
+            mock_drop_repo.fetch_drops_by_mob_id = AsyncMock(return_value=sample_drops)
+            mock_name_resolver.resolve_ids_to_names = AsyncMock(return_value={"2000002": "Blue Potion"})
+
+            result = await search_and_augment_drops(mock_client, "Snail", names)
+
+        mock_name_resolver.resolve_name_to_id.assert_not_called()
+        mock_name_resolver.resolve_ids_to_names.assert_awaited_once_with(mock_client, [2000002], "item")
+        assert [d.item_name for d in result] == ["Red Potion", "Blue Potion"]
+
+
 class TestAggregateExistenceByName:
     """Tests for aggregate_existence_by_name function."""
 
@@ -131,3 +247,26 @@ class TestAggregateExistenceByName:
                     result = await aggregate_existence_by_name(mock_client, "Snail")
 
                     assert len(result) == 2
+
+    @pytest.mark.asyncio
+    async def test_aggregate_existence_image_circuit_open(self, sample_name_id_results):
+        """Test an unavailable image retriever yields partial results instead of an error."""
+        from services.resilience import CircuitOpenError
+
+        mock_client = AsyncMock()
+
+        with patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver:
+            with patch("services.search_orchestrator.image_retriever_client") as mock_image:
+                with patch("services.search_orchestrator.drop_repo_client") as mock_drop:
+                    mock_name_resolver.get_ids_for_name = AsyncMock(return_value=sample_name_id_results)
+                    mock_image.check_images_exist = AsyncMock(side_effect=CircuitOpenError("open"))
+                    mock_drop.check_drops_exist = AsyncMock(return_value=[
+                        {"type": "mob", "id": 100100, "drop_exist": True},
+                        {"type": "item", "id": 2000001, "drop_exist": False}
+                    ])
+
+                    result = await aggregate_existence_by_name(mock_client, "Snail")
+
+                    assert [r["image_exist"] for r in result] == [None, None]
+                    assert [r["drop_exist"] for r in result] == [True, False]
+
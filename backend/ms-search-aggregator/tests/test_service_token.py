@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import patch
+from urllib.parse import parse_qs
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.http_client import SharedHttpClient
+from services.service_token import ServiceRequestClient, ServiceToken, job_client
+
+TOKEN_URL = "https://keycloak/realms/test/protocol/openid-connect/token"
+
+
+def keycloak_and_downstream(grants):
+    """Mock token endpoint issuing numbered tokens, and a downstream echoing Authorization."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == TOKEN_URL:
+            grants.append(parse_qs(request.content.decode()))
+            return httpx.Response(200, json={"access_token": f"t{len(grants)}", "expires_in": 300})
+        return httpx.Response(200, json={"authorization": request.headers.get("Authorization")})
+    return handler
+
+
+class TestServiceToken:
+    """Tests for ServiceToken and ServiceRequestClient classes."""
+
+    @pytest.mark.asyncio
+    async def test_token_fetched_once_and_sent(self):
+        """Test a client-credentials token is minted once and sent on every call."""
+        grants = []
+        shared = SharedHttpClient(transport=httpx.MockTransport(keycloak_and_downstream(grants)))
+        client = ServiceRequestClient(shared, ServiceToken(shared.client, "jobs", "secret", TOKEN_URL))
+
+        first = await client.get("http://drop-repo/x")
+        second = await client.post("http://drop-repo/x", json={})
+        await shared.aclose()
+
+        assert first.json()["authorization"] == "Bearer t1"
+        assert second.json()["authorization"] == "Bearer t1"
+        assert grants == [{"grant_type": ["client_credentials"], "client_id": ["jobs"], "client_secret": ["secret"]}]
+
+    @pytest.mark.asyncio
+    async def test_token_renewed_before_expiry(self):
+        """Test a token inside the refresh margin is replaced for the next call."""
+        grants = []
+        shared = SharedHttpClient(transport=httpx.MockTransport(keycloak_and_downstream(grants)))
+        client = ServiceRequestClient(shared, ServiceToken(shared.client, "jobs", "secret", TOKEN_URL))
+
+        await client.get("http://drop-repo/x")
+        with patch("services.service_token.time.monotonic", return_value=10**9):
+            response = await client.get("http://drop-repo/x")
+        await shared.aclose()
+
+        assert response.json()["authorization"] == "Bearer t2"
+
+    @pytest.mark.asyncio
+    async def test_rejected_client_raises(self):
+        """Test a rejected grant surfaces as an HTTP error."""
+        shared = SharedHttpClient(transport=httpx.MockTransport(lambda request: httpx.Response(401)))
+        token = ServiceToken(shared.client, "jobs", "wrong", TOKEN_URL)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await token.authorization()
+        await shared.aclose()
+
+
+class TestJobClient:
+    """Tests for job_client function."""
+
+    def test_fixed_token(self):
+        """Test a given token is bound as-is."""
+        client = job_client(SharedHttpClient(), token="manual")
+
+        assert client.headers == {"Authorization": "Bearer manual"}
+
+    def test_service_account(self):
+        """Test client credentials give a self-renewing client."""
+        assert isinstance(job_client(SharedHttpClient(), client_id="jobs", client_secret="secret"), ServiceRequestClient)
+
+    def test_missing_credentials(self):
+        """Test a job without any credentials is rejected."""
+        with pytest.raises(ValueError):
+            job_client(SharedHttpClient(), client_id="", client_secret="")
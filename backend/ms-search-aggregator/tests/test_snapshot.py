@@ -0,0 +1,164 @@
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.search_orchestrator import aggregate_existence_by_name, search_and_augment_drops
+from services.snapshot import Snapshot, SnapshotStore, write_snapshot
+from services.snapshot_builder import build_snapshot
+
+NAMES = [
+    {"id": 100100, "type": "mob", "name": "Snail"},
+    {"id": 100101, "type": "mob", "name": "Blue Snail"},
+    {"id": 2000001, "type": "item", "name": "Red Potion"},
+    {"id": 2000002, "type": "item", "name": "Blue Potion"},
+    {"id": 4000019, "type": "item", "name": "Snail"},
+]
+
+
+def drop(drop_id, dropperid, itemid):
+    return {
+        "id": drop_id, "dropperid": dropperid, "itemid": itemid,
+        "minimum_quantity": 1, "maximum_quantity": 1, "questid": 0, "chance": 100000,
+    }
+
+
+DROPS = [drop(3, 100100, 2000002), drop(1, 100100, 2000001), drop(2, 100101, 2000001), drop(4, 100101, 4000019)]
+IMAGES = {("mob", 100100): True, ("mob", 100101): False}
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Path of a snapshot written from the sample data."""
+    path = str(tmp_path / "search.snap")
+    write_snapshot(path, "v1", NAMES, DROPS, IMAGES)
+    return path
+
+
+@pytest.fixture
+def snapshot(snapshot_path):
+    """Mapped sample snapshot."""
+    snapshot = Snapshot(snapshot_path)
+    yield snapshot
+    snapshot.close()
+
+
+class TestSnapshot:
+    """Tests for the snapshot file format and reader."""
+
+    def test_search_by_mob_and_item(self, snapshot):
+        """Test drops are found by dropperid and by itemid, ordered by ID."""
+        assert [d["id"] for d in snapshot.search("mob", 100100)] == ["1", "3"]
+        assert [d["dropperid"] for d in snapshot.search("item", 2000001)] == [100100, 100101]
+        assert snapshot.search("mob", 999) == []
+        assert snapshot.search("mob", 100100)[0] == {**drop(1, 100100, 2000001), "id": "1"}
+
+    def test_names(self, snapshot):
+        """Test name lookups follow the resolver: the last entry of a name wins."""
+        assert snapshot.name_to_id("Snail") == {"id": 4000019, "type": "item"}
+        assert snapshot.ids_for_name("Snail") == [{"type": "mob", "id": 100100}, {"type": "item", "id": 4000019}]
+        assert snapshot.name_to_id("Nobody") is None
+        assert snapshot.name_for_id("item", 2000002) == "Blue Potion"
+        assert snapshot.name_for_id("item", 999) is None
+
+    def test_existence_flags(self, snapshot):
+        """Test image flags, unknown images and drop existence."""
+        assert snapshot.image_exist("mob", 100100) is True
+        assert snapshot.image_exist("mob", 100101) is False
+        assert snapshot.image_exist("item", 2000001) is None
+        assert snapshot.has_drops("item", 4000019) is True
+        assert snapshot.has_drops("item", 999) is False
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test a file without the snapshot magic is refused."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a snapshot at all")
+
+        with pytest.raises(ValueError):
+            Snapshot(str(path))
+
+    def test_store_swaps_replaced_file(self, snapshot_path):
+        """Test a snapshot renamed over the path is mapped and the old one released."""
+        store = SnapshotStore(snapshot_path)
+        old = store.current
+        try:
+            assert store.reload_if_changed() is False
+
+            write_snapshot(snapshot_path, "v2", NAMES, DROPS[:1], {})
+
+            assert store.reload_if_changed() is True
+            assert store.current is not old
+            assert store.stats()["names_version"] == "v2"
+            assert store.stats()["swaps"] == 1
+            assert [d["id"] for d in store.current.search("mob", 100100)] == ["3"]
+        finally:
+            store.close()
+
+    def test_store_keeps_snapshot_when_file_is_missing(self, snapshot_path):
+        """Test a removed file keeps the mapped snapshot in service."""
+        store = SnapshotStore(snapshot_path)
+        try:
+            os.remove(snapshot_path)
+
+            assert store.reload_if_changed() is False
+            assert store.current.name_to_id("Blue Snail") == {"id": 100101, "type": "mob"}
+        finally:
+            store.close()
+
+
+class TestSnapshotOrchestration:
+    """Tests for searches served from a snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_search_without_network(self, snapshot):
+        """Test a search is augmented from the snapshot without downstream calls."""
+        with patch("services.search_orchestrator.name_resolver_client") as mock_name_resolver:
+            result = await search_and_augment_drops(AsyncMock(), "Blue Snail", snapshot=snapshot)
+
+            mock_name_resolver.resolve_name_to_id.assert_not_called()
+
+        assert [(d.dropper_name, d.item_name) for d in result] == [("Blue Snail", "Red Potion"), ("Blue Snail", "Snail")]
+
+    @pytest.mark.asyncio
+    async def test_existence_without_network(self, snapshot):
+        """Test existence comes from the snapshot, with unchecked images as None."""
+        result = await aggregate_existence_by_name(AsyncMock(), "Snail", snapshot=snapshot)
+
+        assert result == [
+            {"type": "mob", "id": 100100, "image_exist": True, "drop_exist": True},
+            {"type": "item", "id": 4000019, "image_exist": None, "drop_exist": True},
+        ]
+
+
+class TestSnapshotBuilder:
+    """Tests for build_snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_build(self, tmp_path):
+        """Test names, drops and image flags are exported into a readable snapshot."""
+        path = str(tmp_path / "search.snap")
+
+        async def check_images(client, items):
+            if any(item["type"] == "item" for item in items):
+                raise httpx.ConnectError("image retriever down")
+            return [{**item, "image_exist": True} for item in items]
+
+        with patch("services.snapshot_builder.name_resolver_client.export_names",
+                   new=AsyncMock(return_value={"version": "v1", "names": NAMES})), \
+             patch("services.snapshot_builder.drop_repo_client.export_drops", new=AsyncMock(return_value=DROPS)), \
+             patch("services.snapshot_builder.image_retriever_client.check_images_exist", new=check_images):
+            counts = await build_snapshot(AsyncMock(), path, image_batch_size=2)
+
+        assert counts == {"drops": 4, "names": 5, "images": 2}
+        assert not os.path.exists(f"{path}.tmp")
+        snapshot = Snapshot(path)
+        try:
+            assert snapshot.image_exist("mob", 100101) is True
+            assert snapshot.image_exist("item", 2000001) is None
+            assert snapshot.stats()["drops"] == 4
+        finally:
+            snapshot.close()
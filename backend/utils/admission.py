@@ -0,0 +1,384 @@
+"""Inbound admission control and load shedding.
+
+Each route group has a concurrency limit and a bounded wait queue. A
+request that finds its group at the limit waits in the queue; when the
+queue is full or the wait runs out, the request is shed with a fast 503
+and ``Retry-After`` instead of piling up on the event loop. Health
+and metrics endpoints bypass admission, and requests recently served
+from a cache are admitted ahead of other waiters and displace them when
+the queue is full. Cheapness is tracked per request, path plus query, so
+one cached query does not promote every query of its route.
+
+Usage:
+    admission = AdmissionController.from_env(route_limits={"/api/drops/import": 2})
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+
+    # After serving a response from the cache
+    admission.mark_cheap(request.url.path, request.url.query)
+
+Stats are served at /health/admission when the controller is stored in
+``app.state.admission``.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from utils.deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "1000"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+# Comma-separated prefix=limit pairs, e.g. "/search=32,/api/drops/import=2".
+ADMISSION_ROUTE_LIMITS = os.getenv("ADMISSION_ROUTE_LIMITS", "")
+ADMISSION_CHEAP_PATHS = int(os.getenv("ADMISSION_CHEAP_PATHS", "10000"))
+ADMISSION_CHEAP_TTL_SECONDS = float(os.getenv("ADMISSION_CHEAP_TTL_SECONDS", "300"))
+
+
+def parse_route_limits(value: str) -> Dict[str, int]:
+    """
+    Parse route limits from their environment form.
+
+    Args:
+        value: Comma-separated ``prefix=limit`` pairs.
+
+    Returns:
+        Path prefix to concurrency limit mapping; malformed pairs are skipped.
+    """
+    limits = {}
+    for pair in filter(None, (part.strip() for part in value.split(","))):
+        prefix, _, limit = pair.partition("=")
+        try:
+            limits[prefix.strip()] = int(limit)
+        except ValueError:
+            logger.warning("Ignoring malformed admission route limit: %r", pair)
+    return limits
+
+
+class RouteLimiter:
+    """Concurrency limit with a bounded priority wait queue for one route group."""
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Route group name used in stats.
+            limit: Requests allowed to run at once.
+            max_queue: Requests allowed to wait for a slot.
+            queue_timeout: Longest wait for a slot in seconds.
+        """
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def _evict_for(self, priority: int) -> bool:
+        """Shed the newest lower-priority waiter to make room; False if there is none."""
+        pending = [entry for entry in self._waiters if not entry[2].done()]
+        if not pending:
+            return False
+        worst = max(pending, key=lambda entry: (entry[0], entry[1]))
+        if worst[0] <= priority:
+            return False
+        worst[2].set_result(False)
+        self.queued -= 1
+        self.shed_queue_full += 1
+        return True
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL) -> bool:
+        """
+        Wait for a slot.
+
+        The wait is bounded by the queue timeout and by the request deadline.
+
+        Args:
+            priority: PRIORITY_HIGH or PRIORITY_NORMAL; lower values are admitted first.
+
+        Returns:
+            True once a slot is held, False if the request was shed.
+        """
+        if self.active < self.limit and not self.queued:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if self.queued >= self.max_queue and not self._evict_for(priority):
+            self.shed_queue_full += 1
+            return False
+
+        timeout = self.queue_timeout
+        left = remaining()
+        if left is not None:
+            timeout = max(0.0, min(timeout, left))
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self.queued += 1
+        try:
+            granted = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Granted or evicted just as the wait timed out.
+                granted = future.result()
+            else:
+                self.queued -= 1
+                self.shed_timeout += 1
+                return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.result():
+                self.release()
+            elif not future.done() or future.cancelled():
+                self.queued -= 1
+            raise
+        if granted:
+            self.admitted += 1
+        return granted
+
+    def release(self) -> None:
+        """Free a slot and hand it to the best waiting request."""
+        self.active -= 1
+        while self._waiters and self.active < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            future.set_result(True)
+            self.queued -= 1
+            self.active += 1
+
+    def stats(self) -> Dict:
+        """Current load and shed counters."""
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+
+def request_key(path: str, query_string: str = "") -> str:
+    """
+    Key identifying a request for cheap marking.
+
+    Args:
+        path: Request path.
+        query_string: Raw query string, without the leading "?".
+
+    Returns:
+        The path, followed by its query parameters in sorted order if it has any.
+    """
+    params = parse_qsl(query_string, keep_blank_values=True)
+    return f"{path}?{urlencode(sorted(params))}" if params else path
+
+
+class CheapPaths:
+    """Bounded set of recently cheap request keys with expiry."""
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Initialize the set.
+
+        Args:
+            max_size: Paths kept; the least recently marked are dropped first.
+            ttl: Seconds a path stays cheap after it was marked.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._paths: "OrderedDict[str, float]" = OrderedDict()
+
+    def add(self, path: str) -> None:
+        """Mark a path as cheap."""
+        self._paths[path] = time.monotonic() + self.ttl
+        self._paths.move_to_end(path)
+        while len(self._paths) > self.max_size:
+            self._paths.popitem(last=False)
+
+    def __contains__(self, path: str) -> bool:
+        expires = self._paths.get(path)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._paths[path]
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+class AdmissionController:
+    """Route limiters, request classification and shed counters for one app."""
+
+    def __init__(
+        self,
+        max_concurrency: int = ADMISSION_MAX_CONCURRENCY,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout_ms: float = ADMISSION_QUEUE_TIMEOUT_MS,
+        route_limits: Optional[Dict[str, int]] = None,
+        exempt_prefixes: Iterable[str] = ("/health", "/metrics"),
+        retry_after: int = ADMISSION_RETRY_AFTER_SECONDS,
+        enabled: bool = ADMISSION_ENABLED,
+        cheap_paths: int = ADMISSION_CHEAP_PATHS,
+        cheap_ttl: float = ADMISSION_CHEAP_TTL_SECONDS,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            max_concurrency: Limit for paths without a route limit, shared by all of them.
+            max_queue: Wait queue size of each route group.
+            queue_timeout_ms: Longest wait for a slot in milliseconds.
+            route_limits: Path prefix to limit mapping; the longest matching prefix wins.
+            exempt_prefixes: Path prefixes that are never limited.
+            retry_after: Retry-After seconds on shed responses.
+            enabled: When False every request is admitted immediately.
+            cheap_paths: Number of cheap paths remembered.
+            cheap_ttl: Seconds a path stays cheap after it was marked.
+        """
+        queue_timeout = queue_timeout_ms / 1000
+        self.enabled = enabled
+        self.retry_after = retry_after
+        self.exempt_prefixes = tuple(exempt_prefixes)
+        self.default = RouteLimiter("*", max_concurrency, max_queue, queue_timeout)
+        self.routes = {
+            prefix: RouteLimiter(prefix, limit, max_queue, queue_timeout)
+            for prefix, limit in (route_limits or {}).items()
+        }
+        self._prefixes = sorted(self.routes, key=len, reverse=True)
+        self.cheap = CheapPaths(cheap_paths, cheap_ttl)
+        self.bypassed = 0
+
+    @classmethod
+    def from_env(cls, route_limits: Optional[Dict[str, int]] = None, **kwargs) -> "AdmissionController":
+        """
+        Build a controller from the environment.
+
+        Args:
+            route_limits: Service defaults; ADMISSION_ROUTE_LIMITS entries override them.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            Configured controller.
+        """
+        limits = {**(route_limits or {}), **parse_route_limits(ADMISSION_ROUTE_LIMITS)}
+        return cls(route_limits=limits, **kwargs)
+
+    def mark_cheap(self, path: str, query_string: str = "") -> None:
+        """
+        Prioritize future requests for a path and query, e.g. after a cache hit.
+
+        Args:
+            path: Request path as seen by the middleware.
+            query_string: Raw query string; other queries of the path stay unprioritized.
+        """
+        self.cheap.add(request_key(path, query_string))
+
+    def classify(self, path: str, query_string: str = "") -> Tuple[Optional[RouteLimiter], int]:
+        """
+        Pick the limiter and priority for a request.
+
+        Args:
+            path: Request path.
+            query_string: Raw query string.
+
+        Returns:
+            (limiter, priority); the limiter is None for exempt paths.
+        """
+        if not self.enabled or path.startswith(self.exempt_prefixes):
+            return None, PRIORITY_HIGH
+        limiter = next((self.routes[prefix] for prefix in self._prefixes if path.startswith(prefix)), self.default)
+        return limiter, PRIORITY_HIGH if request_key(path, query_string) in self.cheap else PRIORITY_NORMAL
+
+    def stats(self) -> Dict:
+        """
+        Admission metrics.
+
+        Returns:
+            Per-route-group load and shed counters plus totals.
+        """
+        limiters = [self.default, *self.routes.values()]
+        return {
+            "enabled": self.enabled,
+            "shed_total": sum(limiter.shed_queue_full + limiter.shed_timeout for limiter in limiters),
+            "bypassed": self.bypassed,
+            "cheap_paths": len(self.cheap),
+            "routes": {limiter.name: limiter.stats() for limiter in limiters},
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that admits, queues or sheds requests.
+
+    Add it before DeadlineMiddleware so the deadline middleware wraps it
+    and time spent queued counts against the request budget.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        """
+        Wrap an ASGI app.
+
+        Args:
+            app: ASGI application.
+            controller: Shared admission controller.
+        """
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        limiter, priority = self.controller.classify(scope["path"], query_string)
+        if limiter is None:
+            self.controller.bypassed += 1
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire(priority):
+            logger.warning("Shed %s %s (route group %s)", scope.get("method"), scope["path"], limiter.name)
+            await self._send_overloaded(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _send_overloaded(self, send) -> None:
+        """Send a 503 response with Retry-After."""
+        body = json.dumps({"detail": "Service overloaded, retry later"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.controller.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
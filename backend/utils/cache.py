@@ -1,7 +1,7 @@
 """Async Redis cache client for microservices."""
 
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 from redis.asyncio import Redis, ConnectionPool
 from redis.exceptions import RedisError
@@ -21,6 +21,10 @@ class CacheClient:
         data = await cache.get("key")
         await cache.set("key", b"value")
 
+        # Batched: one MGET, one pipelined round trip
+        found = await cache.get_many(["a", "b"])
+        await cache.set_many({"a": b"1", "b": b"2"})
+
         # Cleanup
         await cache.close()
     """
@@ -149,6 +153,55 @@ class CacheClient:
             logger.error("Cache set error for %s: %s", key, e)
             return False
 
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """
+        Get several values in one MGET round trip.
+
+        Args:
+            keys: Cache keys (without prefix).
+
+        Returns:
+            Cached bytes by key for the keys found; empty on error.
+        """
+        if not self._client or not keys:
+            return {}
+
+        try:
+            values = await self._client.mget([self._make_key(key) for key in keys])
+            found = {key: value for key, value in zip(keys, values) if value is not None}
+            logger.debug("Cache get_many: %d of %d hit", len(found), len(keys))
+            return found
+        except RedisError as e:
+            logger.error("Cache get_many error for %d keys: %s", len(keys), e)
+            return {}
+
+    async def set_many(self, items: Dict[str, bytes], ttl: Optional[int] = None) -> bool:
+        """
+        Set several values with TTL in one pipelined round trip.
+
+        Args:
+            items: Values by cache key (will be prefixed).
+            ttl: Optional TTL override (defaults to instance ttl).
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not self._client:
+            return False
+        if not items:
+            return True
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(self._make_key(key), ttl or self.ttl, value)
+                await pipe.execute()
+            logger.debug("Cache set_many: %d keys", len(items))
+            return True
+        except RedisError as e:
+            logger.error("Cache set_many error for %d keys: %s", len(items), e)
+            return False
+
     async def delete(self, key: str) -> bool:
         """
         Delete a key from cache.
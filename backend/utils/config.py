@@ -16,6 +16,7 @@ KEYCLOAK_REALM_URL = os.getenv(
     "https://keycloak.mydormroom.dpdns.org/realms/master"
 )
 KEYCLOAK_JWKS_URL = os.getenv("KEYCLOAK_JWKS_URL")
+KEYCLOAK_TOKEN_URL = os.getenv("KEYCLOAK_TOKEN_URL")
 JWT_AUDIENCE = os.getenv("JWT_AUDIENCE")
 
 
@@ -24,3 +25,10 @@ def get_jwks_url() -> str:
     if KEYCLOAK_JWKS_URL:
         return KEYCLOAK_JWKS_URL
     return f"{KEYCLOAK_REALM_URL}/protocol/openid-connect/certs"
+
+
+def get_token_url() -> str:
+    """Get the token endpoint URL, defaulting to Keycloak's standard endpoint."""
+    if KEYCLOAK_TOKEN_URL:
+        return KEYCLOAK_TOKEN_URL
+    return f"{KEYCLOAK_REALM_URL}/protocol/openid-connect/token"
@@ -0,0 +1,192 @@
+"""Request deadlines propagated across service hops.
+
+The edge sets a time budget in the ``X-Request-Timeout-Ms`` header. Each
+service converts it into a local deadline when a request arrives, stops
+the request with 504 once the deadline passes, and forwards the remaining
+budget on every downstream call. A relative budget is used instead of an
+absolute timestamp so hops do not depend on synchronized clocks.
+
+Usage:
+    app.add_middleware(DeadlineMiddleware, default_budget_ms=10000)
+
+    # Inside request handling
+    check_deadline()
+    headers = {**deadline_headers()}
+    timeout = deadline_timeout(5.0)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+# Margin left for the response to travel back when budgeting a downstream call.
+DOWNSTREAM_MARGIN_SECONDS = 0.01
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def set_deadline(budget_seconds: Optional[float]) -> None:
+    """
+    Set the current request's deadline.
+
+    Args:
+        budget_seconds: Time left for the request, or None for no deadline.
+    """
+    _deadline.set(None if budget_seconds is None else time.monotonic() + budget_seconds)
+
+
+def remaining() -> Optional[float]:
+    """
+    Time left before the current request's deadline.
+
+    Returns:
+        Seconds left (negative once expired), or None without a deadline.
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    """Whether the current request's deadline has passed."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check_deadline() -> None:
+    """
+    Stop the current request if its deadline has passed.
+
+    Raises:
+        HTTPException: 504 once the deadline has expired.
+    """
+    if expired():
+        raise HTTPException(status_code=504, detail="Request deadline exceeded")
+
+
+def deadline_headers() -> Dict[str, str]:
+    """
+    Header carrying the remaining budget to a downstream service.
+
+    Returns:
+        The budget header, or an empty dict without a deadline.
+    """
+    left = remaining()
+    if left is None:
+        return {}
+    return {DEADLINE_HEADER: str(max(0, int((left - DOWNSTREAM_MARGIN_SECONDS) * 1000)))}
+
+
+def deadline_timeout(default: float) -> float:
+    """
+    Timeout for a downstream call within the remaining budget.
+
+    Args:
+        default: Timeout in seconds to use when the budget allows it.
+
+    Returns:
+        The smaller of the default and the remaining budget.
+
+    Raises:
+        HTTPException: 504 if the deadline has already passed.
+    """
+    check_deadline()
+    left = remaining()
+    return default if left is None else min(default, left)
+
+
+def parse_budget(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a budget header value.
+
+    Args:
+        value: Milliseconds as sent in the header.
+
+    Returns:
+        Budget in seconds, or None if missing or malformed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value) / 1000)
+    except ValueError:
+        logger.warning("Ignoring malformed %s header: %r", DEADLINE_HEADER, value)
+        return None
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware that enforces the request deadline.
+
+    Requests arriving with no budget left are rejected with 504 before any
+    work starts. Otherwise the request runs under the deadline and is
+    cancelled with 504 if it is still running when the deadline passes and
+    no response has started.
+    """
+
+    def __init__(self, app, default_budget_ms: Optional[float] = None):
+        """
+        Wrap an ASGI app.
+
+        Args:
+            app: ASGI application.
+            default_budget_ms: Budget for requests without the header; None for no deadline.
+        """
+        self.app = app
+        self.default_budget = None if default_budget_ms is None else default_budget_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header_name = DEADLINE_HEADER.lower().encode("latin-1")
+        header = next((value.decode("latin-1") for name, value in scope["headers"] if name == header_name), None)
+        budget = parse_budget(header)
+        if budget is None:
+            budget = self.default_budget
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+
+        set_deadline(budget)
+        if budget <= 0:
+            await self._send_timeout(send)
+            return
+
+        started = False
+
+        async def send_tracked(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        timeout = asyncio.timeout(budget)
+        try:
+            async with timeout:
+                await self.app(scope, receive, send_tracked)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            logger.warning("Request %s %s cancelled at its deadline", scope.get("method"), scope.get("path"))
+            if not started:
+                await self._send_timeout(send)
+
+    @staticmethod
+    async def _send_timeout(send) -> None:
+        """Send a 504 response."""
+        body = json.dumps({"detail": "Request deadline exceeded"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
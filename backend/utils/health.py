@@ -1,6 +1,6 @@
 """Common health check endpoints for microservices."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -17,3 +17,24 @@ async def liveness() -> dict:
         Status dict indicating service is alive.
     """
     return {"status": "alive"}
+
+
+@router.get("/admission")
+async def admission(request: Request) -> dict:
+    """
+    Inbound admission metrics.
+
+    Served under /health so it bypasses admission and stays reachable
+    while the service is shedding load.
+
+    Args:
+        request: Incoming request, for the app's admission controller.
+
+    Returns:
+        Per-route-group load and shed counters, or disabled when the app has no controller.
+    """
+    controller = getattr(request.app.state, "admission", None)
+    if controller is None:
+        return {"enabled": False}
+    return controller.stats()
+
@@ -0,0 +1,210 @@
+"""Tests for admission module."""
+
+import asyncio
+import sys
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.admission import (
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    AdmissionController,
+    AdmissionMiddleware,
+    CheapPaths,
+    RouteLimiter,
+    parse_route_limits,
+)
+from utils.deadline import set_deadline
+from utils.health import router as health_router
+
+
+class TestRouteLimiter:
+    """Tests for RouteLimiter."""
+
+    async def test_admits_up_to_limit_then_queues(self):
+        """Test requests beyond the limit wait for a release."""
+        limiter = RouteLimiter("test", limit=1, max_queue=1, queue_timeout=1.0)
+
+        assert await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+
+        limiter.release()
+        assert await waiter
+        assert limiter.active == 1
+        assert limiter.queued == 0
+
+    async def test_sheds_when_queue_full(self):
+        """Test a full queue sheds new arrivals immediately."""
+        limiter = RouteLimiter("test", limit=1, max_queue=1, queue_timeout=1.0)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        assert not await limiter.acquire()
+        assert limiter.shed_queue_full == 1
+
+        limiter.release()
+        assert await waiter
+
+    async def test_sheds_on_queue_timeout(self):
+        """Test a wait longer than the queue timeout is shed."""
+        limiter = RouteLimiter("test", limit=1, max_queue=4, queue_timeout=0.01)
+        await limiter.acquire()
+
+        assert not await limiter.acquire()
+        assert limiter.shed_timeout == 1
+        assert limiter.queued == 0
+
+    async def test_wait_bounded_by_deadline(self):
+        """Test the wait ends with the request deadline."""
+        limiter = RouteLimiter("test", limit=1, max_queue=4, queue_timeout=10.0)
+        await limiter.acquire()
+        set_deadline(0.01)
+        try:
+            assert not await limiter.acquire()
+        finally:
+            set_deadline(None)
+
+    async def test_high_priority_admitted_first(self):
+        """Test cheap requests jump ahead of normal waiters."""
+        limiter = RouteLimiter("test", limit=1, max_queue=4, queue_timeout=1.0)
+        await limiter.acquire()
+        normal = asyncio.create_task(limiter.acquire(PRIORITY_NORMAL))
+        await asyncio.sleep(0)
+        high = asyncio.create_task(limiter.acquire(PRIORITY_HIGH))
+        await asyncio.sleep(0)
+
+        limiter.release()
+        assert await high
+        assert not normal.done()
+
+        limiter.release()
+        assert await normal
+
+    async def test_high_priority_displaces_normal_when_full(self):
+        """Test a cheap request sheds the newest normal waiter from a full queue."""
+        limiter = RouteLimiter("test", limit=1, max_queue=1, queue_timeout=1.0)
+        await limiter.acquire()
+        normal = asyncio.create_task(limiter.acquire(PRIORITY_NORMAL))
+        await asyncio.sleep(0)
+        high = asyncio.create_task(limiter.acquire(PRIORITY_HIGH))
+        await asyncio.sleep(0)
+
+        assert not await normal
+        assert limiter.shed_queue_full == 1
+
+        limiter.release()
+        assert await high
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test a client disconnect while queued frees its queue entry."""
+        limiter = RouteLimiter("test", limit=1, max_queue=1, queue_timeout=1.0)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.queued == 0
+
+        limiter.release()
+        assert limiter.active == 0
+
+
+class TestController:
+    """Tests for AdmissionController classification and config."""
+
+    def test_parse_route_limits(self):
+        """Test env parsing skips malformed pairs."""
+        assert parse_route_limits("/a=2, /b=x,,/c=5") == {"/a": 2, "/c": 5}
+
+    def test_classify(self):
+        """Test exempt paths, longest prefix match and cheap paths."""
+        controller = AdmissionController(route_limits={"/api": 8, "/api/drops/import": 1}, enabled=True)
+        controller.mark_cheap("/api/cheap")
+
+        assert controller.classify("/health/live") == (None, PRIORITY_HIGH)
+        assert controller.classify("/api/drops/import")[0].name == "/api/drops/import"
+        assert controller.classify("/api/other") == (controller.routes["/api"], PRIORITY_NORMAL)
+        assert controller.classify("/api/cheap")[1] == PRIORITY_HIGH
+        assert controller.classify("/search/x")[0] is controller.default
+
+    def test_cheap_marks_are_per_query(self):
+        """Test a cheap query does not promote other queries of the same path."""
+        controller = AdmissionController(enabled=True)
+        controller.mark_cheap("/api/search", "name=Snail&page=1")
+
+        assert controller.classify("/api/search", "page=1&name=Snail")[1] == PRIORITY_HIGH
+        assert controller.classify("/api/search", "name=Slime")[1] == PRIORITY_NORMAL
+        assert controller.classify("/api/search")[1] == PRIORITY_NORMAL
+
+    def test_disabled_admits_everything(self):
+        """Test a disabled controller never limits."""
+        controller = AdmissionController(enabled=False)
+
+        assert controller.classify("/search/x")[0] is None
+
+    def test_cheap_paths_expire_and_are_bounded(self):
+        """Test cheap paths are evicted by size and by age."""
+        paths = CheapPaths(max_size=2, ttl=60)
+        for path in ("/a", "/b", "/c"):
+            paths.add(path)
+
+        assert "/a" not in paths
+        assert "/c" in paths
+
+        expired = CheapPaths(max_size=2, ttl=-1)
+        expired.add("/a")
+        assert "/a" not in expired
+
+
+@pytest.fixture
+def app():
+    """App with one slot, no queue and a blocking endpoint."""
+    app = FastAPI()
+    app.state.admission = AdmissionController(max_concurrency=1, max_queue=0, retry_after=3, enabled=True)
+    app.state.release = asyncio.Event()
+    app.add_middleware(AdmissionMiddleware, controller=app.state.admission)
+    app.include_router(health_router)
+
+    @app.get("/block")
+    async def block():
+        await app.state.release.wait()
+        return {"ok": True}
+
+    return app
+
+
+class TestAdmissionMiddleware:
+    """Tests for AdmissionMiddleware."""
+
+    async def test_sheds_with_retry_after(self, app):
+        """Test an overloaded route answers 503 with Retry-After while health stays up."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/block"))
+            while app.state.admission.default.active == 0:
+                await asyncio.sleep(0)
+
+            shed = await client.get("/block")
+            health = await client.get("/health/live")
+            stats = (await client.get("/health/admission")).json()
+
+            app.state.release.set()
+            assert (await first).status_code == 200
+
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "3"
+        assert health.status_code == 200
+        assert stats["shed_total"] == 1
+        assert stats["routes"]["*"]["shed_queue_full"] == 1
+        assert app.state.admission.default.active == 0
@@ -0,0 +1,89 @@
+"""Tests for cache module."""
+
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache import CacheClient
+
+
+@pytest.fixture
+def redis_client():
+    """Mock Redis client with a pipeline recording its commands."""
+    client = MagicMock()
+    client.mget = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[True, True])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    client.pipeline.return_value = pipe
+    return client
+
+
+@pytest.fixture
+def cache(redis_client):
+    """Cache client bound to the mock Redis client."""
+    cache = CacheClient(prefix="test", ttl=60)
+    cache._client = redis_client
+    return cache
+
+
+class TestGetMany:
+    """Tests for CacheClient.get_many."""
+
+    async def test_returns_found_keys(self, cache, redis_client):
+        """Test one MGET is sent with prefixed keys and misses are dropped."""
+        redis_client.mget.return_value = [b"1", None]
+
+        assert await cache.get_many(["a", "b"]) == {"a": b"1"}
+        redis_client.mget.assert_awaited_once_with(["test:a", "test:b"])
+
+    async def test_empty_keys(self, cache, redis_client):
+        """Test no round trip is made for no keys."""
+        assert await cache.get_many([]) == {}
+        redis_client.mget.assert_not_called()
+
+    async def test_error_is_a_miss(self, cache, redis_client):
+        """Test Redis errors read as misses."""
+        redis_client.mget.side_effect = RedisError("down")
+
+        assert await cache.get_many(["a"]) == {}
+
+    async def test_disconnected(self):
+        """Test a disconnected client reads nothing."""
+        assert await CacheClient().get_many(["a"]) == {}
+
+
+class TestSetMany:
+    """Tests for CacheClient.set_many."""
+
+    async def test_pipelines_setex(self, cache, redis_client):
+        """Test every key is written with SETEX in one pipeline."""
+        assert await cache.set_many({"a": b"1", "b": b"2"}, ttl=30) is True
+
+        pipe = redis_client.pipeline.return_value
+        redis_client.pipeline.assert_called_once_with(transaction=False)
+        assert [c.args for c in pipe.setex.call_args_list] == [("test:a", 30, b"1"), ("test:b", 30, b"2")]
+        pipe.execute.assert_awaited_once()
+
+    async def test_default_ttl(self, cache, redis_client):
+        """Test the instance TTL is used without an override."""
+        await cache.set_many({"a": b"1"})
+
+        assert redis_client.pipeline.return_value.setex.call_args.args == ("test:a", 60, b"1")
+
+    async def test_error(self, cache, redis_client):
+        """Test Redis errors are reported as a failed write."""
+        redis_client.pipeline.return_value.execute.side_effect = RedisError("down")
+
+        assert await cache.set_many({"a": b"1"}) is False
+
+    async def test_disconnected(self):
+        """Test a disconnected client writes nothing."""
+        assert await CacheClient().set_many({"a": b"1"}) is False
@@ -0,0 +1,130 @@
+"""Tests for deadline module."""
+
+import asyncio
+import sys
+import os
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.deadline import (
+    DEADLINE_HEADER,
+    DeadlineMiddleware,
+    check_deadline,
+    deadline_headers,
+    deadline_timeout,
+    parse_budget,
+    remaining,
+    set_deadline,
+)
+
+
+@pytest.fixture
+def app():
+    """App reporting the budget it sees, with a slow endpoint."""
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware)
+    app.state.calls = 0
+
+    @app.get("/budget")
+    async def budget():
+        app.state.calls += 1
+        return {"remaining": remaining(), "forwarded": deadline_headers()}
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(5)
+        return {}
+
+    return app
+
+
+class TestDeadlineHelpers:
+    """Tests for deadline helper functions."""
+
+    def test_no_deadline(self):
+        """Test helpers are no-ops without a deadline."""
+        set_deadline(None)
+
+        assert remaining() is None
+        assert deadline_headers() == {}
+        assert deadline_timeout(5.0) == 5.0
+        check_deadline()
+
+    def test_timeout_capped_by_budget(self):
+        """Test downstream timeouts and headers use the remaining budget."""
+        set_deadline(0.5)
+
+        assert deadline_timeout(5.0) <= 0.5
+        assert 0 < int(deadline_headers()[DEADLINE_HEADER]) < 500
+        set_deadline(None)
+
+    def test_expired(self):
+        """Test an expired deadline stops the request with 504."""
+        set_deadline(-1)
+
+        with pytest.raises(HTTPException) as exc_info:
+            deadline_timeout(5.0)
+
+        assert exc_info.value.status_code == 504
+        assert deadline_headers() == {DEADLINE_HEADER: "0"}
+        set_deadline(None)
+
+    def test_parse_budget(self):
+        """Test header parsing in milliseconds."""
+        assert parse_budget("1500") == 1.5
+        assert parse_budget("-5") == 0.0
+        assert parse_budget("soon") is None
+        assert parse_budget(None) is None
+
+
+class TestDeadlineMiddleware:
+    """Tests for DeadlineMiddleware class."""
+
+    def test_header_sets_budget(self, app):
+        """Test the header budget is visible to the endpoint and forwarded."""
+        with TestClient(app) as client:
+            response = client.get("/budget", headers={DEADLINE_HEADER: "2000"})
+
+        data = response.json()
+        assert 0 < data["remaining"] <= 2
+        assert int(data["forwarded"][DEADLINE_HEADER]) <= 2000
+
+    def test_no_header_no_deadline(self, app):
+        """Test requests run without a deadline when there is no header or default."""
+        with TestClient(app) as client:
+            response = client.get("/budget")
+
+        assert response.json() == {"remaining": None, "forwarded": {}}
+
+    def test_default_budget(self):
+        """Test the default budget applies to requests without the header."""
+        app = FastAPI()
+        app.add_middleware(DeadlineMiddleware, default_budget_ms=1000)
+
+        @app.get("/budget")
+        async def budget():
+            return {"remaining": remaining()}
+
+        with TestClient(app) as client:
+            assert 0 < client.get("/budget").json()["remaining"] <= 1
+
+    def test_expired_budget_rejected_before_work(self, app):
+        """Test a request arriving with no budget left never reaches the endpoint."""
+        with TestClient(app) as client:
+            response = client.get("/budget", headers={DEADLINE_HEADER: "0"})
+
+        assert response.status_code == 504
+        assert app.state.calls == 0
+
+    def test_slow_request_cancelled(self, app):
+        """Test a request still running at its deadline is cancelled with 504."""
+        with TestClient(app) as client:
+            response = client.get("/slow", headers={DEADLINE_HEADER: "50"})
+
+        assert response.status_code == 504
+        assert response.json() == {"detail": "Request deadline exceeded"}